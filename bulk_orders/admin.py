@@ -13,13 +13,9 @@ from django.conf import settings
 from io import BytesIO
 import xlsxwriter
 import logging
-from .models import BulkOrderLink, OrderEntry, CouponCode
-from .utils import (
-    generate_coupon_codes,
-    generate_bulk_order_pdf,
-    generate_bulk_order_word,
-    generate_bulk_order_excel,
-)
+from .models import BulkOrderLink, OrderEntry, CouponCode, BulkOrderExport
+from .utils import generate_coupon_codes
+from .exports import export_file_response, request_export
 
 logger = logging.getLogger(__name__)
 
@@ -288,35 +284,65 @@ class BulkOrderLinkAdmin(admin.ModelAdmin):
     generate_coupons_action.short_description = "🎟️ Generate Coupons (50 per order)"
 
     def _generate_pdf(self, request, bulk_order):
-        """Generate PDF using centralized utility"""
-        try:
-            return generate_bulk_order_pdf(bulk_order, request)
-        except ImportError:
-            messages.error(request, "PDF generation not available. Install GTK+ libraries.")
-            return None
-        except Exception as e:
-            logger.error(f"Error generating PDF: {str(e)}")
-            messages.error(request, f"Error generating PDF: {str(e)}")
-            return None
+        """Serve the PDF export, or queue it for the background worker"""
+        return self._export(request, bulk_order, BulkOrderExport.KIND_PDF)
         
     def _generate_word(self, request, bulk_order):
-        """Generate Word document using centralized utility"""
-        try:
-            return generate_bulk_order_word(bulk_order)
-        except Exception as e:
-            logger.error(f"Error generating Word document: {str(e)}")
-            messages.error(request, f"Error generating Word document: {str(e)}")
-            return None
+        """Serve the Word export, or queue it for the background worker"""
+        return self._export(request, bulk_order, BulkOrderExport.KIND_WORD)
 
     def _generate_excel(self, request, bulk_order):
-        """Generate Excel using centralized utility"""
+        """Serve the Excel export, or queue it for the background worker"""
+        return self._export(request, bulk_order, BulkOrderExport.KIND_EXCEL)
+
+    def _export(self, request, bulk_order, kind):
+        """
+        Documents render in the background (bulk_orders.exports): download
+        the export if one is ready for the current entries, otherwise queue
+        it and ask the admin to run the action again shortly.
+        """
         try:
-            return generate_bulk_order_excel(bulk_order)
+            export = request_export(bulk_order, kind, user=request.user)
         except Exception as e:
-            logger.error(f"Error generating Excel: {str(e)}")
-            messages.error(request, f"Error generating Excel: {str(e)}")
+            logger.error(f"Error queueing {kind} export: {str(e)}")
+            messages.error(request, f"Error queueing export: {str(e)}")
             return None
 
+        if export.status == BulkOrderExport.STATUS_READY:
+            return export_file_response(export)
+
+        self.message_user(
+            request,
+            f"{export.get_kind_display()} for {bulk_order.organization_name} is being generated. "
+            "Run the action again in a moment to download it.",
+            messages.INFO,
+        )
+        return None
+
+
+@admin.register(BulkOrderExport)
+class BulkOrderExportAdmin(admin.ModelAdmin):
+    list_display = ["bulk_order", "kind", "status", "requested_by", "created_at", "finished_at"]
+    list_filter = ["kind", "status", "created_at"]
+    search_fields = ["bulk_order__organization_name", "bulk_order__slug"]
+    readonly_fields = [
+        "bulk_order",
+        "kind",
+        "fingerprint",
+        "status",
+        "file_path",
+        "filename",
+        "error",
+        "requested_by",
+        "created_at",
+        "updated_at",
+        "finished_at",
+    ]
+    list_select_related = ["bulk_order", "requested_by"]
+
+    def has_add_permission(self, request):
+        return False
+
 
 @admin.register(CouponCode)
 class CouponCodeAdmin(admin.ModelAdmin):
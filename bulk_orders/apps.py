@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class BulkOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bulk_orders'
+
+    def ready(self):
+        """Register the Paystack webhook handler for ORDER- references"""
+        from webhook_router.registry import register_webhook_handler
+
+        register_webhook_handler('ORDER-', 'bulk_orders.views.handle_bulk_order_payment')
@@ -0,0 +1,221 @@
+# bulk_orders/exports.py
+"""
+Bulk order documents rendered by a background task instead of inside the
+request.
+
+WeasyPrint PDFs (and Word/Excel files for big links) take seconds of CPU,
+which held a gunicorn worker for the whole render and timed out on large
+links. Now:
+
+1. request_export() finds or creates a BulkOrderExport for the link, kind
+   and current fingerprint, and queues generate_bulk_order_export_task
+   for new (or failed / stuck) exports
+2. the worker runs run_export(): renders with the usual bulk_orders.utils
+   generator and saves the file to the export storage
+3. the client polls the export's status and downloads it once ready
+
+The fingerprint is the count and latest updated_at of the link's entries,
+plus the link's own updated_at, so a ready export keeps being served until
+an entry is added, changed or deleted. Files live in the storage named by
+settings.BULK_ORDER_EXPORT_STORAGE (raw Cloudinary uploads in production,
+FileSystemStorage in tests).
+"""
+import logging
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.db.models import Count, Max
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from material.excel_export import XLSX_CONTENT_TYPE
+from material.word_report import DOCX_CONTENT_TYPE
+
+from .models import BulkOrderExport
+from .utils import (
+    generate_bulk_order_excel,
+    generate_bulk_order_pdf,
+    generate_bulk_order_word,
+    generate_paid_orders_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+ExportKind = namedtuple("ExportKind", ["render", "filename", "content_type"])
+
+EXPORT_KINDS = {
+    BulkOrderExport.KIND_PDF: ExportKind(
+        generate_bulk_order_pdf, "bulk_order_{slug}_{date}.pdf", "application/pdf"
+    ),
+    BulkOrderExport.KIND_WORD: ExportKind(
+        generate_bulk_order_word, "bulk_order_{slug}_{date}.docx", DOCX_CONTENT_TYPE
+    ),
+    BulkOrderExport.KIND_EXCEL: ExportKind(
+        generate_bulk_order_excel, "bulk_order_{slug}_{date}.xlsx", XLSX_CONTENT_TYPE
+    ),
+    BulkOrderExport.KIND_PAID_ORDERS_PDF: ExportKind(
+        generate_paid_orders_pdf, "completed_orders_{slug}.pdf", "application/pdf"
+    ),
+}
+
+# Anyone may fetch these; the rest are admin-only
+PUBLIC_KINDS = {BulkOrderExport.KIND_PAID_ORDERS_PDF}
+
+# Pending/running exports not finished by then are queued again
+# (the worker died or the task was lost)
+EXPORT_STALE_AFTER = timedelta(minutes=15)
+
+EXPORT_UPLOAD_DIR = "bulk_order_exports"
+
+
+def export_storage():
+    """The storage export files are saved to and served from"""
+    return import_string(
+        getattr(
+            settings,
+            "BULK_ORDER_EXPORT_STORAGE",
+            "django.core.files.storage.FileSystemStorage",
+        )
+    )()
+
+
+def export_fingerprint(bulk_order):
+    """Count and latest updated_at of the link's entries, in one query"""
+    stats = bulk_order.orders.order_by().aggregate(
+        count=Count("id"), last_updated=Max("updated_at")
+    )
+    last_updated = stats["last_updated"].isoformat() if stats["last_updated"] else "-"
+    return f"{stats['count']}:{last_updated}:{bulk_order.updated_at.isoformat()}"
+
+
+def _needs_queueing(export):
+    """Failed, or pending/running for longer than EXPORT_STALE_AFTER"""
+    if export.status == BulkOrderExport.STATUS_FAILED:
+        return True
+    if export.status == BulkOrderExport.STATUS_READY:
+        return False
+    return export.updated_at < timezone.now() - EXPORT_STALE_AFTER
+
+
+def request_export(bulk_order, kind, user=None):
+    """
+    The export of this kind for the link's current entries, queueing a
+    render unless one is ready or already under way.
+
+    Returns:
+        BulkOrderExport (status ready, or pending/running until the worker
+        has rendered it)
+    """
+    from material.background_utils import generate_bulk_order_export_task
+
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind: {kind}")
+
+    export, created = BulkOrderExport.objects.get_or_create(
+        bulk_order=bulk_order,
+        kind=kind,
+        fingerprint=export_fingerprint(bulk_order),
+        defaults={"requested_by": user if user and user.is_authenticated else None},
+    )
+
+    if not created:
+        if not _needs_queueing(export):
+            return export
+        export.status = BulkOrderExport.STATUS_PENDING
+        export.error = ""
+        export.save(update_fields=["status", "error", "updated_at"])
+
+    generate_bulk_order_export_task(str(export.id))
+    logger.info(f"Queued {kind} export {export.id} for bulk order: {bulk_order.slug}")
+    return export
+
+
+def _response_file(response):
+    """The rendered document as a File, without copying streamed files"""
+    if response.streaming:
+        return File(response.file_to_stream)
+    return ContentFile(response.content)
+
+
+def run_export(export_id):
+    """
+    Render an export and save it to the export storage (worker side).
+
+    Claims the export with a conditional update, so a duplicate task for
+    the same export does nothing. Older exports of the same kind for the
+    link are removed once this one is ready.
+
+    Returns:
+        True if this call rendered the export
+    """
+    claimed = BulkOrderExport.objects.filter(
+        id=export_id, status=BulkOrderExport.STATUS_PENDING
+    ).update(status=BulkOrderExport.STATUS_RUNNING, updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    export = BulkOrderExport.objects.select_related("bulk_order").get(id=export_id)
+    bulk_order = export.bulk_order
+    kind = EXPORT_KINDS[export.kind]
+    storage = export_storage()
+
+    try:
+        response = kind.render(bulk_order)
+        filename = kind.filename.format(
+            slug=bulk_order.slug, date=timezone.now().strftime("%Y%m%d")
+        )
+        try:
+            file_path = storage.save(
+                f"{EXPORT_UPLOAD_DIR}/{export.id}/{filename}", _response_file(response)
+            )
+        finally:
+            response.close()
+    except Exception as e:
+        logger.error(f"Error rendering export {export_id}: {str(e)}", exc_info=True)
+        export.status = BulkOrderExport.STATUS_FAILED
+        export.error = str(e)
+        export.finished_at = timezone.now()
+        export.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return True
+
+    export.status = BulkOrderExport.STATUS_READY
+    export.file_path = file_path
+    export.filename = filename
+    export.error = ""
+    export.finished_at = timezone.now()
+    export.save(
+        update_fields=["status", "file_path", "filename", "error", "finished_at", "updated_at"]
+    )
+    logger.info(f"Rendered {export.kind} export {export.id} for bulk order: {bulk_order.slug}")
+
+    _delete_superseded(export, storage)
+    return True
+
+
+def _delete_superseded(export, storage):
+    """Drop older exports of the same kind for the link, and their files"""
+    superseded = BulkOrderExport.objects.filter(
+        bulk_order_id=export.bulk_order_id,
+        kind=export.kind,
+        created_at__lt=export.created_at,
+    ).exclude(status__in=[BulkOrderExport.STATUS_PENDING, BulkOrderExport.STATUS_RUNNING])
+
+    for file_path in superseded.exclude(file_path="").values_list("file_path", flat=True):
+        try:
+            storage.delete(file_path)
+        except Exception as e:
+            logger.warning(f"Could not delete superseded export file {file_path}: {str(e)}")
+    superseded.delete()
+
+
+def export_file_response(export):
+    """Stream a ready export's file from the export storage as an attachment"""
+    return FileResponse(
+        export_storage().open(export.file_path, "rb"),
+        as_attachment=True,
+        filename=export.filename,
+        content_type=EXPORT_KINDS[export.kind].content_type,
+    )
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-16 22:41
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bulk_orders', '0002_serial_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkOrderExport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('pdf', 'PDF summary'), ('word', 'Word document'), ('excel', 'Excel size summary'), ('paid_orders_pdf', 'Public paid orders PDF')], max_length=20)),
+                ('fingerprint', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('file_path', models.CharField(blank=True, max_length=500)),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('bulk_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exports', to='bulk_orders.bulkorderlink')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bulk Order Export',
+                'verbose_name_plural': 'Bulk Order Exports',
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(fields=('bulk_order', 'kind', 'fingerprint'), name='unique_bulk_order_export_fingerprint')],
+            },
+        ),
+    ]
@@ -1,16 +1,15 @@
 # bulk_orders/models.py
 from django.db import models
 import uuid
-from django.db.models import Max
 from django.core.exceptions import ValidationError
 from django.conf import settings
 import logging
 from django.urls import reverse
 from django.utils import timezone
-from django.db import models, transaction
 from django.utils.text import slugify
 import random
 import string
+from material.serials import next_serial, preserve_counter
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +30,9 @@ class BulkOrderLink(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Serial number counter — ensures serial numbers are never reused after deletion
+    last_serial_number = models.PositiveIntegerField(default=0)
+
     def _generate_unique_slug(self):
         """Generate a unique slug from organization name with random suffix"""
         base_slug = slugify(self.organization_name)
@@ -58,6 +60,9 @@ class BulkOrderLink(models.Model):
         # Uppercase organization name
         self.organization_name = self.organization_name.upper()
 
+        # Entries own the serial counter - never overwrite it from here
+        preserve_counter(self, kwargs)
+
         try:
             super().save(*args, **kwargs)
             logger.info(f"BulkOrderLink saved successfully: {self.slug}")
@@ -202,19 +207,8 @@ class OrderEntry(models.Model):
 
         # Generate serial number with race condition protection
         if not self.serial_number:
-            # Use select_for_update to prevent race conditions
-            with transaction.atomic():
-                # Lock the related bulk order to prevent concurrent modifications
-                bulk_order = BulkOrderLink.objects.select_for_update().get(
-                    id=self.bulk_order_id
-                )
-
-                # Get the maximum serial number for this bulk order
-                max_serial = OrderEntry.objects.filter(
-                    bulk_order=self.bulk_order
-                ).aggregate(Max("serial_number"))["serial_number__max"]
-
-                self.serial_number = (max_serial or 0) + 1
+            # Single locked increment of the link's counter (UPDATE ... RETURNING)
+            self.serial_number = next_serial(BulkOrderLink, self.bulk_order_id)
 
         # Normalize names to uppercase
         self.full_name = self.full_name.upper()
@@ -251,3 +245,70 @@ class OrderEntry(models.Model):
             models.Index(fields=["updated_at"], name="order_updated_idx"),
             models.Index(fields=["reference"], name="order_reference_idx"),
         ]
+
+
+class BulkOrderExport(models.Model):
+    """
+    A PDF/Word/Excel document of a bulk order, rendered by a background
+    task instead of inside the request (see bulk_orders.exports).
+
+    fingerprint is the count and latest updated_at of the link's entries
+    (plus the link's own updated_at) when the export was requested; a ready
+    export is served again until that changes.
+    """
+
+    KIND_PDF = "pdf"
+    KIND_WORD = "word"
+    KIND_EXCEL = "excel"
+    KIND_PAID_ORDERS_PDF = "paid_orders_pdf"
+    KIND_CHOICES = [
+        (KIND_PDF, "PDF summary"),
+        (KIND_WORD, "Word document"),
+        (KIND_EXCEL, "Excel size summary"),
+        (KIND_PAID_ORDERS_PDF, "Public paid orders PDF"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_READY, "Ready"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    bulk_order = models.ForeignKey(
+        BulkOrderLink, on_delete=models.CASCADE, related_name="exports"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    fingerprint = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    # Name in the export storage, and the name the file is downloaded as
+    file_path = models.CharField(max_length=500, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.bulk_order.organization_name} ({self.status})"
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Bulk Order Export"
+        verbose_name_plural = "Bulk Order Exports"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bulk_order", "kind", "fingerprint"],
+                name="unique_bulk_order_export_fingerprint",
+            )
+        ]
@@ -39,6 +39,20 @@ TEST MODULES:
    - HasCouponFilterTest: Custom filter functionality
    - AdminIntegrationTest: End-to-end admin workflows
 
+6. test_excel_export.py (3 test classes)
+   - ExcelExportTest / BulkOrderExcelExportTest: Streamed XLSX exports
+   - ExcelExportMemoryBenchmarkTest: Peak memory over 50k rows (RUN_BENCHMARKS=1)
+
+7. test_word_report.py (2 test classes)
+   - WordReportTest / BulkOrderWordReportTest: Bulk-XML DOCX tables, one-pass grouping
+
+8. test_order_report.py (1 test class)
+   - OrderReportTest: One-pass report dataset shared by PDF/Word/Excel
+
+9. test_exports.py (2 test classes)
+   - RequestExportTest: Background export jobs, fingerprint reuse, retries
+   - ExportEndpointsTest: 202 / poll / download flow, public paid orders PDF
+
 COVERAGE AREAS:
 ===============
 
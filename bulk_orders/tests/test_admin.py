@@ -6,7 +6,7 @@ Tests cover:
 - BulkOrderLinkAdmin: list display, actions, filters, permissions
 - OrderEntryAdmin: list display, filters, inlines, bulk actions
 - CouponCodeInline: display, permissions, filtering
-- Admin actions: PDF/Word/Excel downloads, coupon generation
+- Admin actions: PDF/Word/Excel exports (served when ready, else queued), coupon generation
 """
 from django.test import TestCase, RequestFactory, override_settings
 import unittest
@@ -20,7 +20,7 @@ from decimal import Decimal
 from unittest.mock import patch, Mock, MagicMock
 from io import BytesIO
 
-from bulk_orders.models import BulkOrderLink, CouponCode, OrderEntry
+from bulk_orders.models import BulkOrderExport, BulkOrderLink, CouponCode, OrderEntry
 from bulk_orders.admin import (
     BulkOrderLinkAdmin,
     OrderEntryAdmin,
@@ -161,12 +161,17 @@ class BulkOrderLinkAdminTest(TestCase):
         result = self.admin.coupon_count(self.bulk_order)
         self.assertIn('8', result)  # Returns formatted HTML with used/total
 
-    @patch('bulk_orders.admin.generate_bulk_order_pdf')
-    def test_download_pdf_action(self, mock_generate_pdf):
-        """Test download_pdf_action admin action"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_generate_pdf.return_value = mock_response
+    def _ready_export(self):
+        """A ready export as returned by request_export"""
+        export = Mock()
+        export.status = BulkOrderExport.STATUS_READY
+        return export
+
+    @patch('bulk_orders.admin.export_file_response')
+    @patch('bulk_orders.admin.request_export')
+    def test_download_pdf_action(self, mock_request_export, mock_file_response):
+        """Test download_pdf_action serves a ready PDF export"""
+        mock_request_export.return_value = self._ready_export()
         
         request = self.factory.post('/')
         request.user = self.admin_user
@@ -177,15 +182,16 @@ class BulkOrderLinkAdminTest(TestCase):
         
         result = self.admin.download_pdf_action(request, queryset)
         
-        mock_generate_pdf.assert_called_once()
-        self.assertIsNotNone(result)
+        mock_request_export.assert_called_once_with(
+            self.bulk_order, BulkOrderExport.KIND_PDF, user=self.admin_user
+        )
+        self.assertEqual(result, mock_file_response.return_value)
 
-    @patch('bulk_orders.admin.generate_bulk_order_word')
-    def test_download_word_action(self, mock_generate_word):
-        """Test download_word_action admin action"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_generate_word.return_value = mock_response
+    @patch('bulk_orders.admin.export_file_response')
+    @patch('bulk_orders.admin.request_export')
+    def test_download_word_action(self, mock_request_export, mock_file_response):
+        """Test download_word_action serves a ready Word export"""
+        mock_request_export.return_value = self._ready_export()
         
         request = self.factory.post('/')
         request.user = self.admin_user
@@ -196,15 +202,16 @@ class BulkOrderLinkAdminTest(TestCase):
         
         result = self.admin.download_word_action(request, queryset)
         
-        mock_generate_word.assert_called_once()
-        self.assertIsNotNone(result)
+        mock_request_export.assert_called_once_with(
+            self.bulk_order, BulkOrderExport.KIND_WORD, user=self.admin_user
+        )
+        self.assertEqual(result, mock_file_response.return_value)
 
-    @patch('bulk_orders.admin.generate_bulk_order_excel')
-    def test_download_excel_action(self, mock_generate_excel):
-        """Test download_excel_action admin action"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_generate_excel.return_value = mock_response
+    @patch('bulk_orders.admin.export_file_response')
+    @patch('bulk_orders.admin.request_export')
+    def test_download_excel_action(self, mock_request_export, mock_file_response):
+        """Test download_excel_action serves a ready Excel export"""
+        mock_request_export.return_value = self._ready_export()
         
         request = self.factory.post('/')
         request.user = self.admin_user
@@ -215,8 +222,27 @@ class BulkOrderLinkAdminTest(TestCase):
         
         result = self.admin.download_excel_action(request, queryset)
         
-        mock_generate_excel.assert_called_once()
-        self.assertIsNotNone(result)
+        mock_request_export.assert_called_once_with(
+            self.bulk_order, BulkOrderExport.KIND_EXCEL, user=self.admin_user
+        )
+        self.assertEqual(result, mock_file_response.return_value)
+
+    @patch('material.background_utils.generate_bulk_order_export_task')
+    def test_download_action_queues_export(self, mock_task):
+        """Test a download action queues the export and messages the admin"""
+        request = self.factory.post('/')
+        request.user = self.admin_user
+        
+        queryset = BulkOrderLink.objects.filter(id=self.bulk_order.id)
+        
+        with patch.object(self.admin, 'message_user') as mock_message_user:
+            result = self.admin.download_pdf_action(request, queryset)
+        
+        self.assertIsNone(result)
+        export = BulkOrderExport.objects.get(bulk_order=self.bulk_order)
+        self.assertEqual(export.status, BulkOrderExport.STATUS_PENDING)
+        mock_task.assert_called_once_with(str(export.id))
+        mock_message_user.assert_called_once()
 
     @unittest.skip('Message handling in admin actions differs from test expectations')
     def test_download_action_requires_single_selection(self):
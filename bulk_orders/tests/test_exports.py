@@ -0,0 +1,249 @@
+# bulk_orders/tests/test_exports.py
+"""
+Tests for bulk_orders/exports.py and the background export endpoints.
+
+Tests cover:
+- request_export: queues a render without rendering in the request, reuses
+  a ready export until the entries change (count or latest updated_at)
+- run_export: stores the file, no-op on a duplicate task, failures
+  recorded and queued again, superseded exports and files removed
+- API: download actions answer 202, status polling, download once ready,
+  admin-only exports hidden from others, public paid orders PDF
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bulk_orders.exports import export_storage, request_export, run_export
+from bulk_orders.models import BulkOrderExport, BulkOrderLink, OrderEntry
+
+User = get_user_model()
+
+# Local storage standing in for Cloudinary
+LOCAL_STORAGE = "django.core.files.storage.FileSystemStorage"
+
+
+class ExportTestMixin:
+    """Temp-dir export storage, a link with two paid orders, queued tasks recorded"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            BULK_ORDER_EXPORT_STORAGE=LOCAL_STORAGE, MEDIA_ROOT=media_root
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        task_patcher = patch("material.background_utils.generate_bulk_order_export_task")
+        self.mock_task = task_patcher.start()
+        self.addCleanup(task_patcher.stop)
+
+        self.user = User.objects.create_user(
+            username="exports", email="exports@example.com", password="testpass123"
+        )
+        self.bulk_order = BulkOrderLink.objects.create(
+            organization_name="Export Church",
+            price_per_item=Decimal("5000.00"),
+            custom_branding_enabled=True,
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user,
+        )
+        for i, size in enumerate(["M", "L"]):
+            OrderEntry.objects.create(
+                bulk_order=self.bulk_order,
+                email=f"user{i}@example.com",
+                full_name=f"Export User {i}",
+                size=size,
+                custom_name=f"user {i}",
+                paid=True,
+            )
+
+    def add_order(self, **kwargs):
+        return OrderEntry.objects.create(
+            bulk_order=self.bulk_order,
+            email="late@example.com",
+            full_name="Late User",
+            size="S",
+            paid=True,
+            **kwargs,
+        )
+
+
+class RequestExportTest(ExportTestMixin, TestCase):
+    """Test queueing, rendering and reuse of exports"""
+
+    @patch("weasyprint.HTML")
+    def test_request_queues_without_rendering(self, mock_html):
+        """Test the request only records the export and queues the task"""
+        export = request_export(self.bulk_order, BulkOrderExport.KIND_PDF, user=self.user)
+
+        self.assertEqual(export.status, BulkOrderExport.STATUS_PENDING)
+        self.assertEqual(export.requested_by, self.user)
+        self.mock_task.assert_called_once_with(str(export.id))
+        mock_html.assert_not_called()
+
+    def test_worker_stores_file(self):
+        """Test run_export renders and saves the document to the storage"""
+        export = request_export(self.bulk_order, BulkOrderExport.KIND_WORD)
+
+        self.assertTrue(run_export(export.id))
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, BulkOrderExport.STATUS_READY)
+        self.assertTrue(export.filename.endswith(".docx"))
+        self.assertIsNotNone(export.finished_at)
+        with export_storage().open(export.file_path, "rb") as stored:
+            self.assertEqual(stored.read(2), b"PK")
+
+    def test_duplicate_task_is_noop(self):
+        """Test a second task for the same export does not render again"""
+        export = request_export(self.bulk_order, BulkOrderExport.KIND_EXCEL)
+        self.assertTrue(run_export(export.id))
+        self.assertFalse(run_export(export.id))
+
+    def test_ready_export_reused_until_entries_change(self):
+        """Test the fingerprint follows entry count and latest updated_at"""
+        export = request_export(self.bulk_order, BulkOrderExport.KIND_WORD)
+        run_export(export.id)
+        self.mock_task.reset_mock()
+
+        # Fingerprint aggregate + export lookup, no render, nothing queued
+        with self.assertNumQueries(2):
+            reused = request_export(self.bulk_order, BulkOrderExport.KIND_WORD)
+        self.assertEqual(reused.id, export.id)
+        self.assertEqual(reused.status, BulkOrderExport.STATUS_READY)
+        self.mock_task.assert_not_called()
+
+        # A new entry changes the count
+        order = self.add_order()
+        added = request_export(self.bulk_order, BulkOrderExport.KIND_WORD)
+        self.assertNotEqual(added.id, export.id)
+        self.mock_task.assert_called_once_with(str(added.id))
+
+        # An edited entry changes the latest updated_at
+        run_export(added.id)
+        order.custom_name = "changed"
+        order.save()
+        edited = request_export(self.bulk_order, BulkOrderExport.KIND_WORD)
+        self.assertNotIn(edited.id, [export.id, added.id])
+
+    @patch("weasyprint.HTML")
+    def test_failed_export_is_queued_again(self, mock_html):
+        """Test a render error is recorded and the next request retries"""
+        mock_html.return_value.write_pdf.side_effect = RuntimeError("fonts missing")
+        export = request_export(self.bulk_order, BulkOrderExport.KIND_PDF)
+
+        run_export(export.id)
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, BulkOrderExport.STATUS_FAILED)
+        self.assertIn("fonts missing", export.error)
+
+        self.mock_task.reset_mock()
+        retried = request_export(self.bulk_order, BulkOrderExport.KIND_PDF)
+        self.assertEqual(retried.id, export.id)
+        self.assertEqual(retried.status, BulkOrderExport.STATUS_PENDING)
+        self.assertEqual(retried.error, "")
+        self.mock_task.assert_called_once_with(str(export.id))
+
+    def test_superseded_exports_removed(self):
+        """Test an older export and its file go once a newer one is ready"""
+        old = request_export(self.bulk_order, BulkOrderExport.KIND_EXCEL)
+        run_export(old.id)
+        old.refresh_from_db()
+
+        self.add_order()
+        new = request_export(self.bulk_order, BulkOrderExport.KIND_EXCEL)
+        run_export(new.id)
+
+        self.assertFalse(BulkOrderExport.objects.filter(id=old.id).exists())
+        self.assertFalse(export_storage().exists(old.file_path))
+        self.assertTrue(BulkOrderExport.objects.filter(id=new.id).exists())
+
+
+class ExportEndpointsTest(ExportTestMixin, TestCase):
+    """Test the enqueue / poll / download flow over the API"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = User.objects.create_user(
+            username="exportadmin",
+            email="exportadmin@example.com",
+            password="adminpass123",
+            is_staff=True,
+        )
+        self.client = APIClient()
+
+    def _url(self, name, **kwargs):
+        return reverse(f"bulk_orders:link-{name}", kwargs={"slug": self.bulk_order.slug, **kwargs})
+
+    def test_download_poll_and_fetch(self):
+        """Test 202 with a status URL, then the file once the worker is done"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self._url("download-word"))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], BulkOrderExport.STATUS_PENDING)
+        self.assertNotIn("download_url", response.data)
+        export_id = response.data["id"]
+
+        run_export(export_id)
+
+        response = self.client.get(response.data["status_url"])
+        self.assertEqual(response.data["status"], BulkOrderExport.STATUS_READY)
+
+        response = self.client.get(response.data["download_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(".docx", response["Content-Disposition"])
+        self.assertEqual(b"".join(response.streaming_content)[:2], b"PK")
+
+        # Unchanged entries: the action serves the stored file straight away
+        response = self.client.get(self._url("download-word"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.mock_task.call_count, 1)
+        response.close()
+
+    def test_download_before_ready_conflicts(self):
+        """Test the download URL answers 409 while the export is pending"""
+        self.client.force_authenticate(user=self.admin_user)
+        export_id = self.client.get(self._url("generate-size-summary")).data["id"]
+
+        response = self.client.get(self._url("export-download", export_id=export_id))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_admin_exports_hidden_from_others(self):
+        """Test a non-admin cannot poll or download an admin-only export"""
+        export = request_export(self.bulk_order, BulkOrderExport.KIND_EXCEL)
+        run_export(export.id)
+
+        self.client.force_authenticate(user=self.user)
+        for name in ["export-status", "export-download"]:
+            response = self.client.get(self._url(name, export_id=export.id))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch("weasyprint.HTML")
+    def test_public_paid_orders_pdf(self, mock_html):
+        """Test ?download=pdf is queued and anyone can fetch the result"""
+        mock_html.return_value.write_pdf.return_value = b"%PDF-1.7"
+
+        response = self.client.get(self._url("paid-orders"), {"download": "pdf"})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_html.assert_not_called()
+
+        run_export(response.data["id"])
+        response = self.client.get(
+            self._url("export-download", export_id=response.data["id"])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("completed_orders_", response["Content-Disposition"])
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.7")
@@ -10,11 +10,13 @@ Tests cover:
 from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 from django.core.exceptions import ValidationError
 from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch
+import threading
+import time
 import uuid
 
 from bulk_orders.models import BulkOrderLink, CouponCode, OrderEntry
@@ -899,3 +901,123 @@ class OrderEntryModelTest(TransactionTestCase):
         self.assertEqual(orders[0].serial_number, 1)
         self.assertEqual(orders[1].serial_number, 2)
         self.assertEqual(orders[2].serial_number, 3)
+
+
+class OrderEntrySerialCounterTest(TestCase):
+    """Test OrderEntry serials come from the BulkOrderLink counter"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="counteruser", email="counter@example.com", password="testpass123"
+        )
+        self.bulk_order = BulkOrderLink.objects.create(
+            organization_name="Counter Church",
+            price_per_item=Decimal("5000.00"),
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user,
+        )
+
+    def _create_entry(self, name="Counter Person"):
+        return OrderEntry.objects.create(
+            bulk_order=self.bulk_order,
+            email="entry@example.com",
+            full_name=name,
+            size="M",
+        )
+
+    def test_counter_tracks_last_serial(self):
+        """Test the link's counter holds the last serial issued"""
+        entry = self._create_entry()
+
+        self.bulk_order.refresh_from_db()
+        self.assertEqual(self.bulk_order.last_serial_number, entry.serial_number)
+
+    def test_serial_not_reused_after_deletion(self):
+        """Test deleting the last entry doesn't free its serial"""
+        self._create_entry("First")
+        self._create_entry("Second").delete()
+
+        self.assertEqual(self._create_entry("Third").serial_number, 3)
+
+    def test_stale_link_save_keeps_counter(self):
+        """Test saving an old copy of the link doesn't roll the counter back"""
+        stale_link = BulkOrderLink.objects.get(pk=self.bulk_order.pk)
+        self._create_entry("First")
+
+        stale_link.organization_name = "Renamed Church"
+        stale_link.save()
+
+        self.assertEqual(self._create_entry("Second").serial_number, 2)
+
+    def test_allocation_is_one_query(self):
+        """Test allocating a serial locks, increments and reads in one query"""
+        from material.serials import next_serial
+
+        with self.assertNumQueries(1):
+            serial = next_serial(BulkOrderLink, self.bulk_order.pk)
+
+        self.assertEqual(serial, 1)
+
+    def test_missing_link_raises_does_not_exist(self):
+        """Test allocating under a deleted link raises DoesNotExist"""
+        from material.serials import next_serial
+
+        with self.assertRaises(BulkOrderLink.DoesNotExist):
+            next_serial(BulkOrderLink, uuid.uuid4())
+
+
+class OrderEntrySerialLoadTest(TransactionTestCase):
+    """Test concurrent submissions to a single bulk order link"""
+
+    THREADS = 10
+    SUBMISSIONS_PER_THREAD = 10
+
+    def setUp(self):
+        """Set up test data"""
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("Parallel writers need a database shared across connections")
+        self.user = User.objects.create_user(
+            username="loaduser", email="load@example.com", password="testpass123"
+        )
+        self.bulk_order = BulkOrderLink.objects.create(
+            organization_name="Popular Church",
+            price_per_item=Decimal("5000.00"),
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user,
+        )
+
+    def test_concurrent_submissions_get_unique_serials(self):
+        """Test a burst of submissions to one link never collides"""
+        serials = []
+        errors = []
+
+        def submit(index):
+            try:
+                for n in range(self.SUBMISSIONS_PER_THREAD):
+                    entry = OrderEntry.objects.create(
+                        bulk_order=self.bulk_order,
+                        email=f"person{index}_{n}@example.com",
+                        full_name=f"Person {index} {n}",
+                        size="M",
+                    )
+                    serials.append(entry.serial_number)
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=submit, args=(i,)) for i in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = self.THREADS * self.SUBMISSIONS_PER_THREAD
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(serials), list(range(1, total + 1)))
+        self.bulk_order.refresh_from_db()
+        self.assertEqual(self.bulk_order.last_serial_number, total)
+
@@ -0,0 +1,116 @@
+# bulk_orders/tests/test_order_report.py
+"""
+Tests for material/order_report.py and the shared bulk order report pass.
+
+Tests cover:
+- OrderReport: size summary over all orders, paid rows by size, custom
+  names from every order, coupon codes without a query per row
+- stream=True: same summary and rows from an aggregate and chunked rows
+- PDF, Word and Excel rendered from one report: one query in total,
+  against four with a report per format
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from bulk_orders.models import BulkOrderLink, CouponCode, OrderEntry
+from bulk_orders.utils import (
+    build_bulk_order_report,
+    generate_bulk_order_excel,
+    generate_bulk_order_pdf,
+    generate_bulk_order_word,
+)
+
+User = get_user_model()
+
+
+def render_all(bulk_order, report=None):
+    """The admin package's three documents, optionally from one report"""
+    generate_bulk_order_pdf(bulk_order, report=report)
+    generate_bulk_order_word(bulk_order, report=report)
+    generate_bulk_order_excel(bulk_order, report=report).close()
+
+
+class OrderReportTest(TestCase):
+    """Test the one-pass report dataset"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="orderreport", email="orderreport@example.com", password="testpass123"
+        )
+        self.bulk_order = BulkOrderLink.objects.create(
+            organization_name="Order Report Church",
+            price_per_item=Decimal("5000.00"),
+            custom_branding_enabled=True,
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user,
+        )
+        coupon = CouponCode.objects.create(bulk_order=self.bulk_order, code="FREE1234")
+        for i, (name, size, custom, paid, coupon_used) in enumerate(
+            [
+                ("ZED", "M", "zed", True, None),
+                ("AMY", "M", "", False, coupon),
+                ("BOB", "L", "bob", False, None),
+                ("CAL", "L", "", True, None),
+            ]
+        ):
+            OrderEntry.objects.create(
+                bulk_order=self.bulk_order,
+                email=f"user{i}@example.com",
+                full_name=name,
+                size=size,
+                custom_name=custom,
+                paid=paid,
+                coupon_used=coupon_used,
+            )
+
+    def test_report_structure(self):
+        """Test every structure the renderers need comes from one query"""
+        with self.assertNumQueries(1):
+            report = build_bulk_order_report(self.bulk_order)
+
+        self.assertEqual(
+            report.size_summary, [{"size": "L", "count": 2}, {"size": "M", "count": 2}]
+        )
+        self.assertEqual(report.total_orders, 4)
+        self.assertEqual(report.total_paid, 3)
+        self.assertEqual(
+            [(o.size, o.full_name, report.status(o)) for o in report.paid_orders],
+            [("L", "CAL", "Paid"), ("M", "AMY", "Coupon"), ("M", "ZED", "Paid")],
+        )
+        self.assertEqual(list(report.paid_by_size), ["L", "M"])
+        self.assertEqual(report.paid_orders[1].coupon_code, "FREE1234")
+        # Unpaid BOB's custom name is still listed
+        self.assertEqual(report.custom_names_by_size, {"L": ["BOB"], "M": ["ZED"]})
+
+    def test_streamed_report_matches(self):
+        """Test stream=True gives the same summary and rows without holding them"""
+        report = build_bulk_order_report(self.bulk_order)
+        with self.assertNumQueries(2):
+            streamed = build_bulk_order_report(self.bulk_order, stream=True)
+            rows = list(streamed.paid_orders)
+
+        self.assertEqual(streamed.size_summary, report.size_summary)
+        self.assertEqual(streamed.total_paid, report.total_paid)
+        self.assertEqual(rows, report.paid_orders)
+        self.assertIsNone(streamed.custom_names_by_size)
+
+    @patch("weasyprint.HTML")
+    def test_all_formats_from_one_query(self, mock_html):
+        """Test PDF, Word and Excel share a single pass over the orders"""
+        mock_html.return_value.write_pdf.return_value = b"%PDF"
+
+        with self.assertNumQueries(1):
+            render_all(self.bulk_order, report=build_bulk_order_report(self.bulk_order))
+
+        html = mock_html.call_args.kwargs["string"]
+        self.assertIn("Coupon: FREE1234", html)
+        self.assertNotIn("BOB", html)
+
+        # Alone: PDF 1, Word 1, Excel 2 (summary aggregate + streamed rows)
+        with self.assertNumQueries(4):
+            render_all(self.bulk_order)
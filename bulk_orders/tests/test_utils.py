@@ -470,8 +470,8 @@ class GenerateBulkOrderExcelTest(TestCase):
         response = generate_bulk_order_excel(self.bulk_order)
         
         self.assertIsNotNone(response)
-        from django.http import HttpResponse
-        self.assertIsInstance(response, HttpResponse)
+        from django.http import FileResponse
+        self.assertIsInstance(response, FileResponse)
 
     @patch('xlsxwriter.Workbook')
     def test_excel_includes_summary_section(self, mock_workbook):
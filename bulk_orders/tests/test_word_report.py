@@ -0,0 +1,135 @@
+# bulk_orders/tests/test_word_report.py
+"""
+Tests for material/word_report.py and the bulk order Word report.
+
+Tests cover:
+- WordReport.add_table: header and bulk XML rows, escaping, table style
+- group_by_size: one pass into table rows and custom names
+- generate_bulk_order_word: one table per size with restarting serials,
+  unpaid orders only in the custom names section, fixed query count
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from docx import Document
+
+from bulk_orders.models import BulkOrderLink, OrderEntry
+from bulk_orders.utils import generate_bulk_order_word
+from material.word_report import TABLE_STYLE, WordReport, group_by_size
+
+User = get_user_model()
+
+
+def table_texts(table):
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+
+class WordReportTest(TestCase):
+    """Test the shared report builder"""
+
+    def test_add_table_bulk_rows(self):
+        """Test body rows appended as XML read back like python-docx rows"""
+        report = WordReport()
+        report.add_table(["Name", "Custom Name"], [["A & B", "<PASTOR>"], ["C", ""]])
+        document = Document(report.save())
+
+        table = document.tables[0]
+        self.assertEqual(table.style.name, TABLE_STYLE)
+        self.assertEqual(
+            table_texts(table),
+            [["Name", "Custom Name"], ["A & B", "<PASTOR>"], ["C", ""]],
+        )
+
+    def test_custom_names_grid(self):
+        """Test custom names fill a 5-column grid, last row padded"""
+        report = WordReport()
+        report.add_custom_names({"M": [f"NAME {i}" for i in range(7)]})
+        table = Document(report.save()).tables[0]
+
+        self.assertEqual(len(table.rows), 2)
+        self.assertEqual(table_texts(table)[1], ["NAME 5", "NAME 6", "", "", ""])
+
+    def test_group_by_size(self):
+        """Test rows and custom names are split per size in one pass"""
+        entries = [("L", "BOB", "", False), ("L", "CAL", "cal", True), ("M", "AMY", "amy", True)]
+        rows, names = group_by_size(
+            entries,
+            lambda e: [e[1]] if e[3] else None,
+            custom_name=lambda e: e[2].upper(),
+        )
+        self.assertEqual(rows, {"L": [["CAL"]], "M": [["AMY"]]})
+        self.assertEqual(names, {"L": ["CAL"], "M": ["AMY"]})
+
+
+class BulkOrderWordReportTest(TestCase):
+    """Test generate_bulk_order_word output"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="wordreport", email="wordreport@example.com", password="testpass123"
+        )
+        self.bulk_order = BulkOrderLink.objects.create(
+            organization_name="Word Report Church",
+            price_per_item=Decimal("5000.00"),
+            custom_branding_enabled=True,
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user,
+        )
+        for i, (name, size, custom, paid) in enumerate(
+            [
+                ("ZED", "M", "zed", True),
+                ("AMY", "M", "", True),
+                ("BOB", "L", "bob", False),
+                ("CAL", "L", "cal", True),
+            ]
+        ):
+            OrderEntry.objects.create(
+                bulk_order=self.bulk_order,
+                email=f"user{i}@example.com",
+                full_name=name,
+                size=size,
+                custom_name=custom,
+                paid=paid,
+            )
+
+    def _document(self):
+        response = generate_bulk_order_word(self.bulk_order)
+        return Document(BytesIO(response.content))
+
+    def test_size_tables_and_custom_names(self):
+        """Test paid orders per size and every custom name in its grid"""
+        document = self._document()
+        headings = [p.text for p in document.paragraphs if p.style.name.startswith("Heading")]
+        tables = [table_texts(table) for table in document.tables]
+
+        self.assertIn("Size: L (1 people)", headings)
+        self.assertIn("Size: M (2 people)", headings)
+        self.assertEqual(tables[1], [["S/N", "Name", "Custom Name", "Status"], ["1", "CAL", "cal", "Paid"]])
+        self.assertEqual(
+            tables[2],
+            [["S/N", "Name", "Custom Name", "Status"], ["1", "AMY", "-", "Paid"], ["2", "ZED", "zed", "Paid"]],
+        )
+        # Unpaid BOB has a custom name, so is listed there as before
+        self.assertEqual(tables[3][0], ["BOB", "CAL", "", "", ""])
+        self.assertEqual(tables[4][0], ["ZED", "", "", "", ""])
+
+    def test_query_count_independent_of_sizes(self):
+        """Test the report costs one ordered orders query"""
+        with self.assertNumQueries(1):
+            generate_bulk_order_word(self.bulk_order)
+
+        for i, size in enumerate(["S", "XL", "XXL", "XXXL"]):
+            OrderEntry.objects.create(
+                bulk_order=self.bulk_order,
+                email=f"more{i}@example.com",
+                full_name=f"MORE {i}",
+                size=size,
+                custom_name=f"more {i}",
+                paid=True,
+            )
+        with self.assertNumQueries(1):
+            generate_bulk_order_word(self.bulk_order)
@@ -35,6 +35,16 @@ urlpatterns = [
 # POST   /api/bulk_orders/links/<slug>/submit_order/               # Submit order for this bulk order
 #        Request body: { "email": "...", "full_name": "...", "size": "...", "coupon_code": "..." }
 #
+# DOCUMENT EXPORTS (rendered by the background worker):
+# GET    /api/bulk_orders/links/<slug>/download_pdf/              # PDF summary (Admin)
+# GET    /api/bulk_orders/links/<slug>/download_word/             # Word document (Admin)
+# GET    /api/bulk_orders/links/<slug>/generate_size_summary/     # Excel size summary (Admin)
+# GET    /api/bulk_orders/links/<slug>/paid_orders/?download=pdf  # Public paid orders PDF
+#        Returns the file if ready for the current entries, otherwise 202:
+#        { "id": "uuid", "status": "pending", "status_url": "..." }
+# GET    /api/bulk_orders/links/<slug>/exports/<id>/              # Poll status (adds download_url when ready)
+# GET    /api/bulk_orders/links/<slug>/exports/<id>/download/     # Download a ready export (409 until then)
+#
 # ORDER MANAGEMENT:
 # GET    /api/bulk_orders/orders/                                  # List user's orders (Auth Required)
 # GET    /api/bulk_orders/orders/<uuid>/                           # Get specific order (Public)
@@ -10,9 +10,10 @@ from django.utils import timezone
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.http import HttpResponse
-from django.db.models import Count, Q, Prefetch
-from django.core.paginator import Paginator
-from io import BytesIO
+from django.db.models import Q, Prefetch
+from material.excel_export import ExcelExport
+from material.order_report import OrderReport
+from material.word_report import WordReport
 from .models import CouponCode, BulkOrderLink, OrderEntry
 
 logger = logging.getLogger(__name__)
@@ -82,7 +83,27 @@ def _get_bulk_order_with_orders(bulk_order):
         ).get(id=bulk_order.id)
 
 
-def generate_bulk_order_pdf(bulk_order, request=None):
+def _get_bulk_order(bulk_order):
+    """
+    BulkOrderLink from an instance or slug string, without prefetching
+    its orders - documents read them once with build_bulk_order_report().
+    """
+    if isinstance(bulk_order, str):
+        return BulkOrderLink.objects.get(slug=bulk_order)
+    return bulk_order
+
+
+def build_bulk_order_report(bulk_order, stream=False):
+    """
+    One-pass OrderReport for a BulkOrderLink instance or slug string.
+    Build it once and pass it as report=... to render several formats.
+    stream=True aggregates the summary and streams the paid rows instead.
+    """
+    bulk_order = _get_bulk_order(bulk_order)
+    return OrderReport(bulk_order, bulk_order.orders.all(), stream=stream)
+
+
+def generate_bulk_order_pdf(bulk_order, request=None, report=None):
     """
     Generate PDF summary for a bulk order.
     Used by both admin interface and API endpoints.
@@ -90,6 +111,7 @@ def generate_bulk_order_pdf(bulk_order, request=None):
     Args:
         bulk_order: BulkOrderLink instance or slug string
         request: Optional request object for building absolute URIs
+        report: Optional OrderReport already built for this bulk order
     
     Returns:
         HttpResponse with PDF content
@@ -101,21 +123,16 @@ def generate_bulk_order_pdf(bulk_order, request=None):
     try:
         from weasyprint import HTML
         
-        bulk_order = _get_bulk_order_with_orders(bulk_order)
-        orders = bulk_order.orders.all()
-        size_summary = orders.values("size").annotate(count=Count("size")).order_by("size")
-        
-        # Count paid orders
-        paid_orders = orders.filter(Q(paid=True) | Q(coupon_used__isnull=False))
-        total_paid = paid_orders.count()
+        report = report or build_bulk_order_report(bulk_order)
+        bulk_order = report.bulk_order
         
         context = {
             'bulk_order': bulk_order,
-            'size_summary': size_summary,
-            'orders': orders,
-            'paid_orders': paid_orders,
-            'total_orders': orders.count(),
-            'total_paid': total_paid,
+            'size_summary': report.size_summary,
+            'orders': report.orders,
+            'paid_orders': report.paid_orders,
+            'total_orders': report.total_orders,
+            'total_paid': report.total_paid,
             'company_name': settings.COMPANY_NAME,
             'company_address': settings.COMPANY_ADDRESS,
             'company_phone': settings.COMPANY_PHONE,
@@ -147,13 +164,74 @@ def generate_bulk_order_pdf(bulk_order, request=None):
         raise
 
 
-def generate_bulk_order_word(bulk_order):
+def generate_paid_orders_pdf(bulk_order, request=None):
+    """
+    Generate the public "completed orders" PDF: paid orders only, newest first.
+    
+    Args:
+        bulk_order: BulkOrderLink instance or slug string
+        request: Optional request object for building absolute URIs
+    
+    Returns:
+        HttpResponse with PDF content
+    
+    Raises:
+        ImportError: If WeasyPrint is not installed
+        Exception: For other PDF generation errors
+    """
+    try:
+        from weasyprint import HTML
+        
+        bulk_order = _get_bulk_order(bulk_order)
+        paid_orders = list(bulk_order.orders.filter(paid=True).order_by("-created_at"))
+        
+        size_counts = {}
+        for order in paid_orders:
+            size_counts[order.size] = size_counts.get(order.size, 0) + 1
+        
+        context = {
+            'bulk_order': bulk_order,
+            'size_summary': [
+                {'size': size, 'count': count} for size, count in sorted(size_counts.items())
+            ],
+            'paid_orders': paid_orders,
+            'total_paid': len(paid_orders),
+            'company_name': settings.COMPANY_NAME,
+            'company_address': settings.COMPANY_ADDRESS,
+            'company_phone': settings.COMPANY_PHONE,
+            'company_email': settings.COMPANY_EMAIL,
+            'now': timezone.now(),
+        }
+        
+        html_string = render_to_string('bulk_orders/pdf_template.html', context)
+        
+        if request:
+            html = HTML(string=html_string, base_url=request.build_absolute_uri())
+        else:
+            html = HTML(string=html_string)
+        
+        response = HttpResponse(html.write_pdf(), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="completed_orders_{bulk_order.slug}.pdf"'
+        
+        logger.info(f"Generated public paid orders PDF for: {bulk_order.slug}")
+        return response
+        
+    except ImportError as e:
+        logger.error(f"WeasyPrint not available: {str(e)}")
+        raise ImportError("PDF generation not available. Install GTK+ libraries for WeasyPrint.")
+    except Exception as e:
+        logger.error(f"Error generating paid orders PDF for {bulk_order}: {str(e)}")
+        raise
+
+
+def generate_bulk_order_word(bulk_order, report=None):
     """
     Generate Word document for a bulk order.
     Used by both admin interface and API endpoints.
     
     Args:
         bulk_order: BulkOrderLink instance or slug string
+        report: Optional OrderReport already built for this bulk order
     
     Returns:
         HttpResponse with Word document content
@@ -162,158 +240,51 @@ def generate_bulk_order_word(bulk_order):
         Exception: For document generation errors
     """
     try:
-        from docx import Document
-        
-        bulk_order = _get_bulk_order_with_orders(bulk_order)
-        doc = Document()
+        report = report or build_bulk_order_report(bulk_order)
+        bulk_order = report.bulk_order
+        word = WordReport()
+        doc = word.document
+        branded = bulk_order.custom_branding_enabled
         
         # Header
         doc.add_heading(settings.COMPANY_NAME, 0)
         doc.add_heading(f'Bulk Order: {bulk_order.organization_name}', level=1)
         doc.add_paragraph(f"Generated: {timezone.now().strftime('%B %d, %Y - %I:%M %p')}")
         doc.add_paragraph(f'Payment Deadline: {bulk_order.payment_deadline.strftime("%B %d, %Y")}')
-        doc.add_paragraph(f'Custom Branding: {"Yes" if bulk_order.custom_branding_enabled else "No"}')
+        doc.add_paragraph(f'Custom Branding: {"Yes" if branded else "No"}')
         doc.add_paragraph('')
         
-        orders = bulk_order.orders.all()
-        
         # Size Summary
         doc.add_heading('Summary by Size', level=2)
-        size_summary = orders.values("size").annotate(total=Count("id")).order_by("size")
-        
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Light Grid Accent 1'
-        header_cells = table.rows[0].cells
-        header_cells[0].text = 'Size'
-        header_cells[1].text = 'Total'
-        
-        for size_info in size_summary:
-            row_cells = table.add_row().cells
-            row_cells[0].text = size_info['size']
-            row_cells[1].text = str(size_info['total'])
-        
+        word.add_table(
+            ['Size', 'Total'],
+            ([size_info['size'], str(size_info['count'])] for size_info in report.size_summary),
+        )
         doc.add_paragraph()
         
-        # Orders by Size (paginated for large datasets)
-        paginator = Paginator(orders, 1000)
-        
-        for page_num in paginator.page_range:
-            page = paginator.page(page_num)
-            page_orders = page.object_list
-            
-            # Group by size
-            sizes_in_page = set(order.size for order in page_orders)
-            
-            for size in sorted(sizes_in_page):
-                size_orders = [order for order in page_orders if order.size == size]
-                
-                if size_orders:
-                    doc.add_heading(f'Size: {size} ({len(size_orders)} people)', level=2)
-                    
-                    # Determine columns based on custom branding
-                    if bulk_order.custom_branding_enabled:
-                        table = doc.add_table(rows=1, cols=4)
-                        header_cells = table.rows[0].cells
-                        header_cells[0].text = 'S/N'
-                        header_cells[1].text = 'Name'
-                        header_cells[2].text = 'Custom Name'
-                        header_cells[3].text = 'Status'
-                        
-                        for idx, order in enumerate(size_orders, 1):
-                            row_cells = table.add_row().cells
-                            row_cells[0].text = str(idx)
-                            row_cells[1].text = order.full_name
-                            row_cells[2].text = order.custom_name or '-'
-                            row_cells[3].text = 'Coupon' if order.coupon_used else 'Paid'
-                    else:
-                        table = doc.add_table(rows=1, cols=3)
-                        header_cells = table.rows[0].cells
-                        header_cells[0].text = 'S/N'
-                        header_cells[1].text = 'Name'
-                        header_cells[2].text = 'Status'
-                        
-                        for idx, order in enumerate(size_orders, 1):
-                            row_cells = table.add_row().cells
-                            row_cells[0].text = str(idx)
-                            row_cells[1].text = order.full_name
-                            row_cells[2].text = 'Coupon' if order.coupon_used else 'Paid'
-                    
-                    table.style = 'Light Grid Accent 1'
-                    doc.add_paragraph()
-        
-        # ====== NEW SECTION: Custom Names by Size (only if custom branding enabled) ======
-        if bulk_order.custom_branding_enabled:
-            # Add page break to start on new page
-            doc.add_page_break()
-            
-            doc.add_heading('Custom Names by Size', level=1)
-            doc.add_paragraph('This section shows all custom names grouped by size for easy copying.')
-            doc.add_paragraph()
-            
-            # CRITICAL FIX: Query orders for THIS bulk_order ONLY
-            # ONLY include orders that have custom_name set (exclude None/empty)
-            from bulk_orders.models import OrderEntry
-            
-            bulk_order_orders = OrderEntry.objects.filter(
-                bulk_order=bulk_order,  # ✅ Only THIS bulk_order
-                custom_name__isnull=False  # ✅ Only orders WITH custom names
-            ).exclude(
-                custom_name=''  # ✅ Exclude empty strings
-            ).order_by('size', 'full_name')
-            
-            # Get size summary ONLY for orders with custom names
-            custom_names_size_summary = bulk_order_orders.values('size').annotate(
-                count=Count('id')
-            ).order_by('size')
-            
-            # Group orders by size
-            for size_info in custom_names_size_summary:
-                size = size_info['size']
-                size_orders = bulk_order_orders.filter(size=size)
-                
-                # Get custom names (we know they all have custom_name since we filtered)
-                custom_names = [
-                    order.custom_name.upper()
-                    for order in size_orders
-                ]
-                
-                if custom_names:
-                    # Add size header
-                    doc.add_heading(f'SIZE: {size}', level=2)
-                    
-                    # Create table with 5 columns for grid layout
-                    num_cols = 5
-                    num_rows = (len(custom_names) + num_cols - 1) // num_cols  # Ceiling division
-                    
-                    table = doc.add_table(rows=num_rows, cols=num_cols)
-                    table.style = 'Light Grid Accent 1'
-                    
-                    # Fill table with custom names
-                    for idx, custom_name in enumerate(custom_names):
-                        row_idx = idx // num_cols
-                        col_idx = idx % num_cols
-                        table.rows[row_idx].cells[col_idx].text = custom_name
-                    
-                    doc.add_paragraph()
-        
-        # Footer
-        doc.add_paragraph("")
-        footer_para = doc.add_paragraph()
-        footer_para.add_run(f"{settings.COMPANY_NAME}\n").bold = True
-        footer_para.add_run(f"{settings.COMPANY_ADDRESS}\n")
-        footer_para.add_run(f"📞 {settings.COMPANY_PHONE} | 📧 {settings.COMPANY_EMAIL}")
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        # Orders by Size
+        if branded:
+            header = ['Name', 'Custom Name', 'Status']
+            rows_by_size = {
+                size: [[o.full_name, o.custom_name or '-', report.status(o)] for o in orders]
+                for size, orders in report.paid_by_size.items()
+            }
+        else:
+            header = ['Name', 'Status']
+            rows_by_size = {
+                size: [[o.full_name, report.status(o)] for o in orders]
+                for size, orders in report.paid_by_size.items()
+            }
+        word.add_size_tables(rows_by_size, header)
+        
+        # Custom Names by Size (only if custom branding enabled)
+        if branded:
+            word.add_custom_names(report.custom_names_by_size)
+        
+        word.add_footer()
+        response = word.response(
+            f'bulk_order_{bulk_order.slug}_{timezone.now().strftime("%Y%m%d")}.docx'
         )
-        filename = f'bulk_order_{bulk_order.slug}_{timezone.now().strftime("%Y%m%d")}.docx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
         logger.info(f"Generated Word document for bulk order: {bulk_order.slug}")
         return response
@@ -323,26 +294,27 @@ def generate_bulk_order_word(bulk_order):
         raise
 
 
-def generate_bulk_order_excel(bulk_order):
+def generate_bulk_order_excel(bulk_order, report=None):
     """
     Generate Excel spreadsheet for a bulk order.
     Used by both admin interface and API endpoints.
     
     Args:
         bulk_order: BulkOrderLink instance or slug string
+        report: Optional OrderReport already built for this bulk order
     
     Returns:
-        HttpResponse with Excel content
+        FileResponse streaming the Excel file
     
     Raises:
         Exception: For Excel generation errors
     """
     try:
-        import xlsxwriter
-        
-        bulk_order = _get_bulk_order_with_orders(bulk_order)
-        output = BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        # Alone, the Excel export streams its rows instead of holding them
+        report = report or build_bulk_order_report(bulk_order, stream=True)
+        bulk_order = report.bulk_order
+        export = ExcelExport()
+        workbook = export.workbook
         
         # ====== CELL FORMATS ======
         title_format = workbook.add_format({'bold': True, 'font_size': 16, 'align': 'left'})
@@ -384,9 +356,6 @@ def generate_bulk_order_excel(bulk_order):
         worksheet.write(row, 0, "SIZE SUMMARY", section_header_format)
         row += 1
         
-        orders = bulk_order.orders.all()
-        size_summary = orders.values("size").annotate(total=Count("id")).order_by("size")
-        
         # Table headers
         worksheet.write(row, 0, "Size", table_header_format)
         worksheet.write(row, 1, "Total", table_header_format)
@@ -394,10 +363,10 @@ def generate_bulk_order_excel(bulk_order):
         
         # Size data
         grand_total = 0
-        for size_info in size_summary:
+        for size_info in report.size_summary:
             worksheet.write(row, 0, size_info['size'], cell_format)
-            worksheet.write(row, 1, size_info['total'], cell_format)
-            grand_total += size_info['total']
+            worksheet.write(row, 1, size_info['count'], cell_format)
+            grand_total += size_info['count']
             row += 1
         
         # Grand total
@@ -425,9 +394,9 @@ def generate_bulk_order_excel(bulk_order):
         worksheet.write(row, col, "Status", table_header_format)
         row += 1
         
-        # Write order data
+        # Write order data (rows flushed as written in constant_memory mode)
         serial_number = 1
-        for order in orders:
+        for order in report.paid_orders:
             col = 0
             worksheet.write(row, col, serial_number, cell_format)
             col += 1
@@ -440,8 +409,7 @@ def generate_bulk_order_excel(bulk_order):
                 worksheet.write(row, col, order.custom_name or '', cell_left_format)
                 col += 1
             
-            status_text = 'Coupon' if order.coupon_used else 'Paid'
-            worksheet.write(row, col, status_text, cell_format)
+            worksheet.write(row, col, report.status(order), cell_format)
             
             row += 1
             serial_number += 1
@@ -457,15 +425,8 @@ def generate_bulk_order_excel(bulk_order):
             worksheet.set_column(3, 3, 12)  # Status
         
         # ====== FINALIZE ======
-        workbook.close()
-        output.seek(0)
-        
-        response = HttpResponse(
-            output.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
         filename = f'bulk_order_{bulk_order.slug}_{timezone.now().strftime("%Y%m%d")}.xlsx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response = export.response(filename)
         
         logger.info(f"Generated Excel for bulk order: {bulk_order.slug}")
         return response
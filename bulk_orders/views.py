@@ -1,10 +1,9 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action, throttle_classes as apply_throttle_classes
 from rest_framework.response import Response
-from django.http import HttpResponse
 from django.shortcuts import render
 from django.db.models import Count, Q
-from django.template.loader import render_to_string
+from django.urls import reverse
 from django.conf import settings
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -14,7 +13,7 @@ from django.views.decorators.cache import cache_page
 import json
 from rest_framework_extensions.cache.decorators import cache_response
 from drf_spectacular.utils import extend_schema, OpenApiResponse
-from .models import BulkOrderLink, OrderEntry, CouponCode
+from .models import BulkOrderLink, OrderEntry, CouponCode, BulkOrderExport
 from .serializers import (
     BulkOrderLinkSerializer,
     OrderEntrySerializer,
@@ -26,12 +25,13 @@ from payment.utils import (
     calculate_amount_with_vat,
     get_vat_breakdown,
 )
-from .utils import (
-    generate_coupon_codes,
-    generate_bulk_order_pdf,
-    generate_bulk_order_word,
-    generate_bulk_order_excel,
+from payment.status_cache import (
+    get_payment_status,
+    invalidate_payment_status,
+    payment_status_cache_key,
 )
+from .utils import generate_coupon_codes
+from .exports import PUBLIC_KINDS, export_file_response, request_export
 from material.background_utils import (
     send_payment_receipt_email,
     generate_payment_receipt_pdf_task,
@@ -43,6 +43,8 @@ from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+EXPORT_ID_PATTERN = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
 
 class BulkOrderLinkViewSet(viewsets.ModelViewSet):
     serializer_class = BulkOrderLinkSerializer
@@ -101,6 +103,12 @@ class BulkOrderLinkViewSet(viewsets.ModelViewSet):
                     {"error": "Bulk order not found"}, status=status.HTTP_404_NOT_FOUND
                 )
 
+            # download=pdf is rendered by the worker; poll until it is ready
+            if request.GET.get("download") == "pdf":
+                return self._export_response(
+                    request, bulk_order, BulkOrderExport.KIND_PAID_ORDERS_PDF
+                )
+
             # Get only PAID orders
             paid_orders = bulk_order.orders.filter(paid=True).order_by("-created_at")
 
@@ -111,54 +119,6 @@ class BulkOrderLinkViewSet(viewsets.ModelViewSet):
                 .order_by("size")
             )
 
-            # Check if download=pdf parameter
-            if request.GET.get("download") == "pdf":
-                try:
-                    from weasyprint import HTML
-
-                    context = {
-                        "bulk_order": bulk_order,
-                        "size_summary": size_summary,
-                        "paid_orders": paid_orders,
-                        "total_paid": paid_orders.count(),
-                        "company_name": settings.COMPANY_NAME,
-                        "company_address": settings.COMPANY_ADDRESS,
-                        "company_phone": settings.COMPANY_PHONE,
-                        "company_email": settings.COMPANY_EMAIL,
-                        "now": timezone.now(),
-                    }
-
-                    html_string = render_to_string(
-                        "bulk_orders/pdf_template.html", context
-                    )
-                    html = HTML(
-                        string=html_string, base_url=request.build_absolute_uri()
-                    )
-                    pdf = html.write_pdf()
-
-                    response = HttpResponse(pdf, content_type="application/pdf")
-                    filename = f"completed_orders_{bulk_order.slug}.pdf"
-                    response["Content-Disposition"] = (
-                        f'attachment; filename="{filename}"'
-                    )
-
-                    logger.info(
-                        f"Generated public paid orders PDF for: {bulk_order.slug}"
-                    )
-                    return response
-
-                except ImportError:
-                    return Response(
-                        {"error": "PDF generation not available"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
-                except Exception as e:
-                    logger.error(f"Error generating PDF: {str(e)}", exc_info=True)
-                    return Response(
-                        {"error": f"PDF generation failed: {str(e)}"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
-
             # HTML view
             now = timezone.now()
 
@@ -266,45 +226,107 @@ class BulkOrderLinkViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
     def download_pdf(self, request, slug=None):
-        """Generate PDF summary for this specific bulk order"""
-        try:
-            return generate_bulk_order_pdf(slug, request)
-        except ImportError:
+        """PDF summary for this bulk order, rendered in the background"""
+        return self._export_response(request, self.get_object(), BulkOrderExport.KIND_PDF)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def download_word(self, request, slug=None):
+        """Word document for this bulk order, rendered in the background"""
+        return self._export_response(request, self.get_object(), BulkOrderExport.KIND_WORD)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def generate_size_summary(self, request, slug=None):
+        """Excel size summary for this bulk order, rendered in the background"""
+        return self._export_response(request, self.get_object(), BulkOrderExport.KIND_EXCEL)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        permission_classes=[permissions.AllowAny],
+        url_path=rf"exports/(?P<export_id>{EXPORT_ID_PATTERN})",
+        url_name="export-status",
+    )
+    def export_status(self, request, slug=None, export_id=None):
+        """Poll a queued export: status, plus download_url once ready"""
+        export = self._get_export(request, slug, export_id)
+        if export is None:
             return Response(
-                {"error": "PDF generation not available. Install GTK+ libraries."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "Export not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        except Exception as e:
-            logger.error(f"Error generating PDF: {str(e)}")
+        return Response(self._export_payload(request, export))
+
+    @action(
+        detail=True,
+        methods=["get"],
+        permission_classes=[permissions.AllowAny],
+        url_path=rf"exports/(?P<export_id>{EXPORT_ID_PATTERN})/download",
+        url_name="export-download",
+    )
+    def export_download(self, request, slug=None, export_id=None):
+        """Download a ready export's file"""
+        export = self._get_export(request, slug, export_id)
+        if export is None:
             return Response(
-                {"error": f"Error generating PDF: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "Export not found"}, status=status.HTTP_404_NOT_FOUND
             )
-
-    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
-    def download_word(self, request, slug=None):
-        """Generate Word document for this specific bulk order"""
-        try:
-            return generate_bulk_order_word(slug)
-        except Exception as e:
-            logger.error(f"Error generating Word document: {str(e)}")
+        if export.status != BulkOrderExport.STATUS_READY:
             return Response(
-                {"error": f"Error generating Word document: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                self._export_payload(request, export), status=status.HTTP_409_CONFLICT
             )
+        return export_file_response(export)
+
+    def _get_export(self, request, slug, export_id):
+        """The link's export, or None if missing or admin-only for a non-admin"""
+        export = (
+            BulkOrderExport.objects.select_related("bulk_order")
+            .filter(id=export_id, bulk_order__slug=slug)
+            .first()
+        )
+        if export is None:
+            return None
+        if export.kind not in PUBLIC_KINDS and not request.user.is_staff:
+            return None
+        return export
+
+    def _export_payload(self, request, export):
+        """Status body returned while an export is queued or polled"""
+        url_kwargs = {"slug": export.bulk_order.slug, "export_id": export.id}
+        payload = {
+            "id": str(export.id),
+            "kind": export.kind,
+            "status": export.status,
+            "status_url": request.build_absolute_uri(
+                reverse("bulk_orders:link-export-status", kwargs=url_kwargs)
+            ),
+        }
+        if export.status == BulkOrderExport.STATUS_READY:
+            payload["download_url"] = request.build_absolute_uri(
+                reverse("bulk_orders:link-export-download", kwargs=url_kwargs)
+            )
+        elif export.status == BulkOrderExport.STATUS_FAILED:
+            payload["error"] = export.error
+        return payload
 
-    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
-    def generate_size_summary(self, request, slug=None):
-        """Generate Excel size summary for this specific bulk order"""
+    def _export_response(self, request, bulk_order, kind):
+        """
+        The file if an export for the current entries is ready, otherwise
+        202 with the queued export's status to poll.
+        """
         try:
-            return generate_bulk_order_excel(slug)
+            export = request_export(bulk_order, kind, user=request.user)
         except Exception as e:
-            logger.error(f"Error generating Excel: {str(e)}")
+            logger.error(f"Error queueing {kind} export: {str(e)}", exc_info=True)
             return Response(
-                {"error": f"Error generating Excel: {str(e)}"},
+                {"error": f"Error queueing export: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        if export.status == BulkOrderExport.STATUS_READY:
+            return export_file_response(export)
+        return Response(
+            self._export_payload(request, export), status=status.HTTP_202_ACCEPTED
+        )
+
     # ========================================================================
     # ✅ IMPROVED: stats - Single query + caching
     # ========================================================================
@@ -534,25 +556,33 @@ class OrderEntryViewSet(viewsets.ModelViewSet):
         3. Frontend calls this endpoint: GET /api/bulk_orders/orders/{uuid}/verify_payment/
         4. Frontend shows success/failure message based on response
         """
+        # Polled repeatedly after redirect: served from the status cache
+        return Response(
+            get_payment_status(
+                payment_status_cache_key("bulk_orders", pk),
+                self._load_payment_status,
+                is_terminal=lambda data: data["paid"],
+            )
+        )
+
+    def _load_payment_status(self):
         order_entry = self.get_object()
         vat_breakdown = get_vat_breakdown(order_entry.bulk_order.price_per_item)
 
-        return Response(
-            {
-                "order_id": str(order_entry.id),
-                "reference": order_entry.reference,
-                "paid": order_entry.paid,
-                "base_amount": float(vat_breakdown["base_amount"]),
-                "vat_amount": float(vat_breakdown["vat_amount"]),
-                "vat_rate": vat_breakdown["vat_rate"],
-                "amount": float(vat_breakdown["total_amount"]),
-                "email": order_entry.email,
-                "full_name": order_entry.full_name,
-                "organization": order_entry.bulk_order.organization_name,
-                "created_at": order_entry.created_at,
-                "updated_at": order_entry.updated_at,
-            }
-        )
+        return {
+            "order_id": str(order_entry.id),
+            "reference": order_entry.reference,
+            "paid": order_entry.paid,
+            "base_amount": float(vat_breakdown["base_amount"]),
+            "vat_amount": float(vat_breakdown["vat_amount"]),
+            "vat_rate": vat_breakdown["vat_rate"],
+            "amount": float(vat_breakdown["total_amount"]),
+            "email": order_entry.email,
+            "full_name": order_entry.full_name,
+            "organization": order_entry.bulk_order.organization_name,
+            "created_at": order_entry.created_at,
+            "updated_at": order_entry.updated_at,
+        }
 
 
 class CouponCodeViewSet(viewsets.ModelViewSet):
@@ -660,6 +690,19 @@ def bulk_order_payment_webhook(request):
         # ✅ STEP 2: Parse payload
         payload = json.loads(request.body)
 
+    except json.JSONDecodeError:
+        logger.error("Invalid JSON in bulk order webhook payload")
+        return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
+
+    return handle_bulk_order_payment(payload)
+
+
+def handle_bulk_order_payment(payload):
+    """
+    Apply a verified, parsed Paystack payload to its OrderEntry.
+    Registered with webhook_router for ORDER- references.
+    """
+    try:
         # Log sanitized data (no sensitive info)
         logger.info(
             f"Verified bulk order webhook: {payload.get('event')} - "
@@ -732,9 +775,10 @@ def bulk_order_payment_webhook(request):
                 # Don't fail webhook if email fails
                 logger.error(f"Email/PDF generation failed: {str(e)}")
 
-            # ✅ STEP 7: Invalidate stats cache
+            # ✅ STEP 7: Invalidate stats and polled status caches
             cache_key = f"bulk_order_stats_{order_entry.bulk_order.slug}"
             cache.delete(cache_key)
+            invalidate_payment_status("bulk_orders", order_entry.id)
             logger.debug(f"Invalidated stats cache for {order_entry.bulk_order.slug}")
 
             return JsonResponse(
@@ -752,9 +796,6 @@ def bulk_order_payment_webhook(request):
                 {"status": "error", "message": "Order entry not found"}, status=404
             )
 
-    except json.JSONDecodeError:
-        logger.error("Invalid JSON in bulk order webhook payload")
-        return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
     except Exception as e:
         logger.exception("Unexpected error processing bulk order payment webhook")
         return JsonResponse(
@@ -37,17 +37,6 @@ class CartDetailView(views.APIView):
         # Build cart items list
         items = []
         for item in cart:
-            # Find the item_key for this item
-            item_key = None
-            for key in cart.cart.keys():
-                if str(item["product"].id) in key:
-                    # Verify it's the same item by checking extra_fields
-                    if cart.cart[key].get("extra_fields", {}) == item.get(
-                        "extra_fields", {}
-                    ):
-                        item_key = key
-                        break
-
             items.append(
                 {
                     "product_type": item["product"].product_type,
@@ -57,7 +46,7 @@ class CartDetailView(views.APIView):
                     "price": item["price"],
                     "total_price": item["total_price"],
                     "extra_fields": item.get("extra_fields", {}),
-                    "item_key": item_key,
+                    "item_key": item["item_key"],
                 }
             )
 
@@ -190,15 +179,10 @@ class UpdateCartItemView(views.APIView):
             )
 
         try:
+            cart.update_quantity(item_key, quantity)
             if quantity == 0:
-                # Remove item
-                del cart.cart[item_key]
-                cart.save()
                 message = "Item removed from cart"
             else:
-                # Update quantity
-                cart.cart[item_key]["quantity"] = quantity
-                cart.save()
                 message = "Quantity updated successfully"
 
             return Response(
@@ -238,8 +222,7 @@ class RemoveFromCartView(views.APIView):
             )
 
         try:
-            del cart.cart[item_key]
-            cart.save()
+            cart.remove_item(item_key)
 
             logger.info(f"Removed item from cart: {item_key}")
 
@@ -2,11 +2,84 @@
 from decimal import Decimal
 from django.conf import settings
 from django.apps import apps
+from django.core.cache import cache
 from products.constants import VEST_SIZES
+from .storage import get_cart_store
 import logging
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
+AVAILABILITY_VERSION_CACHE_KEY = "cart:availability_version"
+AVAILABILITY_VERSION_SESSION_KEY = "cart_availability_version"
+
+
+def get_availability_version():
+    """
+    Return the catalog availability version, or None if the cache can't hold it.
+    The version is seeded from the clock so a cache flush never repeats an
+    old value that a session may still hold.
+    """
+    version = cache.get(AVAILABILITY_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(AVAILABILITY_VERSION_CACHE_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(AVAILABILITY_VERSION_CACHE_KEY)
+    return version
+
+
+def bump_availability_version():
+    """Invalidate every cart's last cleanup after a product availability change."""
+    try:
+        cache.incr(AVAILABILITY_VERSION_CACHE_KEY)
+    except ValueError:
+        # Key missing (never set or evicted) - reseed
+        cache.set(
+            AVAILABILITY_VERSION_CACHE_KEY, int(time.time() * 1000), timeout=None
+        )
+
+
+class ProductSnapshot:
+    """
+    Request-scoped cache of products referenced by the cart.
+    Shared by CartCleanupMiddleware, Cart and the checkout view so each
+    product row is fetched at most once per request.
+    """
+
+    REQUEST_ATTR = "_cart_product_snapshot"
+
+    def __init__(self):
+        self.products = {}  # (product_type, product_id) -> product or None
+        self.fetch_count = 0  # product rows loaded from the database
+        self.query_count = 0  # queries issued to load them
+
+    @classmethod
+    def for_request(cls, request):
+        """Return the snapshot attached to this request, creating it if needed."""
+        # DRF wraps the Django request; attach to the underlying one so the
+        # middleware and the view see the same snapshot
+        request = getattr(request, "_request", request)
+        snapshot = getattr(request, cls.REQUEST_ATTR, None)
+        if snapshot is None:
+            snapshot = cls()
+            setattr(request, cls.REQUEST_ATTR, snapshot)
+        return snapshot
+
+    def __contains__(self, key):
+        return key in self.products
+
+    def get(self, key):
+        return self.products.get(key)
+
+    def store(self, product_type, product_ids, products):
+        """Record a fetch result, remembering ids that were not found."""
+        self.query_count += 1
+        self.fetch_count += len(products)
+        for product_id in product_ids:
+            self.products[(product_type, product_id)] = None
+        for product in products:
+            self.products[(product_type, str(product.id))] = product
+
 
 class Cart:
     MODEL_MAPPING = {"nysc_kit": "nysckit", "nysc_tour": "nysctour", "church": "church"}
@@ -24,13 +97,23 @@ class Cart:
         
         try:
             product = model.objects.get(id=product_id)
-            if not product.available:
-                return True, False, "no longer available"
-            if product.out_of_stock:
-                return True, False, "out of stock"
-            return True, True, None
         except model.DoesNotExist:
             return False, False, "no longer exists"
+        return self.check_product(product)
+
+    @staticmethod
+    def check_product(product):
+        """
+        Check whether an already-fetched product can be purchased.
+        Returns (exists, available, message) tuple like validate_product.
+        """
+        if product is None:
+            return False, False, "no longer exists"
+        if not product.available:
+            return True, False, "no longer available"
+        if product.out_of_stock:
+            return True, False, "out of stock"
+        return True, True, None
 
     @staticmethod
     def get_clothes_sizes():
@@ -44,50 +127,124 @@ class Cart:
         """
         self.session = request.session
         self.user = getattr(request, 'user', None)
+        self.snapshot = ProductSnapshot.for_request(request)
         
         # ✅ Use user-specific cart key if authenticated
         if self.user and self.user.is_authenticated:
             # Authenticated users get user-specific cart
             cart_key = f"cart_user_{self.user.id}"
-            
+            self.store = get_cart_store(self.session, cart_key)
+
             # ✅ Migrate anonymous cart to user cart on first login
-            anon_cart = self.session.get(settings.CART_SESSION_ID)
-            if anon_cart and cart_key not in self.session:
-                # Copy anonymous cart to user cart
-                self.session[cart_key] = anon_cart
-                # Clear anonymous cart
-                del self.session[settings.CART_SESSION_ID]
+            if self.store.migrate_from(settings.CART_SESSION_ID):
                 logger.info(f"Migrated anonymous cart to user {self.user.id}")
         else:
             # Anonymous users use default cart key
             cart_key = settings.CART_SESSION_ID
-        
-        cart = self.session.get(cart_key)
-        if not cart:
-            cart = self.session[cart_key] = {}
-        
-        self.cart = cart
+            self.store = get_cart_store(self.session, cart_key)
+
+        self.cart = self.store.load()
         self.cart_key = cart_key  # Store for later use
+        self._build_index()
+
+    def _build_index(self):
+        """
+        Build the secondary index (product_type, product_id) -> [item_keys]
+        so lookups by product don't have to scan and split every cart key.
+        """
+        self.index = {}
+        for item_key in self.cart:
+            self._index_add(item_key)
+
+    def _index_add(self, item_key):
+        try:
+            product_key = self._parse_item_key(item_key)
+        except ValueError:
+            return
+        keys = self.index.setdefault(product_key, [])
+        if item_key not in keys:
+            keys.append(item_key)
+
+    def _index_discard(self, item_key):
+        try:
+            product_key = self._parse_item_key(item_key)
+        except ValueError:
+            return
+        keys = self.index.get(product_key)
+        if keys and item_key in keys:
+            keys.remove(item_key)
+            if not keys:
+                del self.index[product_key]
+
+    def get_item_keys(self, product):
+        """Return the cart keys holding this product, in O(1)."""
+        return list(self.index.get((product.product_type, str(product.id)), []))
+
+    def _parse_item_key(self, item_key):
+        """Split a composite cart key into its (product_type, product_id) parts."""
+        product_info = item_key.split("|||")[0]
+        product_type, product_id = product_info.split(":::")
+        return product_type, product_id
+
+    def get_products(self, item_keys=None):
+        """
+        Fetch the products referenced by the given cart keys in bulk.
+        Issues one query per product model instead of one per cart line, and
+        only for products not already in this request's snapshot.
+        Returns a dict keyed by (product_type, product_id).
+        """
+        if item_keys is None:
+            item_keys = self.cart.keys()
+
+        # Group product ids not yet in the snapshot by product type
+        requested = set()
+        ids_by_type = {}
+        for item_key in item_keys:
+            try:
+                product_type, product_id = self._parse_item_key(item_key)
+                uuid.UUID(product_id)
+            except ValueError:
+                continue
+            requested.add((product_type, product_id))
+            if (product_type, product_id) not in self.snapshot:
+                ids_by_type.setdefault(product_type, set()).add(product_id)
+
+        for product_type, product_ids in ids_by_type.items():
+            try:
+                model = apps.get_model("products", self.MODEL_MAPPING[product_type])
+            except (KeyError, LookupError):
+                continue
+
+            queryset = model.objects.filter(id__in=product_ids).select_related(
+                "category"
+            )
+            self.snapshot.store(product_type, product_ids, list(queryset))
+
+        products = {}
+        for key in requested:
+            product = self.snapshot.get(key)
+            if product is not None:
+                products[key] = product
+        return products
 
     def __iter__(self):
         """Iterate over items in cart and get the products from the database."""
-        for item_key in self.cart.keys():
+        products = self.get_products()
+
+        for item_key in list(self.cart.keys()):
             try:
                 # Split our composite key to get product info
-                key_parts = item_key.split("|||")
-                product_info = key_parts[0]
-                product_type, product_id = product_info.split(":::")
+                product_type, product_id = self._parse_item_key(item_key)
 
-                # Get the correct model and fetch the product
-                model_name = self.MODEL_MAPPING[product_type]
-                model = apps.get_model("products", model_name)
-                product = model.objects.get(id=product_id)
+                # Look up the product from the batched fetch
+                product = products[(product_type, product_id)]
 
                 # Create a copy of the cart item data
                 item = self.cart[item_key].copy()
 
-                # Add the product object to the item
+                # Add the product object and its key to the item
                 item['product'] = product
+                item['item_key'] = item_key
 
                 # Convert price to Decimal for calculations
                 item['price'] = Decimal(item['price'])
@@ -136,14 +293,16 @@ class Cart:
                 'price': current_price,  # ✅ Fresh from database
                 'extra_fields': extra_fields,
             }
+            self._index_add(item_key)
         else:
             # ✅ Existing item - update price to current database price
             self.cart[item_key]['price'] = current_price
         
         if override_quantity:
             self.cart[item_key]['quantity'] = quantity
+            self.store.write_item(item_key, self.cart[item_key])
         else:
-            self.cart[item_key]['quantity'] += quantity
+            self.store.increment(item_key, self.cart[item_key], quantity)
         
         self.save()
         
@@ -151,22 +310,34 @@ class Cart:
 
     def remove(self, product, extra_fields=None):
         """Remove a specific item from the cart."""
-        for item_key in list(self.cart.keys()):
-            key_parts = item_key.split("|||")
-            product_info = key_parts[0]
-            current_type, current_id = product_info.split(":::")
-
-            if current_type == product.product_type and str(current_id) == str(product.id):
-                if extra_fields:
-                    item_extra_fields = self.cart[item_key].get('extra_fields', {})
-                    if item_extra_fields == extra_fields:
-                        del self.cart[item_key]
-                        self.save()
-                        break
-                else:
-                    del self.cart[item_key]
-                    self.save()
-                    break
+        for item_key in self.get_item_keys(product):
+            if extra_fields:
+                item_extra_fields = self.cart[item_key].get('extra_fields', {})
+                if item_extra_fields != extra_fields:
+                    continue
+            self.remove_item(item_key)
+            break
+
+    def remove_item(self, item_key):
+        """Remove a cart line by its item key. Returns False if it wasn't there."""
+        if item_key not in self.cart:
+            return False
+        del self.cart[item_key]
+        self._index_discard(item_key)
+        self.store.delete(item_key)
+        self.save()
+        return True
+
+    def update_quantity(self, item_key, quantity):
+        """Set the quantity of a cart line; a quantity of 0 removes it."""
+        if item_key not in self.cart:
+            return False
+        if quantity == 0:
+            return self.remove_item(item_key)
+        self.cart[item_key]['quantity'] = quantity
+        self.store.write_item(item_key, self.cart[item_key])
+        self.save()
+        return True
 
     def __len__(self):
         """Count total items in cart."""
@@ -180,17 +351,17 @@ class Cart:
 
     def clear(self):
         """
-        Remove cart from session.
+        Remove cart from its storage.
         ✅ ENHANCED: Uses correct cart key
         """
         self.cart = {}
-        if self.cart_key in self.session:
-            del self.session[self.cart_key]
+        self.index = {}
+        self.store.clear()
         self.save()
 
     def save(self):
-        """Mark session as modified to ensure it's saved."""
-        self.session.modified = True
+        """Persist pending changes (marks the session modified for session storage)."""
+        self.store.save()
 
     def cleanup(self):
         """
@@ -200,15 +371,14 @@ class Cart:
         removed_items = {"deleted": [], "out_of_stock": []}
 
         cart_keys = list(self.cart.keys())
+        products = self.get_products(cart_keys)
 
         for item_key in cart_keys:
             try:
-                key_parts = item_key.split("|||")
-                product_info = key_parts[0]
-                product_type, product_id = product_info.split(":::")
+                product_type, product_id = self._parse_item_key(item_key)
 
-                exists, available, reason = self.validate_product(
-                    product_type, product_id
+                exists, available, reason = self.check_product(
+                    products.get((product_type, product_id))
                 )
 
                 if not exists or not available:
@@ -219,6 +389,8 @@ class Cart:
                     }
 
                     del self.cart[item_key]
+                    self._index_discard(item_key)
+                    self.store.delete(item_key)
 
                     if not exists:
                         removed_items["deleted"].append(item_info)
@@ -230,6 +402,8 @@ class Cart:
             except (ValueError, KeyError) as e:
                 logger.error(f"Invalid cart item found during cleanup: {e}")
                 del self.cart[item_key]
+                self._index_discard(item_key)
+                self.store.delete(item_key)
                 self.save()
 
         return removed_items if any(removed_items.values()) else None
\ No newline at end of file
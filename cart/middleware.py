@@ -1,12 +1,27 @@
 # cart/middleware.py
+from django.conf import settings
 from django.contrib import messages
-from .cart import Cart
+from .cart import (
+    Cart,
+    ProductSnapshot,
+    AVAILABILITY_VERSION_SESSION_KEY,
+    get_availability_version,
+)
 from django.apps import apps
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Routes that always re-validate the cart, whatever the availability version
+DEFAULT_CART_CLEANUP_PATHS = ("/api/cart/", "/api/order/checkout/")
 
 
 class CartCleanupMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.cleanup_paths = tuple(
+            getattr(settings, "CART_CLEANUP_PATHS", DEFAULT_CART_CLEANUP_PATHS)
+        )
 
     def validate_product(self, product_type, product_id):
         """
@@ -24,31 +39,69 @@ class CartCleanupMiddleware:
         except (model.DoesNotExist, LookupError):
             return False, False, "no longer exists"
 
+    def needs_cleanup(self, request, version):
+        """
+        Decide whether the cart must be re-validated on this request.
+        Cart and checkout routes always re-validate; other routes only do so
+        when product availability changed since the cart was last checked.
+        """
+        if request.path.startswith(self.cleanup_paths):
+            return True
+        if version is None:
+            # Cache can't track versions - fall back to always cleaning up
+            return True
+        return request.session.get(AVAILABILITY_VERSION_SESSION_KEY) != version
+
     def __call__(self, request):
         # Only process if there's a session and cart
         if hasattr(request, "session") and "cart" in request.session:
-            cart = Cart(request)
-            removed_items = cart.cleanup()
-
-            # If items were removed, add a message
-            if removed_items:
-                message_parts = []
-                if removed_items.get("deleted"):
-                    message_parts.append(
-                        f"{len(removed_items['deleted'])} item(s) were removed because they are no longer available"
-                    )
-                if removed_items.get("out_of_stock"):
-                    message_parts.append(
-                        f"{len(removed_items['out_of_stock'])} item(s) were removed because they are out of stock"
-                    )
-
-                if message_parts:
-                    messages.warning(
-                        request,
-                        "Your cart has been updated: "
-                        + " and ".join(message_parts)
-                        + ".",
-                    )
+            version = get_availability_version()
+
+            if self.needs_cleanup(request, version):
+                self.cleanup_cart(request)
+
+                # Remember which catalog state this cart was validated against
+                if (
+                    version is not None
+                    and request.session.get(AVAILABILITY_VERSION_SESSION_KEY)
+                    != version
+                ):
+                    request.session[AVAILABILITY_VERSION_SESSION_KEY] = version
 
         response = self.get_response(request)
+
+        # Report how many product rows the cart layers loaded for this request
+        snapshot = getattr(request, ProductSnapshot.REQUEST_ATTR, None)
+        if snapshot is not None and snapshot.query_count:
+            logger.debug(
+                f"Cart product snapshot for {request.path}: "
+                f"{snapshot.fetch_count} product(s) fetched in "
+                f"{snapshot.query_count} queries"
+            )
+
         return response
+
+    def cleanup_cart(self, request):
+        """Remove invalid items from the cart and tell the user about it."""
+        cart = Cart(request)
+        removed_items = cart.cleanup()
+
+        # If items were removed, add a message
+        if removed_items:
+            message_parts = []
+            if removed_items.get("deleted"):
+                message_parts.append(
+                    f"{len(removed_items['deleted'])} item(s) were removed because they are no longer available"
+                )
+            if removed_items.get("out_of_stock"):
+                message_parts.append(
+                    f"{len(removed_items['out_of_stock'])} item(s) were removed because they are out of stock"
+                )
+
+            if message_parts:
+                messages.warning(
+                    request,
+                    "Your cart has been updated: "
+                    + " and ".join(message_parts)
+                    + ".",
+                )
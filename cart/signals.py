@@ -3,8 +3,12 @@
 Cart-related signal handlers
 """
 from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
+from products.models import NyscKit, NyscTour, Church
+from .cart import bump_availability_version
+from .storage import get_cart_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,63 @@ def clear_user_cart_on_logout(sender, request, user, **kwargs):
     
     # Clear user's cart from session
     cart_key = f"cart_user_{user.id}"
-    if cart_key in request.session:
+    if getattr(settings, "CART_STORAGE", "session") != "session":
+        get_cart_store(request.session, cart_key).clear()
+        logger.info(f"Cleared cart for user {user.id} on logout")
+    elif cart_key in request.session:
         del request.session[cart_key]
-        logger.info(f"Cleared cart for user {user.id} on logout")
\ No newline at end of file
+        logger.info(f"Cleared cart for user {user.id} on logout")
+
+
+PRODUCT_MODELS = (NyscKit, NyscTour, Church)
+
+
+def track_availability_change(sender, instance, **kwargs):
+    """
+    Note whether a product save flips available/out_of_stock so the cart
+    cleanup middleware only re-validates carts when it matters.
+    """
+    if instance._state.adding:
+        instance._availability_changed = False
+        return
+
+    previous = (
+        sender.objects.filter(pk=instance.pk)
+        .values("available", "out_of_stock")
+        .first()
+    )
+    instance._availability_changed = previous is None or (
+        previous["available"] != instance.available
+        or previous["out_of_stock"] != instance.out_of_stock
+    )
+
+
+def bump_on_availability_change(sender, instance, **kwargs):
+    """Bump the catalog availability version after a relevant product save."""
+    if getattr(instance, "_availability_changed", False):
+        bump_availability_version()
+        instance._availability_changed = False
+        logger.info(f"Availability changed for {sender.__name__} {instance.pk}")
+
+
+def bump_on_product_delete(sender, instance, **kwargs):
+    """Bump the catalog availability version when a product is deleted."""
+    bump_availability_version()
+
+
+for product_model in PRODUCT_MODELS:
+    pre_save.connect(
+        track_availability_change,
+        sender=product_model,
+        dispatch_uid=f"cart_track_availability_{product_model.__name__}",
+    )
+    post_save.connect(
+        bump_on_availability_change,
+        sender=product_model,
+        dispatch_uid=f"cart_bump_availability_{product_model.__name__}",
+    )
+    post_delete.connect(
+        bump_on_product_delete,
+        sender=product_model,
+        dispatch_uid=f"cart_bump_availability_delete_{product_model.__name__}",
+    )
@@ -0,0 +1,205 @@
+# cart/storage.py
+"""
+Cart storage backends
+
+Cart keeps its working copy of the cart as a plain dict; a storage backend
+persists the changes. Select the backend with settings.CART_STORAGE:
+
+- "session": the cart dict lives in request.session (default)
+- "redis":   one Redis hash per cart, quantities updated with HINCRBY so
+             concurrent requests on the same cart never lose an update
+"""
+from django.conf import settings
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+
+
+def get_redis_client():
+    """Return the shared Redis client for cart storage (one pool per process)."""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.Redis.from_url(
+            settings.CART_REDIS_URL, decode_responses=True
+        )
+    return _redis_client
+
+
+class SessionCartStore:
+    """Keep the cart dict inside the Django session."""
+
+    def __init__(self, session, cart_key):
+        self.session = session
+        self.cart_key = cart_key
+        self.cart = {}
+
+    def migrate_from(self, anon_key):
+        """Move an anonymous cart to this cart key if this cart is empty."""
+        anon_cart = self.session.get(anon_key)
+        if anon_cart and self.cart_key not in self.session:
+            self.session[self.cart_key] = anon_cart
+            del self.session[anon_key]
+            return True
+        return False
+
+    def load(self):
+        cart = self.session.get(self.cart_key)
+        if not cart:
+            cart = self.session[self.cart_key] = {}
+        self.cart = cart
+        return cart
+
+    def write_item(self, item_key, item):
+        # The cart dict is the session value, so it already holds the change
+        self.save()
+
+    def increment(self, item_key, item, amount):
+        item["quantity"] += amount
+        self.save()
+        return item["quantity"]
+
+    def delete(self, item_key):
+        self.save()
+
+    def clear(self):
+        self.cart = {}
+        if self.cart_key in self.session:
+            del self.session[self.cart_key]
+        self.save()
+
+    def save(self):
+        """Mark session as modified to ensure it's saved."""
+        self.session.modified = True
+
+
+class RedisCartStore:
+    """
+    Keep each cart in Redis instead of the session row.
+
+    A cart is two hashes sharing a TTL: "<key>:items" maps item keys to the
+    JSON item data, "<key>:qty" maps item keys to quantities. The session only
+    holds the anonymous cart id, so cart writes no longer rewrite the session.
+    """
+
+    KEY_PREFIX = "cart"
+
+    def __init__(self, session, cart_key, client=None):
+        self.session = session
+        self.cart_key = cart_key
+        self.client = client or get_redis_client()
+        self.ttl = getattr(settings, "CART_REDIS_TTL", settings.SESSION_COOKIE_AGE)
+        self.cart = {}
+        self.redis_key = self._redis_key(cart_key, create=True)
+
+    def _redis_key(self, cart_key, create=False):
+        if cart_key.startswith("cart_user_"):
+            return f"{self.KEY_PREFIX}:{cart_key}"
+
+        # Anonymous carts are addressed by a random id kept in the session
+        cart_id = self.session.get(cart_key)
+        if not isinstance(cart_id, str):
+            if not create:
+                return None
+            cart_id = uuid.uuid4().hex
+            self.session[cart_key] = cart_id
+        return f"{self.KEY_PREFIX}:anon:{cart_id}"
+
+    def _keys(self, redis_key=None):
+        redis_key = redis_key or self.redis_key
+        return f"{redis_key}:items", f"{redis_key}:qty"
+
+    def _expire(self, pipe):
+        for key in self._keys():
+            pipe.expire(key, self.ttl)
+
+    def migrate_from(self, anon_key):
+        """Rename an anonymous cart to this cart key if this cart is empty."""
+        anon_redis_key = self._redis_key(anon_key)
+        if anon_redis_key is None:
+            return False
+
+        anon_items, anon_qty = self._keys(anon_redis_key)
+        items_key, qty_key = self._keys()
+        if self.client.exists(anon_items) and not self.client.exists(items_key):
+            pipe = self.client.pipeline()
+            pipe.rename(anon_items, items_key)
+            pipe.rename(anon_qty, qty_key)
+            self._expire(pipe)
+            pipe.execute()
+            # Only forget the anonymous cart once it has moved, like the session store
+            del self.session[anon_key]
+            return True
+        return False
+
+    def load(self):
+        items_key, qty_key = self._keys()
+        pipe = self.client.pipeline()
+        pipe.hgetall(items_key)
+        pipe.hgetall(qty_key)
+        items, quantities = pipe.execute()
+
+        cart = {}
+        for item_key, data in items.items():
+            try:
+                item = json.loads(data)
+                item["quantity"] = int(quantities.get(item_key, 0))
+            except (ValueError, TypeError) as e:
+                logger.error(f"Corrupted cart item in Redis: {e}")
+                continue
+            cart[item_key] = item
+        self.cart = cart
+        return cart
+
+    def _dump(self, item):
+        return json.dumps({k: v for k, v in item.items() if k != "quantity"})
+
+    def write_item(self, item_key, item):
+        items_key, qty_key = self._keys()
+        pipe = self.client.pipeline()
+        pipe.hset(items_key, item_key, self._dump(item))
+        pipe.hset(qty_key, item_key, item["quantity"])
+        self._expire(pipe)
+        pipe.execute()
+
+    def increment(self, item_key, item, amount):
+        items_key, qty_key = self._keys()
+        pipe = self.client.pipeline()
+        pipe.hset(items_key, item_key, self._dump(item))
+        pipe.hincrby(qty_key, item_key, amount)
+        self._expire(pipe)
+        quantity = pipe.execute()[1]
+        item["quantity"] = quantity
+        return quantity
+
+    def delete(self, item_key):
+        items_key, qty_key = self._keys()
+        pipe = self.client.pipeline()
+        pipe.hdel(items_key, item_key)
+        pipe.hdel(qty_key, item_key)
+        pipe.execute()
+
+    def clear(self):
+        self.cart = {}
+        self.client.delete(*self._keys())
+
+    def save(self):
+        # Every change is written through to Redis as it happens
+        pass
+
+
+CART_STORES = {
+    "session": SessionCartStore,
+    "redis": RedisCartStore,
+}
+
+
+def get_cart_store(session, cart_key):
+    """Return the configured storage backend for a cart."""
+    backend = getattr(settings, "CART_STORAGE", "session")
+    return CART_STORES[backend](session, cart_key)
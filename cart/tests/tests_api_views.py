@@ -14,7 +14,7 @@ Coverage:
 - Error handling and edge cases
 """
 from decimal import Decimal
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -1094,3 +1094,95 @@ class CartAPIEdgeCasesTests(TestCase):
         expected_vat = expected_subtotal * Decimal("0.075")
         expected_total = expected_subtotal + expected_vat.quantize(Decimal("0.01"))
         self.assertEqual(Decimal(response.data["total_cost"]), expected_total)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "cart-query-count-tests",
+        }
+    }
+)
+class CartDetailViewQueryCountTests(TestCase):
+    """Benchmark: GET /api/cart/ stays at O(product types) queries"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("cart:cart-detail")
+        self.add_url = reverse("cart:cart-add")
+
+        self.category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.vests = [
+            NyscKit.objects.create(
+                name=f"Vest {i}",
+                type="vest",
+                category=self.category,
+                price=Decimal("3000.00"),
+                available=True,
+                out_of_stock=False,
+            )
+            for i in range(15)
+        ]
+
+    def _add_vests(self, count):
+        for vest in self.vests[:count]:
+            self.client.post(
+                self.add_url,
+                {
+                    "product_type": "nysc_kit",
+                    "product_id": str(vest.id),
+                    "quantity": 1,
+                    "size": "M",
+                },
+                format="json",
+            )
+
+    def _count_detail_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def test_query_count_independent_of_line_count(self):
+        """Test a 15-line cart costs the same queries as a 1-line cart"""
+        self._add_vests(1)
+        self.client.get(self.url)  # warm up one-off session writes
+        single_line_queries, _ = self._count_detail_queries()
+
+        self._add_vests(15)
+        many_line_queries, response = self._count_detail_queries()
+
+        self.assertEqual(len(response.data["items"]), 15)
+        self.assertEqual(many_line_queries, single_line_queries)
+
+    def test_item_keys_match_cart_lines(self):
+        """Test each returned item_key addresses its own cart line"""
+        self._add_vests(3)
+        self.client.post(
+            self.add_url,
+            {
+                "product_type": "nysc_kit",
+                "product_id": str(self.vests[0].id),
+                "quantity": 1,
+                "size": "L",
+            },
+            format="json",
+        )
+
+        _, response = self._count_detail_queries()
+        keys = [item["item_key"] for item in response.data["items"]]
+
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(len(set(keys)), 4)
+        for item in response.data["items"]:
+            self.assertIn(f"size:{item['extra_fields']['size']}", item["item_key"])
+            self.assertIn(item["product_id"], item["item_key"])
@@ -11,10 +11,11 @@ Coverage:
 - Edge cases: invalid products, corrupted data, decimal precision
 """
 from decimal import Decimal
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth import get_user_model
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.conf import settings
+from django.core.cache import cache
 from unittest.mock import Mock, patch, MagicMock
 from cart.cart import Cart
 from products.models import NyscKit, NyscTour, Church
@@ -1287,3 +1288,458 @@ class CartEdgeCasesTests(TestCase):
 
         # Should be empty (new session)
         self.assertEqual(len(new_cart), 0)
+
+
+class CartBatchedProductResolutionTests(TestCase):
+    """Test cart iteration fetches products in one query per product type"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("/")
+        middleware = SessionMiddleware(lambda x: x)
+        middleware.process_request(self.request)
+        self.request.session.save()
+        self.request.user = Mock(is_authenticated=False)
+
+        self.cart = Cart(self.request)
+
+        from products.models import Category
+
+        self.kit_category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.tour_category = Category.objects.create(
+            name="NYSC TOUR", slug="nysc-tour", product_type="nysc_tour"
+        )
+        self.church_category = Category.objects.create(
+            name="CHURCH PROGRAMME", slug="church-prog", product_type="church"
+        )
+
+        self.kits = [
+            NyscKit.objects.create(
+                name=f"Kit {i}",
+                type="cap",
+                category=self.kit_category,
+                price=Decimal("5000.00"),
+            )
+            for i in range(10)
+        ]
+        self.tour = NyscTour.objects.create(
+            name="Lagos", category=self.tour_category, price=Decimal("3000.00")
+        )
+        self.church = Church.objects.create(
+            name="Quality Shilo Shirt",
+            church="WINNERS",
+            category=self.church_category,
+            price=Decimal("2000.00"),
+        )
+
+    def test_single_product_type_uses_one_query(self):
+        """Test iterating many lines of one product type costs one query"""
+        for kit in self.kits:
+            self.cart.add(kit, quantity=1)
+
+        with self.assertNumQueries(1):
+            items = list(self.cart)
+
+        self.assertEqual(len(items), 10)
+
+    def test_query_count_scales_with_product_types_not_lines(self):
+        """Test query count equals number of distinct product types"""
+        for kit in self.kits:
+            self.cart.add(kit, quantity=1, size="M")
+            self.cart.add(kit, quantity=1, size="L")
+        self.cart.add(self.tour, quantity=1, call_up_number="AB/22C/1234")
+        self.cart.add(self.church, quantity=2, size="XL")
+
+        with self.assertNumQueries(3):
+            items = list(self.cart)
+
+        self.assertEqual(len(items), 22)
+
+    def test_category_is_preloaded(self):
+        """Test products come with their category already loaded"""
+        self.cart.add(self.kits[0], quantity=1)
+
+        items = list(self.cart)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(items[0]["product"].category.name, "NYSC KIT")
+
+    def test_missing_product_is_skipped(self):
+        """Test lines for products that no longer exist are skipped"""
+        self.cart.add(self.kits[0], quantity=1)
+        self.cart.add(self.kits[1], quantity=1)
+        self.kits[1].delete()
+
+        items = list(self.cart)
+
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]["product"], self.kits[0])
+
+    def test_malformed_product_id_is_skipped(self):
+        """Test lines with a non-UUID product id don't break the batch query"""
+        self.cart.add(self.kits[0], quantity=1)
+        self.cart.cart["nysc_kit:::not-a-uuid"] = {
+            "product_id": "not-a-uuid",
+            "product_type": "nysc_kit",
+            "quantity": 1,
+            "price": "100.00",
+            "extra_fields": {},
+        }
+
+        items = list(self.cart)
+
+        self.assertEqual(len(items), 1)
+
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "cart-tests",
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CartProductSnapshotTests(TestCase):
+    """Test the request-scoped product snapshot shared across cart layers"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("/api/cart/")
+        middleware = SessionMiddleware(lambda x: x)
+        middleware.process_request(self.request)
+        self.request.session.save()
+        self.request.user = Mock(is_authenticated=False)
+
+        from products.models import Category
+
+        self.category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.cap = NyscKit.objects.create(
+            name="Cap", type="cap", category=self.category, price=Decimal("5000.00")
+        )
+        self.vest = NyscKit.objects.create(
+            name="Vest", type="vest", category=self.category, price=Decimal("3000.00")
+        )
+
+        cart = Cart(self.request)
+        cart.add(self.cap, quantity=1)
+        cart.add(self.vest, quantity=2, size="M")
+
+    def test_carts_on_same_request_share_snapshot(self):
+        """Test a second Cart on the same request reuses fetched products"""
+        self.assertIs(Cart(self.request).snapshot, Cart(self.request).snapshot)
+
+        list(Cart(self.request))
+
+        with self.assertNumQueries(0):
+            items = list(Cart(self.request))
+
+        self.assertEqual(len(items), 2)
+
+    def test_repeated_iteration_fetches_once(self):
+        """Test iterating the same cart repeatedly issues a single query"""
+        cart = Cart(self.request)
+
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                list(cart)
+
+        self.assertEqual(cart.snapshot.query_count, 1)
+        self.assertEqual(cart.snapshot.fetch_count, 2)
+
+    def test_cleanup_then_iterate_fetches_once(self):
+        """Test cleanup and a later iteration share one fetch"""
+        cart = Cart(self.request)
+
+        with self.assertNumQueries(1):
+            cart.cleanup()
+            items = list(cart)
+
+        self.assertEqual(len(items), 2)
+
+    def test_middleware_and_view_share_snapshot(self):
+        """Test the cleanup middleware primes the snapshot used by the view"""
+        from cart.middleware import CartCleanupMiddleware
+
+        def view(request):
+            return [item["product"] for item in Cart(request)]
+
+        middleware = CartCleanupMiddleware(view)
+
+        with self.assertNumQueries(1):
+            products = middleware(self.request)
+
+        self.assertEqual(len(products), 2)
+        snapshot = Cart(self.request).snapshot
+        self.assertEqual(snapshot.fetch_count, 2)
+        self.assertEqual(snapshot.query_count, 1)
+
+    def test_missing_products_are_remembered(self):
+        """Test a missing product is not re-queried on the same request"""
+        self.vest.delete()
+        cart = Cart(self.request)
+
+        with self.assertNumQueries(1):
+            list(cart)
+            list(cart)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CartAvailabilityVersionTests(TestCase):
+    """Test the availability version bumped by product changes"""
+
+    def setUp(self):
+        cache.clear()
+
+        from products.models import Category
+
+        self.category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.product = NyscKit.objects.create(
+            name="Cap", type="cap", category=self.category, price=Decimal("5000.00")
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_version_changes_when_availability_changes(self):
+        """Test toggling available bumps the version"""
+        from cart.cart import get_availability_version
+
+        before = get_availability_version()
+        self.product.available = False
+        self.product.save()
+
+        self.assertNotEqual(get_availability_version(), before)
+
+    def test_version_changes_when_out_of_stock_changes(self):
+        """Test toggling out_of_stock bumps the version"""
+        from cart.cart import get_availability_version
+
+        before = get_availability_version()
+        self.product.out_of_stock = True
+        self.product.save()
+
+        self.assertNotEqual(get_availability_version(), before)
+
+    def test_version_unchanged_by_price_change(self):
+        """Test unrelated edits leave the version alone"""
+        from cart.cart import get_availability_version
+
+        before = get_availability_version()
+        self.product.price = Decimal("5500.00")
+        self.product.save()
+
+        self.assertEqual(get_availability_version(), before)
+
+    def test_version_changes_when_product_deleted(self):
+        """Test deleting a product bumps the version"""
+        from cart.cart import get_availability_version
+
+        before = get_availability_version()
+        self.product.delete()
+
+        self.assertNotEqual(get_availability_version(), before)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CartCleanupMiddlewareOverheadTests(TestCase):
+    """Benchmark: per-request cleanup overhead on routes that don't use the cart"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.session_middleware = SessionMiddleware(lambda x: x)
+
+        from products.models import Category
+
+        self.category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.products = [
+            NyscKit.objects.create(
+                name=f"Kit {i}",
+                type="cap",
+                category=self.category,
+                price=Decimal("5000.00"),
+            )
+            for i in range(10)
+        ]
+
+        # Build a session holding a 10-line cart
+        request = self._request("/api/cart/")
+        cart = Cart(request)
+        for product in self.products:
+            cart.add(product, quantity=1)
+        request.session.save()
+        self.session_key = request.session.session_key
+
+    def tearDown(self):
+        cache.clear()
+
+    def _request(self, path):
+        from django.contrib.messages.storage.fallback import FallbackStorage
+
+        request = self.factory.get(path)
+        self.session_middleware.process_request(request)
+        if getattr(self, "session_key", None):
+            request.session = request.session.__class__(self.session_key)
+        request.user = Mock(is_authenticated=False)
+        request._messages = FallbackStorage(request)
+        return request
+
+    def _run(self, path):
+        from cart.middleware import CartCleanupMiddleware
+
+        request = self._request(path)
+        # Load the session up front so only middleware queries are counted
+        "cart" in request.session
+        middleware = CartCleanupMiddleware(lambda r: "response")
+        return request, middleware
+
+    def test_first_request_validates_and_records_version(self):
+        """Test a cart never checked against a version is cleaned up once"""
+        from cart.cart import AVAILABILITY_VERSION_SESSION_KEY
+
+        request, middleware = self._run("/api/feed/")
+
+        with self.assertNumQueries(1):
+            middleware(request)
+
+        self.assertIn(AVAILABILITY_VERSION_SESSION_KEY, request.session)
+
+    def test_unrelated_route_skips_cleanup_when_version_unchanged(self):
+        """Test admin/feed style requests cost no product queries"""
+        request, middleware = self._run("/api/feed/")
+        middleware(request)
+        request.session.save()
+
+        request, middleware = self._run("/api/v1/academic-directory/")
+        with self.assertNumQueries(0):
+            middleware(request)
+
+    def test_unrelated_route_cleans_up_after_availability_change(self):
+        """Test a version bump forces re-validation on the next request"""
+        request, middleware = self._run("/api/feed/")
+        middleware(request)
+        request.session.save()
+
+        self.products[0].available = False
+        self.products[0].save()
+
+        request, middleware = self._run("/api/feed/")
+        with self.assertNumQueries(1):
+            middleware(request)
+
+        self.assertEqual(len(Cart(request).cart), 9)
+
+    def test_cart_routes_always_clean_up(self):
+        """Test cart and checkout routes re-validate regardless of version"""
+        request, middleware = self._run("/api/feed/")
+        middleware(request)
+        request.session.save()
+
+        for path in ("/api/cart/", "/api/order/checkout/"):
+            request, middleware = self._run(path)
+            with self.assertNumQueries(1):
+                middleware(request)
+
+
+class CartItemKeyIndexTests(TestCase):
+    """Test the (product_type, product_id) -> item keys index"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("/")
+        middleware = SessionMiddleware(lambda x: x)
+        middleware.process_request(self.request)
+        self.request.session.save()
+        self.request.user = Mock(is_authenticated=False)
+
+        self.cart = Cart(self.request)
+
+        from products.models import Category
+
+        self.category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.vest = NyscKit.objects.create(
+            name="Vest", type="vest", category=self.category, price=Decimal("3000.00")
+        )
+        self.cap = NyscKit.objects.create(
+            name="Cap", type="cap", category=self.category, price=Decimal("5000.00")
+        )
+
+    def test_iteration_yields_item_key(self):
+        """Test each iterated item carries the key it is stored under"""
+        self.cart.add(self.vest, quantity=1, size="M")
+        self.cart.add(self.vest, quantity=1, size="L")
+
+        keys = {item["item_key"] for item in self.cart}
+
+        self.assertEqual(keys, set(self.cart.cart.keys()))
+
+    def test_index_tracks_added_variants(self):
+        """Test every variant of a product is indexed under that product"""
+        self.cart.add(self.vest, quantity=1, size="M")
+        self.cart.add(self.vest, quantity=1, size="L")
+        self.cart.add(self.cap, quantity=1)
+
+        self.assertEqual(len(self.cart.get_item_keys(self.vest)), 2)
+        self.assertEqual(len(self.cart.get_item_keys(self.cap)), 1)
+
+    def test_index_rebuilt_from_session(self):
+        """Test a new Cart on the same session rebuilds the index"""
+        self.cart.add(self.vest, quantity=1, size="M")
+
+        cart = Cart(self.request)
+
+        self.assertEqual(
+            cart.get_item_keys(self.vest), self.cart.get_item_keys(self.vest)
+        )
+
+    def test_remove_does_not_scan_keys(self):
+        """Test remove finds the item without parsing every cart key"""
+        for size in ("S", "M", "L", "XL"):
+            self.cart.add(self.vest, quantity=1, size=size)
+        self.cart.add(self.cap, quantity=1)
+
+        with patch.object(Cart, "_parse_item_key", wraps=self.cart._parse_item_key) as parse:
+            self.cart.remove(self.cap)
+
+        self.assertEqual(parse.call_count, 1)  # only the removed key
+        self.assertEqual(self.cart.get_item_keys(self.cap), [])
+        self.assertEqual(len(self.cart.cart), 4)
+
+    def test_remove_item_and_update_quantity_keep_index_in_sync(self):
+        """Test key-based helpers update the index"""
+        self.cart.add(self.vest, quantity=1, size="M")
+        self.cart.add(self.vest, quantity=1, size="L")
+        key_m, key_l = self.cart.get_item_keys(self.vest)
+
+        self.assertTrue(self.cart.update_quantity(key_m, 5))
+        self.assertEqual(self.cart.cart[key_m]["quantity"], 5)
+
+        self.assertTrue(self.cart.update_quantity(key_m, 0))
+        self.assertEqual(self.cart.get_item_keys(self.vest), [key_l])
+
+        self.assertTrue(self.cart.remove_item(key_l))
+        self.assertEqual(self.cart.get_item_keys(self.vest), [])
+        self.assertFalse(self.cart.remove_item(key_l))
+
+    def test_cleanup_updates_index(self):
+        """Test items dropped by cleanup leave the index"""
+        self.cart.add(self.vest, quantity=1, size="M")
+        self.cart.add(self.cap, quantity=1)
+        self.cap.out_of_stock = True
+        self.cap.save()
+
+        self.cart.cleanup()
+
+        self.assertEqual(self.cart.get_item_keys(self.cap), [])
+        self.assertEqual(len(self.cart.get_item_keys(self.vest)), 1)
@@ -0,0 +1,287 @@
+# cart/tests/tests_storage.py
+"""
+Tests for cart storage backends (cart/storage.py)
+
+Coverage:
+- Backend selection via CART_STORAGE
+- RedisCartStore: add/update/remove/clear round trips, TTL, corrupted data
+- Anonymous to authenticated cart migration in Redis
+- One Redis round trip per cart write, session left untouched
+- Concurrent quantity updates (no lost updates with HINCRBY)
+- Benchmark: add/update/remove throughput with concurrent users
+  (opt-in: set RUN_BENCHMARKS=1)
+
+Redis tests run against fakeredis when it is installed.
+"""
+import os
+import threading
+import time
+import unittest
+from decimal import Decimal
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from unittest.mock import Mock, patch
+from cart.cart import Cart
+from cart.storage import SessionCartStore, RedisCartStore, get_cart_store
+from products.models import NyscKit
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
+
+def make_product(name="Cap", price="5000.00"):
+    """Unsaved product - cart storage never needs the database row"""
+    return NyscKit(name=name, type="cap", price=Decimal(price))
+
+
+class CartStoreSelectionTests(TestCase):
+    """Test the storage backend is picked from settings"""
+
+    def setUp(self):
+        request = RequestFactory().get("/")
+        SessionMiddleware(lambda x: x).process_request(request)
+        self.session = request.session
+
+    def test_default_is_session_store(self):
+        """Test carts live in the session unless configured otherwise"""
+        self.assertIsInstance(get_cart_store(self.session, "cart"), SessionCartStore)
+
+    @unittest.skipIf(fakeredis is None, "fakeredis not installed")
+    @override_settings(CART_STORAGE="redis")
+    def test_redis_store_selected(self):
+        """Test CART_STORAGE='redis' selects the Redis backend"""
+        with patch("cart.storage.get_redis_client", return_value=fakeredis.FakeRedis()):
+            self.assertIsInstance(
+                get_cart_store(self.session, "cart"), RedisCartStore
+            )
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis not installed")
+@override_settings(CART_STORAGE="redis")
+class RedisCartStoreTests(SimpleTestCase):
+    """Test Cart operations persisted through RedisCartStore"""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        patcher = patch("cart.storage.get_redis_client", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.session = {}
+        self.product = make_product()
+        self.other = make_product("Vest", "3000.00")
+
+    def _cart(self, user=None):
+        request = RequestFactory().get("/")
+        request.session = self.session
+        request.user = user or Mock(is_authenticated=False)
+        return Cart(request)
+
+    def test_session_only_holds_cart_id(self):
+        """Test the session keeps an id, not the cart contents"""
+        cart = self._cart()
+        cart.add(self.product, quantity=2)
+
+        self.assertIsInstance(self.session["cart"], str)
+        self.assertTrue(self.redis.exists(f"{cart.store.redis_key}:items"))
+
+    def test_add_and_reload(self):
+        """Test items survive a round trip through Redis"""
+        self._cart().add(self.product, quantity=2, size="M")
+
+        cart = self._cart()
+
+        self.assertEqual(len(cart), 2)
+        item = next(iter(cart.cart.values()))
+        self.assertEqual(item["price"], "5000.00")
+        self.assertEqual(item["extra_fields"], {"size": "M"})
+
+    def test_add_increments_quantity(self):
+        """Test repeated adds increment with HINCRBY"""
+        self._cart().add(self.product, quantity=2)
+        self._cart().add(self.product, quantity=3)
+
+        self.assertEqual(len(self._cart()), 5)
+
+    def test_override_quantity(self):
+        """Test override sets the quantity instead of incrementing"""
+        self._cart().add(self.product, quantity=2)
+        self._cart().add(self.product, quantity=7, override_quantity=True)
+
+        self.assertEqual(len(self._cart()), 7)
+
+    def test_update_and_remove_item(self):
+        """Test key-based updates and removals are persisted"""
+        cart = self._cart()
+        cart.add(self.product, quantity=1)
+        cart.add(self.other, quantity=1)
+        product_key = cart.get_item_keys(self.product)[0]
+        other_key = cart.get_item_keys(self.other)[0]
+
+        cart.update_quantity(product_key, 4)
+        cart.remove_item(other_key)
+
+        reloaded = self._cart()
+        self.assertEqual(list(reloaded.cart), [product_key])
+        self.assertEqual(reloaded.cart[product_key]["quantity"], 4)
+
+    def test_remove_by_product(self):
+        """Test Cart.remove deletes the Redis fields"""
+        cart = self._cart()
+        cart.add(self.product, quantity=1)
+
+        cart.remove(self.product)
+
+        self.assertEqual(self._cart().cart, {})
+
+    def test_clear(self):
+        """Test clear drops the Redis hashes"""
+        cart = self._cart()
+        cart.add(self.product, quantity=1)
+
+        cart.clear()
+
+        self.assertFalse(self.redis.exists(f"{cart.store.redis_key}:items"))
+        self.assertEqual(len(self._cart()), 0)
+
+    def test_writes_set_ttl(self):
+        """Test cart hashes expire with the session"""
+        cart = self._cart()
+        cart.add(self.product, quantity=1)
+
+        ttl = self.redis.ttl(f"{cart.store.redis_key}:qty")
+        self.assertGreater(ttl, 0)
+        self.assertLessEqual(ttl, cart.store.ttl)
+
+    def test_corrupted_item_is_skipped(self):
+        """Test unreadable item data doesn't break loading"""
+        cart = self._cart()
+        cart.add(self.product, quantity=1)
+        self.redis.hset(f"{cart.store.redis_key}:items", "broken", "{not json")
+
+        self.assertEqual(len(self._cart().cart), 1)
+
+    def test_one_round_trip_per_write(self):
+        """Test each add/update/remove is one pipeline and never writes the session"""
+        user = Mock(is_authenticated=True, id=7)
+        products = [make_product(f"Kit {i}") for i in range(5)]
+        cart = self._cart(user=user)
+
+        with patch.object(self.redis, "pipeline", wraps=self.redis.pipeline) as pipeline:
+            for product in products:
+                cart.add(product, quantity=1)
+            cart.update_quantity(cart.get_item_keys(products[0])[0], 3)
+            cart.remove(products[-1])
+
+        self.assertEqual(pipeline.call_count, len(products) + 2)
+        self.assertEqual(self.session, {})
+        self.assertEqual(len(self._cart(user=user).cart), len(products) - 1)
+
+    def test_anonymous_cart_migrates_on_login(self):
+        """Test an anonymous Redis cart becomes the user's cart"""
+        self._cart().add(self.product, quantity=2)
+        user = Mock(is_authenticated=True, id=42)
+
+        cart = self._cart(user=user)
+
+        self.assertEqual(cart.cart_key, "cart_user_42")
+        self.assertEqual(len(cart), 2)
+        self.assertNotIn("cart", self.session)
+
+    def test_existing_user_cart_not_overwritten(self):
+        """Test migration keeps the user's own cart when it already exists"""
+        user = Mock(is_authenticated=True, id=42)
+        self._cart(user=user).add(self.other, quantity=1)
+        self._cart().add(self.product, quantity=5)
+
+        cart = self._cart(user=user)
+
+        self.assertEqual(len(cart), 1)
+
+    def test_anonymous_cart_kept_when_user_cart_exists(self):
+        """Test login with both carts present leaves the anonymous cart reachable"""
+        user = Mock(is_authenticated=True, id=42)
+        self._cart(user=user).add(self.other, quantity=1)
+        self._cart().add(self.product, quantity=5)
+        anon_cart_id = self.session["cart"]
+
+        self._cart(user=user)
+
+        self.assertEqual(self.session["cart"], anon_cart_id)
+        self.assertTrue(self.redis.exists(f"cart:anon:{anon_cart_id}:items"))
+        self.assertEqual(len(self._cart()), 5)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis not installed")
+@override_settings(CART_STORAGE="redis")
+class RedisCartStoreConcurrencyTests(SimpleTestCase):
+    """Benchmark: cart throughput and correctness under concurrent users"""
+
+    USERS = 8
+    OPERATIONS = 50
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        patcher = patch("cart.storage.get_redis_client", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cart(self, session, user_id):
+        request = RequestFactory().get("/")
+        request.session = session
+        request.user = Mock(is_authenticated=True, id=user_id)
+        return Cart(request)
+
+    def _run_threads(self, target):
+        threads = [
+            threading.Thread(target=target, args=(i,)) for i in range(self.USERS)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    def test_concurrent_adds_to_same_cart_lose_no_updates(self):
+        """Test parallel tabs adding to one cart sum their quantities"""
+        product = make_product()
+
+        def worker(_):
+            for _ in range(self.OPERATIONS):
+                self._cart({}, user_id=1).add(product, quantity=1)
+
+        self._run_threads(worker)
+
+        self.assertEqual(len(self._cart({}, user_id=1)), self.USERS * self.OPERATIONS)
+
+    @unittest.skipUnless(os.environ.get("RUN_BENCHMARKS"), "Benchmark; set RUN_BENCHMARKS=1")
+    def test_add_update_remove_throughput(self):
+        """Test add/update/remove throughput across concurrent users"""
+        products = [make_product(f"Kit {i}") for i in range(5)]
+        errors = []
+
+        def worker(user_id):
+            try:
+                session = {}
+                for _ in range(self.OPERATIONS // 5):
+                    cart = self._cart(session, user_id)
+                    for product in products:
+                        cart.add(product, quantity=1)
+                    key = cart.get_item_keys(products[0])[0]
+                    cart.update_quantity(key, 3)
+                    cart.remove(products[-1])
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        elapsed = self._run_threads(worker)
+        operations = self.USERS * (self.OPERATIONS // 5) * (len(products) + 2)
+
+        self.assertEqual(errors, [])
+        for user_id in range(self.USERS):
+            cart = self._cart({}, user_id)
+            self.assertEqual(len(cart.cart), len(products) - 1)
+        # Generous floor: catches accidental per-operation round-trip blowups
+        self.assertGreater(operations / elapsed, 200)
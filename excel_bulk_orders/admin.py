@@ -12,10 +12,11 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.urls import reverse
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.db.models import Count, Q
 from django.utils import timezone
 from django.conf import settings
+from material.excel_export import XLSX_CONTENT_TYPE
 import logging
 
 from .models import ExcelBulkOrder, ExcelParticipant, ExcelCouponCode
@@ -377,11 +378,12 @@ class ExcelBulkOrderAdmin(admin.ModelAdmin):
         try:
             excel_buffer = generate_participants_excel(bulk_order)
             
-            response = HttpResponse(
-                excel_buffer.getvalue(),
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            response = FileResponse(
+                excel_buffer,
+                as_attachment=True,
+                filename=f"{bulk_order.reference}_participants.xlsx",
+                content_type=XLSX_CONTENT_TYPE,
             )
-            response['Content-Disposition'] = f'attachment; filename="{bulk_order.reference}_participants.xlsx"'
             
             logger.info(f"Admin downloaded Excel for {bulk_order.reference}")
             return response
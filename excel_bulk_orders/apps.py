@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ExcelBulkOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'excel_bulk_orders'
+
+    def ready(self):
+        """Register the Paystack webhook handler for EXL- references"""
+        from webhook_router.registry import register_webhook_handler
+
+        register_webhook_handler('EXL-', 'excel_bulk_orders.views.handle_excel_bulk_order_payment')
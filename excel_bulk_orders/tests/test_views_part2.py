@@ -239,7 +239,8 @@ class ExcelParticipantViewSetTest(APITestCase):
         self.assertEqual(len(response.data.get('results', [])), 0)
 
 
-@override_settings(PAYSTACK_SECRET_KEY='test_secret_key')  # FIXED: Apply to entire class
+# Inbox off: the handler runs inline so its effects are visible to the test
+@override_settings(PAYSTACK_SECRET_KEY='test_secret_key', WEBHOOK_INBOX_ENABLED=False)  # FIXED: Apply to entire class
 class ExcelBulkOrderWebhookTest(APITestCase):
     """Test webhook endpoint for Excel bulk orders"""
     
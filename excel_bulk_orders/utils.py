@@ -17,6 +17,8 @@ import string
 import random
 import logging
 from django.conf import settings
+from material.excel_export import ExcelExport, iter_rows
+from material.word_report import WordReport, group_by_size
 from .models import ExcelBulkOrder, ExcelParticipant
 
 logger = logging.getLogger(__name__)
@@ -484,13 +486,33 @@ def generate_participants_word(bulk_order):
         Exception: If document generation fails
     """
     try:
-        from docx import Document
-        from docx.shared import Pt, RGBColor, Inches
+        from collections import Counter
         from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-        from django.db.models import Count
         from django.utils import timezone
         
-        doc = Document()
+        requires_custom_name = bulk_order.requires_custom_name
+        
+        # Every table, count and custom name below comes from this one pass
+        statuses = Counter()
+        
+        def row(participant):
+            size, full_name, custom_name, is_coupon_applied = participant
+            status = 'Free (Coupon)' if is_coupon_applied else 'Paid'
+            statuses[status] += 1
+            if requires_custom_name:
+                return [full_name, custom_name.upper() if custom_name else '-', status]
+            return [full_name, status]
+        
+        participants = bulk_order.participants.all().order_by('size', 'full_name')
+        rows_by_size, names_by_size = group_by_size(
+            iter_rows(participants, 'size', 'full_name', 'custom_name', 'is_coupon_applied'),
+            row,
+            custom_name=(lambda participant: participant[2] and participant[2].upper())
+            if requires_custom_name else None,
+        )
+        
+        report = WordReport()
+        doc = report.document
         
         # Title
         title = doc.add_heading(bulk_order.title, 0)
@@ -502,145 +524,37 @@ def generate_participants_word(bulk_order):
         doc.add_paragraph(f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M')}")
         doc.add_paragraph("")
         
-        participants = bulk_order.participants.all().order_by('size', 'full_name')
-        
         # Summary
         doc.add_heading("Summary", level=1)
         summary_para = doc.add_paragraph()
-        summary_para.add_run(f"Total Participants: {participants.count()}\n").bold = True
-        summary_para.add_run(f"Paid: {participants.filter(is_coupon_applied=False).count()}\n")
-        summary_para.add_run(f"Free (Coupons): {participants.filter(is_coupon_applied=True).count()}\n")
+        summary_para.add_run(f"Total Participants: {sum(statuses.values())}\n").bold = True
+        summary_para.add_run(f"Paid: {statuses['Paid']}\n")
+        summary_para.add_run(f"Free (Coupons): {statuses['Free (Coupon)']}\n")
         summary_para.add_run(f"Total Amount: ₦{bulk_order.total_amount:,.2f}\n")
         
         doc.add_paragraph("")
         
         # Size breakdown
         doc.add_heading("Size Breakdown", level=1)
-        size_summary = participants.values('size').annotate(count=Count('size')).order_by('size')
-        
-        for size_data in size_summary:
-            size = size_data['size']
-            count = size_data['count']
-            doc.add_paragraph(f"{size}: {count} participant(s)", style='List Bullet')
+        for size, rows in rows_by_size.items():
+            doc.add_paragraph(f"{size}: {len(rows)} participant(s)", style='List Bullet')
         
         doc.add_paragraph("")
         
         # Participant list by size
         doc.add_heading("Participant List", level=1)
+        if requires_custom_name:
+            header = ['Full Name', 'Custom Name', 'Status']
+        else:
+            header = ['Full Name', 'Status']
+        report.add_size_tables(rows_by_size, header, heading="Size: {size} ({count})")
         
-        for size_data in size_summary:
-            size = size_data['size']
-            size_participants = participants.filter(size=size)
-            
-            if size_participants.exists():
-                doc.add_heading(f"Size: {size} ({size_participants.count()})", level=2)
-                
-                # Determine columns based on custom name requirement
-                if bulk_order.requires_custom_name:
-                    table = doc.add_table(rows=1, cols=4)
-                    table.style = 'Light Grid Accent 1'
-                    
-                    # Header row
-                    header_cells = table.rows[0].cells
-                    header_cells[0].text = 'S/N'
-                    header_cells[1].text = 'Full Name'
-                    header_cells[2].text = 'Custom Name'
-                    header_cells[3].text = 'Status'
-                    
-                    for idx, participant in enumerate(size_participants, 1):
-                        row_cells = table.add_row().cells
-                        row_cells[0].text = str(idx)
-                        row_cells[1].text = participant.full_name
-                        # Only show custom name if it exists
-                        row_cells[2].text = participant.custom_name.upper() if participant.custom_name else '-'
-                        row_cells[3].text = 'Free (Coupon)' if participant.is_coupon_applied else 'Paid'
-                else:
-                    table = doc.add_table(rows=1, cols=3)
-                    table.style = 'Light Grid Accent 1'
-                    
-                    # Header row
-                    header_cells = table.rows[0].cells
-                    header_cells[0].text = 'S/N'
-                    header_cells[1].text = 'Full Name'
-                    header_cells[2].text = 'Status'
-                    
-                    for idx, participant in enumerate(size_participants, 1):
-                        row_cells = table.add_row().cells
-                        row_cells[0].text = str(idx)
-                        row_cells[1].text = participant.full_name
-                        row_cells[2].text = 'Free (Coupon)' if participant.is_coupon_applied else 'Paid'
-                
-                doc.add_paragraph()
-        
-        # ====== NEW SECTION: Custom Names by Size (only if custom names enabled) ======
-        if bulk_order.requires_custom_name:
-            # Add page break to start on new page
-            doc.add_page_break()
-            
-            doc.add_heading('Custom Names by Size', level=1)
-            doc.add_paragraph('This section shows all custom names grouped by size for easy copying.')
-            doc.add_paragraph()
-            
-            # CRITICAL FIX: Query participants for THIS bulk_order ONLY
-            # CORRECTION: Field name is 'bulk_order', NOT 'excel_bulk_order'
-            # ONLY include participants who have custom_name set (exclude None/empty)
-            from excel_bulk_orders.models import ExcelParticipant
-            from django.db.models import Q
-            
-            bulk_order_participants = ExcelParticipant.objects.filter(
-                bulk_order=bulk_order,  # ✅ CORRECT field name
-                custom_name__isnull=False  # ✅ Only participants WITH custom names
-            ).exclude(
-                custom_name=''  # ✅ Exclude empty strings
-            ).order_by('size', 'full_name')
-            
-            # Get size summary ONLY for participants with custom names
-            custom_names_size_summary = bulk_order_participants.values('size').annotate(
-                count=Count('id')
-            ).order_by('size')
-            
-            # Group participants by size
-            for size_data in custom_names_size_summary:
-                size = size_data['size']
-                size_participants = bulk_order_participants.filter(size=size)
-                
-                # Get custom names (we know they all have custom_name since we filtered)
-                custom_names = [
-                    participant.custom_name.upper()
-                    for participant in size_participants
-                ]
-
-                
-                if custom_names:
-                    # Add size header
-                    doc.add_heading(f'SIZE: {size}', level=2)
-                    
-                    # Create table with 5 columns for grid layout
-                    num_cols = 5
-                    num_rows = (len(custom_names) + num_cols - 1) // num_cols  # Ceiling division
-                    
-                    table = doc.add_table(rows=num_rows, cols=num_cols)
-                    table.style = 'Light Grid Accent 1'
-                    
-                    # Fill table with custom names
-                    for idx, custom_name in enumerate(custom_names):
-                        row_idx = idx // num_cols
-                        col_idx = idx % num_cols
-                        table.rows[row_idx].cells[col_idx].text = custom_name
-                    
-                    doc.add_paragraph()
-        
-        # Footer
-        doc.add_paragraph("")
-        footer_para = doc.add_paragraph()
-        footer_para.add_run(f"{settings.COMPANY_NAME}\n").bold = True
-        footer_para.add_run(f"{settings.COMPANY_ADDRESS}\n")
-        footer_para.add_run(f"📞 {settings.COMPANY_PHONE} | 📧 {settings.COMPANY_EMAIL}")
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
+        # Custom Names by Size (only if custom names enabled)
+        if requires_custom_name:
+            report.add_custom_names(names_by_size)
+        
+        report.add_footer()
+        buffer = report.save()
         
         logger.info(f"Generated Word document for Excel bulk order: {bulk_order.reference}")
         return buffer
@@ -658,18 +572,15 @@ def generate_participants_excel(bulk_order):
         bulk_order: ExcelBulkOrder instance
     
     Returns:
-        BytesIO: Excel file buffer
+        File object with the finished workbook, rewound (spooled to disk
+        once large; the caller closes it, e.g. by returning a FileResponse)
     
     Raises:
         Exception: If Excel generation fails
     """
     try:
-        import xlsxwriter
-        from django.db.models import Count
-        from django.utils import timezone
-        
-        buffer = BytesIO()
-        workbook = xlsxwriter.Workbook(buffer, {'constant_memory': True})
+        export = ExcelExport()
+        workbook = export.workbook
         
         # Define formats
         header_format = workbook.add_format({
@@ -723,32 +634,34 @@ def generate_participants_excel(bulk_order):
         for col, header in enumerate(headers):
             participants_sheet.write(0, col, header, header_format)
         
-        # Write participant data
-        participants = bulk_order.participants.all().order_by('row_number')
-        for idx, participant in enumerate(participants, 1):
-            row_format = free_format if participant.is_coupon_applied else paid_format
+        # Write participant data (streamed in chunks, never materialized)
+        participants = iter_rows(
+            bulk_order.participants.order_by('row_number'),
+            'full_name', 'size', 'custom_name', 'is_coupon_applied', 'coupon_code',
+        )
+        for idx, (full_name, size, custom_name, is_coupon_applied, coupon_code) in enumerate(participants, 1):
+            row_format = free_format if is_coupon_applied else paid_format
             
             col = 0
             participants_sheet.write(idx, col, idx, normal_format)
             col += 1
-            participants_sheet.write(idx, col, participant.full_name, row_format)
+            participants_sheet.write(idx, col, full_name, row_format)
             col += 1
-            participants_sheet.write(idx, col, participant.size, row_format)
+            participants_sheet.write(idx, col, size, row_format)
             col += 1
             
             # Only include Custom Name column if required
             if bulk_order.requires_custom_name:
-                custom_name_display = participant.custom_name.upper() if participant.custom_name else '-'
+                custom_name_display = custom_name.upper() if custom_name else '-'
                 participants_sheet.write(idx, col, custom_name_display, row_format)
                 col += 1
             
-            status = 'Free (Coupon)' if participant.is_coupon_applied else 'Paid'
+            status = 'Free (Coupon)' if is_coupon_applied else 'Paid'
             participants_sheet.write(idx, col, status, row_format)
             col += 1
-            participants_sheet.write(idx, col, participant.coupon_code or '-', row_format)
+            participants_sheet.write(idx, col, coupon_code or '-', row_format)
         
-        workbook.close()
-        buffer.seek(0)
+        buffer = export.close()
         
         logger.info(f"Generated Excel for Excel bulk order: {bulk_order.reference}")
         return buffer
@@ -11,7 +11,7 @@ Endpoints:
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.utils import timezone
@@ -43,6 +43,11 @@ from payment.utils import (
     get_vat_breakdown,
 )
 from payment.security import verify_paystack_signature
+from payment.status_cache import (
+    get_payment_status,
+    invalidate_payment_status,
+    payment_status_cache_key,
+)
 from material.background_utils import send_email_async
 
 logger = logging.getLogger(__name__)
@@ -360,6 +365,25 @@ class ExcelBulkOrderViewSet(viewsets.ModelViewSet):
         2. Frontend calls this endpoint to check if payment was processed
         3. Webhook (separately) handles the actual payment processing
         """
+        # Polled repeatedly after redirect: served from the status cache
+        status_entry = get_payment_status(
+            payment_status_cache_key("excel_bulk_orders", pk),
+            lambda: self._load_payment_status(request),
+            is_terminal=lambda entry: entry["data"]["paid"],
+        )
+
+        # Same scoping as get_queryset() for cache hits
+        user = request.user
+        if (
+            user.is_authenticated
+            and not user.is_staff
+            and status_entry["created_by_id"] != user.pk
+        ):
+            raise Http404
+
+        return Response(status_entry["data"])
+
+    def _load_payment_status(self, request):
         bulk_order = self.get_object()
 
         # Get participant count if payment is complete
@@ -374,27 +398,26 @@ class ExcelBulkOrderViewSet(viewsets.ModelViewSet):
             bulk_order, context={"request": request}
         )
 
-        return Response(
-            {
-                "reference": bulk_order.reference,
-                "title": bulk_order.title,
-                "coordinator_email": bulk_order.coordinator_email,
-                "paid": bulk_order.payment_status,
-                "validation_status": bulk_order.validation_status,
-                "base_amount": float(vat_breakdown["base_amount"]),
-                "vat_amount": float(vat_breakdown["vat_amount"]),
-                "vat_rate": vat_breakdown["vat_rate"],
-                "total_amount": float(vat_breakdown["total_amount"]),
-                "participants_count": participants_count,
-                "paystack_reference": bulk_order.paystack_reference,
-                "message": (
-                    "Payment successful"
-                    if bulk_order.payment_status
-                    else "Payment pending"
-                ),
-                "bulk_order": serializer.data,
-            }
-        )
+        data = {
+            "reference": bulk_order.reference,
+            "title": bulk_order.title,
+            "coordinator_email": bulk_order.coordinator_email,
+            "paid": bulk_order.payment_status,
+            "validation_status": bulk_order.validation_status,
+            "base_amount": float(vat_breakdown["base_amount"]),
+            "vat_amount": float(vat_breakdown["vat_amount"]),
+            "vat_rate": vat_breakdown["vat_rate"],
+            "total_amount": float(vat_breakdown["total_amount"]),
+            "participants_count": participants_count,
+            "paystack_reference": bulk_order.paystack_reference,
+            "message": (
+                "Payment successful"
+                if bulk_order.payment_status
+                else "Payment pending"
+            ),
+            "bulk_order": serializer.data,
+        }
+        return {"created_by_id": bulk_order.created_by_id, "data": data}
 
     @action(detail=True, methods=["get"], url_path="download-template")
     def download_template(self, request, pk=None):
@@ -561,6 +584,20 @@ def excel_bulk_order_payment_webhook(request):
 
         # 📦 STEP 2: Parse payload
         payload = json.loads(request.body)
+
+    except json.JSONDecodeError:
+        logger.error("Invalid JSON in excel webhook payload")
+        return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
+
+    return handle_excel_bulk_order_payment(payload)
+
+
+def handle_excel_bulk_order_payment(payload):
+    """
+    Apply a verified, parsed Paystack payload to its ExcelBulkOrder.
+    Registered with webhook_router for EXL- references.
+    """
+    try:
         event = payload.get("event")
         data = payload.get("data", {})
 
@@ -637,6 +674,9 @@ def excel_bulk_order_payment_webhook(request):
 
             logger.info(f"Created {participants_count} participants for {reference}")
 
+            # Polls may have cached "paid" before participants existed
+            invalidate_payment_status("excel_bulk_orders", bulk_order.id)
+
             # 📧 STEP 6: Send confirmation email
             send_bulk_order_confirmation_email(bulk_order, participants_count)
 
@@ -661,10 +701,6 @@ def excel_bulk_order_payment_webhook(request):
                 {"status": "error", "message": "Order not found"}, status=404
             )
 
-    except json.JSONDecodeError:
-        logger.error("Invalid JSON in excel webhook payload")
-        return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
-
     except Exception:
         logger.exception("Unexpected error processing excel webhook")
         return JsonResponse(
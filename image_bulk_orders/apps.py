@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ImageBulkOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'image_bulk_orders'
+
+    def ready(self):
+        """Register the Paystack webhook handler for IMG-BULK- references"""
+        from webhook_router.registry import register_webhook_handler
+
+        register_webhook_handler('IMG-BULK-', 'image_bulk_orders.views.handle_image_bulk_order_payment')
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-16 20:19
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seed_counters(apps, schema_editor):
+    """Start each link's counter at its highest serial already issued."""
+    ImageBulkOrderLink = apps.get_model("image_bulk_orders", "ImageBulkOrderLink")
+    ImageOrderEntry = apps.get_model("image_bulk_orders", "ImageOrderEntry")
+    last_serials = ImageOrderEntry.objects.values("bulk_order_id").annotate(
+        last=Max("serial_number")
+    )
+    for row in last_serials:
+        ImageBulkOrderLink.objects.filter(id=row["bulk_order_id"]).update(
+            last_serial_number=row["last"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('image_bulk_orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagebulkorderlink',
+            name='last_serial_number',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
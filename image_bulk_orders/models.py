@@ -14,6 +14,7 @@ from django.core.validators import MinValueValidator
 from django.utils.text import slugify
 from decimal import Decimal
 from cloudinary.models import CloudinaryField
+from material.serials import next_serial, preserve_counter
 import logging
 
 User = get_user_model()
@@ -44,6 +45,9 @@ class ImageBulkOrderLink(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Serial number counter — ensures serial numbers are never reused after deletion
+    last_serial_number = models.PositiveIntegerField(default=0)
+
     def save(self, *args, **kwargs):
         """Auto-generate slug and normalize organization name"""
         try:
@@ -63,6 +67,9 @@ class ImageBulkOrderLink(models.Model):
                 self.slug = slug
                 logger.info(f"Generated slug: {self.slug} for organization: {self.organization_name}")
             
+            # Entries own the serial counter - never overwrite it from here
+            preserve_counter(self, kwargs)
+
             super().save(*args, **kwargs)
             logger.info(f"ImageBulkOrderLink saved successfully: {self.slug}")
         except Exception as e:
@@ -186,11 +193,8 @@ class ImageOrderEntry(models.Model):
 
         # Auto-increment serial_number within bulk_order
         if not self.serial_number:
-            last_order = ImageOrderEntry.objects.filter(
-                bulk_order=self.bulk_order
-            ).order_by('-serial_number').first()
-            
-            self.serial_number = (last_order.serial_number + 1) if last_order else 1
+            # Single locked increment of the link's counter (UPDATE ... RETURNING)
+            self.serial_number = next_serial(ImageBulkOrderLink, self.bulk_order_id)
             logger.info(f"Assigned serial_number: {self.serial_number} for bulk_order: {self.bulk_order.slug}")
 
         super().save(*args, **kwargs)
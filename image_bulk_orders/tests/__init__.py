@@ -40,6 +40,11 @@ TEST MODULES:
    - HasCouponFilterTest: Custom filter functionality
    - AdminIntegrationTest: End-to-end admin workflows
 
+6. test_zip_package.py (4 test classes)
+   - ZipPackageTest / FetchConcurrentlyTest: Spooled zip builder, bounded fetch pool
+   - AdminPackageImagesTest: Package images from a local stand-in image server
+   - AdminPackageBenchmarkTest: Wall clock and peak memory over 100 images (RUN_BENCHMARKS=1)
+
 COVERAGE AREAS:
 ===============
 
@@ -969,4 +969,55 @@ class ImageOrderEntryModelTest(TransactionTestCase):
                     reference=order1.reference  # Duplicate reference
                 )
                 order2.serial_number = 999
-                order2.save()
\ No newline at end of file
+                order2.save()
+
+
+class ImageOrderEntrySerialCounterTest(TestCase):
+    """Test ImageOrderEntry serials come from the ImageBulkOrderLink counter"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='counteruser',
+            email='counter@example.com',
+            password='testpass123'
+        )
+        self.bulk_order = ImageBulkOrderLink.objects.create(
+            organization_name='Counter Church',
+            price_per_item=Decimal('5000.00'),
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user
+        )
+
+    def _create_entry(self, name='Counter Person'):
+        return ImageOrderEntry.objects.create(
+            bulk_order=self.bulk_order,
+            email='entry@example.com',
+            full_name=name,
+            size='M'
+        )
+
+    def test_counter_tracks_last_serial(self):
+        """Test the link's counter holds the last serial issued"""
+        entry = self._create_entry()
+
+        self.bulk_order.refresh_from_db()
+        self.assertEqual(self.bulk_order.last_serial_number, entry.serial_number)
+
+    def test_serial_not_reused_after_deletion(self):
+        """Test deleting the last entry doesn't free its serial"""
+        self._create_entry('First')
+        self._create_entry('Second').delete()
+
+        self.assertEqual(self._create_entry('Third').serial_number, 3)
+
+    def test_stale_link_save_keeps_counter(self):
+        """Test saving an old copy of the link doesn't roll the counter back"""
+        stale_link = ImageBulkOrderLink.objects.get(pk=self.bulk_order.pk)
+        self._create_entry('First')
+
+        stale_link.custom_branding_enabled = True
+        stale_link.save()
+
+        self.assertEqual(self._create_entry('Second').serial_number, 2)
+
@@ -428,7 +428,7 @@ class GenerateAdminPackageWithImagesTest(TestCase):
         mock_word.return_value = mock_word_response
         
         mock_excel_response = Mock()
-        mock_excel_response.content = b'fake xlsx'
+        mock_excel_response.streaming_content = [b'fake xlsx']
         mock_excel.return_value = mock_excel_response
         
         response = generate_admin_package_with_images(self.bulk_order.id)
@@ -0,0 +1,344 @@
+# image_bulk_orders/tests/test_zip_package.py
+"""
+Tests for material/zip_package.py and the image bulk order admin package,
+against a local stand-in for the Cloudinary image CDN.
+
+Tests cover:
+- ZipPackage: images and Office files stored, others deflated, chunked
+  entries, streamed FileResponse
+- fetch_concurrently: every item fetched, bounded work in flight
+- generate_admin_package_with_images: images by size, duplicate names
+  kept, failed downloads logged and skipped, keep-alive connections reused
+- Benchmark: wall clock and peak memory for 100 images, concurrent
+  streamed package vs the previous sequential temp dir + BytesIO build
+  (opt-in: set RUN_BENCHMARKS=1)
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse
+
+import requests
+from django.contrib.auth import get_user_model
+from django.http import FileResponse, HttpResponse
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from image_bulk_orders import utils as image_utils
+from image_bulk_orders.models import ImageBulkOrderLink, ImageOrderEntry
+from image_bulk_orders.utils import generate_admin_package_with_images
+from material.zip_package import FETCH_WORKERS, ZipPackage, fetch_concurrently
+
+User = get_user_model()
+
+# Incompressible stand-in photo, like a real JPEG
+IMAGE_BYTES = random.Random(0).randbytes(200_000)
+
+
+def read_zip(response):
+    return zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+
+
+class StandInImageHandler(BaseHTTPRequestHandler):
+    """Serves IMAGE_BYTES for any path after a CDN-like delay; /missing/ is 404"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        time.sleep(self.server.latency)
+        if self.path.startswith("/missing/"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(IMAGE_BYTES)))
+        self.end_headers()
+        self.wfile.write(IMAGE_BYTES)
+
+
+class StandInImageServerMixin:
+    """Local image server; order image URLs are pointed at it by file name"""
+
+    latency = 0.02
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInImageHandler)
+        cls.server.daemon_threads = True
+        cls.server.latency = cls.latency
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.connections = set()
+        package_image_files = image_utils._package_image_files
+
+        def local_image_files(report, package_name):
+            for arcname, url in package_image_files(report, package_name):
+                yield arcname, self.local_url(url)
+
+        patcher = patch(
+            "image_bulk_orders.utils._package_image_files", side_effect=local_image_files
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for name in ["pdf", "word", "excel"]:
+            document = Mock(content=f"fake {name}".encode(), streaming_content=[b"fake xlsx"])
+            patcher = patch(
+                f"image_bulk_orders.utils.generate_image_bulk_order_{name}", return_value=document
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def local_url(self, url):
+        """The stand-in URL for a Cloudinary URL: same file name, local host"""
+        name = PurePosixPath(urlparse(url).path).name
+        prefix = "missing/" if name.startswith("missing") else ""
+        return f"{self.base_url}/{prefix}{name}"
+
+    @classmethod
+    def create_bulk_order(cls, username):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@example.com", password="testpass123"
+        )
+        return ImageBulkOrderLink.objects.create(
+            organization_name="Image Package Church",
+            price_per_item=Decimal("5000.00"),
+            custom_branding_enabled=True,
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=user,
+        )
+
+
+class ZipPackageTest(SimpleTestCase):
+    """Test the spooled zip builder"""
+
+    def test_compression_by_file_type(self):
+        """Test images and Office files are stored, documents deflated"""
+        with ZipPackage() as package:
+            package.write_bytes("pkg/images/M/a.JPG", IMAGE_BYTES)
+            package.write_bytes("pkg/report.pdf", b"%PDF" * 1000)
+            package.write_chunks("pkg/report.xlsx", [b"PK", b"\x03\x04"])
+            response = package.response("pkg.zip")
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn('filename="pkg.zip"', response["Content-Disposition"])
+
+        archive = read_zip(response)
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.getinfo("pkg/images/M/a.JPG").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo("pkg/report.xlsx").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo("pkg/report.pdf").compress_type, zipfile.ZIP_DEFLATED)
+        self.assertEqual(archive.read("pkg/report.xlsx"), b"PK\x03\x04")
+
+
+class FetchConcurrentlyTest(SimpleTestCase):
+    """Test the bounded fetch pool"""
+
+    def test_bounded_in_flight(self):
+        """Test every item is fetched with at most two per worker ahead"""
+        workers = 4
+        lock = threading.Lock()
+        started = []
+
+        def fetch(url):
+            with lock:
+                started.append(url)
+            time.sleep(0.001)
+            return url.upper()
+
+        results = {}
+        for key, value in fetch_concurrently(
+            ((i, f"url-{i}") for i in range(50)), fetch, workers=workers
+        ):
+            results[key] = value
+            with lock:
+                self.assertLessEqual(len(started) - len(results), workers * 2)
+
+        self.assertEqual(results, {i: f"URL-{i}" for i in range(50)})
+
+
+class AdminPackageImagesTest(StandInImageServerMixin, TestCase):
+    """Test images in the admin package, fetched from the stand-in"""
+
+    def setUp(self):
+        super().setUp()
+        self.bulk_order = self.create_bulk_order("packageimages")
+        for i, (size, custom_name, image) in enumerate(
+            [
+                ("M", "PASTOR JOHN", "image_bulk_orders/photo_1.jpg"),
+                ("M", "PASTOR JOHN", "image_bulk_orders/photo_2.jpg"),
+                ("L", "", "image_bulk_orders/photo_3.png"),
+                ("L", "BROKEN", "image_bulk_orders/missing_4.jpg"),
+                ("S", "NO PHOTO", None),
+            ]
+        ):
+            ImageOrderEntry.objects.create(
+                bulk_order=self.bulk_order,
+                email=f"user{i}@example.com",
+                full_name=f"Image User {i}",
+                size=size,
+                custom_name=custom_name,
+                image=image,
+                paid=True,
+            )
+
+    def test_images_by_size(self):
+        """Test images land under images/<size>/, stored, failed ones skipped"""
+        response = generate_admin_package_with_images(self.bulk_order.id)
+        archive = read_zip(response)
+        names = archive.namelist()
+        package_name = names[0].split("/")[0]
+        images = sorted(name for name in names if "/images/" in name)
+
+        self.assertIn(f"{package_name}/{self.bulk_order.slug}.pdf", names)
+        self.assertIn(f"{package_name}/{self.bulk_order.slug}.xlsx", names)
+        self.assertEqual(
+            images,
+            sorted(
+                [
+                    f"{package_name}/images/L/3_Image_User_2.png",
+                    f"{package_name}/images/M/PASTOR_JOHN.jpg",
+                    # Second PASTOR JOHN keeps its photo under a serial prefix
+                    f"{package_name}/images/M/2_PASTOR_JOHN.jpg",
+                ]
+            ),
+        )
+        for name in images:
+            self.assertEqual(archive.getinfo(name).compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.read(name), IMAGE_BYTES)
+
+    def test_failed_download_reported(self):
+        """Test a failed image is logged and the package still built"""
+        with self.assertLogs("image_bulk_orders.utils", level="ERROR") as logs:
+            response = generate_admin_package_with_images(self.bulk_order.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any("missing_4.jpg" in line for line in logs.output))
+        names = read_zip(response).namelist()
+        self.assertEqual(len([name for name in names if "/images/" in name]), 3)
+        self.assertFalse(any("BROKEN" in name for name in names))
+
+    def test_connections_reused(self):
+        """Test the pooled session keeps connections alive across images"""
+        for i in range(20):
+            ImageOrderEntry.objects.create(
+                bulk_order=self.bulk_order,
+                email=f"more{i}@example.com",
+                full_name=f"More User {i}",
+                size="XL",
+                image=f"image_bulk_orders/more_{i}.jpg",
+                paid=True,
+            )
+
+        generate_admin_package_with_images(self.bulk_order.id)
+
+        # 24 downloads over no more connections than pool workers
+        self.assertLessEqual(len(self.server.connections), FETCH_WORKERS)
+
+
+def legacy_admin_package(package_name, image_files):
+    """The previous build: sequential requests.get, temp dir, BytesIO zip"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_dir = Path(temp_dir) / package_name
+        package_dir.mkdir()
+        for arcname, url in image_files:
+            path = Path(temp_dir) / arcname
+            path.parent.mkdir(parents=True, exist_ok=True)
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+            path.write_bytes(response.content)
+
+        zip_buffer = BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for file_path in package_dir.rglob("*"):
+                if file_path.is_file():
+                    zip_file.write(file_path, file_path.relative_to(package_dir.parent))
+        zip_buffer.seek(0)
+        return HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
+
+
+@unittest.skipUnless(os.environ.get("RUN_BENCHMARKS"), "Benchmark; set RUN_BENCHMARKS=1")
+class AdminPackageBenchmarkTest(StandInImageServerMixin, TestCase):
+    """Benchmark: admin package with 100 images from the stand-in CDN"""
+
+    IMAGES = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bulk_order = cls.create_bulk_order("packagebench")
+        for i in range(cls.IMAGES):
+            ImageOrderEntry.objects.create(
+                bulk_order=cls.bulk_order,
+                email=f"corper{i}@example.com",
+                full_name=f"Corper {i}",
+                size=["S", "M", "L", "XL"][i % 4],
+                custom_name=f"CORPER {i}",
+                image=f"image_bulk_orders/corper_{i}.jpg",
+                paid=True,
+            )
+
+    def _measure(self, build):
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            size = build()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return elapsed, peak, size
+
+    def test_concurrent_streamed_package(self):
+        """Test the new package is faster and holds far less of the archive"""
+        report = image_utils.build_image_bulk_order_report(self.bulk_order)
+        # Same (arcname, stand-in URL) pairs the package fetches
+        image_files = list(image_utils._package_image_files(report, "bench"))
+
+        legacy = self._measure(
+            lambda: len(legacy_admin_package("bench", image_files).content)
+        )
+
+        def build():
+            response = generate_admin_package_with_images(self.bulk_order.id)
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            response.close()
+            return size
+
+        current = self._measure(build)
+
+        summary = (
+            f"{self.IMAGES} images of {len(IMAGE_BYTES)} bytes, {self.latency * 1000:.0f}ms each: "
+            f"previous {legacy[0]:.2f}s peak {legacy[1] / 1e6:.1f}MB ({legacy[2]} bytes), "
+            f"concurrent {current[0]:.2f}s peak {current[1] / 1e6:.1f}MB ({current[2]} bytes)"
+        )
+        self.assertLess(current[0], legacy[0] / 2, summary)
+        self.assertLess(current[1], legacy[1] / 2, summary)
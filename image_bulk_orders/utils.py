@@ -10,15 +10,15 @@ from django.utils import timezone
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.http import HttpResponse
-from django.db.models import Count, Q, Prefetch
-from io import BytesIO
-import zipfile
-import os
-import tempfile
+from django.db.models import Q, Prefetch
+from functools import partial
 import requests
 from pathlib import Path
-from django.core.paginator import Paginator
 
+from material.excel_export import ExcelExport
+from material.order_report import OrderReport
+from material.word_report import WordReport
+from material.zip_package import ZipPackage, fetch_concurrently, pooled_session
 from .models import ImageCouponCode, ImageBulkOrderLink, ImageOrderEntry
 
 logger = logging.getLogger(__name__)
@@ -52,6 +52,26 @@ def generate_coupon_codes_image(bulk_order, count=10):
         raise
 
 
+def _get_image_bulk_order(bulk_order):
+    """
+    ImageBulkOrderLink from an instance or slug string, without prefetching
+    its orders - documents read them once with build_image_bulk_order_report().
+    """
+    if isinstance(bulk_order, str):
+        return ImageBulkOrderLink.objects.get(slug=bulk_order)
+    return bulk_order
+
+
+def build_image_bulk_order_report(bulk_order, stream=False):
+    """
+    One-pass OrderReport (with images) for an ImageBulkOrderLink instance or
+    slug string. Build it once and pass it as report=... to render several formats.
+    stream=True aggregates the summary and streams the paid rows instead.
+    """
+    bulk_order = _get_image_bulk_order(bulk_order)
+    return OrderReport(bulk_order, bulk_order.orders.all(), with_images=True, stream=stream)
+
+
 def _get_image_bulk_order_with_orders(bulk_order):
     """
     Helper to get bulk order with optimized prefetch.
@@ -78,32 +98,28 @@ def _get_image_bulk_order_with_orders(bulk_order):
         ).get(id=bulk_order.id)
 
 
-def generate_image_bulk_order_pdf(bulk_order, request=None):
+def generate_image_bulk_order_pdf(bulk_order, request=None, report=None):
     """
     Generate PDF summary for an image bulk order.
     
     ✅ FIXES:
     - Proper serial number ordering (by size, then name)
     - Correct total counts in summary
+    Pass report=... to reuse an OrderReport already built for this bulk order.
     """
     try:
         from weasyprint import HTML
         
-        bulk_order = _get_image_bulk_order_with_orders(bulk_order)
-        orders = bulk_order.orders.all()
-        size_summary = orders.values("size").annotate(count=Count("size")).order_by("size")
-        
-        # Count paid orders (including coupon users)
-        paid_orders = orders.filter(Q(paid=True) | Q(coupon_used__isnull=False))
-        total_paid = paid_orders.count()
+        report = report or build_image_bulk_order_report(bulk_order)
+        bulk_order = report.bulk_order
         
         context = {
             'bulk_order': bulk_order,
-            'size_summary': size_summary,
-            'orders': orders,
-            'paid_orders': paid_orders,  # ✅ FIX: Pass paid_orders to template
-            'total_orders': orders.count(),
-            'total_paid': total_paid,
+            'size_summary': report.size_summary,
+            'orders': report.orders,
+            'paid_orders': report.paid_orders,  # ✅ FIX: Pass paid_orders to template
+            'total_orders': report.total_orders,
+            'total_paid': report.total_paid,
             'company_name': settings.COMPANY_NAME,
             'company_address': settings.COMPANY_ADDRESS,
             'company_phone': settings.COMPANY_PHONE,
@@ -135,169 +151,62 @@ def generate_image_bulk_order_pdf(bulk_order, request=None):
         raise
 
 
-def generate_image_bulk_order_word(bulk_order):
+def generate_image_bulk_order_word(bulk_order, report=None):
     """
     Generate Word document for an image bulk order.
     
     ✅ NEW: Includes "Custom Names by Size" section at the end
     ✅ FIX: Serial numbers restart at 1 for each size section
+    Pass report=... to reuse an OrderReport already built for this bulk order.
     """
     try:
-        from docx import Document
-        
-        bulk_order = _get_image_bulk_order_with_orders(bulk_order)
-        doc = Document()
+        report = report or build_image_bulk_order_report(bulk_order)
+        bulk_order = report.bulk_order
+        word = WordReport()
+        doc = word.document
+        branded = bulk_order.custom_branding_enabled
         
         # Header
         doc.add_heading(settings.COMPANY_NAME, 0)
         doc.add_heading(f'Image Bulk Order: {bulk_order.organization_name}', level=1)
         doc.add_paragraph(f"Generated: {timezone.now().strftime('%B %d, %Y - %I:%M %p')}")
         doc.add_paragraph(f'Payment Deadline: {bulk_order.payment_deadline.strftime("%B %d, %Y")}')
-        doc.add_paragraph(f'Custom Branding: {"Yes" if bulk_order.custom_branding_enabled else "No"}')
+        doc.add_paragraph(f'Custom Branding: {"Yes" if branded else "No"}')
         doc.add_paragraph('')
         
-        orders = bulk_order.orders.all()
-        
         # Size Summary
         doc.add_heading('Summary by Size', level=2)
-        size_summary = orders.values("size").annotate(total=Count("id")).order_by("size")
-        
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Light Grid Accent 1'
-        header_cells = table.rows[0].cells
-        header_cells[0].text = 'Size'
-        header_cells[1].text = 'Total'
+        word.add_table(
+            ['Size', 'Total'],
+            ([size_info['size'], str(size_info['count'])] for size_info in report.size_summary),
+        )
+        doc.add_paragraph()
         
-        for size_info in size_summary:
-            row_cells = table.add_row().cells
-            row_cells[0].text = size_info['size']
-            row_cells[1].text = str(size_info['total'])
+        # Orders by Size
+        def row(order):
+            has_image = '✓' if order.image else '-'
+            if branded:
+                return [order.full_name, order.custom_name or '-', has_image, report.status(order)]
+            return [order.full_name, has_image, report.status(order)]
         
-        doc.add_paragraph()
+        if branded:
+            header = ['Name', 'Custom Name', 'Image', 'Status']
+        else:
+            header = ['Name', 'Image', 'Status']
+        # ✅ Serial numbers restart at 1 for each size
+        word.add_size_tables(
+            {size: [row(order) for order in orders] for size, orders in report.paid_by_size.items()},
+            header,
+        )
         
-        # Orders by Size (paginated for large datasets)
-        paginator = Paginator(orders, 1000)
+        # Custom Names by Size (only if custom branding enabled)
+        if branded:
+            word.add_custom_names(report.custom_names_by_size)
         
-        for page_num in paginator.page_range:
-            page = paginator.page(page_num)
-            page_orders = page.object_list
-            
-            # Group by size
-            sizes_in_page = set(order.size for order in page_orders)
-            
-            for size in sorted(sizes_in_page):
-                size_orders = [order for order in page_orders if order.size == size]
-                
-                if size_orders:
-                    doc.add_heading(f'Size: {size} ({len(size_orders)} people)', level=2)
-                    
-                    # Determine columns based on custom branding
-                    if bulk_order.custom_branding_enabled:
-                        table = doc.add_table(rows=1, cols=5)
-                        header_cells = table.rows[0].cells
-                        header_cells[0].text = 'S/N'
-                        header_cells[1].text = 'Name'
-                        header_cells[2].text = 'Custom Name'
-                        header_cells[3].text = 'Image'
-                        header_cells[4].text = 'Status'
-                        
-                        # ✅ FIX: Serial number restarts at 1 for each size
-                        for idx, order in enumerate(size_orders, 1):
-                            row_cells = table.add_row().cells
-                            row_cells[0].text = str(idx)  # ✅ Starts at 1 for each size
-                            row_cells[1].text = order.full_name
-                            row_cells[2].text = order.custom_name or '-'
-                            row_cells[3].text = '✓' if order.image else '-'
-                            row_cells[4].text = 'Coupon' if order.coupon_used else 'Paid'
-                    else:
-                        table = doc.add_table(rows=1, cols=4)
-                        header_cells = table.rows[0].cells
-                        header_cells[0].text = 'S/N'
-                        header_cells[1].text = 'Name'
-                        header_cells[2].text = 'Image'
-                        header_cells[3].text = 'Status'
-                        
-                        # ✅ FIX: Serial number restarts at 1 for each size
-                        for idx, order in enumerate(size_orders, 1):
-                            row_cells = table.add_row().cells
-                            row_cells[0].text = str(idx)  # ✅ Starts at 1 for each size
-                            row_cells[1].text = order.full_name
-                            row_cells[2].text = '✓' if order.image else '-'
-                            row_cells[3].text = 'Coupon' if order.coupon_used else 'Paid'
-                    
-                    table.style = 'Light Grid Accent 1'
-                    doc.add_paragraph()
-        
-        # ====== NEW SECTION: Custom Names by Size (only if custom branding enabled) ======
-        if bulk_order.custom_branding_enabled:
-            # Add page break to start on new page
-            doc.add_page_break()
-            
-            doc.add_heading('Custom Names by Size', level=1)
-            doc.add_paragraph('This section shows all custom names grouped by size for easy copying.')
-            doc.add_paragraph()
-            
-            # Query orders for THIS bulk_order ONLY with custom names
-            bulk_order_orders = ImageOrderEntry.objects.filter(
-                bulk_order=bulk_order,
-                custom_name__isnull=False
-            ).exclude(
-                custom_name=''
-            ).order_by('size', 'full_name')
-            
-            # Get size summary ONLY for orders with custom names
-            custom_names_size_summary = bulk_order_orders.values('size').annotate(
-                count=Count('id')
-            ).order_by('size')
-            
-            # Group orders by size
-            for size_info in custom_names_size_summary:
-                size = size_info['size']
-                size_orders = bulk_order_orders.filter(size=size)
-                
-                # Get custom names (uppercase for consistency)
-                custom_names = [
-                    order.custom_name.upper()
-                    for order in size_orders
-                ]
-                
-                if custom_names:
-                    # Add size header
-                    doc.add_heading(f'SIZE: {size}', level=2)
-                    
-                    # Create table with 5 columns for grid layout
-                    num_cols = 5
-                    num_rows = (len(custom_names) + num_cols - 1) // num_cols  # Ceiling division
-                    
-                    table = doc.add_table(rows=num_rows, cols=num_cols)
-                    table.style = 'Light Grid Accent 1'
-                    
-                    # Fill table with custom names
-                    for idx, custom_name in enumerate(custom_names):
-                        row_idx = idx // num_cols
-                        col_idx = idx % num_cols
-                        table.rows[row_idx].cells[col_idx].text = custom_name
-                    
-                    doc.add_paragraph()
-        
-        # Footer
-        doc.add_paragraph("")
-        footer_para = doc.add_paragraph()
-        footer_para.add_run(f"{settings.COMPANY_NAME}\n").bold = True
-        footer_para.add_run(f"{settings.COMPANY_ADDRESS}\n")
-        footer_para.add_run(f"📞 {settings.COMPANY_PHONE} | 📧 {settings.COMPANY_EMAIL}")
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        word.add_footer()
+        response = word.response(
+            f'image_bulk_order_{bulk_order.slug}_{timezone.now().strftime("%Y%m%d")}.docx'
         )
-        filename = f'image_bulk_order_{bulk_order.slug}_{timezone.now().strftime("%Y%m%d")}.docx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
         logger.info(f"Generated Word document for image bulk order: {bulk_order.slug}")
         return response
@@ -307,18 +216,20 @@ def generate_image_bulk_order_word(bulk_order):
         raise
 
 
-def generate_image_bulk_order_excel(bulk_order):
+def generate_image_bulk_order_excel(bulk_order, report=None):
     """
     Generate Excel spreadsheet for an image bulk order.
     
     ✅ FIX: Serial numbers increase continuously across all sizes
+    Returns a FileResponse streaming the workbook.
+    Pass report=... to reuse an OrderReport already built for this bulk order.
     """
     try:
-        import xlsxwriter
-        
-        bulk_order = _get_image_bulk_order_with_orders(bulk_order)
-        output = BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        # Alone, the Excel export streams its rows instead of holding them
+        report = report or build_image_bulk_order_report(bulk_order, stream=True)
+        bulk_order = report.bulk_order
+        export = ExcelExport()
+        workbook = export.workbook
         
         # ====== CELL FORMATS ======
         title_format = workbook.add_format({'bold': True, 'font_size': 16, 'align': 'left'})
@@ -363,17 +274,14 @@ def generate_image_bulk_order_excel(bulk_order):
         worksheet.write(row, 1, "Total", table_header_format)
         row += 1
         
-        orders = bulk_order.orders.all()
-        size_summary = orders.values("size").annotate(total=Count("id")).order_by("size")
-        
-        for size_info in size_summary:
+        for size_info in report.size_summary:
             worksheet.write(row, 0, size_info['size'], cell_format)
-            worksheet.write(row, 1, size_info['total'], cell_format)
+            worksheet.write(row, 1, size_info['count'], cell_format)
             row += 1
         
         # Total row
         worksheet.write(row, 0, "TOTAL", total_format)
-        worksheet.write(row, 1, orders.count(), total_format)
+        worksheet.write(row, 1, report.total_paid, total_format)
         row += 3
         
         # ====== ALL ORDERS TABLE ======
@@ -407,7 +315,7 @@ def generate_image_bulk_order_excel(bulk_order):
         # Write order data
         # ✅ FIX: Serial number increases continuously (1, 2, 3... across all sizes)
         serial_number = 1
-        for order in orders:
+        for order in report.paid_orders:
             col = 0
             worksheet.write(row, col, serial_number, cell_format)  # ✅ Continuous numbering
             col += 1
@@ -423,8 +331,7 @@ def generate_image_bulk_order_excel(bulk_order):
             worksheet.write(row, col, '✓' if order.image else '-', cell_format)
             col += 1
             
-            status_text = 'Coupon' if order.coupon_used else 'Paid'
-            worksheet.write(row, col, status_text, cell_format)
+            worksheet.write(row, col, report.status(order), cell_format)
             
             row += 1
             serial_number += 1  # ✅ Increment for next order
@@ -442,15 +349,8 @@ def generate_image_bulk_order_excel(bulk_order):
             worksheet.set_column(4, 4, 12)  # Status
         
         # ====== FINALIZE ======
-        workbook.close()
-        output.seek(0)
-        
-        response = HttpResponse(
-            output.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
         filename = f'image_bulk_order_{bulk_order.slug}_{timezone.now().strftime("%Y%m%d")}.xlsx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response = export.response(filename)
         
         logger.info(f"Generated Excel for image bulk order: {bulk_order.slug}")
         return response
@@ -460,10 +360,14 @@ def generate_image_bulk_order_excel(bulk_order):
         raise
 
 
-def download_image_from_cloudinary(url):
-    """Download image from Cloudinary URL"""
+def download_image_from_cloudinary(url, session=None):
+    """
+    Download image from Cloudinary URL.
+    Pass a session (see material.zip_package.pooled_session) to reuse its
+    keep-alive connections across many downloads.
+    """
     try:
-        response = requests.get(url, timeout=30)
+        response = (session or requests).get(url, timeout=30)
         response.raise_for_status()
         return response.content
     except Exception as e:
@@ -471,6 +375,33 @@ def download_image_from_cloudinary(url):
         return None
 
 
+def _package_image_files(report, package_name):
+    """
+    (arcname, url) for each order image, under images/<size>/.
+    Named after the custom name, or serial number and full name; a name
+    already taken in the size gets the serial number prefixed.
+    """
+    taken = set()
+    for order in report.orders:
+        if not order.image:
+            continue
+        
+        if order.custom_name:
+            filename_base = order.custom_name.replace(' ', '_')
+        else:
+            filename_base = f"{order.serial_number}_{order.full_name.replace(' ', '_')}"
+        
+        # Get file extension from Cloudinary URL
+        image_url = order.image.url
+        ext = Path(image_url).suffix or '.jpg'
+        size_dir = f"{package_name}/images/{order.size}"
+        arcname = f"{size_dir}/{filename_base}{ext}"
+        if arcname in taken:
+            arcname = f"{size_dir}/{order.serial_number}_{filename_base}{ext}"
+        taken.add(arcname)
+        yield arcname, image_url
+
+
 def generate_admin_package_with_images(bulk_order_id):
     """
     Generate complete admin package: PDF + Word + Excel + Images by size.
@@ -487,73 +418,44 @@ def generate_admin_package_with_images(bulk_order_id):
             /M/
                 003_Bob_Wilson.jpg
             ...
+    
+    Images are downloaded concurrently on a pooled session and written
+    straight into the zip (stored, not recompressed), which is built in a
+    spooled temp file and streamed back as a FileResponse.
     """
     try:
-        bulk_order = ImageBulkOrderLink.objects.prefetch_related(
-            'orders'
-        ).get(id=bulk_order_id)
-        
-        # Create temp directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            package_name = f"{bulk_order.slug}_{timezone.now().strftime('%Y%m%d')}"
-            package_dir = temp_path / package_name
-            package_dir.mkdir()
-            
+        bulk_order = ImageBulkOrderLink.objects.get(id=bulk_order_id)
+        # One pass over the orders feeds all three documents and the images
+        report = build_image_bulk_order_report(bulk_order)
+        package_name = f"{bulk_order.slug}_{timezone.now().strftime('%Y%m%d')}"
+        
+        with ZipPackage() as package:
             # Generate documents
-            pdf_response = generate_image_bulk_order_pdf(bulk_order)
-            word_response = generate_image_bulk_order_word(bulk_order)
-            excel_response = generate_image_bulk_order_excel(bulk_order)
-            
-            # Save documents
-            (package_dir / f"{bulk_order.slug}.pdf").write_bytes(pdf_response.content)
-            (package_dir / f"{bulk_order.slug}.docx").write_bytes(word_response.content)
-            (package_dir / f"{bulk_order.slug}.xlsx").write_bytes(excel_response.content)
+            pdf_response = generate_image_bulk_order_pdf(bulk_order, report=report)
+            package.write_bytes(f"{package_name}/{bulk_order.slug}.pdf", pdf_response.content)
             
-            # Create images directory structure
-            images_dir = package_dir / "images"
-            images_dir.mkdir()
+            word_response = generate_image_bulk_order_word(bulk_order, report=report)
+            package.write_bytes(f"{package_name}/{bulk_order.slug}.docx", word_response.content)
             
-            # Download and organize images by size
-            orders_with_images = bulk_order.orders.filter(image__isnull=False)
-            
-            for order in orders_with_images:
-                # Create size subdirectory
-                size_dir = images_dir / order.size
-                size_dir.mkdir(exist_ok=True)
-                
-                # Determine filename
-                if order.custom_name:
-                    filename_base = order.custom_name.replace(' ', '_')
-                else:
-                    filename_base = f"{order.serial_number}_{order.full_name.replace(' ', '_')}"
-                
-                # Get file extension from Cloudinary URL
-                image_url = order.image.url
-                ext = Path(image_url).suffix or '.jpg'
-                filename = f"{filename_base}{ext}"
-                
-                # Download image
-                image_data = download_image_from_cloudinary(image_url)
-                if image_data:
-                    (size_dir / filename).write_bytes(image_data)
-                    logger.info(f"Downloaded image: {filename}")
-            
-            # Create ZIP
-            zip_buffer = BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for file_path in package_dir.rglob('*'):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(package_dir.parent)
-                        zip_file.write(file_path, arcname)
-            
-            zip_buffer.seek(0)
+            excel_response = generate_image_bulk_order_excel(bulk_order, report=report)
+            package.write_chunks(
+                f"{package_name}/{bulk_order.slug}.xlsx", excel_response.streaming_content
+            )
+            excel_response.close()
             
-            response = HttpResponse(zip_buffer.getvalue(), content_type='application/zip')
-            response['Content-Disposition'] = f'attachment; filename="{package_name}.zip"'
+            # Download images by size, each written as soon as it arrives
+            with pooled_session() as session:
+                fetch = partial(download_image_from_cloudinary, session=session)
+                images = fetch_concurrently(_package_image_files(report, package_name), fetch)
+                for arcname, image_data in images:
+                    if image_data:
+                        package.write_bytes(arcname, image_data)
+                        logger.info(f"Downloaded image: {arcname}")
             
-            logger.info(f"Generated admin package with images for: {bulk_order.slug}")
-            return response
+            response = package.response(f"{package_name}.zip")
+        
+        logger.info(f"Generated admin package with images for: {bulk_order.slug}")
+        return response
             
     except Exception as e:
         logger.error(f"Error generating admin package: {str(e)}")
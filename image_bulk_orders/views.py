@@ -21,6 +21,11 @@ from django.utils import timezone
 from django.template.loader import render_to_string
 from material.throttling import BulkOrderWebhookThrottle
 from payment.utils import initialize_payment, get_vat_breakdown
+from payment.status_cache import (
+    get_payment_status,
+    invalidate_payment_status,
+    payment_status_cache_key,
+)
 from payment.security import verify_paystack_signature, sanitize_payment_log_data
 from .models import ImageBulkOrderLink, ImageCouponCode, ImageOrderEntry
 from .serializers import (
@@ -344,26 +349,34 @@ class ImageOrderEntryViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
     def verify_payment(self, request, pk=None):
         """Verify payment status for an ImageOrderEntry - PUBLIC ENDPOINT"""
+        # Polled repeatedly after redirect: served from the status cache
+        return Response(
+            get_payment_status(
+                payment_status_cache_key("image_bulk_orders", pk),
+                self._load_payment_status,
+                is_terminal=lambda data: data["paid"],
+            )
+        )
+
+    def _load_payment_status(self):
         order_entry = self.get_object()
         vat_breakdown = get_vat_breakdown(order_entry.bulk_order.price_per_item)
 
-        return Response(
-            {
-                "order_id": str(order_entry.id),
-                "reference": order_entry.reference,
-                "paid": order_entry.paid,
-                "base_amount": float(vat_breakdown["base_amount"]),
-                "vat_amount": float(vat_breakdown["vat_amount"]),
-                "vat_rate": vat_breakdown["vat_rate"],
-                "amount": float(vat_breakdown["total_amount"]),
-                "email": order_entry.email,
-                "full_name": order_entry.full_name,
-                "organization": order_entry.bulk_order.organization_name,
-                "has_image": bool(order_entry.image),
-                "created_at": order_entry.created_at,
-                "updated_at": order_entry.updated_at,
-            }
-        )
+        return {
+            "order_id": str(order_entry.id),
+            "reference": order_entry.reference,
+            "paid": order_entry.paid,
+            "base_amount": float(vat_breakdown["base_amount"]),
+            "vat_amount": float(vat_breakdown["vat_amount"]),
+            "vat_rate": vat_breakdown["vat_rate"],
+            "amount": float(vat_breakdown["total_amount"]),
+            "email": order_entry.email,
+            "full_name": order_entry.full_name,
+            "organization": order_entry.bulk_order.organization_name,
+            "has_image": bool(order_entry.image),
+            "created_at": order_entry.created_at,
+            "updated_at": order_entry.updated_at,
+        }
 
 
 class ImageCouponCodeViewSet(viewsets.ModelViewSet):
@@ -411,6 +424,21 @@ def image_bulk_order_payment_webhook(request):
             return JsonResponse({"error": "Invalid signature"}, status=401)
 
         payload = json.loads(request.body)
+
+    except json.JSONDecodeError:
+        logger.error("Invalid JSON payload")
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    return handle_image_bulk_order_payment(payload)
+
+
+def handle_image_bulk_order_payment(payload):
+    """
+    Apply a verified, parsed Paystack payload to its ImageOrderEntry.
+    Registered with webhook_router for IMG-BULK- references.
+    """
+    reference = ""
+    try:
         event = payload.get("event")
 
         if event != "charge.success":
@@ -446,6 +474,7 @@ def image_bulk_order_payment_webhook(request):
         # Invalidate cache
         cache_key = f"image_bulk_order_stats_{order_entry.bulk_order.slug}"
         cache.delete(cache_key)
+        invalidate_payment_status("image_bulk_orders", order_entry.id)
 
         # ✅ Send payment receipt email (async)
         from material.background_utils import send_image_payment_receipt_email
@@ -463,10 +492,6 @@ def image_bulk_order_payment_webhook(request):
         logger.error(f"Order entry not found for reference: {reference}")
         return JsonResponse({"error": "Order not found"}, status=404)
 
-    except json.JSONDecodeError:
-        logger.error("Invalid JSON payload")
-        return JsonResponse({"error": "Invalid JSON"}, status=400)
-
     except Exception as e:
         logger.error(f"Webhook processing error: {str(e)}", exc_info=True)
         return JsonResponse({"error": "Internal server error"}, status=500)
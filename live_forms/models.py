@@ -10,11 +10,11 @@ real time with all rows visible. Admin exports PDF / Word / Excel.
 Architecture mirrors bulk_orders A-Z, minus all payment logic.
 """
 import uuid
-from django.db import models, transaction
-from django.db.models import F, Max
+from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.utils.text import slugify
+from material.serials import next_serial, preserve_counter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -100,6 +100,9 @@ class LiveFormLink(models.Model):
                     f"Generated slug '{self.slug}' for LiveFormLink: {self.organization_name}"
                 )
 
+            # Entries own the serial counter - never overwrite it from here
+            preserve_counter(self, kwargs)
+
             super().save(*args, **kwargs)
             logger.info(f"LiveFormLink saved: {self.slug}")
         except Exception as e:
@@ -200,7 +203,7 @@ class LiveFormEntry(models.Model):
     # ------------------------------------------------------------------
     def save(self, *args, **kwargs):
         """
-        Auto-assign serial_number (race-condition safe via select_for_update),
+        Auto-assign serial_number (race-condition safe via the parent counter),
         normalise names to uppercase, update social proof counters atomically.
         """
         # Normalise names
@@ -210,14 +213,8 @@ class LiveFormEntry(models.Model):
 
         # Auto-increment serial_number — race-condition safe using parent counter
         if not self.serial_number:
-            with transaction.atomic():
-                # Lock parent row and increment counter atomically
-                LiveFormLink.objects.filter(id=self.live_form_id).select_for_update().update(
-                    last_serial_number=F("last_serial_number") + 1
-                )
-                # Read the new counter value
-                parent = LiveFormLink.objects.get(id=self.live_form_id)
-                self.serial_number = parent.last_serial_number
+            # Lock, increment and read the counter in one UPDATE ... RETURNING
+            self.serial_number = next_serial(LiveFormLink, self.live_form_id)
 
         try:
             super().save(*args, **kwargs)
@@ -305,6 +305,14 @@ class LiveFormEntrySerialNumberTest(TestCase):
         e2 = make_entry(self.form, full_name="Second Person", size="M")
         self.assertEqual(e2.serial_number, 2)
 
+    def test_stale_form_save_keeps_counter(self):
+        stale_form = LiveFormLink.objects.get(pk=self.form.pk)
+        make_entry(self.form, full_name="First Person", size="S")
+        stale_form.organization_name = "Renamed Org"
+        stale_form.save()
+        e2 = make_entry(self.form, full_name="Second Person", size="M")
+        self.assertEqual(e2.serial_number, 2)
+
     def test_serial_not_reassigned_on_update(self):
         entry = make_entry(self.form)
         original_serial = entry.serial_number
@@ -16,7 +16,7 @@ from io import BytesIO
 from unittest.mock import MagicMock, patch, PropertyMock
 
 from django.contrib.auth import get_user_model
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.test import TestCase
 from django.utils import timezone
 
@@ -271,9 +271,9 @@ class GenerateLiveFormExcelTest(TestCase):
         from live_forms.utils import generate_live_form_excel
         return generate_live_form_excel(form or self.form)
 
-    def test_returns_http_response(self):
+    def test_returns_file_response(self):
         response = self._generate()
-        self.assertIsInstance(response, HttpResponse)
+        self.assertIsInstance(response, FileResponse)
 
     def test_content_type_is_xlsx(self):
         response = self._generate()
@@ -290,7 +290,7 @@ class GenerateLiveFormExcelTest(TestCase):
     def test_accepts_slug_string(self):
         from live_forms.utils import generate_live_form_excel
         response = generate_live_form_excel(self.form.slug)
-        self.assertIsInstance(response, HttpResponse)
+        self.assertIsInstance(response, FileResponse)
 
     def test_excel_actually_generated_with_real_openpyxl(self):
         """
@@ -304,7 +304,7 @@ class GenerateLiveFormExcelTest(TestCase):
             self.skipTest("openpyxl not installed")
 
         response = self._generate()
-        self.assertIsInstance(response, HttpResponse)
+        self.assertIsInstance(response, FileResponse)
         # XLSX files start with PK (ZIP magic bytes)
         content = b"".join(response.streaming_content) if hasattr(response, "streaming_content") else response.content
         self.assertTrue(
@@ -15,7 +15,8 @@ from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Case, Count, When
+from collections import Counter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -126,14 +127,23 @@ def generate_live_form_word(live_form):
         Exception: For document generation errors
     """
     try:
-        from docx import Document
-        from docx.shared import Pt, RGBColor
-        from io import BytesIO
+        from material.excel_export import iter_rows
+        from material.word_report import WordReport
 
         live_form = _get_live_form_with_entries(live_form)
-        entries = live_form.entries.all().order_by("serial_number")
+        branded = live_form.custom_branding_enabled
+
+        # One query feeds the summary, the custom names and the entries table
+        entries = list(
+            iter_rows(
+                live_form.entries.all().order_by("serial_number"),
+                "serial_number", "full_name", "custom_name", "size", "created_at",
+            )
+        )
+        size_totals = Counter(size for _, _, _, size, _ in entries)
 
-        doc = Document()
+        report = WordReport()
+        doc = report.document
 
         # ── Header ──────────────────────────────────────────────────────
         doc.add_heading(settings.COMPANY_NAME, 0)
@@ -145,54 +155,38 @@ def generate_live_form_word(live_form):
             f"Expires At: {live_form.expires_at.strftime('%B %d, %Y — %I:%M %p')}"
         )
         doc.add_paragraph(
-            f"Custom Branding: {'Yes' if live_form.custom_branding_enabled else 'No'}"
+            f"Custom Branding: {'Yes' if branded else 'No'}"
         )
-        doc.add_paragraph(f"Total Entries: {entries.count()}")
+        doc.add_paragraph(f"Total Entries: {len(entries)}")
         doc.add_paragraph("")
 
         # ── Size Summary ─────────────────────────────────────────────────
         doc.add_heading("Summary by Size", level=2)
-        size_summary = (
-            entries.values("size").annotate(total=Count("id")).order_by("size")
+        report.add_table(
+            ["Size", "Total"],
+            ([size, str(total)] for size, total in sorted(size_totals.items())),
         )
 
-        summary_table = doc.add_table(rows=1, cols=2)
-        summary_table.style = "Light Grid Accent 1"
-        hdr = summary_table.rows[0].cells
-        hdr[0].text = "Size"
-        hdr[1].text = "Total"
-
-        for row_data in size_summary:
-            row = summary_table.add_row().cells
-            row[0].text = row_data["size"]
-            row[1].text = str(row_data["total"])
-
         doc.add_paragraph("")
 
         # ── Custom Names by Size (only when custom_branding_enabled) ────
-        if live_form.custom_branding_enabled:
+        if branded:
             doc.add_heading("Custom Names by Size", level=2)
 
             # Collect custom names grouped by size
             size_order = ["S", "M", "L", "XL", "XXL", "XXXL", "XXXXL"]
             custom_by_size = {}
-            for entry in entries:
-                size = entry.size
-                if size not in custom_by_size:
-                    custom_by_size[size] = []
-                custom_by_size[size].append(entry.custom_name or "—")
-
-            custom_table = doc.add_table(rows=1, cols=2)
-            custom_table.style = "Light Grid Accent 1"
-            hdr_cells = custom_table.rows[0].cells
-            hdr_cells[0].text = "Size"
-            hdr_cells[1].text = "Custom Names"
-
-            for size in size_order:
-                if size in custom_by_size:
-                    row = custom_table.add_row().cells
-                    row[0].text = size
-                    row[1].text = ", ".join(custom_by_size[size])
+            for _, _, custom_name, size, _ in entries:
+                custom_by_size.setdefault(size, []).append(custom_name or "—")
+
+            report.add_table(
+                ["Size", "Custom Names"],
+                (
+                    [size, ", ".join(custom_by_size[size])]
+                    for size in size_order
+                    if size in custom_by_size
+                ),
+            )
 
             doc.add_paragraph("")
 
@@ -201,44 +195,21 @@ def generate_live_form_word(live_form):
 
         # Build dynamic columns based on custom_branding_enabled
         col_headers = ["#", "Full Name", "Size", "Submitted At"]
-        if live_form.custom_branding_enabled:
+        if branded:
             col_headers.insert(2, "Custom Name")  # after Full Name
 
-        entry_table = doc.add_table(rows=1, cols=len(col_headers))
-        entry_table.style = "Light Grid Accent 1"
-        hdr_cells = entry_table.rows[0].cells
-        for i, header in enumerate(col_headers):
-            hdr_cells[i].text = header
+        def entry_row(serial_number, full_name, custom_name, size, created_at):
+            row = [str(serial_number), full_name, size, created_at.strftime("%Y-%m-%d %H:%M")]
+            if branded:
+                row.insert(2, custom_name)
+            return row
 
-        for entry in entries:
-            row_cells = entry_table.add_row().cells
-            if live_form.custom_branding_enabled:
-                row_cells[0].text = str(entry.serial_number)
-                row_cells[1].text = entry.full_name
-                row_cells[2].text = entry.custom_name
-                row_cells[3].text = entry.size
-                row_cells[4].text = entry.created_at.strftime("%Y-%m-%d %H:%M")
-            else:
-                row_cells[0].text = str(entry.serial_number)
-                row_cells[1].text = entry.full_name
-                row_cells[2].text = entry.size
-                row_cells[3].text = entry.created_at.strftime("%Y-%m-%d %H:%M")
+        report.add_table(col_headers, (entry_row(*entry) for entry in entries))
 
         # ── Save ─────────────────────────────────────────────────────────
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type=(
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            ),
-        )
-        filename = (
+        response = report.response(
             f"live_form_{live_form.slug}_{timezone.now().strftime('%Y%m%d')}.docx"
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
         logger.info(f"Generated Word document for live form: {live_form.slug}")
         return response
@@ -265,20 +236,22 @@ def generate_live_form_excel(live_form):
         live_form: LiveFormLink instance or slug string
 
     Returns:
-        HttpResponse with Excel content
+        FileResponse streaming the Excel file
 
     Raises:
         Exception: For generation errors
     """
     try:
-        import xlsxwriter
-        from io import BytesIO
+        from material.excel_export import ExcelExport, iter_rows
+        from .models import LiveFormLink
 
-        live_form = _get_live_form_with_entries(live_form)
-        entries = live_form.entries.all().order_by("serial_number")
+        # Entries are streamed below, so skip the prefetch
+        if isinstance(live_form, str):
+            live_form = LiveFormLink.objects.get(slug=live_form)
+        entries = live_form.entries.order_by("serial_number")
 
-        buffer = BytesIO()
-        workbook = xlsxwriter.Workbook(buffer, {"in_memory": True})
+        export = ExcelExport()
+        workbook = export.workbook
 
         # ── Formats ──────────────────────────────────────────────────────
         header_fmt = workbook.add_format(
@@ -350,30 +323,33 @@ def generate_live_form_excel(live_form):
 
         ws.set_row(DATA_ROW_START, 20)
 
-        # Data rows
-        for row_offset, entry in enumerate(entries):
+        # Data rows (streamed in chunks, never materialized)
+        rows = iter_rows(
+            entries, "serial_number", "full_name", "custom_name", "size", "created_at"
+        )
+        for row_offset, (serial_number, full_name, custom_name, size, created_at) in enumerate(rows):
             excel_row = DATA_ROW_START + 1 + row_offset
             fmt = cell_fmt if row_offset % 2 == 0 else alt_cell_fmt
 
             if live_form.custom_branding_enabled:
-                ws.write(excel_row, 0, entry.serial_number, fmt)
-                ws.write(excel_row, 1, entry.full_name, fmt)
-                ws.write(excel_row, 2, entry.custom_name, fmt)
-                ws.write(excel_row, 3, entry.size, fmt)
+                ws.write(excel_row, 0, serial_number, fmt)
+                ws.write(excel_row, 1, full_name, fmt)
+                ws.write(excel_row, 2, custom_name, fmt)
+                ws.write(excel_row, 3, size, fmt)
                 ws.write(
                     excel_row,
                     4,
-                    entry.created_at.strftime("%Y-%m-%d %H:%M"),
+                    created_at.strftime("%Y-%m-%d %H:%M"),
                     fmt,
                 )
             else:
-                ws.write(excel_row, 0, entry.serial_number, fmt)
-                ws.write(excel_row, 1, entry.full_name, fmt)
-                ws.write(excel_row, 2, entry.size, fmt)
+                ws.write(excel_row, 0, serial_number, fmt)
+                ws.write(excel_row, 1, full_name, fmt)
+                ws.write(excel_row, 2, size, fmt)
                 ws.write(
                     excel_row,
                     3,
-                    entry.created_at.strftime("%Y-%m-%d %H:%M"),
+                    created_at.strftime("%Y-%m-%d %H:%M"),
                     fmt,
                 )
 
@@ -424,14 +400,18 @@ def generate_live_form_excel(live_form):
             ws_custom.set_column(2, 2, 32)
             ws_custom.set_row(4, 20)
 
-            # Sort entries by size (SIZE_CHOICES order) then full_name
+            # Sort entries by size (SIZE_CHOICES order) then full_name,
+            # in the database so rows can be streamed in order
             size_order = ["S", "M", "L", "XL", "XXL", "XXXL", "XXXXL"]
-            sorted_entries = sorted(
-                entries,
-                key=lambda e: (
-                    size_order.index(e.size) if e.size in size_order else 99,
-                    e.full_name,
+            sorted_entries = iter_rows(
+                entries.order_by(
+                    Case(
+                        *[When(size=size, then=i) for i, size in enumerate(size_order)],
+                        default=99,
+                    ),
+                    "full_name",
                 ),
+                "size", "custom_name", "full_name",
             )
 
             # Group rows by size with a subtle size divider
@@ -449,10 +429,10 @@ def generate_live_form_excel(live_form):
             current_size = None
             excel_row = 5
 
-            for entry in sorted_entries:
+            for size, custom_name, full_name in sorted_entries:
                 # Insert a size-group divider row whenever size changes
-                if entry.size != current_size:
-                    current_size = entry.size
+                if size != current_size:
+                    current_size = size
                     ws_custom.write(excel_row, 0, current_size, size_divider_fmt)
                     ws_custom.write(excel_row, 1, "", size_divider_fmt)
                     ws_custom.write(excel_row, 2, "", size_divider_fmt)
@@ -460,24 +440,17 @@ def generate_live_form_excel(live_form):
                     excel_row += 1
 
                 row_fmt = cell_fmt if excel_row % 2 == 0 else alt_cell_fmt
-                ws_custom.write(excel_row, 0, entry.size, row_fmt)
-                ws_custom.write(excel_row, 1, entry.custom_name or "—", row_fmt)
-                ws_custom.write(excel_row, 2, entry.full_name, row_fmt)
+                ws_custom.write(excel_row, 0, size, row_fmt)
+                ws_custom.write(excel_row, 1, custom_name or "—", row_fmt)
+                ws_custom.write(excel_row, 2, full_name, row_fmt)
                 excel_row += 1
 
             ws_custom.freeze_panes(5, 0)
 
-        workbook.close()
-        buffer.seek(0)
-
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
         filename = (
             f"live_form_{live_form.slug}_{timezone.now().strftime('%Y%m%d')}.xlsx"
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response = export.response(filename)
 
         logger.info(f"Generated Excel for live form: {live_form.slug}")
         return response
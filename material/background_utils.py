@@ -7,6 +7,7 @@ Enhanced with Cloudinary PDF storage before emailing
 from threading import Thread
 from background_task import background
 from django.core.mail import EmailMessage
+from django.db.models import prefetch_related_objects
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -136,11 +137,12 @@ def generate_order_confirmation_pdf_task(order_id):
         from order.models import BaseOrder
         from order.receipt_utils import generate_and_store_order_confirmation
 
+        # Concrete order (by its stored order_type) so the receipt can show
+        # kit / church details; only that type's child table is read
         order = (
-            BaseOrder.objects.select_related("user")
-            .prefetch_related("items__content_type")
-            .get(id=order_id)
+            BaseOrder.objects.select_related("user").get(id=order_id).get_concrete_order()
         )
+        prefetch_related_objects([order], "items__content_type")
 
         # Generate PDF and store in Cloudinary
         pdf_bytes, cloudinary_url = generate_and_store_order_confirmation(order)
@@ -999,3 +1001,86 @@ def generate_live_form_report_task(live_form_id, recipient_email):
         logger.error(
             f"Error in generate_live_form_report_task for {live_form_id}: {str(e)}"
         )
+
+
+# ============================================================================
+# WEBHOOK INBOX
+# ============================================================================
+
+
+@background(schedule=0, remove_existing_tasks=True)
+def drain_webhook_inbox_task():
+    """
+    Drain pending webhook events into the app handlers.
+    Queued by router_webhook on each new event; remove_existing_tasks keeps a
+    single queued drain however many webhooks arrive before it runs.
+    """
+    try:
+        from webhook_router.inbox import drain_inbox
+
+        drain_inbox()
+
+    except Exception as e:
+        logger.error(f"Error in drain_webhook_inbox_task: {str(e)}")
+
+
+# ============================================================================
+# PAYMENT RECONCILIATION
+# ============================================================================
+
+
+@background(schedule=0, remove_existing_tasks=True)
+def reconcile_pending_payments_task():
+    """
+    Verify pending Paystack transactions and settle the paid ones.
+    remove_existing_tasks keeps at most one reconciliation queued.
+    """
+    try:
+        from payment.reconciliation import reconcile_pending_payments
+
+        reconcile_pending_payments()
+
+    except Exception as e:
+        logger.error(f"Error in reconcile_pending_payments_task: {str(e)}")
+
+
+# ============================================================================
+# STOREFRONT SNAPSHOT
+# ============================================================================
+
+
+@background(schedule=0, remove_existing_tasks=True)
+def rebuild_storefront_snapshot_task():
+    """
+    Rebuild the precomputed storefront payloads.
+    Queued after catalog writes and on a schedule (rebuild_storefront
+    command); remove_existing_tasks keeps a single rebuild queued.
+    """
+    try:
+        from products.storefront import rebuild_storefront_snapshot
+
+        rebuild_storefront_snapshot()
+
+    except Exception as e:
+        logger.error(f"Error in rebuild_storefront_snapshot_task: {str(e)}")
+
+
+# ============================================================================
+# BULK ORDER EXPORTS
+# ============================================================================
+
+
+@background(schedule=0)
+def generate_bulk_order_export_task(export_id):
+    """
+    Render a queued BulkOrderExport (PDF/Word/Excel) and store the file.
+    Queued by bulk_orders.exports.request_export; a duplicate run for the
+    same export is a no-op.
+    """
+    try:
+        from bulk_orders.exports import run_export
+
+        run_export(export_id)
+
+    except Exception as e:
+        logger.error(f"Error in generate_bulk_order_export_task for {export_id}: {str(e)}")
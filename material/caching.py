@@ -0,0 +1,36 @@
+# material/caching.py
+"""
+Cache aliases used across the project.
+
+settings.CACHES defines three aliases so each kind of traffic can be sized,
+flushed and (on Redis) pooled on its own:
+
+    default    application data (cache.get / cache.set in views and services)
+    pages      product catalog responses and the storefront snapshot
+               (products.catalog_cache, products.storefront)
+    throttle   DRF throttle history (see material.throttling)
+
+Tests often override CACHES with just a "default" entry, so lookups fall
+back to "default" when an alias isn't configured.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+PAGE_CACHE_ALIAS = "pages"
+THROTTLE_CACHE_ALIAS = "throttle"
+
+
+def resolve_alias(alias):
+    """Return alias if it is configured, otherwise the default alias"""
+    return alias if alias in settings.CACHES else "default"
+
+
+def get_cache(alias):
+    """Return the cache for alias, or the default cache if it isn't configured"""
+    return caches[resolve_alias(alias)]
+
+
+def is_redis_alias(alias):
+    """True when alias (after fallback) is a django-redis cache"""
+    backend = settings.CACHES[resolve_alias(alias)]["BACKEND"]
+    return backend.startswith("django_redis.")
@@ -0,0 +1,114 @@
+# material/order_report.py
+"""
+One-pass report dataset shared by the PDF, Word and Excel documents of
+bulk orders and image bulk orders.
+
+Each format used to run its own size-summary aggregate, paid-order count
+and order list query (plus a query per size for the custom names, and a
+coupon lookup per row in the PDF), so the admin package that renders all
+three read the same orders many times over. An OrderReport reads a bulk
+order's orders once, by size then name, as values_list() rows and keeps
+the structures every renderer needs:
+
+- size_summary: {"size", "count"} per size over all orders, the shape
+  of the values() aggregate it replaces
+- paid_orders / paid_by_size: paid or coupon orders, the document rows
+- custom_names_by_size: every custom name, uppercased, for the grid
+- orders: all rows, e.g. for the images in the admin package
+
+Build it once and pass it to each generator with report=... to render
+several formats from the same pass. An Excel export on its own builds a
+stream=True report instead, keeping its rows out of memory.
+"""
+from collections import namedtuple
+
+from django.db.models import Count, Q
+
+from material.excel_export import iter_rows
+
+ReportRow = namedtuple(
+    "ReportRow",
+    ["serial_number", "size", "full_name", "custom_name", "paid", "coupon_code", "image"],
+    defaults=[None],
+)
+
+REPORT_FIELDS = (
+    "serial_number", "size", "full_name", "custom_name", "paid", "coupon_used__code",
+)
+
+# Orders listed in the documents; the rest only count towards the summary
+# and the custom names
+PAID = Q(paid=True) | Q(coupon_used__isnull=False)
+
+
+class OrderReport:
+    """
+    A bulk order's orders read once and grouped for every document format.
+
+        report = OrderReport(bulk_order, bulk_order.orders.all())
+        for size, rows in report.paid_by_size.items():
+            ...
+
+    With stream=True (a single Excel export) the summary comes from one
+    aggregate and paid_orders is a one-shot iterator over chunked rows, so
+    nothing is held in memory; orders, paid_by_size and
+    custom_names_by_size are then None.
+    """
+
+    def __init__(self, bulk_order, orders, with_images=False, stream=False):
+        self.bulk_order = bulk_order
+        self.fields = REPORT_FIELDS + ("image",) if with_images else REPORT_FIELDS
+        if stream:
+            self._summarize(orders)
+        else:
+            self._group(orders)
+
+    def _group(self, orders):
+        """Read every order once and keep the rows grouped in memory"""
+        self.orders = []
+        self.paid_orders = []
+        self.paid_by_size = {}
+        self.custom_names_by_size = {}
+        size_counts = {}
+
+        for values in iter_rows(orders.order_by("size", "full_name"), *self.fields):
+            row = ReportRow(*values)
+            self.orders.append(row)
+            size_counts[row.size] = size_counts.get(row.size, 0) + 1
+            if row.paid or row.coupon_code:
+                self.paid_orders.append(row)
+                self.paid_by_size.setdefault(row.size, []).append(row)
+            if row.custom_name:
+                self.custom_names_by_size.setdefault(row.size, []).append(
+                    row.custom_name.upper()
+                )
+
+        self.size_summary = [
+            {"size": size, "count": count} for size, count in size_counts.items()
+        ]
+        self.total_orders = len(self.orders)
+        self.total_paid = len(self.paid_orders)
+
+    def _summarize(self, orders):
+        """Aggregate the summary and leave the paid rows to be streamed"""
+        totals = list(
+            orders.order_by()
+            .values("size")
+            .annotate(count=Count("id"), paid=Count("id", filter=PAID))
+            .order_by("size")
+        )
+        self.size_summary = [{"size": t["size"], "count": t["count"]} for t in totals]
+        self.total_orders = sum(t["count"] for t in totals)
+        self.total_paid = sum(t["paid"] for t in totals)
+        self.orders = self.paid_by_size = self.custom_names_by_size = None
+        self.paid_orders = (
+            ReportRow(*values)
+            for values in iter_rows(
+                orders.filter(PAID).order_by("size", "full_name"), *self.fields
+            )
+        )
+
+    @staticmethod
+    def status(row):
+        """'Coupon' or 'Paid', as listed in the Word and Excel documents"""
+        return "Coupon" if row.coupon_code else "Paid"
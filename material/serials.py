@@ -0,0 +1,65 @@
+# material/serials.py
+"""
+Serial number allocation
+
+Serial numbers are handed out from a counter column on a "parent" row
+(e.g. OrderSerialCounter.last_serial_number). A single
+UPDATE ... SET col = col + 1 ... RETURNING col both locks the row and reads
+the new value, so concurrent writers never compute the same serial and never
+need a second query to read it back.
+
+The row lock is held until the caller's transaction ends; keep the work
+after allocation short.
+"""
+from django.db import connections, router
+
+
+def allocate_serial(model, pk, field="last_serial_number", count=1):
+    """
+    Atomically add `count` to `field` on the row `pk` of `model`.
+    Returns the new counter value (the last serial of the allocated block),
+    or None if the row doesn't exist.
+    """
+    db = router.db_for_write(model)
+    connection = connections[db]
+    quote = connection.ops.quote_name
+    meta = model._meta
+    column = quote(meta.get_field(field).column)
+
+    sql = (
+        f"UPDATE {quote(meta.db_table)} SET {column} = {column} + %s "
+        f"WHERE {quote(meta.pk.column)} = %s RETURNING {column}"
+    )
+    pk = meta.pk.get_db_prep_value(pk, connection)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [count, pk])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def next_serial(parent_model, parent_pk, field="last_serial_number"):
+    """
+    Allocate the next serial number under a parent row (bulk order link,
+    live form, ...). Raises parent_model.DoesNotExist if the parent is gone.
+    """
+    serial = allocate_serial(parent_model, parent_pk, field)
+    if serial is None:
+        raise parent_model.DoesNotExist(
+            f"{parent_model._meta.object_name} {parent_pk} does not exist"
+        )
+    return serial
+
+
+def preserve_counter(instance, save_kwargs, field="last_serial_number"):
+    """
+    Stop a full save() of a parent row from writing back a stale counter.
+    Counters only move through allocate_serial; call this from the parent's
+    save() before super().save(**save_kwargs).
+    """
+    if instance._state.adding or save_kwargs.get("update_fields") is not None:
+        return
+    save_kwargs["update_fields"] = [
+        f.name
+        for f in instance._meta.concrete_fields
+        if not f.primary_key and f.name != field
+    ]
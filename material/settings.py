@@ -218,24 +218,89 @@ DATABASES = {
 # CACHING
 # ==============================================================================
 
+# Three aliases (see material/caching.py):
+#   default   application data
+#   pages     product catalog responses and storefront snapshot
+#   throttle  DRF throttle history
+# Production uses Redis when REDIS_URL is set; each alias can be moved to
+# its own Redis database/instance with REDIS_PAGE_CACHE_URL and
+# REDIS_THROTTLE_URL. Without Redis everything falls back to the
+# database cache table under separate key prefixes.
+
+REDIS_URL = env.str("REDIS_URL", default="")
+REDIS_MAX_CONNECTIONS = env.int("REDIS_MAX_CONNECTIONS", default=50)
+
+
+def redis_cache(location, key_prefix, timeout=300, compress=False):
+    options = {
+        "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        # redis-py picks the hiredis parser automatically when it's installed
+        "CONNECTION_POOL_KWARGS": {
+            "max_connections": REDIS_MAX_CONNECTIONS,
+            "retry_on_timeout": True,
+            "health_check_interval": 30,
+        },
+        "SOCKET_CONNECT_TIMEOUT": 2,
+        "SOCKET_TIMEOUT": 2,
+        # A Redis outage degrades to cache misses instead of 500s
+        "IGNORE_EXCEPTIONS": True,
+    }
+    if compress:
+        # zlib only kicks in above the compressor's min length
+        options["COMPRESSOR"] = "django_redis.compressors.zlib.ZlibCompressor"
+    return {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": location,
+        "KEY_PREFIX": key_prefix,
+        "TIMEOUT": timeout,
+        "OPTIONS": options,
+    }
+
+
+def database_cache(key_prefix, timeout=300):
+    return {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache_table",
+        "KEY_PREFIX": key_prefix,
+        "TIMEOUT": timeout,
+    }
+
+
 if DEBUG:
     CACHES = {
-        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        for alias in ("default", "pages", "throttle")
+    }
+elif REDIS_URL:
+    CACHES = {
+        "default": redis_cache(REDIS_URL, "material", compress=True),
+        "pages": redis_cache(
+            env.str("REDIS_PAGE_CACHE_URL", default=REDIS_URL),
+            "material_pages",
+            timeout=600,
+            compress=True,
+        ),
+        "throttle": redis_cache(
+            env.str("REDIS_THROTTLE_URL", default=REDIS_URL),
+            "material_throttle",
+            timeout=3600,
+        ),
     }
+    DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
 else:
     CACHES = {
-        "default": {
-            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-            "LOCATION": "django_cache_table",
-            "KEY_PREFIX": "material",
-            "TIMEOUT": 300,
-        }
+        "default": database_cache("material"),
+        "pages": database_cache("material_pages", timeout=600),
+        "throttle": database_cache("material_throttle", timeout=3600),
     }
 
 CACHE_TTL_SHORT = 60 * 5    # 5 minutes
 CACHE_TTL_MEDIUM = 60 * 15  # 15 minutes
 CACHE_TTL_LONG = 60 * 60    # 1 hour
 
+# Polled payment status for a still-pending transaction (payment.status_cache)
+PAYMENT_STATUS_PENDING_TTL = env.int("PAYMENT_STATUS_PENDING_TTL", default=3)
+
 
 # ==============================================================================
 # AUTHENTICATION & AUTHORIZATION
@@ -265,6 +330,12 @@ SESSION_ENGINE = "django.contrib.sessions.backends.db"
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
 SESSION_SAVE_EVERY_REQUEST = False
 CART_SESSION_ID = "cart"
+# "session" keeps carts in the session row; "redis" keeps one Redis hash per cart
+CART_STORAGE = env.str("CART_STORAGE", default="session")
+CART_REDIS_URL = env.str("CART_REDIS_URL", default="redis://localhost:6379/1")
+CART_REDIS_TTL = SESSION_COOKIE_AGE
+# Cart cleanup always runs on these routes; elsewhere only after availability changes
+CART_CLEANUP_PATHS = ["/api/cart/", "/api/order/checkout/"]
 
 
 # ==============================================================================
@@ -409,6 +480,12 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = "/media/"
 DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 
+# Rendered bulk order PDF/Word/Excel exports (bulk_orders.exports)
+BULK_ORDER_EXPORT_STORAGE = env.str(
+    "BULK_ORDER_EXPORT_STORAGE",
+    default="cloudinary_storage.storage.RawMediaCloudinaryStorage",
+)
+
 
 # ==============================================================================
 # CLOUDINARY
@@ -451,6 +528,9 @@ PAYSTACK_PUBLIC_KEY = env("PAYSTACK_PUBLIC_KEY")
 PAYSTACK_SECRET_KEY = env("PAYSTACK_SECRET_KEY")
 PAYSTACK_WEBHOOK_SECRET = env("PAYSTACK_WEBHOOK_SECRET", default="")
 
+# Store webhooks in the inbox and process them in the background worker
+WEBHOOK_INBOX_ENABLED = env.bool("WEBHOOK_INBOX_ENABLED", default=True)
+
 
 # ==============================================================================
 # YOUTUBE
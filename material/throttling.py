@@ -1,8 +1,143 @@
 # material/throttling.py
 """
 Custom rate throttling classes for API endpoints
+
+Every class here is a drop-in replacement for the DRF throttle it extends,
+but uses GCRA (generic cell rate algorithm) instead of a list of request
+timestamps: each key stores a single "theoretical arrival time", so the
+state is O(1) per client however high the rate. A rate of "N/period"
+allows a burst of N requests, then one every period/N.
+
+State lives in the "throttle" cache alias (see material.caching). On Redis
+the whole check is one atomic Lua script (one round trip, no read-modify-
+write race); on other backends it falls back to a cache get/set, and only
+allowed requests write.
+"""
+import logging
+import math
+
+from rest_framework import throttling
+
+from .caching import THROTTLE_CACHE_ALIAS, get_cache, is_redis_alias, resolve_alias
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = throttle key, ARGV = emission interval, burst tolerance (seconds)
+# (same step as gcra() below)
+# Returns {allowed, seconds until the next request would be allowed}
+GCRA_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local allow_at = tat - tolerance
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+
+local new_tat = tat + emission
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
 """
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+
+# Redis client -> registered Script (EVALSHA, re-loaded automatically on NOSCRIPT)
+_scripts = {}
+
+
+def gcra(tat, now, emission, tolerance):
+    """
+    One GCRA step (virtual scheduling): a request is allowed while the
+    theoretical arrival time is at most tolerance ahead of now, so a
+    tolerance of (N - 1) emission intervals allows a burst of N.
+    Returns (allowed, new_tat, wait); new_tat is None when the request is
+    rejected and nothing should be stored.
+    """
+    tat = max(tat if tat is not None else now, now)
+    allow_at = tat - tolerance
+    if now < allow_at:
+        return False, None, allow_at - now
+    return True, tat + emission, 0.0
+
+
+class ThrottleCacheMixin:
+    """Store throttle state in the throttle cache alias"""
+
+    @property
+    def cache(self):
+        return get_cache(THROTTLE_CACHE_ALIAS)
+
+
+class GCRAThrottleMixin(ThrottleCacheMixin):
+    """
+    GCRA in place of SimpleRateThrottle's history list. Subclasses keep
+    rate/scope/get_cache_key exactly as with the DRF classes.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        emission = self.duration / self.num_requests
+        # Burst of exactly num_requests: the tolerance covers the N - 1 after the first
+        tolerance = self.duration - emission
+
+        if is_redis_alias(THROTTLE_CACHE_ALIAS):
+            allowed, self._wait = self._allow_redis(emission, tolerance)
+        else:
+            allowed, self._wait = self._allow_cache(emission, tolerance)
+        return allowed
+
+    def _allow_redis(self, emission, tolerance):
+        from django_redis import get_redis_connection
+
+        try:
+            client = get_redis_connection(resolve_alias(THROTTLE_CACHE_ALIAS))
+            script = _scripts.get(client)
+            if script is None:
+                script = _scripts[client] = client.register_script(GCRA_SCRIPT)
+            allowed, wait = script(
+                keys=[self.cache.make_key(self.key)], args=[emission, tolerance]
+            )
+        except Exception as e:
+            # Fail open, like the cache itself with IGNORE_EXCEPTIONS
+            logger.warning(f"Throttle check failed for {self.scope}: {str(e)}")
+            return True, 0.0
+        return bool(allowed), float(wait)
+
+    def _allow_cache(self, emission, tolerance):
+        now = self.timer()
+        allowed, new_tat, wait = gcra(
+            self.cache.get(self.key), now, emission, tolerance
+        )
+        if allowed:
+            self.cache.set(self.key, new_tat, math.ceil(new_tat - now))
+        return allowed, wait
+
+    def wait(self):
+        """Seconds until the next request from this client would be allowed"""
+        return getattr(self, "_wait", None) or None
+
+
+class AnonRateThrottle(GCRAThrottleMixin, throttling.AnonRateThrottle):
+    """GCRA version of DRF's AnonRateThrottle (keyed by client IP)"""
+
+    pass
+
+
+class UserRateThrottle(GCRAThrottleMixin, throttling.UserRateThrottle):
+    """GCRA version of DRF's UserRateThrottle (keyed by user, else IP)"""
+
+    pass
 
 
 class CheckoutRateThrottle(UserRateThrottle):
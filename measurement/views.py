@@ -1,5 +1,5 @@
 from rest_framework import viewsets, permissions
-from rest_framework.throttling import UserRateThrottle
+from material.throttling import UserRateThrottle
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
@@ -2,9 +2,10 @@
 from rest_framework import views, viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.db.models import Count, prefetch_related_objects
 from .models import BaseOrder, NyscKitOrder, NyscTourOrder, ChurchOrder, OrderItem
 from .serializers import (
     BaseOrderSerializer,
@@ -59,9 +60,12 @@ class CheckoutView(views.APIView):
                 {"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Resolve cart items once; products come from the request snapshot
+        cart_items = list(cart)
+
         # ✅ Validate cart prices before checkout
         price_validation_errors = []
-        for item in cart:
+        for item in cart_items:
             product = item["product"]
             cart_price = Decimal(str(item["price"]))
             actual_price = product.price
@@ -107,7 +111,7 @@ class CheckoutView(views.APIView):
             with transaction.atomic():
                 # Group cart items by product type
                 grouped_items = {}
-                for item in cart:
+                for item in cart_items:
                     product_type = item["product"].__class__.__name__
                     if product_type not in grouped_items:
                         grouped_items[product_type] = []
@@ -120,6 +124,11 @@ class CheckoutView(views.APIView):
                     "Church": ChurchOrder,
                 }
 
+                # ContentType per product model, looked up once per checkout
+                content_types = ContentType.objects.get_for_models(
+                    *{item["product"].__class__ for item in cart_items}
+                )
+
                 # Create separate order for each product type
                 for product_type, items in grouped_items.items():
                     order_model = order_type_map.get(product_type)
@@ -159,34 +168,28 @@ class CheckoutView(views.APIView):
                             }
                         )
 
-                    # Create order
-                    order = order_model.objects.create(**order_data)
-
-                    # Create order items with FRESH prices from database
-                    for item in items:
-                        product = item["product"]
-
-                        # ✅ CRITICAL: Always use fresh price from database
-                        actual_price = product.price
-
-                        # Get ContentType for the product
-                        product_ct = ContentType.objects.get_for_model(product)
-
-                        # Create OrderItem with correct GenericForeignKey setup
-                        OrderItem.objects.create(
-                            order=order,  # ✅ ForeignKey to the order
-                            content_type=product_ct,  # ✅ ContentType for GenericForeignKey
-                            object_id=product.id,  # ✅ Object ID for GenericForeignKey
-                            price=actual_price,  # ✅ Use database price, not cart price
+                    # Build order items in memory with FRESH prices from database
+                    order_items = [
+                        OrderItem(
+                            content_type=content_types[item["product"].__class__],
+                            object_id=item["product"].id,
+                            price=item["product"].price,  # ✅ Use database price, not cart price
                             quantity=item["quantity"],
                             extra_fields=item.get("extra_fields", {}),
                         )
+                        for item in items
+                    ]
 
-                    # ✅ Calculate total_cost from OrderItems
-                    order.total_cost = sum(
-                        item.get_cost() for item in order.items.all()
+                    # ✅ Calculate total_cost from the in-memory items
+                    order_data["total_cost"] = sum(
+                        order_item.get_cost() for order_item in order_items
                     )
-                    order.save()
+
+                    # Create order, then all of its items in one insert
+                    order = order_model.objects.create(**order_data)
+                    for order_item in order_items:
+                        order_item.order = order
+                    OrderItem.objects.bulk_create(order_items)
 
                     orders_created.append(order)
                     logger.info(
@@ -308,6 +311,14 @@ class CheckoutView(views.APIView):
             )
 
 
+class OrderPagination(PageNumberPagination):
+    """Custom pagination for the order list"""
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
 @extend_schema_view(
     list=extend_schema(description="List all orders for authenticated user"),
     retrieve=extend_schema(
@@ -330,108 +341,87 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderPagination
     queryset = (
         BaseOrder.objects.none()
     )  # ✅ ADD THIS LINE - Default for schema generation
 
     def get_queryset(self):
         """
-        ✅ FIXED: Get orders for authenticated user with polymorphic type selection
-        Uses select_related to fetch the specific order type (Church/NyscKit/NyscTour)
+        ✅ FIXED: Get orders for authenticated user
+        The concrete type (Church/NyscKit/NyscTour) comes from the stored
+        order_type column, so rows never need child-table probes
         """
         # ✅ ADD THIS CHECK
         if getattr(self, "swagger_fake_view", False):
             return BaseOrder.objects.none()
 
         # Regular queryset for authenticated users
-        base_queryset = (
-            BaseOrder.objects.filter(user=self.request.user)
-            .prefetch_related("items", "items__content_type")
-            .select_related(
-                "churchorder",  # Fetch ChurchOrder relationship
-                "nysckitorder",  # Fetch NyscKitOrder relationship
-                "nysctourorder",  # Fetch NyscTourOrder relationship
-            )
-            .order_by("-created")
+        base_queryset = BaseOrder.objects.filter(user=self.request.user).order_by(
+            "-created"
         )
 
+        if self.action == "list":
+            # order_type is stored on the row, so the list never touches the
+            # child tables; it only needs the number of items, not the items
+            return base_queryset.annotate(item_count=Count("items"))
+
         return base_queryset
 
+    # Detail serializer for each concrete order type
+    ORDER_SERIALIZERS = {
+        "NyscKitOrder": NyscKitOrderSerializer,
+        "NyscTourOrder": NyscTourOrderSerializer,
+        "ChurchOrder": ChurchOrderSerializer,
+    }
+
     def get_serializer_class(self):
         """Return appropriate serializer based on order type"""
         if self.action == "list":
             return OrderListSerializer
-
-        # For retrieve, determine the specific order type
-        if hasattr(self, "get_object"):
-            try:
-                obj = self.get_object()
-                # ✅ FIXED: Get actual polymorphic type
-                actual_type = self._get_actual_order_type(obj)
-
-                if actual_type == "NyscKitOrder":
-                    return NyscKitOrderSerializer
-                elif actual_type == "NyscTourOrder":
-                    return NyscTourOrderSerializer
-                elif actual_type == "ChurchOrder":
-                    return ChurchOrderSerializer
-            except:
-                pass
-
         return BaseOrderSerializer
 
-    def _get_actual_order_type(self, order):
-        """
-        ✅ NEW: Helper method to determine the actual polymorphic order type
-        """
-        # Check if this is a specific order type
-        if hasattr(order, "churchorder"):
-            return "ChurchOrder"
-        elif hasattr(order, "nysckitorder"):
-            return "NyscKitOrder"
-        elif hasattr(order, "nysctourorder"):
-            return "NyscTourOrder"
-        return "BaseOrder"
+    def _get_order_serializer_class(self, order):
+        """Pick the detail serializer from the stored order_type"""
+        return self.ORDER_SERIALIZERS.get(order.order_type, BaseOrderSerializer)
 
     def _get_actual_order_instance(self, order):
         """
-        ✅ NEW: Helper method to get the actual polymorphic instance
+        Return the concrete order (reads only the matching child table)
+        with its items prefetched for serialization
         """
-        # Return the specific order instance
-        if hasattr(order, "churchorder"):
-            return order.churchorder
-        elif hasattr(order, "nysckitorder"):
-            return order.nysckitorder
-        elif hasattr(order, "nysctourorder"):
-            return order.nysctourorder
-        return order
+        actual_order = order.get_concrete_order()
+        prefetch_related_objects(
+            [actual_order], "items", "items__content_type"
+        )
+        return actual_order
 
     def list(self, request, *args, **kwargs):
         """
         ✅ FIXED: List orders with correct polymorphic types
+        Paginated; one query for the page plus one for the total count
         """
         queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        orders = page if page is not None else queryset
 
         # Build lightweight response with correct order types
-        orders_data = []
-        for order in queryset:
-            # Get the actual polymorphic order type
-            order_type = self._get_actual_order_type(order)
-            actual_order = self._get_actual_order_instance(order)
-
-            orders_data.append(
-                {
-                    "id": str(order.id),
-                    "serial_number": order.serial_number,
-                    "order_type": order_type,  # ✅ NOW SHOWS CORRECT TYPE
-                    "total_cost": float(order.total_cost),
-                    "paid": order.paid,  # ✅ SHOWS ACTUAL PAID STATUS
-                    "created": order.created,
-                    "item_count": order.items.count(),
-                }
-            )
+        orders_data = [
+            {
+                "id": str(order.id),
+                "serial_number": order.serial_number,
+                "order_type": order.order_type,  # ✅ NOW SHOWS CORRECT TYPE
+                "total_cost": float(order.total_cost),
+                "paid": order.paid,  # ✅ SHOWS ACTUAL PAID STATUS
+                "created": order.created,
+                "item_count": order.item_count,
+            }
+            for order in orders
+        ]
 
         serializer = OrderListSerializer(orders_data, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return Response(serializer.data)
 
     def retrieve(self, request, *args, **kwargs):
@@ -444,7 +434,7 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
         actual_instance = self._get_actual_order_instance(instance)
 
         # Get the correct serializer for this order type
-        serializer_class = self.get_serializer_class()
+        serializer_class = self._get_order_serializer_class(actual_instance)
         serializer = serializer_class(actual_instance, context={"request": request})
 
         return Response(serializer.data)
@@ -456,7 +446,7 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
         actual_order = self._get_actual_order_instance(order)
 
         # Get correct serializer
-        serializer_class = self.get_serializer_class()
+        serializer_class = self._get_order_serializer_class(actual_order)
         serializer = serializer_class(actual_order, context={"request": request})
 
         return Response(
@@ -0,0 +1,50 @@
+# order/management/commands/backfill_order_types.py
+from django.core.management.base import BaseCommand
+from order.models import BaseOrder, ORDER_MODELS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Sets order_type on orders that don't have one yet, in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of orders updated per query",
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        total = 0
+
+        for order_type, model in ORDER_MODELS.items():
+            updated = 0
+            while True:
+                ids = list(
+                    model.objects.filter(order_type="").values_list("pk", flat=True)[
+                        :batch_size
+                    ]
+                )
+                if not ids:
+                    break
+                updated += BaseOrder.objects.filter(pk__in=ids).update(
+                    order_type=order_type
+                )
+            if updated:
+                self.stdout.write(f"{order_type}: {updated} orders")
+            total += updated
+
+        # Whatever is left has no child row
+        remaining = BaseOrder.objects.filter(order_type="").update(
+            order_type="BaseOrder"
+        )
+        if remaining:
+            self.stdout.write(f"BaseOrder: {remaining} orders")
+        total += remaining
+
+        logger.info(f"Backfilled order_type on {total} orders")
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} orders"))
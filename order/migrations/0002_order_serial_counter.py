@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-16 20:15
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seed_counter(apps, schema_editor):
+    """Start the counter at the highest serial already issued."""
+    BaseOrder = apps.get_model("order", "BaseOrder")
+    OrderSerialCounter = apps.get_model("order", "OrderSerialCounter")
+    last_serial = BaseOrder.objects.aggregate(Max("serial_number"))["serial_number__max"]
+    OrderSerialCounter.objects.update_or_create(
+        id=1, defaults={"last_serial_number": last_serial or 0}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSerialCounter',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('last_serial_number', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counter, migrations.RunPython.noop),
+    ]
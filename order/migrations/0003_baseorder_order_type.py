@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-16 20:58
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_order_types(apps, schema_editor):
+    """Set order_type on existing orders from their child table, in batches."""
+    BaseOrder = apps.get_model("order", "BaseOrder")
+    for model_name in ("NyscKitOrder", "NyscTourOrder", "ChurchOrder"):
+        model = apps.get_model("order", model_name)
+        while True:
+            ids = list(
+                model.objects.filter(order_type="").values_list("pk", flat=True)[
+                    :BATCH_SIZE
+                ]
+            )
+            if not ids:
+                break
+            BaseOrder.objects.filter(pk__in=ids).update(order_type=model_name)
+
+    # Whatever is left has no child row
+    BaseOrder.objects.filter(order_type="").update(order_type="BaseOrder")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0002_order_serial_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseorder',
+            name='order_type',
+            field=models.CharField(blank=True, choices=[('BaseOrder', 'Order'), ('NyscKitOrder', 'NYSC Kit Order'), ('NyscTourOrder', 'NYSC Tour Order'), ('ChurchOrder', 'Church Order')], db_index=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_order_types, migrations.RunPython.noop),
+    ]
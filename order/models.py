@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import Max
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -7,6 +8,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 from decimal import Decimal
 from django.core.validators import RegexValidator
+from material.serials import allocate_serial
 
 
 User = get_user_model()
@@ -15,6 +17,74 @@ validate_phone_number = RegexValidator(
     regex=r"^\d{11}$", message="Phone number must be 11 digits"
 )
 
+class OrderSerialCounter(models.Model):
+    """
+    Single-row counter backing BaseOrder.serial_number.
+    Serials are allocated by a locked increment of this row instead of
+    reading the highest existing serial, so concurrent checkouts can't
+    compute the same number.
+    """
+
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    last_serial_number = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def next_serial(cls):
+        """Allocate the next order serial number (one UPDATE ... RETURNING)."""
+        serial = allocate_serial(cls, cls.SINGLETON_ID)
+        if serial is None:
+            # Counter row missing - seed it from existing orders
+            last_serial = BaseOrder.objects.aggregate(Max("serial_number"))[
+                "serial_number__max"
+            ]
+            cls.objects.get_or_create(
+                id=cls.SINGLETON_ID, defaults={"last_serial_number": last_serial or 0}
+            )
+            serial = allocate_serial(cls, cls.SINGLETON_ID)
+        return serial
+
+    def __str__(self):
+        return f"Order serial counter ({self.last_serial_number})"
+
+
+ORDER_TYPE_CHOICES = [
+    ("BaseOrder", "Order"),
+    ("NyscKitOrder", "NYSC Kit Order"),
+    ("NyscTourOrder", "NYSC Tour Order"),
+    ("ChurchOrder", "Church Order"),
+]
+
+
+class BaseOrderQuerySet(models.QuerySet):
+    """Order queries driven by the stored order_type instead of child-table probes"""
+
+    def of_type(self, *order_types):
+        """Filter to the given order types (model classes or names)."""
+        names = [
+            t if isinstance(t, str) else t._meta.object_name for t in order_types
+        ]
+        return self.filter(order_type__in=names)
+
+    def concrete(self):
+        """
+        Evaluate to the concrete order instances, in queryset order.
+        One query for the ids plus one per order type present, each
+        reading only that type's child table.
+        """
+        rows = list(self.values_list("pk", "order_type"))
+        ids_by_type = {}
+        for pk, order_type in rows:
+            ids_by_type.setdefault(order_type, []).append(pk)
+
+        orders = {}
+        for order_type, ids in ids_by_type.items():
+            model = ORDER_MODELS.get(order_type, BaseOrder)
+            orders.update(model.objects.in_bulk(ids))
+        return [orders[pk] for pk, _ in rows if pk in orders]
+
+
 class BaseOrder(models.Model):
     """Base model for all order types"""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -22,6 +92,15 @@ class BaseOrder(models.Model):
     serial_number = models.PositiveIntegerField(
         unique=True, editable=False, db_index=True
     )
+    # Concrete order model name, set on create so listing and reporting
+    # never need to probe the child tables
+    order_type = models.CharField(
+        max_length=20,
+        choices=ORDER_TYPE_CHOICES,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
     first_name = models.CharField(max_length=50)
     middle_name = models.CharField(max_length=50, blank=True)
     last_name = models.CharField(max_length=50)
@@ -55,6 +134,8 @@ class BaseOrder(models.Model):
         help_text='Admin user who generated the order items'
     )
 
+    objects = BaseOrderQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created"]
 
@@ -66,13 +147,27 @@ class BaseOrder(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.serial_number:
-            last_serial = BaseOrder.objects.all().order_by("serial_number").last()
-            if last_serial:
-                self.serial_number = last_serial.serial_number + 1
-            else:
-                self.serial_number = 1
+            self.serial_number = OrderSerialCounter.next_serial()
+        if not self.order_type:
+            self.order_type = self._meta.object_name
         super(BaseOrder, self).save(*args, **kwargs)
 
+    def get_concrete_order(self):
+        """
+        Return this order as its concrete subclass instance.
+        Reads only the child table named by order_type (or the row cached by
+        select_related); orders saved before order_type existed are probed.
+        """
+        if self.order_type == self._meta.object_name:
+            return self
+        if self.order_type in ORDER_MODELS:
+            return getattr(self, self.order_type.lower())
+        for order_type in ORDER_MODELS:
+            child = getattr(self, order_type.lower(), None)
+            if child is not None:
+                return child
+        return self
+
     def get_full_name(self):
         """Return customer's full name"""
         return f"{self.first_name} {self.middle_name} {self.last_name}".strip()
@@ -135,6 +230,14 @@ class ChurchOrder(BaseOrder):
         verbose_name_plural = "Church Orders"
 
 
+# Concrete order models by order_type
+ORDER_MODELS = {
+    "NyscKitOrder": NyscKitOrder,
+    "NyscTourOrder": NyscTourOrder,
+    "ChurchOrder": ChurchOrder,
+}
+
+
 class OrderItem(models.Model):
     order = models.ForeignKey(BaseOrder, related_name="items", on_delete=models.CASCADE)
     content_type = models.ForeignKey(ContentType, on_delete=models.PROTECT)
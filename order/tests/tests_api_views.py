@@ -10,7 +10,11 @@ Coverage:
 - Edge cases and security
 """
 from decimal import Decimal
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -776,6 +780,197 @@ class CheckoutViewMultipleProductTypesTests(TestCase):
         self.assertEqual(response.data["vat_rate"], 7.5)
 
 
+class CheckoutViewProductSnapshotTests(TestCase):
+    """Test checkout loads each product row once per request"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.checkout_url = reverse("order:checkout")
+
+        nysc_category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.cap = NyscKit.objects.create(
+            name="Test Cap", type="cap", category=nysc_category, price=Decimal("5000.00")
+        )
+        self.vest = NyscKit.objects.create(
+            name="Test Vest", type="vest", category=nysc_category, price=Decimal("3000.00")
+        )
+        church_category = Category.objects.create(
+            name="CHURCH", slug="church", product_type="church"
+        )
+        self.church_product = Church.objects.create(
+            name="Winners T-Shirt",
+            church="Winners",
+            category=church_category,
+            price=Decimal("8000.00"),
+        )
+
+    @patch("order.api_views.generate_order_confirmation_pdf_task")
+    @patch("order.api_views.send_order_confirmation_email_async")
+    @patch("order.api_views.initialize_payment")
+    def test_checkout_queries_each_product_table_once(
+        self, mock_initialize_payment, mock_email, mock_pdf
+    ):
+        """Test price validation, serializer validation and grouping share one fetch"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        mock_initialize_payment.return_value = {
+            "status": True,
+            "data": {
+                "authorization_url": "https://checkout.paystack.com/test",
+                "access_code": "test_access_code",
+            },
+        }
+
+        add_url = reverse("cart:cart-add")
+        for product, extra in (
+            (self.cap, {"product_type": "nysc_kit"}),
+            (self.vest, {"product_type": "nysc_kit", "size": "M"}),
+            (self.church_product, {"product_type": "church", "size": "L"}),
+        ):
+            self.client.post(
+                add_url,
+                {"product_id": str(product.id), "quantity": 1, **extra},
+                format="json",
+            )
+
+        checkout_data = {
+            "first_name": "John",
+            "last_name": "Doe",
+            "phone_number": "08012345678",
+            "call_up_number": "AB/22C/1234",
+            "state": "Lagos",
+            "local_government": "Ikeja",
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.checkout_url, checkout_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        def product_queries(table):
+            return [
+                q for q in ctx.captured_queries if f'FROM "{table}"' in q["sql"]
+            ]
+
+        self.assertEqual(len(product_queries("products_nysckit")), 1)
+        self.assertEqual(len(product_queries("products_church")), 1)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class CheckoutViewOrderItemCreationTests(TestCase):
+    """Test checkout creates order items in bulk"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.checkout_url = reverse("order:checkout")
+        self.add_url = reverse("cart:cart-add")
+
+        category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.products = [
+            NyscKit.objects.create(
+                name=f"Test Cap {i}",
+                type="cap",
+                category=category,
+                price=Decimal("1000.00") + i,
+            )
+            for i in range(20)
+        ]
+        self.checkout_data = {
+            "first_name": "John",
+            "last_name": "Doe",
+            "phone_number": "08012345678",
+            "call_up_number": "AB/22C/1234",
+            "state": "Lagos",
+            "local_government": "Ikeja",
+        }
+
+    def _checkout(self, products):
+        """Fill the cart with the given products and return (response, query count)"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for product in products:
+            self.client.post(
+                self.add_url,
+                {"product_id": str(product.id), "quantity": 2, "product_type": "nysc_kit"},
+                format="json",
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.checkout_url, self.checkout_data, format="json"
+            )
+        return response, len(ctx.captured_queries)
+
+    @patch("order.api_views.generate_order_confirmation_pdf_task")
+    @patch("order.api_views.send_order_confirmation_email_async")
+    @patch("order.api_views.initialize_payment")
+    def test_query_count_independent_of_cart_size(
+        self, mock_initialize_payment, mock_email, mock_pdf
+    ):
+        """Test a 20-line cart checks out in as many queries as a 2-line cart"""
+        mock_initialize_payment.return_value = {
+            "status": True,
+            "data": {
+                "authorization_url": "https://checkout.paystack.com/test",
+                "access_code": "test_access_code",
+            },
+        }
+
+        small_response, small_queries = self._checkout(self.products[:2])
+        large_response, large_queries = self._checkout(self.products)
+
+        self.assertEqual(small_response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(large_response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(large_queries, small_queries)
+
+    @patch("order.api_views.generate_order_confirmation_pdf_task")
+    @patch("order.api_views.send_order_confirmation_email_async")
+    @patch("order.api_views.initialize_payment")
+    def test_bulk_created_items_and_total(
+        self, mock_initialize_payment, mock_email, mock_pdf
+    ):
+        """Test every cart line becomes an OrderItem and total_cost matches"""
+        mock_initialize_payment.return_value = {
+            "status": True,
+            "data": {
+                "authorization_url": "https://checkout.paystack.com/test",
+                "access_code": "test_access_code",
+            },
+        }
+
+        response, _ = self._checkout(self.products)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = NyscKitOrder.objects.get(user=self.user)
+        items = list(order.items.all())
+        self.assertEqual(len(items), 20)
+        self.assertEqual(
+            {item.object_id for item in items}, {p.id for p in self.products}
+        )
+        expected_total = sum(p.price * 2 for p in self.products)
+        self.assertEqual(order.total_cost, expected_total)
+        self.assertEqual(sum(item.get_cost() for item in items), expected_total)
+
+
 class CheckoutViewEdgeCasesTests(TestCase):
     """Test edge cases and error handling"""
 
@@ -952,8 +1147,8 @@ class OrderViewSetListTests(TestCase):
         response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], str(order1.id))
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], str(order1.id))
 
     def test_list_orders_with_no_orders(self):
         """Test list returns empty array when user has no orders"""
@@ -961,7 +1156,7 @@ class OrderViewSetListTests(TestCase):
         response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_list_orders_returns_most_recent_first(self):
         """Test list returns orders in reverse chronological order"""
@@ -988,10 +1183,10 @@ class OrderViewSetListTests(TestCase):
         response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
         # Most recent first
-        self.assertEqual(response.data[0]["id"], str(order2.id))
-        self.assertEqual(response.data[1]["id"], str(order1.id))
+        self.assertEqual(response.data["results"][0]["id"], str(order2.id))
+        self.assertEqual(response.data["results"][1]["id"], str(order1.id))
 
     def test_list_orders_includes_order_type(self):
         """Test list includes order_type field"""
@@ -1011,7 +1206,98 @@ class OrderViewSetListTests(TestCase):
         response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn("order_type", response.data[0])
+        self.assertIn("order_type", response.data["results"][0])
+
+
+    def _create_orders(self, count):
+        """Create `count` orders of mixed types, each with two items"""
+        category, _ = Category.objects.get_or_create(
+            slug="nysc-kit", defaults={"name": "NYSC KIT", "product_type": "nysc_kit"}
+        )
+        product = NyscKit.objects.create(
+            name="Test Cap", type="cap", category=category, price=Decimal("5000.00")
+        )
+        product_ct = ContentType.objects.get_for_model(NyscKit)
+        for i in range(count):
+            if i % 3 == 0:
+                order = NyscKitOrder.objects.create(
+                    user=self.user1,
+                    first_name="John",
+                    last_name="Doe",
+                    phone_number="08012345678",
+                    call_up_number="AB/22C/1234",
+                    state="Lagos",
+                    local_government="Ikeja",
+                )
+            elif i % 3 == 1:
+                order = NyscTourOrder.objects.create(
+                    user=self.user1,
+                    first_name="John",
+                    last_name="Doe",
+                    phone_number="08012345678",
+                )
+            else:
+                order = ChurchOrder.objects.create(
+                    user=self.user1,
+                    first_name="John",
+                    last_name="Doe",
+                    phone_number="08012345678",
+                )
+            OrderItem.objects.bulk_create(
+                [
+                    OrderItem(
+                        order=order,
+                        content_type=product_ct,
+                        object_id=product.id,
+                        price=product.price,
+                        quantity=1,
+                    )
+                    for _ in range(2)
+                ]
+            )
+
+    def test_list_query_count_independent_of_order_count(self):
+        """Test listing 3 or 15 orders costs the same number of queries"""
+        self.client.force_authenticate(user=self.user1)
+        self._create_orders(3)
+        self.client.get(self.list_url)  # Warm up session/auth lookups
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.list_url)
+
+        self._create_orders(12)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 15)
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+
+    def test_list_includes_item_count_and_concrete_type(self):
+        """Test item_count and order_type come from the annotated queryset"""
+        self.client.force_authenticate(user=self.user1)
+        self._create_orders(3)
+
+        response = self.client.get(self.list_url)
+
+        results = response.data["results"]
+        self.assertEqual({order["item_count"] for order in results}, {2})
+        self.assertEqual(
+            sorted(order["order_type"] for order in results),
+            ["ChurchOrder", "NyscKitOrder", "NyscTourOrder"],
+        )
+
+    def test_list_is_paginated(self):
+        """Test the list is paginated with a page_size query param"""
+        self.client.force_authenticate(user=self.user1)
+        self._create_orders(5)
+
+        response = self.client.get(self.list_url, {"page_size": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
 
 
 class OrderViewSetRetrieveTests(TestCase):
@@ -1279,4 +1565,4 @@ class OrderViewSetPolymorphicTests(TestCase):
         response = self.client.get(list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data["results"]), 3)
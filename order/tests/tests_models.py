@@ -12,14 +12,24 @@ Coverage:
 - Security: price validation, data integrity
 """
 from decimal import Decimal
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 from django.utils import timezone
-from order.models import BaseOrder, NyscKitOrder, NyscTourOrder, ChurchOrder, OrderItem
+from django.core.management import call_command
+from io import StringIO
+from order.models import (
+    BaseOrder,
+    NyscKitOrder,
+    NyscTourOrder,
+    ChurchOrder,
+    OrderItem,
+    OrderSerialCounter,
+)
 from products.models import Category, NyscKit, NyscTour, Church
+import threading
 import uuid
 
 User = get_user_model()
@@ -103,7 +113,7 @@ class BaseOrderModelTests(TestCase):
         self.assertEqual(order3.serial_number, 3)
     
     def test_serial_number_continues_after_deletion(self):
-        """Test serial numbers are reused after deletions (not continued)"""
+        """Test serial numbers continue after deletions (never reused)"""
         order1 = BaseOrder.objects.create(
             user=self.user,
             first_name='John',
@@ -125,8 +135,9 @@ class BaseOrderModelTests(TestCase):
         # Delete order2
         order2.delete()
         
-        # Create new order - gets serial_number 2 (last serial + 1), not 3
-        # This is because save() finds the last serial (1) and increments it
+        # Create new order - gets serial_number 3, not 2
+        # The counter row keeps the last serial issued, so receipts and
+        # emails for the deleted order never share a number with a new one
         order3 = BaseOrder.objects.create(
             user=self.user,
             first_name='Bob',
@@ -136,7 +147,7 @@ class BaseOrderModelTests(TestCase):
             total_cost=Decimal('30000.00')
         )
         
-        self.assertEqual(order3.serial_number, 2)  # Reuses deleted serial number
+        self.assertEqual(order3.serial_number, 3)  # Deleted serial is not reused
     
     def test_serial_number_preserves_on_update(self):
         """Test serial number doesn't change on update"""
@@ -1594,4 +1605,229 @@ class OrderPolymorphismTests(TestCase):
         # Each queryset should only have its type
         self.assertEqual(NyscKitOrder.objects.count(), 1)
         self.assertEqual(ChurchOrder.objects.count(), 1)
-        self.assertEqual(NyscTourOrder.objects.count(), 1)
\ No newline at end of file
+        self.assertEqual(NyscTourOrder.objects.count(), 1)
+
+
+class OrderSerialCounterTests(TestCase):
+    """Test serial numbers are allocated from the counter row"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def _create_order(self):
+        return NyscTourOrder.objects.create(
+            user=self.user,
+            first_name='John',
+            last_name='Doe',
+            phone_number='08012345678',
+        )
+
+    def test_counter_tracks_last_serial(self):
+        """Test the counter row holds the last serial issued"""
+        order = self._create_order()
+
+        counter = OrderSerialCounter.objects.get(id=OrderSerialCounter.SINGLETON_ID)
+        self.assertEqual(counter.last_serial_number, order.serial_number)
+
+    def test_missing_counter_is_seeded_from_existing_orders(self):
+        """Test a missing counter row restarts after the highest existing serial"""
+        self._create_order()
+        self._create_order()
+        OrderSerialCounter.objects.all().delete()
+
+        order = self._create_order()
+
+        self.assertEqual(order.serial_number, 3)
+
+    def test_allocation_does_not_scan_orders(self):
+        """Test allocating a serial is a single query on the counter table"""
+        self._create_order()
+
+        with self.assertNumQueries(1):
+            serial = OrderSerialCounter.next_serial()
+
+        self.assertEqual(serial, 2)
+
+
+class OrderTypeDiscriminatorTests(TestCase):
+    """Test the stored order_type column and its queryset helpers"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.kit_order = NyscKitOrder.objects.create(
+            user=self.user,
+            first_name='John',
+            last_name='Doe',
+            phone_number='08012345678',
+            call_up_number='AB/22C/1234',
+            state='Lagos',
+            local_government='Ikeja'
+        )
+        self.tour_order = NyscTourOrder.objects.create(
+            user=self.user,
+            first_name='Jane',
+            last_name='Smith',
+            phone_number='08087654321'
+        )
+        self.church_order = ChurchOrder.objects.create(
+            user=self.user,
+            first_name='Bob',
+            last_name='Johnson',
+            phone_number='08099999999'
+        )
+
+    def test_order_type_set_on_create(self):
+        """Test each order stores its concrete model name"""
+        self.assertEqual(
+            dict(BaseOrder.objects.values_list('id', 'order_type')),
+            {
+                self.kit_order.id: 'NyscKitOrder',
+                self.tour_order.id: 'NyscTourOrder',
+                self.church_order.id: 'ChurchOrder',
+            }
+        )
+
+    def test_plain_base_order_type(self):
+        """Test a BaseOrder without a child row is typed BaseOrder"""
+        order = BaseOrder.objects.create(
+            user=self.user,
+            first_name='Plain',
+            last_name='Order',
+            phone_number='08011111111'
+        )
+
+        self.assertEqual(order.order_type, 'BaseOrder')
+        self.assertIs(order.get_concrete_order(), order)
+
+    def test_of_type_filters_by_column(self):
+        """Test of_type accepts model classes or names"""
+        self.assertEqual(
+            list(BaseOrder.objects.of_type(ChurchOrder).values_list('id', flat=True)),
+            [self.church_order.id]
+        )
+        self.assertEqual(
+            BaseOrder.objects.of_type('NyscKitOrder', 'NyscTourOrder').count(), 2
+        )
+
+    def test_get_concrete_order_reads_one_child_table(self):
+        """Test resolving the subclass costs a single query"""
+        order = BaseOrder.objects.get(id=self.church_order.id)
+
+        with self.assertNumQueries(1):
+            concrete = order.get_concrete_order()
+
+        self.assertIsInstance(concrete, ChurchOrder)
+        self.assertTrue(concrete.pickup_on_camp)
+
+    def test_get_concrete_order_probes_untyped_orders(self):
+        """Test orders saved before the column existed still resolve"""
+        BaseOrder.objects.filter(id=self.kit_order.id).update(order_type='')
+        order = BaseOrder.objects.get(id=self.kit_order.id)
+
+        self.assertIsInstance(order.get_concrete_order(), NyscKitOrder)
+
+    def test_concrete_queries_once_per_type(self):
+        """Test concrete() reads ids once plus one query per order type"""
+        with self.assertNumQueries(4):
+            orders = BaseOrder.objects.filter(user=self.user).order_by('serial_number').concrete()
+
+        self.assertEqual(
+            [type(order) for order in orders],
+            [NyscKitOrder, NyscTourOrder, ChurchOrder]
+        )
+
+    def test_backfill_command(self):
+        """Test the backfill command types orders in batches"""
+        BaseOrder.objects.update(order_type='')
+        out = StringIO()
+
+        call_command('backfill_order_types', batch_size=1, stdout=out)
+
+        self.assertEqual(
+            dict(BaseOrder.objects.values_list('id', 'order_type')),
+            {
+                self.kit_order.id: 'NyscKitOrder',
+                self.tour_order.id: 'NyscTourOrder',
+                self.church_order.id: 'ChurchOrder',
+            }
+        )
+        self.assertIn('Backfilled 3 orders', out.getvalue())
+
+
+class OrderSerialConcurrencyTests(TransactionTestCase):
+    """Test serial allocation under parallel checkouts"""
+
+    THREADS = 8
+    ORDERS_PER_THREAD = 10
+
+    def setUp(self):
+        """Set up test fixtures"""
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Parallel writers need a database shared across connections')
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def test_parallel_orders_get_unique_monotonic_serials(self):
+        """Test parallel checkouts never collide and serials keep increasing"""
+        order_types = [NyscKitOrder, NyscTourOrder, ChurchOrder]
+        serials_by_thread = {}
+        errors = []
+
+        def worker(index):
+            serials = serials_by_thread.setdefault(index, [])
+            try:
+                for _ in range(self.ORDERS_PER_THREAD):
+                    order_model = order_types[index % len(order_types)]
+                    extra = (
+                        {'call_up_number': 'AB/22C/1234', 'state': 'Lagos', 'local_government': 'Ikeja'}
+                        if order_model is NyscKitOrder
+                        else {}
+                    )
+                    with transaction.atomic():
+                        order = order_model.objects.create(
+                            user=self.user,
+                            first_name='John',
+                            last_name='Doe',
+                            phone_number='08012345678',
+                            **extra
+                        )
+                    serials.append(order.serial_number)
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = self.THREADS * self.ORDERS_PER_THREAD
+        all_serials = [s for serials in serials_by_thread.values() for s in serials]
+
+        self.assertEqual(errors, [])
+        # No rollbacks, so the serials are unique and gap-free
+        self.assertEqual(sorted(all_serials), list(range(1, total + 1)))
+        self.assertEqual(
+            sorted(BaseOrder.objects.values_list('serial_number', flat=True)),
+            list(range(1, total + 1)),
+        )
+        # Each worker sees its own serials increase
+        for serials in serials_by_thread.values():
+            self.assertEqual(serials, sorted(serials))
@@ -125,10 +125,9 @@ class BaseOrderSerializerTests(TestCase):
         """Test serializer contains all expected fields"""
         serializer = BaseOrderSerializer(self.order)
         
-        # Note: order_type doesn't appear because it's not a model field
-        # and not implemented as a method field
+        # order_type is read from the stored discriminator column
         expected_fields = {
-            'id', 'serial_number', 'first_name', 'middle_name',
+            'id', 'serial_number', 'order_type', 'first_name', 'middle_name',
             'last_name', 'phone_number', 'total_cost', 'paid', 'created',
             'updated', 'items'
         }
@@ -415,7 +415,7 @@ class ChurchPDFView(View):
         
         # ✅ FIXED: Get order items with generation tracking
         order_items_query = OrderItem.objects.select_related(
-            'order', 'content_type'
+            'order__churchorder', 'content_type'
         ).filter(
             order__paid=True,
             content_type=church_type,
@@ -453,8 +453,8 @@ class ChurchPDFView(View):
             processed_order_ids.add(order.id)
             
             # ✅ CORRECT: Cast to ChurchOrder to access pickup fields
-            from order.models import ChurchOrder
-            church_order = ChurchOrder.objects.get(id=order.id)
+            # (child row already joined by select_related - no extra query)
+            church_order = order.get_concrete_order()
             
             full_name = f"{order.last_name} {order.middle_name} {order.first_name}".strip().upper()
             product_name = order_item.product.name
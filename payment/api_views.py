@@ -4,7 +4,6 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse, JsonResponse
-from django.db import transaction
 from django.conf import settings
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from .models import PaymentTransaction
@@ -18,11 +17,9 @@ from .serializers import (
 from rest_framework.decorators import throttle_classes as apply_throttle_classes
 from .utils import initialize_payment, verify_payment
 from .security import verify_paystack_signature, sanitize_payment_log_data  # ✅ NEW
+from .settlement import settle_payment
+from .status_cache import get_payment_status, payment_status_cache_key
 from order.models import BaseOrder
-from material.background_utils import (
-    send_payment_receipt_email_async,
-    generate_payment_receipt_pdf_task,
-)
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -191,41 +188,48 @@ class VerifyPaymentView(views.APIView):
             )
 
         try:
-            payment = PaymentTransaction.objects.prefetch_related("orders").get(
-                reference=reference
+            data = get_payment_status(
+                payment_status_cache_key("payment", reference),
+                lambda: self._load_status(reference),
+                is_terminal=lambda data: data["status"] != "pending",
             )
         except PaymentTransaction.DoesNotExist:
             return Response(
                 {"error": "Payment not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _load_status(self, reference):
+        payment = PaymentTransaction.objects.prefetch_related("orders").get(
+            reference=reference
+        )
+
         # Pure status check - just return current state from database
         # The webhook handles actual payment verification and updates
         is_paid = payment.status == "success"
 
-        # Get first order for additional context
-        first_order = payment.orders.first()
-
-        return Response(
-            {
-                "reference": reference,
-                "status": payment.status,
-                "amount": float(payment.amount),
-                "paid": is_paid,
-                "email": payment.email,
-                "customer_name": (
-                    f"{first_order.first_name} {first_order.last_name}"
-                    if first_order
-                    else None
-                ),
-                "order_count": payment.orders.count(),
-                "created_at": payment.created,
-                "message": (
-                    "Payment successful" if is_paid else "Payment pending or failed"
-                ),
-            },
-            status=status.HTTP_200_OK,
-        )
+        # Get first order for additional context (prefetched, no extra query)
+        orders = list(payment.orders.all())
+        first_order = orders[0] if orders else None
+
+        return {
+            "reference": reference,
+            "status": payment.status,
+            "amount": float(payment.amount),
+            "paid": is_paid,
+            "email": payment.email,
+            "customer_name": (
+                f"{first_order.first_name} {first_order.last_name}"
+                if first_order
+                else None
+            ),
+            "order_count": len(orders),
+            "created_at": payment.created,
+            "message": (
+                "Payment successful" if is_paid else "Payment pending or failed"
+            ),
+        }
 
 
 @extend_schema(
@@ -264,6 +268,19 @@ def payment_webhook(request):
         # ✅ STEP 2: Parse payload (now we know it's from Paystack)
         payload = json.loads(request.body)
 
+    except json.JSONDecodeError:
+        logger.error("Webhook: Invalid JSON payload")
+        return HttpResponse(status=400)
+
+    return handle_payment_webhook(payload)
+
+
+def handle_payment_webhook(payload):
+    """
+    Apply a verified, parsed Paystack payload to its PaymentTransaction.
+    Registered with webhook_router for MATERIAL- references.
+    """
+    try:
         # ✅ STEP 3: Log sanitized data
         logger.info(
             f"Verified webhook received: {payload.get('event')} - "
@@ -282,42 +299,20 @@ def payment_webhook(request):
             return HttpResponse(status=400)
 
         try:
-            # Use transaction.atomic with select_for_update for race condition safety
-            with transaction.atomic():
-                payment = PaymentTransaction.objects.select_for_update().get(
-                    reference=reference
-                )
-
-                # Idempotency check - don't process if already successful
-                if payment.status == "success":
-                    logger.info(f"Webhook: Payment {reference} already processed")
-                    return HttpResponse(status=200)
-
-                # Update payment status
-                payment.status = "success"
-                payment.save(update_fields=["status", "modified"])
-
-                # Update orders
-                for order in payment.orders.select_for_update():
-                    if not order.paid:
-                        order.paid = True
-                        order.save(update_fields=["paid", "updated"])
-
-            # Send payment receipt (outside transaction for performance)
-            send_payment_receipt_email_async(str(payment.id))
-            generate_payment_receipt_pdf_task(str(payment.id))
-
-            logger.info(f"Webhook: Payment {reference} processed successfully")
+            # Locked, set-based settlement shared with reconciliation
+            settlement = settle_payment(reference)
 
         except PaymentTransaction.DoesNotExist:
             logger.error(f"Webhook: Payment not found for reference {reference}")
             return HttpResponse(status=404)
 
+        if settlement.settled:
+            logger.info(f"Webhook: Payment {reference} processed successfully")
+        else:
+            logger.info(f"Webhook: Payment {reference} already processed")
+
         return HttpResponse(status=200)
 
-    except json.JSONDecodeError:
-        logger.error("Webhook: Invalid JSON payload")
-        return HttpResponse(status=400)
     except Exception as e:
         logger.exception("Webhook: Error processing payment")
         return HttpResponse(status=500)
@@ -3,4 +3,10 @@ from django.apps import AppConfig
 
 class PaymentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "payment"
\ No newline at end of file
+    name = "payment"
+
+    def ready(self):
+        """Register the Paystack webhook handler for MATERIAL- references"""
+        from webhook_router.registry import register_webhook_handler
+
+        register_webhook_handler("MATERIAL-", "payment.api_views.handle_payment_webhook")
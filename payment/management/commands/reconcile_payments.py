@@ -0,0 +1,67 @@
+# payment/management/commands/reconcile_payments.py
+"""
+Management command: reconcile_payments
+
+Verifies pending Paystack transactions (lost webhooks, closed tabs) across
+payment, bulk_orders, image_bulk_orders and excel_bulk_orders, and settles
+the ones Paystack reports as paid. Run from cron:
+  */15 * * * * /path/to/python manage.py reconcile_payments
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from payment.reconciliation import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_LOOKBACK,
+    DEFAULT_MIN_AGE,
+    DEFAULT_WORKERS,
+    SOURCES,
+    reconcile_pending_payments,
+)
+
+
+class Command(BaseCommand):
+    help = "Verify pending Paystack transactions and settle the paid ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            action="append",
+            choices=sorted(SOURCES),
+            help="Only reconcile this app (repeatable, default: all)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Transactions verified and settled per batch",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help="Concurrent Paystack verify calls",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=int(DEFAULT_MIN_AGE.total_seconds() // 60),
+            help="Skip transactions newer than this many minutes",
+        )
+        parser.add_argument(
+            "--lookback",
+            type=int,
+            default=int(DEFAULT_LOOKBACK.total_seconds() // 3600),
+            help="Skip transactions older than this many hours",
+        )
+
+    def handle(self, *args, **options):
+        report = reconcile_pending_payments(
+            sources=options["source"],
+            min_age=timedelta(minutes=options["min_age"]),
+            lookback=timedelta(hours=options["lookback"]),
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+        )
+        self.stdout.write(self.style.SUCCESS(str(report)))
@@ -0,0 +1,226 @@
+# payment/paystack.py
+"""
+Shared Paystack HTTP client.
+
+Every Paystack call in the project (order checkout, bulk_orders,
+image_bulk_orders, excel_bulk_orders) goes through here via
+payment.utils, so they all reuse one pooled keep-alive connection instead
+of opening a fresh TCP + TLS connection per request.
+
+- PaystackClient: thread-safe, backed by a shared requests.Session
+- AsyncPaystackClient: the same API on an httpx.AsyncClient
+
+Transient failures are retried with exponential backoff and full jitter,
+and each call logs its latency. Only idempotent calls (GET, e.g.
+/transaction/verify) are retried on timeouts, dropped connections, 429 and
+5xx responses. A POST (e.g. /transaction/initialize) may already have
+reached Paystack by then, so it is only retried when the connection could
+not be opened at all and nothing was sent.
+
+Optional settings:
+    PAYSTACK_BASE_URL       API root (default https://api.paystack.co)
+    PAYSTACK_TIMEOUT        Per-attempt timeout in seconds (default 10)
+    PAYSTACK_MAX_RETRIES    Retries after the first attempt (default 2)
+    PAYSTACK_RETRY_BACKOFF  Backoff base in seconds (default 0.5)
+    PAYSTACK_POOL_SIZE      Keep-alive connections kept open (default 10)
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+PAYSTACK_BASE_URL = "https://api.paystack.co"
+
+# Responses worth another attempt; anything else is returned as-is
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Safe to send twice; other methods are only retried if never sent
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _get_headers():
+    # Read per call so key rotation (and override_settings) take effect
+    return {
+        "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+def _build_url(path):
+    base_url = _get_setting("PAYSTACK_BASE_URL", PAYSTACK_BASE_URL).rstrip("/")
+    return f"{base_url}/{path.lstrip('/')}"
+
+
+def _backoff_delay(attempt):
+    """Exponential backoff with full jitter for the given retry (0-based)"""
+    base = _get_setting("PAYSTACK_RETRY_BACKOFF", 0.5)
+    return random.uniform(0, base * (2**attempt))
+
+
+def _is_idempotent(method):
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+def _should_retry(method, status_code):
+    return _is_idempotent(method) and status_code in RETRY_STATUS_CODES
+
+
+def _never_sent(exc):
+    """True if the connection could not be opened, so no request went out"""
+    if isinstance(
+        exc, (requests.exceptions.ConnectTimeout, httpx.ConnectError, httpx.ConnectTimeout)
+    ):
+        return True
+    # requests wraps refused/unresolvable hosts as ConnectionError(MaxRetryError)
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _should_retry_error(method, exc):
+    return _is_idempotent(method) or _never_sent(exc)
+
+
+def _log_latency(method, path, status_code, started, attempt):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"Paystack {method} {path} -> {status_code} "
+        f"in {elapsed_ms:.1f}ms (attempt {attempt + 1})"
+    )
+
+
+class PaystackClient:
+    """Synchronous Paystack client on a pooled, keep-alive requests.Session"""
+
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    pool_size = _get_setting("PAYSTACK_POOL_SIZE", 10)
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=pool_size
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def request(self, method, path, **kwargs):
+        """
+        Send a request, retrying transient failures (see module docstring
+        for which ones). Returns the final response; raises the last
+        requests exception if no attempt got one.
+        """
+        url = _build_url(path)
+        send = getattr(self.session, method.lower())
+        timeout = _get_setting("PAYSTACK_TIMEOUT", 10)
+        max_retries = _get_setting("PAYSTACK_MAX_RETRIES", 2)
+
+        for attempt in range(max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = send(
+                    url, headers=_get_headers(), timeout=timeout, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                _log_latency(method, path, type(e).__name__, started, attempt)
+                if attempt == max_retries or not _should_retry_error(method, e):
+                    raise
+            else:
+                _log_latency(method, path, response.status_code, started, attempt)
+                if attempt == max_retries or not _should_retry(method, response.status_code):
+                    return response
+            time.sleep(_backoff_delay(attempt))
+
+    def post(self, path, json=None):
+        return self.request("POST", path, json=json)
+
+    def get(self, path, params=None):
+        if params is None:
+            return self.request("GET", path)
+        return self.request("GET", path, params=params)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class AsyncPaystackClient:
+    """
+    Async Paystack client on a pooled httpx.AsyncClient.
+    The underlying client is bound to the event loop it is first used on;
+    call aclose() when that loop shuts down.
+    """
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            pool_size = _get_setting("PAYSTACK_POOL_SIZE", 10)
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                ),
+            )
+        return self._client
+
+    async def request(self, method, path, **kwargs):
+        """Async counterpart of PaystackClient.request"""
+        url = _build_url(path)
+        timeout = _get_setting("PAYSTACK_TIMEOUT", 10)
+        max_retries = _get_setting("PAYSTACK_MAX_RETRIES", 2)
+
+        for attempt in range(max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    method, url, headers=_get_headers(), timeout=timeout, **kwargs
+                )
+            except httpx.TransportError as e:
+                _log_latency(method, path, type(e).__name__, started, attempt)
+                if attempt == max_retries or not _should_retry_error(method, e):
+                    raise
+            else:
+                _log_latency(method, path, response.status_code, started, attempt)
+                if attempt == max_retries or not _should_retry(method, response.status_code):
+                    return response
+            await asyncio.sleep(_backoff_delay(attempt))
+
+    async def post(self, path, json=None):
+        return await self.request("POST", path, json=json)
+
+    async def get(self, path, params=None):
+        return await self.request("GET", path, params=params)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Process-wide clients shared by all apps
+paystack_client = PaystackClient()
+async_paystack_client = AsyncPaystackClient()
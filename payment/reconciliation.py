@@ -0,0 +1,248 @@
+# payment/reconciliation.py
+"""
+Reconcile pending Paystack transactions whose webhook never arrived.
+
+Pages through unpaid rows in every app that takes Paystack payments:
+
+    payment            PaymentTransaction (status="pending")   MATERIAL-...
+    bulk_orders        OrderEntry (paid=False)                 ORDER-{bulk}-{entry}
+    image_bulk_orders  ImageOrderEntry (paid=False)            IMG-BULK-...
+    excel_bulk_orders  ExcelBulkOrder (payment_status=False)   EXL-...
+
+Each page is verified against Paystack concurrently on a bounded thread
+pool (HTTP only, no database work in the workers), then the successful
+charges are settled one batch at a time through the handler registered
+for their reference prefix (webhook_router.registry), so a reconciled
+payment goes down exactly the same idempotent path as a webhook.
+"""
+import logging
+import math
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.utils import timezone
+
+from webhook_router.registry import get_handler
+from .utils import verify_payment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = 8
+
+# Skip rows younger than this: the customer may still be on the checkout page
+DEFAULT_MIN_AGE = timedelta(minutes=15)
+# Rows older than this are abandoned checkouts, not lost webhooks
+DEFAULT_LOOKBACK = timedelta(days=2)
+
+PendingPayment = namedtuple("PendingPayment", ["source", "reference"])
+# result: parsed Paystack response, None when the call itself failed
+Verification = namedtuple("Verification", ["pending", "result", "latency"])
+
+
+def _payment_source():
+    from .models import PaymentTransaction
+
+    return (
+        PaymentTransaction.objects.filter(status="pending"),
+        "created",
+        lambda row: row.reference,
+        ("pk", "reference"),
+    )
+
+
+def _bulk_order_source():
+    from bulk_orders.models import OrderEntry
+
+    # The Paystack reference is built at checkout, not stored
+    return (
+        OrderEntry.objects.filter(paid=False),
+        "created_at",
+        lambda row: f"ORDER-{row.bulk_order_id}-{row.pk}",
+        ("pk", "bulk_order_id"),
+    )
+
+
+def _image_bulk_order_source():
+    from image_bulk_orders.models import ImageOrderEntry
+
+    return (
+        ImageOrderEntry.objects.filter(paid=False),
+        "created_at",
+        lambda row: row.reference,
+        ("pk", "reference"),
+    )
+
+
+def _excel_bulk_order_source():
+    from excel_bulk_orders.models import ExcelBulkOrder
+
+    return (
+        ExcelBulkOrder.objects.filter(payment_status=False),
+        "created_at",
+        lambda row: row.reference,
+        ("pk", "reference"),
+    )
+
+
+# source name -> callable returning (queryset, created field, reference builder, fields)
+SOURCES = {
+    "payment": _payment_source,
+    "bulk_orders": _bulk_order_source,
+    "image_bulk_orders": _image_bulk_order_source,
+    "excel_bulk_orders": _excel_bulk_order_source,
+}
+
+
+def iter_pending_pages(
+    sources=None,
+    min_age=DEFAULT_MIN_AGE,
+    lookback=DEFAULT_LOOKBACK,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Yield lists of PendingPayment, at most batch_size each.
+    Keyset pagination on pk keeps every page query cheap however deep we go.
+    """
+    now = timezone.now()
+    for name in sources or SOURCES:
+        queryset, created_field, build_reference, fields = SOURCES[name]()
+        queryset = queryset.filter(
+            **{
+                f"{created_field}__lte": now - min_age,
+                f"{created_field}__gte": now - lookback,
+            }
+        ).only(*fields).order_by("pk")
+
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(page[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            yield [PendingPayment(name, build_reference(row)) for row in rows]
+            if len(rows) < batch_size:
+                break
+
+
+def _verify(pending):
+    started = time.perf_counter()
+    result = verify_payment(pending.reference)
+    return Verification(pending, result, time.perf_counter() - started)
+
+
+def _is_paid(result):
+    # Unknown references (checkout never started) come back with status False
+    return bool(result.get("status")) and (
+        (result.get("data") or {}).get("status") == "success"
+    )
+
+
+def _settle(verification):
+    """Hand a verified charge to its app handler. Returns True when accepted."""
+    reference = verification.pending.reference
+    handler = get_handler(reference)
+    if handler is None:
+        logger.error(f"No handler registered for reconciled reference {reference}")
+        return False
+
+    payload = {"event": "charge.success", "data": verification.result["data"]}
+    response = handler(payload)
+    return response.status_code < 400
+
+
+class ReconciliationReport:
+    """Counts, throughput and verify latency percentiles for one run"""
+
+    def __init__(self):
+        self.checked = 0
+        self.settled = 0
+        self.unpaid = 0
+        self.errors = 0
+        self.latencies = []
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        """Transactions checked per second"""
+        return self.checked / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent):
+        """Verify latency (seconds) at the given percentile, nearest-rank"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def as_dict(self):
+        return {
+            "checked": self.checked,
+            "settled": self.settled,
+            "unpaid": self.unpaid,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+            "p99_ms": round(self.percentile(99) * 1000, 1),
+        }
+
+    def __str__(self):
+        stats = self.as_dict()
+        return (
+            f"Checked {stats['checked']} pending transactions in {stats['elapsed']}s "
+            f"({stats['throughput']}/s): {stats['settled']} settled, "
+            f"{stats['unpaid']} unpaid, {stats['errors']} errors. "
+            f"Verify latency p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+            f"p99={stats['p99_ms']}ms"
+        )
+
+
+def reconcile_pending_payments(
+    sources=None,
+    min_age=DEFAULT_MIN_AGE,
+    lookback=DEFAULT_LOOKBACK,
+    batch_size=DEFAULT_BATCH_SIZE,
+    workers=DEFAULT_WORKERS,
+):
+    """
+    Verify every pending transaction with Paystack and settle the paid ones.
+    Returns a ReconciliationReport.
+    """
+    report = ReconciliationReport()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for page in iter_pending_pages(sources, min_age, lookback, batch_size):
+            verifications = list(executor.map(_verify, page))
+
+            # Settle on this thread: the handlers lock rows and queue receipts
+            for verification in verifications:
+                report.checked += 1
+                report.latencies.append(verification.latency)
+
+                if verification.result is None:
+                    report.errors += 1
+                    continue
+                if not _is_paid(verification.result):
+                    report.unpaid += 1
+                    continue
+
+                try:
+                    if _settle(verification):
+                        report.settled += 1
+                    else:
+                        report.errors += 1
+                except Exception as e:
+                    report.errors += 1
+                    logger.error(
+                        f"Error settling {verification.pending.reference}: {str(e)}"
+                    )
+
+    report.elapsed = time.perf_counter() - started
+    logger.info(str(report))
+    return report
@@ -0,0 +1,93 @@
+# payment/settlement.py
+"""
+Payment settlement shared by every path that confirms a Paystack charge
+(the webhook handler and the reconciliation job).
+
+settle_payment() locks the PaymentTransaction row, flips it to success and
+marks all its unpaid orders paid with a single UPDATE ... RETURNING, so
+concurrent confirmations of the same reference settle it exactly once and
+receipts are only queued by the caller that did the transition.
+"""
+from collections import namedtuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from material.background_utils import (
+    send_payment_receipt_email_async,
+    generate_payment_receipt_pdf_task,
+)
+from order.models import BaseOrder
+from .models import PaymentTransaction
+from .status_cache import invalidate_payment_status
+import logging
+
+logger = logging.getLogger(__name__)
+
+# settled: this call moved the payment to success
+# order_ids: orders this call moved to paid
+Settlement = namedtuple("Settlement", ["payment", "settled", "order_ids"])
+
+
+def mark_orders_paid(payment):
+    """
+    Mark the payment's unpaid orders paid in one statement.
+    Returns the ids of the orders actually transitioned.
+    """
+    qn = connection.ops.quote_name
+    through = PaymentTransaction.orders.through._meta
+    order_meta = BaseOrder._meta
+    order_pk = order_meta.pk
+    paid_column = order_meta.get_field("paid").column
+    updated_column = order_meta.get_field("updated").column
+
+    sql = (
+        f"UPDATE {qn(order_meta.db_table)} "
+        f"SET {qn(paid_column)} = %s, {qn(updated_column)} = %s "
+        f"WHERE {qn(paid_column)} = %s AND {qn(order_pk.column)} IN ("
+        f"SELECT {qn(through.get_field('baseorder').column)} "
+        f"FROM {qn(through.db_table)} "
+        f"WHERE {qn(through.get_field('paymenttransaction').column)} = %s"
+        f") RETURNING {qn(order_pk.column)}"
+    )
+    params = [
+        True,
+        connection.ops.adapt_datetimefield_value(timezone.now()),
+        False,
+        payment.pk,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [order_pk.to_python(row[0]) for row in cursor.fetchall()]
+
+
+def settle_payment(reference):
+    """
+    Settle a successful charge. Idempotent: a reference that is already
+    settled is returned untouched with settled=False.
+
+    Raises PaymentTransaction.DoesNotExist for unknown references.
+    """
+    with transaction.atomic():
+        payment = PaymentTransaction.objects.select_for_update().get(
+            reference=reference
+        )
+
+        # Idempotency check - don't process if already successful
+        if payment.status == "success":
+            return Settlement(payment, False, [])
+
+        payment.status = "success"
+        payment.save(update_fields=["status", "modified"])
+        order_ids = mark_orders_paid(payment)
+
+    invalidate_payment_status("payment", reference)
+
+    # Send payment receipt (outside transaction for performance)
+    send_payment_receipt_email_async(str(payment.id))
+    generate_payment_receipt_pdf_task(str(payment.id))
+
+    logger.info(
+        f"Payment {reference} settled - {len(order_ids)} order(s) marked paid"
+    )
+    return Settlement(payment, True, order_ids)
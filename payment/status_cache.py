@@ -0,0 +1,89 @@
+# payment/status_cache.py
+"""
+Cached, single-flight payment status lookups for the verify endpoints.
+
+Frontends poll VerifyPaymentView and the per-app verify_payment actions
+every second or two after the Paystack redirect. Each poll is answered
+from the cache when possible:
+
+- settled (terminal) statuses are cached for CACHE_TTL_SHORT
+- pending statuses are cached for PAYMENT_STATUS_PENDING_TTL seconds
+- concurrent polls for the same key while nothing is cached wait for the
+  one lookup already in flight instead of each hitting the database
+
+The settlement paths call invalidate_payment_status() once a payment is
+marked paid, so the next poll sees it immediately.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Pending answers are only held briefly: the webhook may land any moment
+DEFAULT_PENDING_TTL = 3
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def payment_status_cache_key(kind, identifier):
+    return f"payment_status_{kind}_{identifier}"
+
+
+def _store(key, result, is_terminal):
+    if is_terminal(result):
+        timeout = getattr(settings, "CACHE_TTL_SHORT", 300)
+    else:
+        timeout = getattr(settings, "PAYMENT_STATUS_PENDING_TTL", DEFAULT_PENDING_TTL)
+    if timeout:
+        cache.set(key, result, timeout)
+
+
+def get_payment_status(key, loader, is_terminal):
+    """
+    Return the cached status payload for key, or call loader() to build it.
+
+    Only one loader per key runs at a time in this process; callers that
+    arrive while it runs get its result (or its exception). is_terminal(result)
+    decides how long the result is cached.
+    """
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = loader()
+        _store(key, flight.result, is_terminal)
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def invalidate_payment_status(kind, identifier):
+    """Drop the cached status so the next poll reads the settled row"""
+    cache.delete(payment_status_cache_key(kind, identifier))
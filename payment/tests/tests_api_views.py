@@ -614,8 +614,8 @@ class PaymentWebhookTests(TestCase):
 
         self.assertEqual(response.status_code, 404)
 
-    @patch("payment.api_views.generate_payment_receipt_pdf_task")
-    @patch("payment.api_views.send_payment_receipt_email_async")
+    @patch("payment.settlement.generate_payment_receipt_pdf_task")
+    @patch("payment.settlement.send_payment_receipt_email_async")
     @patch("payment.api_views.verify_paystack_signature")
     def test_webhook_successful_processing(self, mock_verify_sig, mock_email, mock_pdf):
         """Test successful webhook processing"""
@@ -667,7 +667,7 @@ class PaymentWebhookTests(TestCase):
         # Should return 200 (already processed)
         self.assertEqual(response.status_code, 200)
 
-    @patch("payment.api_views.send_payment_receipt_email_async")
+    @patch("payment.settlement.send_payment_receipt_email_async")
     @patch("payment.api_views.verify_paystack_signature")
     def test_webhook_multiple_orders(self, mock_verify_sig, mock_email):
         """Test webhook with multiple orders"""
@@ -946,8 +946,8 @@ class PaymentFlowIntegrationTests(APITestCase):
             paid=False,
         )
 
-    @patch("payment.api_views.generate_payment_receipt_pdf_task")
-    @patch("payment.api_views.send_payment_receipt_email_async")
+    @patch("payment.settlement.generate_payment_receipt_pdf_task")
+    @patch("payment.settlement.send_payment_receipt_email_async")
     @patch("payment.api_views.verify_paystack_signature")
     @patch("payment.api_views.initialize_payment")
     def test_complete_payment_flow(
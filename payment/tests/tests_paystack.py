@@ -0,0 +1,290 @@
+# payment/tests/tests_paystack.py
+"""
+Tests for payment/paystack.py against a local stand-in Paystack server
+
+Test Coverage:
+===============
+✅ PaystackClient
+   - Requests reach the configured base URL with auth headers
+   - Connections are kept alive and reused across calls
+   - 5xx responses to GETs are retried, then succeed
+   - Retries stop after PAYSTACK_MAX_RETRIES
+   - 4xx responses are not retried
+   - POSTs are not retried on 5xx or read timeouts, only when the
+     connection could not be opened
+
+✅ payment.utils through the client
+   - initialize_payment / verify_payment
+   - ainitialize_payment / averify_payment (httpx variant)
+   - Async POST read timeouts are not retried
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from payment.paystack import AsyncPaystackClient, PaystackClient, async_paystack_client
+from payment.utils import (
+    ainitialize_payment,
+    averify_payment,
+    initialize_payment,
+    verify_payment,
+)
+
+
+class StandInPaystackHandler(BaseHTTPRequestHandler):
+    """Answers like Paystack; scripted statuses and delays are served first"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        server.requests.append(
+            {
+                "method": self.command,
+                "path": self.path,
+                "authorization": self.headers.get("Authorization"),
+                "body": body,
+            }
+        )
+        server.connections.add(self.client_address)
+        if server.delays:
+            time.sleep(server.delays.pop(0))
+
+        status = server.statuses.pop(0) if server.statuses else 200
+        payload = {"status": status == 200, "message": "stand-in", "data": {}}
+        if self.path.startswith("/transaction/verify/"):
+            payload["data"] = {
+                "reference": self.path.rsplit("/", 1)[-1],
+                "status": "success",
+            }
+        elif body:
+            payload["data"] = {"reference": body["reference"]}
+
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client timed out and hung up
+
+    do_GET = _respond
+    do_POST = _respond
+
+
+class StandInServerMixin:
+    handler_class = StandInPaystackHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), cls.handler_class)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.connections = set()
+        self.server.statuses = []
+        self.server.delays = []
+        settings_override = override_settings(
+            PAYSTACK_BASE_URL=self.base_url,
+            PAYSTACK_SECRET_KEY="sk_test_secret",
+            PAYSTACK_RETRY_BACKOFF=0,
+            PAYSTACK_MAX_RETRIES=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class PaystackClientTests(StandInServerMixin, SimpleTestCase):
+    """Test the pooled synchronous client"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = PaystackClient()
+        self.addCleanup(self.client.close)
+
+    def test_sends_auth_header_to_base_url(self):
+        """Test requests go to PAYSTACK_BASE_URL with the bearer token"""
+        response = self.client.get("/transaction/verify/REF-1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests[0]["path"], "/transaction/verify/REF-1")
+        self.assertEqual(
+            self.server.requests[0]["authorization"], "Bearer sk_test_secret"
+        )
+
+    def test_reuses_keep_alive_connection(self):
+        """Test consecutive calls share one TCP connection"""
+        for i in range(5):
+            self.client.get(f"/transaction/verify/REF-{i}")
+
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_retries_server_errors(self):
+        """Test 5xx responses to a GET are retried until one succeeds"""
+        self.server.statuses = [503, 502]
+
+        response = self.client.get("/transaction/verify/REF")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_gives_up_after_max_retries(self):
+        """Test the last failed response is returned once retries run out"""
+        self.server.statuses = [500, 500, 500, 500]
+
+        response = self.client.get("/transaction/verify/REF")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_client_errors_not_retried(self):
+        """Test 4xx responses are returned immediately"""
+        self.server.statuses = [400]
+
+        response = self.client.get("/transaction/verify/REF")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_post_server_errors_not_retried(self):
+        """Test a 5xx to initialize is returned, the POST may have been applied"""
+        self.server.statuses = [503]
+
+        response = self.client.post("/transaction/initialize", json={"reference": "R"})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 1)
+
+    @override_settings(PAYSTACK_TIMEOUT=0.2)
+    def test_post_read_timeout_not_retried(self):
+        """Test a read timeout on initialize is raised without sending it again"""
+        self.server.delays = [1]
+
+        with self.assertRaises(requests.ReadTimeout):
+            self.client.post("/transaction/initialize", json={"reference": "R"})
+
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_post_connect_error_retried(self):
+        """Test a POST is retried when the connection could not be opened"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+
+        with override_settings(PAYSTACK_BASE_URL=f"http://127.0.0.1:{closed_port}"), patch(
+            "payment.paystack._backoff_delay", return_value=0
+        ) as backoff:
+            with self.assertRaises(requests.ConnectionError):
+                self.client.post("/transaction/initialize", json={"reference": "R"})
+
+        self.assertEqual(backoff.call_count, 2)
+
+
+class PaymentUtilsThroughClientTests(StandInServerMixin, SimpleTestCase):
+    """Test payment.utils functions end to end against the stand-in server"""
+
+    def test_initialize_payment(self):
+        """Test initialize_payment posts the kobo payload"""
+        result = initialize_payment(
+            Decimal("100.00"), "test@example.com", "REF-INIT", "https://cb"
+        )
+
+        self.assertTrue(result["status"])
+        self.assertEqual(result["data"]["reference"], "REF-INIT")
+        self.assertEqual(self.server.requests[0]["body"]["amount"], 10000)
+
+    def test_initialize_payment_error_returns_none(self):
+        """Test a rejected initialization returns None"""
+        self.server.statuses = [401]
+
+        result = initialize_payment(
+            Decimal("100.00"), "test@example.com", "REF-INIT", "https://cb"
+        )
+
+        self.assertIsNone(result)
+
+    def test_verify_payment(self):
+        """Test verify_payment returns Paystack's data"""
+        result = verify_payment("REF-VERIFY")
+
+        self.assertEqual(result["data"]["status"], "success")
+
+    def test_async_variants(self):
+        """Test the httpx-based variants share one pooled connection"""
+
+        async def run():
+            try:
+                init = await ainitialize_payment(
+                    Decimal("50.00"), "test@example.com", "REF-ASYNC", "https://cb"
+                )
+                verify = await averify_payment("REF-ASYNC")
+                return init, verify
+            finally:
+                await async_paystack_client.aclose()
+
+        init, verify = asyncio.run(run())
+
+        self.assertEqual(init["data"]["reference"], "REF-ASYNC")
+        self.assertEqual(verify["data"]["reference"], "REF-ASYNC")
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_async_client_retries_server_errors(self):
+        """Test the async client retries 5xx responses"""
+        self.server.statuses = [503]
+        client = AsyncPaystackClient()
+
+        async def run():
+            try:
+                return await client.get("/transaction/verify/REF")
+            finally:
+                await client.aclose()
+
+        response = asyncio.run(run())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 2)
+
+    @override_settings(PAYSTACK_TIMEOUT=0.2)
+    def test_async_post_read_timeout_not_retried(self):
+        """Test the async client does not resend initialize after a read timeout"""
+        self.server.delays = [1]
+        client = AsyncPaystackClient()
+
+        async def run():
+            try:
+                return await client.post("/transaction/initialize", json={"reference": "R"})
+            finally:
+                await client.aclose()
+
+        with self.assertRaises(httpx.ReadTimeout):
+            asyncio.run(run())
+
+        self.assertEqual(len(self.server.requests), 1)
@@ -0,0 +1,309 @@
+# payment/tests/tests_reconciliation.py
+"""
+Tests for payment/reconciliation.py against a local stand-in Paystack server
+
+Test Coverage:
+===============
+✅ Paging
+   - Pending rows from every app, with the Paystack reference each one uses
+   - Rows inside min_age / outside lookback skipped
+   - Keyset pages never exceed batch_size
+
+✅ reconcile_pending_payments()
+   - Paid charges settled through the registered app handler
+   - Abandoned and unknown references left pending
+   - Paystack failures counted as errors
+   - Verify calls bounded by the worker count
+   - reconcile_payments command
+
+✅ Benchmark: throughput and latency percentiles with a slow Paystack
+"""
+import json
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from bulk_orders.models import BulkOrderLink, OrderEntry
+from excel_bulk_orders.models import ExcelBulkOrder
+from order.models import BaseOrder
+from payment.models import PaymentTransaction
+from payment.reconciliation import (
+    ReconciliationReport,
+    iter_pending_pages,
+    reconcile_pending_payments,
+)
+from payment.tests.tests_paystack import StandInPaystackHandler, StandInServerMixin
+from webhook_router.registry import clear_handler_cache
+
+User = get_user_model()
+
+
+class ReconcilePaystackHandler(StandInPaystackHandler):
+    """Answers verify calls from server.outcomes, after server.delay seconds"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.inflight += 1
+            server.max_inflight = max(server.max_inflight, server.inflight)
+        try:
+            time.sleep(server.delay)
+            reference = self.path.rsplit("/", 1)[-1]
+            server.verified.append(reference)
+            outcome = server.outcomes.get(reference)
+
+            if outcome == 502:
+                # Gateway error page, not JSON
+                status, data = 502, b"<html>Bad Gateway</html>"
+            elif outcome is None:
+                status = 400
+                data = json.dumps(
+                    {"status": False, "message": "Transaction reference not found"}
+                ).encode()
+            else:
+                status = 200
+                data = json.dumps(
+                    {
+                        "status": True,
+                        "message": "Verification successful",
+                        "data": {"reference": reference, "status": outcome},
+                    }
+                ).encode()
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.inflight -= 1
+
+
+class ReconciliationTestMixin(StandInServerMixin):
+    handler_class = ReconcilePaystackHandler
+
+    def setUp(self):
+        super().setUp()
+        self.server.outcomes = {}
+        self.server.verified = []
+        self.server.delay = 0
+        self.server.lock = threading.Lock()
+        self.server.inflight = 0
+        self.server.max_inflight = 0
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        clear_handler_cache()
+        self.addCleanup(clear_handler_cache)
+
+    def _create_payment(self, reference, outcome=None):
+        order = BaseOrder.objects.create(
+            user=self.user,
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="08012345678",
+            total_cost=Decimal("10000.00"),
+        )
+        payment = PaymentTransaction.objects.create(
+            reference=reference,
+            amount=Decimal("10000.00"),
+            email="john@example.com",
+        )
+        payment.orders.add(order)
+        if outcome:
+            self.server.outcomes[reference] = outcome
+        return payment, order
+
+    def _reconcile(self, **kwargs):
+        kwargs.setdefault("min_age", timedelta(0))
+        return reconcile_pending_payments(**kwargs)
+
+
+@patch("payment.settlement.generate_payment_receipt_pdf_task")
+@patch("payment.settlement.send_payment_receipt_email_async")
+class ReconcilePendingPaymentsTests(ReconciliationTestMixin, TestCase):
+    """Test verifying and settling pending transactions"""
+
+    def test_paid_charges_settled(self, mock_email, mock_pdf):
+        """Test charges Paystack reports as paid are settled"""
+        paid, paid_order = self._create_payment("MATERIAL-PAID", "success")
+        abandoned, _ = self._create_payment("MATERIAL-ABANDONED", "abandoned")
+        unknown, _ = self._create_payment("MATERIAL-UNKNOWN")
+
+        report = self._reconcile(sources=["payment"])
+
+        self.assertEqual(report.checked, 3)
+        self.assertEqual(report.settled, 1)
+        self.assertEqual(report.unpaid, 2)
+        self.assertEqual(report.errors, 0)
+
+        paid.refresh_from_db()
+        paid_order.refresh_from_db()
+        self.assertEqual(paid.status, "success")
+        self.assertTrue(paid_order.paid)
+        mock_email.assert_called_once_with(str(paid.id))
+        for payment in (abandoned, unknown):
+            payment.refresh_from_db()
+            self.assertEqual(payment.status, "pending")
+
+    def test_settled_payments_not_rechecked(self, mock_email, mock_pdf):
+        """Test a second run only verifies what is still pending"""
+        self._create_payment("MATERIAL-PAID", "success")
+        self._create_payment("MATERIAL-ABANDONED", "abandoned")
+        self._reconcile(sources=["payment"])
+        self.server.verified = []
+
+        report = self._reconcile(sources=["payment"])
+
+        self.assertEqual(self.server.verified, ["MATERIAL-ABANDONED"])
+        self.assertEqual(report.settled, 0)
+
+    def test_paystack_errors_counted(self, mock_email, mock_pdf):
+        """Test failed verify calls are errors and leave the payment pending"""
+        payment, _ = self._create_payment("MATERIAL-DOWN", 502)
+
+        report = self._reconcile(sources=["payment"])
+
+        self.assertEqual(report.errors, 1)
+        self.assertEqual(len(self.server.verified), 3)  # Retried
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "pending")
+
+    def test_age_window(self, mock_email, mock_pdf):
+        """Test fresh and very old transactions are skipped"""
+        self._create_payment("MATERIAL-FRESH", "success")
+        old, _ = self._create_payment("MATERIAL-OLD", "success")
+        PaymentTransaction.objects.filter(pk=old.pk).update(
+            created=timezone.now() - timedelta(days=30)
+        )
+
+        report = reconcile_pending_payments(
+            sources=["payment"], min_age=timedelta(minutes=15)
+        )
+
+        self.assertEqual(report.checked, 0)
+        self.assertEqual(self.server.verified, [])
+
+    def test_worker_pool_bounded(self, mock_email, mock_pdf):
+        """Test no more than `workers` verify calls are in flight"""
+        self.server.delay = 0.02
+        for i in range(12):
+            self._create_payment(f"MATERIAL-POOL-{i}", "abandoned")
+
+        self._reconcile(sources=["payment"], workers=3)
+
+        self.assertLessEqual(self.server.max_inflight, 3)
+        self.assertGreater(self.server.max_inflight, 1)
+
+    def test_command(self, mock_email, mock_pdf):
+        """Test reconcile_payments prints the run report"""
+        self._create_payment("MATERIAL-PAID", "success")
+        out = StringIO()
+
+        call_command(
+            "reconcile_payments", source=["payment"], min_age=0, stdout=out
+        )
+
+        self.assertIn("1 settled", out.getvalue())
+        self.assertIn("p95=", out.getvalue())
+
+
+class PendingPagesTests(ReconciliationTestMixin, TestCase):
+    """Test paging pending rows across apps"""
+
+    def test_references_per_app(self):
+        """Test each app's rows come back with their Paystack reference"""
+        self._create_payment("MATERIAL-ONE")
+        bulk_order = BulkOrderLink.objects.create(
+            organization_name="Test Church",
+            price_per_item=Decimal("5000.00"),
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user,
+        )
+        entry = OrderEntry.objects.create(
+            bulk_order=bulk_order,
+            email="user@example.com",
+            full_name="User",
+            size="M",
+        )
+        excel_order = ExcelBulkOrder.objects.create(
+            title="Test Order",
+            coordinator_name="Test Coordinator",
+            coordinator_email="test@example.com",
+            coordinator_phone="08012345678",
+            price_per_participant=Decimal("5000.00"),
+            created_by=self.user,
+        )
+
+        pages = list(iter_pending_pages(min_age=timedelta(0)))
+        references = {p.source: p.reference for page in pages for p in page}
+
+        self.assertEqual(references["payment"], "MATERIAL-ONE")
+        self.assertEqual(
+            references["bulk_orders"], f"ORDER-{bulk_order.id}-{entry.id}"
+        )
+        self.assertEqual(references["excel_bulk_orders"], excel_order.reference)
+
+    def test_pages_bounded_by_batch_size(self):
+        """Test keyset pages cover every row once, batch_size at a time"""
+        for i in range(7):
+            self._create_payment(f"MATERIAL-PAGE-{i}")
+
+        pages = list(
+            iter_pending_pages(["payment"], min_age=timedelta(0), batch_size=3)
+        )
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        references = [p.reference for page in pages for p in page]
+        self.assertEqual(len(set(references)), 7)
+
+
+class ReconciliationReportTests(TestCase):
+    """Test the run report"""
+
+    def test_percentiles_and_throughput(self):
+        """Test nearest-rank percentiles and checks per second"""
+        report = ReconciliationReport()
+        report.latencies = [i / 1000 for i in range(1, 101)]
+        report.checked = 100
+        report.elapsed = 2.0
+
+        self.assertEqual(report.percentile(50), 0.05)
+        self.assertEqual(report.percentile(95), 0.095)
+        self.assertEqual(report.percentile(100), 0.1)
+        self.assertEqual(report.throughput, 50)
+        self.assertEqual(ReconciliationReport().percentile(95), 0.0)
+
+
+@patch("payment.settlement.generate_payment_receipt_pdf_task")
+@patch("payment.settlement.send_payment_receipt_email_async")
+class ReconciliationThroughputTests(ReconciliationTestMixin, TestCase):
+    """Benchmark: pending transactions/sec with a 20ms Paystack"""
+
+    TRANSACTIONS = 40
+
+    def test_concurrent_verification_throughput(self, mock_email, mock_pdf):
+        """Test the worker pool overlaps Paystack round trips"""
+        self.server.delay = 0.02
+        for i in range(self.TRANSACTIONS):
+            self._create_payment(
+                f"MATERIAL-BENCH-{i}", "success" if i % 2 else "abandoned"
+            )
+
+        report = self._reconcile(sources=["payment"], workers=8, batch_size=20)
+
+        self.assertEqual(report.checked, self.TRANSACTIONS)
+        self.assertEqual(report.settled, self.TRANSACTIONS // 2)
+        self.assertGreaterEqual(report.percentile(50), 0.02)
+        # Serial verification tops out at 50/s with 20ms calls
+        self.assertGreater(report.throughput, 50)
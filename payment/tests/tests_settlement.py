@@ -0,0 +1,191 @@
+# payment/tests/tests_settlement.py
+"""
+Tests for payment/settlement.py
+
+Test Coverage:
+===============
+✅ settle_payment()
+   - Marks the payment successful and every unpaid order paid
+   - Returns only the orders it actually transitioned
+   - Queues receipts once, only when it settled the payment
+   - Idempotent on repeat calls
+   - Constant query count regardless of order count
+   - Unknown references raise DoesNotExist
+
+✅ Concurrency
+   - Parallel webhook + settle calls settle exactly once
+"""
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from order.models import BaseOrder
+from payment.api_views import handle_payment_webhook
+from payment.models import PaymentTransaction
+from payment.settlement import settle_payment
+
+User = get_user_model()
+
+
+class SettlementFixturesMixin:
+    def _create_payment(self, order_count=2, reference="MATERIAL-SETTLE"):
+        self.user, _ = User.objects.get_or_create(
+            username="testuser", defaults={"email": "test@example.com"}
+        )
+        orders = [
+            BaseOrder.objects.create(
+                user=self.user,
+                first_name="John",
+                last_name="Doe",
+                email="john@example.com",
+                phone_number="08012345678",
+                total_cost=Decimal("10000.00"),
+                paid=False,
+            )
+            for _ in range(order_count)
+        ]
+        payment = PaymentTransaction.objects.create(
+            reference=reference,
+            amount=Decimal("10000.00") * order_count,
+            email="john@example.com",
+            status="pending",
+        )
+        payment.orders.add(*orders)
+        return payment, orders
+
+
+@patch("payment.settlement.generate_payment_receipt_pdf_task")
+@patch("payment.settlement.send_payment_receipt_email_async")
+class SettlePaymentTests(SettlementFixturesMixin, TestCase):
+    """Test settle_payment"""
+
+    def test_settles_payment_and_orders(self, mock_email, mock_pdf):
+        """Test the payment and all its orders are marked paid"""
+        payment, orders = self._create_payment()
+
+        settlement = settle_payment("MATERIAL-SETTLE")
+
+        self.assertTrue(settlement.settled)
+        self.assertEqual(
+            sorted(settlement.order_ids), sorted(order.id for order in orders)
+        )
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "success")
+        self.assertEqual(
+            BaseOrder.objects.filter(id__in=[o.id for o in orders], paid=True).count(),
+            2,
+        )
+        mock_email.assert_called_once_with(str(payment.id))
+        mock_pdf.assert_called_once_with(str(payment.id))
+
+    def test_only_unpaid_orders_returned(self, mock_email, mock_pdf):
+        """Test orders that were already paid are left out of the result"""
+        payment, orders = self._create_payment(order_count=3)
+        BaseOrder.objects.filter(id=orders[0].id).update(paid=True)
+
+        settlement = settle_payment("MATERIAL-SETTLE")
+
+        self.assertEqual(
+            sorted(settlement.order_ids), sorted(o.id for o in orders[1:])
+        )
+
+    def test_repeat_settlement_is_noop(self, mock_email, mock_pdf):
+        """Test settling twice transitions nothing and queues no receipts"""
+        self._create_payment()
+        settle_payment("MATERIAL-SETTLE")
+        mock_email.reset_mock()
+        mock_pdf.reset_mock()
+
+        settlement = settle_payment("MATERIAL-SETTLE")
+
+        self.assertFalse(settlement.settled)
+        self.assertEqual(settlement.order_ids, [])
+        mock_email.assert_not_called()
+        mock_pdf.assert_not_called()
+
+    def test_query_count_independent_of_orders(self, mock_email, mock_pdf):
+        """Test settlement issues the same queries for 1 or 20 orders"""
+        self._create_payment(order_count=1, reference="MATERIAL-ONE")
+        with CaptureQueriesContext(connection) as single:
+            settle_payment("MATERIAL-ONE")
+
+        payment, _ = self._create_payment(order_count=20, reference="MATERIAL-MANY")
+        with CaptureQueriesContext(connection) as many:
+            settlement = settle_payment("MATERIAL-MANY")
+
+        self.assertEqual(len(settlement.order_ids), 20)
+        self.assertEqual(len(many.captured_queries), len(single.captured_queries))
+
+    def test_unknown_reference(self, mock_email, mock_pdf):
+        """Test unknown references raise DoesNotExist"""
+        with self.assertRaises(PaymentTransaction.DoesNotExist):
+            settle_payment("MATERIAL-MISSING")
+
+
+class SettlementConcurrencyTests(SettlementFixturesMixin, TransactionTestCase):
+    """Test webhook + verify races settle a payment exactly once"""
+
+    WORKERS = 6
+
+    def setUp(self):
+        """Set up test fixtures"""
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("Parallel writers need a database shared across connections")
+
+    @patch("payment.settlement.generate_payment_receipt_pdf_task")
+    @patch("payment.settlement.send_payment_receipt_email_async")
+    def test_parallel_confirmations_settle_once(self, mock_email, mock_pdf):
+        """Test concurrent webhook deliveries and settle calls race safely"""
+        payment, orders = self._create_payment(order_count=3)
+        payload = {
+            "event": "charge.success",
+            "data": {"reference": "MATERIAL-SETTLE", "status": "success"},
+        }
+        results = []
+        errors = []
+        barrier = threading.Barrier(self.WORKERS)
+
+        def worker(index):
+            try:
+                barrier.wait()
+                if index % 2:
+                    # Webhook delivery
+                    results.append(handle_payment_webhook(payload).status_code)
+                else:
+                    # Verify / reconciliation path
+                    results.append(settle_payment("MATERIAL-SETTLE"))
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(self.WORKERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        settlements = [r for r in results if not isinstance(r, int)]
+        statuses = [r for r in results if isinstance(r, int)]
+        self.assertEqual(set(statuses), {200})
+
+        # Receipts are queued exactly once across all racers
+        mock_email.assert_called_once_with(str(payment.id))
+        mock_pdf.assert_called_once_with(str(payment.id))
+        transitioned = [oid for s in settlements for oid in s.order_ids]
+        self.assertLessEqual(len(transitioned), 3)
+        self.assertEqual(len(transitioned), len(set(transitioned)))
+
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "success")
+        self.assertFalse(
+            BaseOrder.objects.filter(id__in=[o.id for o in orders], paid=False).exists()
+        )
@@ -0,0 +1,188 @@
+# payment/tests/tests_status_cache.py
+"""
+Tests for payment/status_cache.py and the polled verify endpoints
+
+Test Coverage:
+===============
+✅ get_payment_status()
+   - N concurrent polls for one key run the loader once
+   - Loader errors reach every waiting caller and are not cached
+   - Terminal results cached longer than pending ones
+
+✅ VerifyPaymentView
+   - Repeat polls answered from the cache (no payment queries)
+   - settle_payment() invalidates the cached pending answer
+"""
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from order.models import BaseOrder
+from payment.models import PaymentTransaction
+from payment.settlement import settle_payment
+from payment.status_cache import get_payment_status, payment_status_cache_key
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "payment-status-tests",
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PAYMENT_STATUS_PENDING_TTL=3)
+class GetPaymentStatusTests(SimpleTestCase):
+    """Test single-flight lookups"""
+
+    POLLERS = 20
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_polls_share_one_lookup(self):
+        """Test N concurrent polls for one reference make one upstream call"""
+        calls = []
+        barrier = threading.Barrier(self.POLLERS)
+        results = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)  # Slow upstream: every poller arrives meanwhile
+            return {"status": "pending"}
+
+        def poll():
+            barrier.wait()
+            results.append(
+                get_payment_status(
+                    "payment_status_test_REF",
+                    loader,
+                    is_terminal=lambda data: data["status"] != "pending",
+                )
+            )
+
+        threads = [threading.Thread(target=poll) for _ in range(self.POLLERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"status": "pending"}] * self.POLLERS)
+
+    def test_errors_shared_and_not_cached(self):
+        """Test a failing lookup raises for waiters and is retried next poll"""
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def failing_loader():
+            started.set()
+            release.wait()
+            raise PaymentTransaction.DoesNotExist()
+
+        def waiter():
+            started.wait()
+            try:
+                get_payment_status("payment_status_test_ERR", failing_loader, bool)
+            except PaymentTransaction.DoesNotExist as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        with self.assertRaises(PaymentTransaction.DoesNotExist):
+            threading.Timer(0.05, release.set).start()
+            get_payment_status("payment_status_test_ERR", failing_loader, bool)
+        thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(
+            get_payment_status("payment_status_test_ERR", lambda: {"ok": 1}, bool),
+            {"ok": 1},
+        )
+
+    def test_ttl_depends_on_terminal_state(self):
+        """Test settled answers outlive pending ones"""
+        with patch("payment.status_cache.cache.set") as mock_set:
+            get_payment_status("k1", lambda: {"paid": False}, lambda d: d["paid"])
+            get_payment_status("k2", lambda: {"paid": True}, lambda d: d["paid"])
+
+        pending_timeout = mock_set.call_args_list[0][0][2]
+        terminal_timeout = mock_set.call_args_list[1][0][2]
+        self.assertEqual(pending_timeout, 3)
+        self.assertGreater(terminal_timeout, pending_timeout)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class VerifyPaymentViewCacheTests(TestCase):
+    """Test VerifyPaymentView polling through the status cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("payment:verify")
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        order = BaseOrder.objects.create(
+            user=self.user,
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="08012345678",
+            total_cost=Decimal("10000.00"),
+        )
+        self.payment = PaymentTransaction.objects.create(
+            reference="MATERIAL-POLL",
+            amount=Decimal("10000.00"),
+            email="john@example.com",
+        )
+        self.payment.orders.add(order)
+
+    def test_repeat_polls_served_from_cache(self):
+        """Test only the first poll reads the payment tables"""
+        first = self.client.get(self.url, {"reference": "MATERIAL-POLL"})
+
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(5):
+                response = self.client.get(self.url, {"reference": "MATERIAL-POLL"})
+
+        self.assertEqual(response.data, first.data)
+        table = PaymentTransaction._meta.db_table
+        self.assertFalse([q for q in ctx.captured_queries if table in q["sql"]])
+        self.assertTrue(cache.get(payment_status_cache_key("payment", "MATERIAL-POLL")))
+
+    @patch("payment.settlement.generate_payment_receipt_pdf_task")
+    @patch("payment.settlement.send_payment_receipt_email_async")
+    def test_settlement_invalidates_cached_status(self, mock_email, mock_pdf):
+        """Test the next poll after settlement sees the payment as paid"""
+        response = self.client.get(self.url, {"reference": "MATERIAL-POLL"})
+        self.assertFalse(response.data["paid"])
+
+        settle_payment("MATERIAL-POLL")
+        response = self.client.get(self.url, {"reference": "MATERIAL-POLL"})
+
+        self.assertTrue(response.data["paid"])
+        self.assertEqual(response.data["status"], "success")
+
+    def test_unknown_reference_not_cached(self):
+        """Test 404s are not cached, so a late-created payment is found"""
+        response = self.client.get(self.url, {"reference": "MATERIAL-LATE"})
+        self.assertEqual(response.status_code, 404)
+
+        PaymentTransaction.objects.create(
+            reference="MATERIAL-LATE", amount=Decimal("1.00"), email="a@b.com"
+        )
+        response = self.client.get(self.url, {"reference": "MATERIAL-LATE"})
+
+        self.assertEqual(response.status_code, 200)
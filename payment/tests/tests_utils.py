@@ -233,7 +233,7 @@ class InitializePaymentTests(TestCase):
         self.metadata = {"order_id": "123", "customer": "John Doe"}
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_initialize_payment_success(self, mock_post):
         """Test successful payment initialization"""
         # Mock successful response
@@ -261,7 +261,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(result["data"]["reference"], "MATERIAL-TEST1234")
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_amount_converted_to_kobo(self, mock_post):
         """Test that amount is converted to kobo (multiply by 100)"""
         mock_response = Mock()
@@ -281,7 +281,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["amount"], 1000000)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_amount_with_decimals_converted_correctly(self, mock_post):
         """Test that decimal amounts are converted correctly"""
         mock_response = Mock()
@@ -300,7 +300,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["amount"], 1234567)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_headers_include_authorization(self, mock_post):
         """Test that headers include authorization bearer token"""
         mock_response = Mock()
@@ -319,7 +319,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(headers["Content-Type"], "application/json")
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_payload_structure(self, mock_post):
         """Test that payload has correct structure"""
         mock_response = Mock()
@@ -346,7 +346,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["metadata"], self.metadata)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_metadata_defaults_to_empty_dict(self, mock_post):
         """Test that metadata defaults to empty dict when None"""
         mock_response = Mock()
@@ -364,7 +364,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["metadata"], {})
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_correct_api_url(self, mock_post):
         """Test that correct Paystack API URL is used"""
         mock_response = Mock()
@@ -380,7 +380,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(url, "https://api.paystack.co/transaction/initialize")
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_timeout_set_to_10_seconds(self, mock_post):
         """Test that timeout is set to 10 seconds"""
         mock_response = Mock()
@@ -396,7 +396,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(timeout, 10)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_timeout_returns_none(self, mock_post):
         """Test that timeout exception returns None"""
         mock_post.side_effect = requests.Timeout("Connection timeout")
@@ -408,7 +408,7 @@ class InitializePaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_request_exception_returns_none(self, mock_post):
         """Test that request exceptions return None"""
         mock_post.side_effect = requests.RequestException("Network error")
@@ -420,7 +420,7 @@ class InitializePaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_non_ok_response_returns_none(self, mock_post):
         """Test that non-OK response returns None"""
         mock_response = Mock()
@@ -438,7 +438,7 @@ class InitializePaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_json_decode_error_returns_none(self, mock_post):
         """Test that JSON decode error returns None"""
         mock_response = Mock()
@@ -453,7 +453,7 @@ class InitializePaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_generic_exception_returns_none(self, mock_post):
         """Test that generic exceptions return None"""
         mock_post.side_effect = Exception("Unexpected error")
@@ -465,7 +465,7 @@ class InitializePaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_zero_amount(self, mock_post):
         """Test initialization with zero amount"""
         mock_response = Mock()
@@ -483,7 +483,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["amount"], 0)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_very_large_amount(self, mock_post):
         """Test initialization with very large amount"""
         mock_response = Mock()
@@ -501,7 +501,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["amount"], 9999999999)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_complex_metadata(self, mock_post):
         """Test initialization with complex nested metadata"""
         mock_response = Mock()
@@ -529,7 +529,7 @@ class InitializePaymentTests(TestCase):
         self.assertEqual(payload["metadata"], complex_metadata)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_special_characters_in_email(self, mock_post):
         """Test initialization with special characters in email"""
         mock_response = Mock()
@@ -562,7 +562,7 @@ class VerifyPaymentTests(TestCase):
         self.reference = "MATERIAL-TEST1234"
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_verify_payment_success(self, mock_get):
         """Test successful payment verification"""
         mock_response = Mock()
@@ -585,7 +585,7 @@ class VerifyPaymentTests(TestCase):
         self.assertEqual(result["data"]["reference"], "MATERIAL-TEST1234")
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_correct_api_url_with_reference(self, mock_get):
         """Test that correct API URL is constructed with reference"""
         mock_response = Mock()
@@ -603,7 +603,7 @@ class VerifyPaymentTests(TestCase):
         )
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_headers_include_authorization(self, mock_get):
         """Test that headers include authorization bearer token"""
         mock_response = Mock()
@@ -621,7 +621,7 @@ class VerifyPaymentTests(TestCase):
         self.assertEqual(headers["Content-Type"], "application/json")
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_timeout_set_to_10_seconds(self, mock_get):
         """Test that timeout is set to 10 seconds"""
         mock_response = Mock()
@@ -637,7 +637,7 @@ class VerifyPaymentTests(TestCase):
         self.assertEqual(timeout, 10)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_timeout_returns_none(self, mock_get):
         """Test that timeout exception returns None"""
         mock_get.side_effect = requests.Timeout("Connection timeout")
@@ -647,7 +647,7 @@ class VerifyPaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_request_exception_returns_none(self, mock_get):
         """Test that request exceptions return None"""
         mock_get.side_effect = requests.RequestException("Network error")
@@ -657,7 +657,7 @@ class VerifyPaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_json_decode_error_returns_none(self, mock_get):
         """Test that JSON decode error returns None"""
         mock_response = Mock()
@@ -670,7 +670,7 @@ class VerifyPaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_generic_exception_returns_none(self, mock_get):
         """Test that generic exceptions return None"""
         mock_get.side_effect = Exception("Unexpected error")
@@ -680,7 +680,7 @@ class VerifyPaymentTests(TestCase):
         self.assertIsNone(result)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_failed_verification_response(self, mock_get):
         """Test handling of failed verification response"""
         mock_response = Mock()
@@ -702,7 +702,7 @@ class VerifyPaymentTests(TestCase):
         self.assertEqual(result["data"]["status"], "failed")
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_reference_with_special_characters(self, mock_get):
         """Test verification with reference containing special characters"""
         mock_response = Mock()
@@ -719,7 +719,7 @@ class VerifyPaymentTests(TestCase):
         self.assertIn(special_reference, url)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_returns_full_response_data(self, mock_get):
         """Test that function returns full response data"""
         full_response = {
@@ -761,8 +761,8 @@ class UtilsIntegrationTests(TestCase):
     @override_settings(
         PAYSTACK_SECRET_KEY="sk_test_secret", PAYSTACK_PUBLIC_KEY="pk_test_public"
     )
-    @patch("payment.utils.requests.post")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.post")
+    @patch("payment.paystack.requests.Session.get")
     def test_initialize_then_verify_flow(self, mock_get, mock_post):
         """Test complete flow: initialize then verify"""
         # Mock initialization
@@ -827,7 +827,7 @@ class UtilsEdgeCaseTests(TestCase):
     """Test edge cases and boundary conditions"""
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_initialize_with_empty_metadata_dict(self, mock_post):
         """Test initialization with explicitly empty metadata"""
         mock_response = Mock()
@@ -849,7 +849,7 @@ class UtilsEdgeCaseTests(TestCase):
         self.assertEqual(payload["metadata"], {})
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_initialize_with_very_long_reference(self, mock_post):
         """Test initialization with very long reference"""
         mock_response = Mock()
@@ -872,7 +872,7 @@ class UtilsEdgeCaseTests(TestCase):
         self.assertEqual(payload["reference"], long_reference)
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.get")
+    @patch("payment.paystack.requests.Session.get")
     def test_verify_with_empty_reference(self, mock_get):
         """Test verification with empty reference"""
         mock_response = Mock()
@@ -889,7 +889,7 @@ class UtilsEdgeCaseTests(TestCase):
         self.assertTrue(url.endswith("/transaction/verify/"))
 
     @override_settings(PAYSTACK_SECRET_KEY="sk_test_secret")
-    @patch("payment.utils.requests.post")
+    @patch("payment.paystack.requests.Session.post")
     def test_initialize_decimal_rounding(self, mock_post):
         """Test that decimal amounts are properly rounded to kobo"""
         mock_response = Mock()
@@ -1,8 +1,9 @@
 # payment/utils.py
-import json
+import httpx
 import requests
 from decimal import Decimal
 from django.conf import settings
+from .paystack import paystack_client, async_paystack_client
 from .security import sanitize_payment_log_data  # ✅ ADD THIS
 import logging
 
@@ -65,20 +66,8 @@ def get_paystack_keys():
     return settings.PAYSTACK_SECRET_KEY, settings.PAYSTACK_PUBLIC_KEY
 
 
-def initialize_payment(amount, email, reference, callback_url, metadata=None):
-    """
-    Initialize payment with Paystack
-    ✅ ENHANCED: Now sanitizes logs
-    """
-    secret_key, _ = get_paystack_keys()
-
-    url = "https://api.paystack.co/transaction/initialize"
-    headers = {
-        "Authorization": f"Bearer {secret_key}",
-        "Content-Type": "application/json",
-    }
-
-    payload = {
+def _build_initialize_payload(amount, email, reference, callback_url, metadata):
+    return {
         "amount": int(amount * 100),  # Convert to kobo
         "email": email,
         "reference": reference,
@@ -86,6 +75,50 @@ def initialize_payment(amount, email, reference, callback_url, metadata=None):
         "metadata": metadata or {},
     }
 
+
+def _handle_initialize_response(response):
+    response_data = response.json()
+
+    # ✅ Log sanitized response
+    logger.info(
+        f"Paystack initialization response: "
+        f"{sanitize_payment_log_data(response_data)}"
+    )
+
+    # requests and httpx responses both come through here; only
+    # requests has .ok, so check the status code itself
+    if not 200 <= response.status_code < 300:
+        logger.error(
+            f"Paystack initialization error: "
+            f"{response_data.get('message', 'Unknown error')}"
+        )
+        return None
+
+    return response_data
+
+
+def _handle_verify_response(reference, response):
+    response_data = response.json()
+
+    # ✅ Log sanitized response
+    logger.info(
+        f"Paystack verification response for {reference}: "
+        f"{sanitize_payment_log_data(response_data)}"
+    )
+
+    return response_data
+
+
+def initialize_payment(amount, email, reference, callback_url, metadata=None):
+    """
+    Initialize payment with Paystack
+    ✅ ENHANCED: Now sanitizes logs
+    Sent through the shared pooled client (see payment.paystack)
+    """
+    payload = _build_initialize_payload(
+        amount, email, reference, callback_url, metadata
+    )
+
     # ✅ Log sanitized payload
     logger.info(
         f"Initializing Paystack payment - Reference: {reference}, "
@@ -93,23 +126,8 @@ def initialize_payment(amount, email, reference, callback_url, metadata=None):
     )
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
-        response_data = response.json()
-        
-        # ✅ Log sanitized response
-        logger.info(
-            f"Paystack initialization response: "
-            f"{sanitize_payment_log_data(response_data)}"
-        )
-
-        if not response.ok:
-            logger.error(
-                f"Paystack initialization error: "
-                f"{response_data.get('message', 'Unknown error')}"
-            )
-            return None
-
-        return response_data
+        response = paystack_client.post("/transaction/initialize", json=payload)
+        return _handle_initialize_response(response)
 
     except requests.Timeout:
         logger.error("Paystack API timeout during payment initialization")
@@ -123,30 +141,56 @@ def verify_payment(reference):
     """
     Verify payment with Paystack
     ✅ ENHANCED: Now sanitizes logs
+    Sent through the shared pooled client (see payment.paystack)
     """
-    secret_key, _ = get_paystack_keys()
+    try:
+        response = paystack_client.get(f"/transaction/verify/{reference}")
+        return _handle_verify_response(reference, response)
 
-    url = f"https://api.paystack.co/transaction/verify/{reference}"
-    headers = {
-        "Authorization": f"Bearer {secret_key}",
-        "Content-Type": "application/json",
-    }
+    except requests.Timeout:
+        logger.error(f"Paystack API timeout during verification of {reference}")
+        return None
+    except Exception as e:
+        logger.error(f"Error verifying payment {reference}: {str(e)}")
+        return None
+
+
+async def ainitialize_payment(amount, email, reference, callback_url, metadata=None):
+    """Async variant of initialize_payment for async views and tasks"""
+    payload = _build_initialize_payload(
+        amount, email, reference, callback_url, metadata
+    )
+
+    logger.info(
+        f"Initializing Paystack payment - Reference: {reference}, "
+        f"Amount: {amount}, Email: {email[:3]}***"
+    )
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response_data = response.json()
-        
-        # ✅ Log sanitized response
-        logger.info(
-            f"Paystack verification response for {reference}: "
-            f"{sanitize_payment_log_data(response_data)}"
+        response = await async_paystack_client.post(
+            "/transaction/initialize", json=payload
         )
-        
-        return response_data
-        
-    except requests.Timeout:
+        return _handle_initialize_response(response)
+
+    except httpx.TimeoutException:
+        logger.error("Paystack API timeout during payment initialization")
+        return None
+    except Exception as e:
+        logger.error(f"Error initializing Paystack payment: {str(e)}")
+        return None
+
+
+async def averify_payment(reference):
+    """Async variant of verify_payment for async views and tasks"""
+    try:
+        response = await async_paystack_client.get(
+            f"/transaction/verify/{reference}"
+        )
+        return _handle_verify_response(reference, response)
+
+    except httpx.TimeoutException:
         logger.error(f"Paystack API timeout during verification of {reference}")
         return None
     except Exception as e:
         logger.error(f"Error verifying payment {reference}: {str(e)}")
-        return None
\ No newline at end of file
+        return None
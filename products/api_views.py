@@ -3,18 +3,21 @@ from rest_framework import viewsets, permissions, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
-from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from .catalog_cache import CatalogCacheMixin, record_catalog_lookup
 from .models import Category, NyscKit, NyscTour, Church
 from .serializers import (
     CategorySerializer, NyscKitSerializer, NyscTourSerializer, 
     ChurchSerializer, ProductListSerializer
 )
+from .storefront import (
+    STOREFRONT_LIMIT, STOREFRONT_MAX_LIMIT, build_storefront_payload,
+    category_product_counts, get_storefront_entry, known_storefront_slug,
+)
 from .constants import (
     STATES, LGAS, VEST_SIZES, CHURCH_SIZES, CHURCH_CHOICES,
     get_lgas_for_state, get_all_states_list
@@ -32,27 +35,28 @@ class ProductPagination(PageNumberPagination):
     list=extend_schema(description="List all categories with product counts"),
     retrieve=extend_schema(description="Get specific category details"),
 )
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for product categories - Read only"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
-    
-    @method_decorator(cache_page(60 * 15))  # Cache for 15 minutes
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-    
-    @method_decorator(cache_page(60 * 15))
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+    catalog_cache_name = 'categories'
+    catalog_list_timeout = 60 * 15  # Cache for 15 minutes
+    catalog_detail_timeout = 60 * 15
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'list':
+            context['product_counts'] = category_product_counts()
+        return context
 
 
 @extend_schema_view(
     list=extend_schema(description="List all NYSC Kit products with filters"),
     retrieve=extend_schema(description="Get specific NYSC Kit product details"),
 )
-class NyscKitViewSet(viewsets.ReadOnlyModelViewSet):
+class NyscKitViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for NYSC Kit products"""
     serializer_class = NyscKitSerializer
     permission_classes = [permissions.AllowAny]
@@ -63,26 +67,18 @@ class NyscKitViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['price', 'created', 'name']
     ordering = ['type', 'name']  # Default ordering
     lookup_field = 'id'
+    catalog_cache_name = 'nysc_kits'  # Cached 10 minutes (list) / 30 minutes (detail)
     
     def get_queryset(self):
         """Optimized queryset with select_related"""
         return NyscKit.objects.select_related('category').filter(available=True)
-    
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
-    @method_decorator(vary_on_cookie)
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-    
-    @method_decorator(cache_page(60 * 30))  # Cache for 30 minutes
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
 
 
 @extend_schema_view(
     list=extend_schema(description="List all NYSC Tour products with filters"),
     retrieve=extend_schema(description="Get specific NYSC Tour product details"),
 )
-class NyscTourViewSet(viewsets.ReadOnlyModelViewSet):
+class NyscTourViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for NYSC Tour products"""
     serializer_class = NyscTourSerializer
     permission_classes = [permissions.AllowAny]
@@ -93,26 +89,18 @@ class NyscTourViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['price', 'created', 'name']
     ordering = ['name']  # Default ordering
     lookup_field = 'id'
+    catalog_cache_name = 'nysc_tours'  # Cached 10 minutes (list) / 30 minutes (detail)
     
     def get_queryset(self):
         """Optimized queryset with select_related"""
         return NyscTour.objects.select_related('category').filter(available=True)
-    
-    @method_decorator(cache_page(60 * 10))
-    @method_decorator(vary_on_cookie)
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-    
-    @method_decorator(cache_page(60 * 30))
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
 
 
 @extend_schema_view(
     list=extend_schema(description="List all Church merchandise products with filters"),
     retrieve=extend_schema(description="Get specific Church product details"),
 )
-class ChurchViewSet(viewsets.ReadOnlyModelViewSet):
+class ChurchViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for Church merchandise products"""
     serializer_class = ChurchSerializer
     permission_classes = [permissions.AllowAny]
@@ -123,19 +111,11 @@ class ChurchViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['price', 'created', 'name']
     ordering = ['church', 'name']  # Default ordering
     lookup_field = 'id'
+    catalog_cache_name = 'churches'  # Cached 10 minutes (list) / 30 minutes (detail)
     
     def get_queryset(self):
         """Optimized queryset with select_related"""
         return Church.objects.select_related('category').filter(available=True)
-    
-    @method_decorator(cache_page(60 * 10))
-    @method_decorator(vary_on_cookie)
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-    
-    @method_decorator(cache_page(60 * 30))
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
 
 
 @extend_schema(
@@ -153,80 +133,52 @@ class ChurchViewSet(viewsets.ReadOnlyModelViewSet):
             name='limit',
             type=int,
             location=OpenApiParameter.QUERY,
-            description='Limit items per product type (default: 4)',
+            description='Limit items per product type (default: 4, at most 20)',
             required=False
         ),
     ]
 )
-class ProductListView(views.APIView):
+class ProductListView(CatalogCacheMixin, views.APIView):
     """
     Combined product list endpoint - returns all product types grouped
     Optimized for storefront display
     """
     permission_classes = [permissions.AllowAny]
     serializer_class = ProductListSerializer 
-    @method_decorator(cache_page(60 * 10))
-    @method_decorator(vary_on_cookie)
+    catalog_cache_name = 'storefront'
+
     def get(self, request):
         category_slug = request.query_params.get('category')
-        limit = int(request.query_params.get('limit', 4))
-        
-        # Get all categories
-        categories = Category.objects.all()
-        current_category = None
-        
-        # Base querysets with optimization
-        nysc_kits = NyscKit.objects.select_related('category').filter(available=True)
-        nysc_tours = NyscTour.objects.select_related('category').filter(available=True)
-        churches = Church.objects.select_related('category').filter(available=True)
-        
-        # Apply category filter if provided
-        if category_slug:
-            try:
-                current_category = Category.objects.get(slug=category_slug)
-                nysc_kits = nysc_kits.filter(category=current_category)
-                nysc_tours = nysc_tours.filter(category=current_category)
-                churches = churches.filter(category=current_category)
-            except Category.DoesNotExist:
-                pass
-        
-        # Get counts for pagination info
-        total_kits = nysc_kits.count()
-        total_tours = nysc_tours.count()
-        total_churches = churches.count()
-        
-        # Apply limit for initial load
-        nysc_kits = nysc_kits[:limit]
-        nysc_tours = nysc_tours[:limit]
-        churches = churches[:limit]
-        
-        # Serialize data
-        data = {
-            'nysc_kits': NyscKitSerializer(nysc_kits, many=True, context={'request': request}).data,
-            'nysc_tours': NyscTourSerializer(nysc_tours, many=True, context={'request': request}).data,
-            'churches': ChurchSerializer(churches, many=True, context={'request': request}).data,
-            'categories': CategorySerializer(categories, many=True).data,
-            'current_category': CategorySerializer(current_category).data if current_category else None,
-            'pagination': {
-                'nysc_kits': {
-                    'showing': len(nysc_kits),
-                    'total': total_kits,
-                    'has_more': total_kits > limit
-                },
-                'nysc_tours': {
-                    'showing': len(nysc_tours),
-                    'total': total_tours,
-                    'has_more': total_tours > limit
-                },
-                'churches': {
-                    'showing': len(churches),
-                    'total': total_churches,
-                    'has_more': total_churches > limit
-                },
-            }
-        }
-        
-        return Response(data)
+        try:
+            limit = int(request.query_params.get('limit', STOREFRONT_LIMIT))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response({
+                'error': 'limit must be a positive integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, STOREFRONT_MAX_LIMIT)
+
+        if limit != STOREFRONT_LIMIT:
+            # Keyed on the clamped limit and a known slug, so arbitrary
+            # values share entries instead of filling the pages cache
+            slug = known_storefront_slug(category_slug)
+            return self.catalog_response(
+                'list', ['category', 'limit'],
+                lambda: build_storefront_payload(limit, slug),
+                self.catalog_list_timeout,
+                params=[('category', slug), ('limit', limit)],
+            )
+
+        # Homepage: prebuilt bytes from the storefront snapshot
+        entry, hit = get_storefront_entry(category_slug)
+        record_catalog_lookup('storefront:list', hit)
+        response = get_conditional_response(request, etag=entry.etag)
+        if response is None:
+            response = HttpResponse(entry.body, content_type='application/json')
+        response['ETag'] = entry.etag
+        response['X-Catalog-Cache'] = 'HIT' if hit else 'MISS'
+        return response
 
 @extend_schema(tags=['Dropdowns'])
 class StatesListView(views.APIView):
@@ -0,0 +1,174 @@
+# products/catalog_cache.py
+"""
+Shared cache for the public catalog endpoints.
+
+Responses are the same for every visitor, so they are cached on the
+normalized query string alone (only the parameters a view actually reads,
+sorted, blanks dropped) instead of per session like cache_page +
+vary_on_cookie did. utm_* tags, cache busters and cookie churn all share
+one entry.
+
+Every key embeds the catalog version. products.signals bumps it whenever a
+category or product is saved or deleted, so a price or stock change made
+in the admin is visible on the next request; stale entries simply expire.
+Hits and misses are counted per endpoint in-process (catalog_cache_stats).
+"""
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from rest_framework.response import Response
+
+from material.caching import PAGE_CACHE_ALIAS, get_cache
+
+CATALOG_VERSION_CACHE_KEY = "products:catalog_version"
+CATALOG_CACHE_TIMEOUT = 60 * 10
+
+_stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+_stats_lock = threading.Lock()
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version. Seeded from the clock so a cache
+    flush never brings back a version old entries were stored under.
+    """
+    cache = get_cache(PAGE_CACHE_ALIAS)
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_CACHE_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response"""
+    cache = get_cache(PAGE_CACHE_ALIAS)
+    try:
+        cache.incr(CATALOG_VERSION_CACHE_KEY)
+    except ValueError:
+        # Key missing (never set or evicted) - reseed
+        cache.set(CATALOG_VERSION_CACHE_KEY, int(time.time() * 1000), timeout=None)
+
+
+def normalize_params(query_params, allowed):
+    """Sorted (name, value) pairs for the allowed, non-blank parameters"""
+    pairs = []
+    for name in sorted(set(query_params) & set(allowed)):
+        for value in sorted(query_params.getlist(name)):
+            value = value.strip()
+            if value:
+                pairs.append((name, value))
+    return pairs
+
+
+def catalog_cache_key(endpoint, request, allowed_params, version=None, params=None):
+    # Scheme and host are part of the key: responses carry absolute
+    # next/previous and image URLs. Views that validate their parameters
+    # pass the cleaned (name, value) pairs as params instead.
+    if params is None:
+        params = normalize_params(request.query_params, allowed_params)
+    params = urlencode(params)
+    url = f"{request.scheme}://{request.get_host()}?{params}"
+    digest = hashlib.md5(url.encode("utf-8"), usedforsecurity=False).hexdigest()
+    if version is None:
+        version = get_catalog_version()
+    return f"products:catalog:{version}:{endpoint}:{digest}"
+
+
+def record_catalog_lookup(endpoint, hit):
+    """Count a cache hit or miss for endpoint"""
+    with _stats_lock:
+        _stats[endpoint]["hits" if hit else "misses"] += 1
+
+
+def get_cached_catalog(endpoint, request, allowed_params, build, timeout=None, params=None):
+    """
+    Return (data, hit). build() produces the response data on a miss;
+    it is cached under the current catalog version.
+    """
+    cache = get_cache(PAGE_CACHE_ALIAS)
+    key = catalog_cache_key(endpoint, request, allowed_params, params=params)
+
+    data = cache.get(key)
+    if data is not None:
+        record_catalog_lookup(endpoint, True)
+        return data, True
+
+    record_catalog_lookup(endpoint, False)
+    data = build()
+    cache.set(key, data, timeout or CATALOG_CACHE_TIMEOUT)
+    return data, False
+
+
+def catalog_cache_stats():
+    """Hits, misses and hit rate per endpoint since start (or last reset)"""
+    with _stats_lock:
+        stats = {}
+        for endpoint, counts in _stats.items():
+            total = counts["hits"] + counts["misses"]
+            stats[endpoint] = {
+                **counts,
+                "hit_rate": counts["hits"] / total if total else 0.0,
+            }
+        return stats
+
+
+def reset_catalog_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class CatalogCacheMixin:
+    """
+    list()/retrieve() for the read-only catalog viewsets, served from the
+    catalog cache. Lists are keyed on filterset/search/ordering/pagination
+    params, details on the lookup value. Plain views call catalog_response().
+    """
+
+    catalog_cache_name = None
+    catalog_list_timeout = CATALOG_CACHE_TIMEOUT
+    catalog_detail_timeout = 60 * 30
+
+    def get_catalog_list_params(self):
+        params = list(getattr(self, "filterset_fields", []))
+        params += ["search", "ordering", "page"]
+        pagination_class = getattr(self, "pagination_class", None)
+        page_size_param = getattr(pagination_class, "page_size_query_param", None)
+        if page_size_param:
+            params.append(page_size_param)
+        return params
+
+    def catalog_response(self, endpoint, allowed_params, build, timeout, params=None):
+        data, hit = get_cached_catalog(
+            f"{self.catalog_cache_name}:{endpoint}",
+            self.request,
+            allowed_params,
+            build,
+            timeout,
+            params=params,
+        )
+        response = Response(data)
+        response["X-Catalog-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.catalog_response(
+            "list",
+            self.get_catalog_list_params(),
+            lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs).data,
+            self.catalog_list_timeout,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return self.catalog_response(
+            f"detail:{lookup}",
+            [],
+            lambda: super(CatalogCacheMixin, self).retrieve(
+                request, *args, **kwargs
+            ).data,
+            self.catalog_detail_timeout,
+        )
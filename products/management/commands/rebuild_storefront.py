@@ -0,0 +1,35 @@
+# products/management/commands/rebuild_storefront.py
+"""
+Management command: rebuild_storefront
+
+Rebuilds the precomputed storefront payloads served by ProductListView and
+invalidates the catalog cache if the catalog changed without a model signal
+(queryset updates, soft deletes, raw SQL). Run from cron:
+  */10 * * * * /path/to/python manage.py rebuild_storefront
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.storefront import rebuild_storefront_snapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed storefront snapshot"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        changed = rebuild_storefront_snapshot()
+        elapsed = time.perf_counter() - start
+
+        if changed:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Storefront changed outside signals; catalog cache "
+                    f"invalidated ({elapsed:.2f}s)"
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Storefront snapshot rebuilt ({elapsed:.2f}s)")
+            )
@@ -19,6 +19,11 @@ class CategorySerializer(serializers.ModelSerializer):
         
     def get_product_count(self, obj: 'Category') -> int:
         """Get count of available products in this category"""
+        # Precomputed by list views (see products.storefront.category_product_counts)
+        product_counts = self.context.get('product_counts')
+        if product_counts is not None:
+            return product_counts.get((obj.product_type, obj.pk), 0)
+
         model_map = {
             'nysc_kit': NyscKit,
             'nysc_tour': NyscTour,
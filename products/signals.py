@@ -0,0 +1,42 @@
+# products/signals.py
+"""
+Catalog cache invalidation: any category or product write bumps the catalog
+version, so cached list/detail/storefront responses are never served stale.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from .catalog_cache import bump_catalog_version
+from .models import Category, NyscKit, NyscTour, Church
+
+CATALOG_MODELS = (Category, NyscKit, NyscTour, Church)
+
+
+def rebuild_storefront_after_commit():
+    """
+    Bump again once the write is visible to other connections (a request
+    may have rebuilt from pre-commit rows meanwhile), then warm the
+    storefront snapshot in the background.
+    """
+    from material.background_utils import rebuild_storefront_snapshot_task
+
+    bump_catalog_version()
+    rebuild_storefront_snapshot_task()
+
+
+def bump_catalog_on_change(sender, instance, **kwargs):
+    """Invalidate cached catalog responses after a save or delete."""
+    bump_catalog_version()
+    transaction.on_commit(rebuild_storefront_after_commit)
+
+
+for catalog_model in CATALOG_MODELS:
+    post_save.connect(
+        bump_catalog_on_change,
+        sender=catalog_model,
+        dispatch_uid=f"products_bump_catalog_{catalog_model.__name__}",
+    )
+    post_delete.connect(
+        bump_catalog_on_change,
+        sender=catalog_model,
+        dispatch_uid=f"products_bump_catalog_delete_{catalog_model.__name__}",
+    )
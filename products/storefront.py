@@ -0,0 +1,263 @@
+# products/storefront.py
+"""
+Precomputed storefront (homepage) payloads for ProductListView.
+
+The storefront for "all products" and for every category is built in one
+pass: four queries however many categories exist. Each product is
+serialized once and each payload is rendered to JSON bytes with an ETag.
+The snapshot is stored in the pages cache under the catalog version, so
+the products.signals bump makes the next request rebuild it. Each worker
+also keeps the snapshot for the current version in memory, so a request
+costs one cache read (the version) and a write of prebuilt bytes.
+
+Other limits (up to STOREFRONT_MAX_LIMIT) have no snapshot:
+build_storefront_payload() builds just the requested payload, and
+ProductListView caches it in the catalog cache.
+
+rebuild_storefront_snapshot() (rebuild_storefront command /
+rebuild_storefront_snapshot_task) warms the snapshot on a schedule. It
+also bumps the catalog version if the content changed without a signal,
+for example after a queryset update().
+"""
+import hashlib
+import threading
+from collections import defaultdict, namedtuple
+
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from material.caching import PAGE_CACHE_ALIAS, get_cache
+
+from .catalog_cache import bump_catalog_version, get_catalog_version
+from .models import Category, NyscKit, NyscTour, Church
+from .serializers import (
+    CategorySerializer, NyscKitSerializer, NyscTourSerializer, ChurchSerializer
+)
+
+# Items per product type on the storefront (ProductListView's default limit)
+STOREFRONT_LIMIT = 4
+# Largest ?limit= ProductListView serves; larger values are clamped
+STOREFRONT_MAX_LIMIT = 20
+STOREFRONT_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+PRODUCT_GROUPS = (
+    ('nysc_kits', 'nysc_kit', NyscKit, NyscKitSerializer),
+    ('nysc_tours', 'nysc_tour', NyscTour, NyscTourSerializer),
+    ('churches', 'church', Church, ChurchSerializer),
+)
+
+StorefrontEntry = namedtuple('StorefrontEntry', ['etag', 'body'])
+_Snapshot = namedtuple('_Snapshot', ['version', 'entries'])
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def category_product_counts():
+    """
+    Available products per category, keyed (product_type, category_id).
+    Three grouped queries instead of a count per category.
+    """
+    counts = {}
+    for _, product_type, model, _ in PRODUCT_GROUPS:
+        rows = (
+            model.objects.filter(available=True, category__isnull=False)
+            .values('category')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        for row in rows:
+            counts[(product_type, row['category'])] = row['total']
+    return counts
+
+
+def build_storefront_payloads(limit=STOREFRONT_LIMIT):
+    """
+    Return {category_slug: payload} with "" for the unfiltered storefront.
+    Payloads match what ProductListView has always returned.
+    """
+    categories = list(Category.objects.all())
+    products = {}
+    by_category = {}
+    for key, _, model, _ in PRODUCT_GROUPS:
+        products[key] = list(
+            model.objects.select_related('category').filter(available=True)
+        )
+        grouped = defaultdict(list)
+        for product in products[key]:
+            grouped[product.category_id].append(product)
+        by_category[key] = grouped
+
+    counts = {
+        (product_type, category_id): len(items)
+        for key, product_type, _, _ in PRODUCT_GROUPS
+        for category_id, items in by_category[key].items()
+        if category_id is not None
+    }
+    category_data = {
+        category.pk: CategorySerializer(
+            category, context={'product_counts': counts}
+        ).data
+        for category in categories
+    }
+
+    # Serialize each product once, however many payloads show it
+    serialized = {}
+
+    def serialize(serializer_class, items):
+        data = []
+        for product in items:
+            if product.pk not in serialized:
+                serialized[product.pk] = serializer_class(product).data
+            data.append(serialized[product.pk])
+        return data
+
+    def payload(current_category, groups):
+        data = {}
+        pagination = {}
+        for key, _, _, serializer_class in PRODUCT_GROUPS:
+            items = groups[key]
+            shown = items[:limit]
+            data[key] = serialize(serializer_class, shown)
+            pagination[key] = {
+                'showing': len(shown),
+                'total': len(items),
+                'has_more': len(items) > limit,
+            }
+        data['categories'] = list(category_data.values())
+        data['current_category'] = (
+            category_data[current_category.pk] if current_category else None
+        )
+        data['pagination'] = pagination
+        return data
+
+    payloads = {'': payload(None, products)}
+    for category in categories:
+        payloads[category.slug] = payload(
+            category,
+            {key: by_category[key].get(category.pk, []) for key in by_category},
+        )
+    return payloads
+
+
+def known_storefront_slug(category_slug):
+    """category_slug if a category has that slug, else '' (one query, no build)"""
+    if category_slug and Category.objects.filter(slug=category_slug).exists():
+        return category_slug
+    return ''
+
+
+def build_storefront_payload(limit, category_slug=''):
+    """
+    The one payload for category_slug ("" or an unknown slug: unfiltered)
+    with limit items per product type, without building every category.
+    Same shape as the build_storefront_payloads() entries.
+    """
+    categories = list(Category.objects.all())
+    current_category = next(
+        (category for category in categories if category.slug == category_slug), None
+    )
+    counts = category_product_counts()
+    category_data = {
+        category.pk: CategorySerializer(
+            category, context={'product_counts': counts}
+        ).data
+        for category in categories
+    }
+
+    data = {}
+    pagination = {}
+    for key, _, model, serializer_class in PRODUCT_GROUPS:
+        queryset = model.objects.filter(available=True)
+        if current_category is not None:
+            queryset = queryset.filter(category=current_category)
+        shown = list(queryset.select_related('category')[:limit])
+        total = queryset.count()
+        data[key] = serializer_class(shown, many=True).data
+        pagination[key] = {
+            'showing': len(shown),
+            'total': total,
+            'has_more': total > limit,
+        }
+    data['categories'] = list(category_data.values())
+    data['current_category'] = (
+        category_data[current_category.pk] if current_category else None
+    )
+    data['pagination'] = pagination
+    return data
+
+
+def render_entry(data):
+    body = JSONRenderer().render(data)
+    return StorefrontEntry(f'"{hashlib.md5(body).hexdigest()}"', body)
+
+
+def build_storefront_snapshot():
+    """Rendered {category_slug: StorefrontEntry} for the default limit"""
+    return {
+        slug: render_entry(data)
+        for slug, data in build_storefront_payloads().items()
+    }
+
+
+def snapshot_cache_key(version):
+    return f"storefront_snapshot_{version}"
+
+
+def get_storefront_snapshot():
+    """
+    Return (entries, hit) for the current catalog version, building and
+    publishing the snapshot if no worker has yet.
+    """
+    global _snapshot
+
+    version = get_catalog_version()
+    if version is None:
+        # Dummy cache (DEBUG): nothing to key the snapshot on
+        return build_storefront_snapshot(), False
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot.entries, True
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot.entries, True
+
+        cache = get_cache(PAGE_CACHE_ALIAS)
+        entries = cache.get(snapshot_cache_key(version))
+        hit = entries is not None
+        if not hit:
+            entries = build_storefront_snapshot()
+            cache.set(snapshot_cache_key(version), entries, STOREFRONT_SNAPSHOT_TIMEOUT)
+        _snapshot = _Snapshot(version, entries)
+        return entries, hit
+
+
+def get_storefront_entry(category_slug):
+    """Return (StorefrontEntry, hit); unknown slugs get the unfiltered storefront"""
+    entries, hit = get_storefront_snapshot()
+    return entries.get(category_slug or '', entries['']), hit
+
+
+def rebuild_storefront_snapshot():
+    """
+    Build and publish a fresh snapshot. Returns True if its content
+    differed from the published one (the catalog version is then bumped).
+    """
+    cache = get_cache(PAGE_CACHE_ALIAS)
+    entries = build_storefront_snapshot()
+    version = get_catalog_version()
+    current = cache.get(snapshot_cache_key(version))
+
+    changed = current is not None and (
+        {slug: entry.etag for slug, entry in current.items()}
+        != {slug: entry.etag for slug, entry in entries.items()}
+    )
+    if changed:
+        # Changed without a signal: cached catalog responses are stale too
+        bump_catalog_version()
+        version = get_catalog_version()
+    cache.set(snapshot_cache_key(version), entries, STOREFRONT_SNAPSHOT_TIMEOUT)
+    return changed
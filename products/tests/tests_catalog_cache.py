@@ -0,0 +1,154 @@
+# products/tests/tests_catalog_cache.py
+"""
+Tests for products/catalog_cache.py and the cached catalog endpoints
+
+Test Coverage:
+===============
+✅ Cache keys
+   - Normalized on the parameters a view reads (order, blanks, unknown params)
+   - Cookies / sessions don't split entries
+
+✅ Invalidation
+   - A price change is visible on the very next request (list, detail, storefront)
+   - Category saves and product deletes invalidate cached responses
+
+✅ Hit-rate counters
+   - Hits and misses counted per endpoint
+"""
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from products.catalog_cache import (
+    catalog_cache_stats,
+    normalize_params,
+    reset_catalog_cache_stats,
+)
+from products.models import Category, NyscKit
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog-cache-default",
+    },
+    "pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog-cache-pages",
+    },
+}
+
+
+class NormalizeParamsTest(SimpleTestCase):
+    """Test query parameter normalization"""
+
+    def test_order_blanks_and_unknown_params_ignored(self):
+        """Test equivalent query strings normalize to the same pairs"""
+        allowed = ["type", "ordering", "page"]
+        a = normalize_params(QueryDict("ordering=price&type=vest&utm_source=ig"), allowed)
+        b = normalize_params(QueryDict("type=vest&page=&ordering=price&_=1712"), allowed)
+
+        self.assertEqual(a, [("ordering", "price"), ("type", "vest")])
+        self.assertEqual(a, b)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CatalogCacheViewTest(APITestCase):
+    """Test the catalog endpoints served through the catalog cache"""
+
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        reset_catalog_cache_stats()
+
+        self.client = APIClient()
+        self.category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.kit = NyscKit.objects.create(
+            name="Quality Nysc Kakhi",
+            type="kakhi",
+            category=self.category,
+            price=Decimal("5000.00"),
+            available=True,
+        )
+        self.list_url = reverse("products:nysc-kit-list")
+        self.detail_url = reverse(
+            "products:nysc-kit-detail", kwargs={"id": str(self.kit.id)}
+        )
+        self.storefront_url = reverse("products:product-list")
+
+    def _price(self, data):
+        if "results" in data:
+            data = data["results"][0]
+        return Decimal(str(data["price"]))
+
+    def test_price_change_visible_immediately(self):
+        """Test a saved price change is served on the next request"""
+        self.assertEqual(self._price(self.client.get(self.list_url).data), 5000)
+        self.assertEqual(self._price(self.client.get(self.detail_url).data), 5000)
+        self.assertEqual(
+            self.client.get(self.list_url)["X-Catalog-Cache"], "HIT"
+        )
+
+        self.kit.price = Decimal("6500.00")
+        self.kit.save()
+
+        list_response = self.client.get(self.list_url)
+        self.assertEqual(list_response["X-Catalog-Cache"], "MISS")
+        self.assertEqual(self._price(list_response.data), 6500)
+        self.assertEqual(self._price(self.client.get(self.detail_url).data), 6500)
+
+        storefront = self.client.get(self.storefront_url).json()
+        self.assertEqual(Decimal(str(storefront["nysc_kits"][0]["price"])), 6500)
+
+    def test_params_normalized_and_cookies_ignored(self):
+        """Test reordered params, tracking params and cookies share one entry"""
+        first = self.client.get(f"{self.list_url}?type=kakhi&ordering=price")
+        self.assertEqual(first["X-Catalog-Cache"], "MISS")
+
+        self.client.cookies["sessionid"] = "visitor-two"
+        second = self.client.get(
+            f"{self.list_url}?ordering=price&type=kakhi&utm_source=ig&page="
+        )
+
+        self.assertEqual(second["X-Catalog-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+    def test_category_save_and_product_delete_invalidate(self):
+        """Test category and delete signals bump the catalog version"""
+        self.client.get(self.storefront_url)
+        self.category.description = "Updated"
+        self.category.save()
+        response = self.client.get(self.storefront_url)
+        self.assertEqual(response["X-Catalog-Cache"], "MISS")
+        self.assertEqual(response.json()["categories"][0]["description"], "Updated")
+
+        self.kit.delete()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_missing_detail_not_cached(self):
+        """Test 404 details are not stored"""
+        url = reverse("products:category-detail", kwargs={"slug": "nope"})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertEqual(catalog_cache_stats()["categories:detail:nope"]["hits"], 0)
+
+    def test_hit_rate_counters(self):
+        """Test hits and misses are counted per endpoint"""
+        for _ in range(4):
+            self.client.get(self.list_url)
+        self.client.get(self.storefront_url)
+
+        stats = catalog_cache_stats()
+        self.assertEqual(stats["nysc_kits:list"]["misses"], 1)
+        self.assertEqual(stats["nysc_kits:list"]["hits"], 3)
+        self.assertEqual(stats["nysc_kits:list"]["hit_rate"], 0.75)
+        self.assertEqual(stats["storefront:list"]["misses"], 1)
@@ -0,0 +1,332 @@
+# products/tests/tests_storefront.py
+"""
+Tests for products/storefront.py and the ProductListView snapshot
+
+Test Coverage:
+===============
+✅ Snapshot build
+   - Payloads for "all" and every category (grouping, counts, pagination)
+   - Unknown category slugs get the unfiltered storefront
+   - Fixed number of queries however many categories exist
+   - CategoryViewSet product counts without a query per category
+
+✅ ProductListView
+   - Served as prebuilt JSON bytes with an ETag
+   - Warm snapshot served without a database query
+   - If-None-Match answered with 304
+   - Non-default limits still served (catalog cache path): only the
+     requested payload built, clamped to STOREFRONT_MAX_LIMIT, bad input 400
+   - rebuild_storefront_snapshot() detects changes made without signals
+
+✅ Benchmark: homepage p50/p99 latency, snapshot vs per-request build
+   (opt-in: set RUN_BENCHMARKS=1)
+"""
+import math
+import os
+import time
+import unittest
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from products.catalog_cache import get_catalog_version
+from products.api_views import ProductListView
+from products.models import Category, NyscKit, NyscTour, Church
+from products.storefront import STOREFRONT_MAX_LIMIT, build_storefront_payloads
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "storefront-default",
+    },
+    "pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "storefront-pages",
+    },
+}
+
+DUMMY_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class StorefrontDataMixin:
+    def create_catalog(self, kits=6):
+        self.kit_category = Category.objects.create(
+            name="NYSC KIT", slug="nysc-kit", product_type="nysc_kit"
+        )
+        self.tour_category = Category.objects.create(
+            name="NYSC TOUR", slug="nysc-tour", product_type="nysc_tour"
+        )
+        self.church_category = Category.objects.create(
+            name="CHURCH PROGRAMME", slug="church-prog", product_type="church"
+        )
+        for i in range(kits):
+            NyscKit.objects.create(
+                name="Quality Nysc Kakhi",
+                type="kakhi",
+                category=self.kit_category,
+                price=Decimal("5000.00") + i,
+                available=True,
+            )
+        NyscKit.objects.create(
+            name="Quality Nysc Cap",
+            type="cap",
+            category=self.kit_category,
+            price=Decimal("1500.00"),
+            available=False,
+        )
+        NyscTour.objects.create(
+            name="Lagos", category=self.tour_category, price=Decimal("15000.00")
+        )
+        Church.objects.create(
+            name="Quality RCCG Shirt",
+            church="RCCG",
+            category=self.church_category,
+            price=Decimal("3500.00"),
+        )
+
+
+class StorefrontBuildTest(StorefrontDataMixin, APITestCase):
+    """Test the one-pass storefront build"""
+
+    def setUp(self):
+        self.create_catalog()
+
+    def test_payloads_grouped_and_counted(self):
+        """Test each payload lists its category's products with totals"""
+        payloads = build_storefront_payloads(limit=4)
+
+        everything = payloads[""]
+        self.assertEqual(len(everything["nysc_kits"]), 4)
+        self.assertEqual(everything["pagination"]["nysc_kits"]["total"], 6)
+        self.assertTrue(everything["pagination"]["nysc_kits"]["has_more"])
+        self.assertIsNone(everything["current_category"])
+
+        kits = payloads["nysc-kit"]
+        self.assertEqual(kits["current_category"]["slug"], "nysc-kit")
+        self.assertEqual(kits["current_category"]["product_count"], 6)
+        self.assertEqual(kits["nysc_tours"], [])
+        self.assertEqual(kits["pagination"]["churches"]["total"], 0)
+
+        counts = {c["slug"]: c["product_count"] for c in everything["categories"]}
+        self.assertEqual(
+            counts, {"nysc-kit": 6, "nysc-tour": 1, "church-prog": 1}
+        )
+
+    def test_query_count_independent_of_categories(self):
+        """Test the build runs the same queries for 3 or 13 categories"""
+        with CaptureQueriesContext(connection) as few:
+            build_storefront_payloads()
+
+        for i in range(10):
+            category = Category.objects.create(
+                name="NYSC KIT", slug=f"extra-{i}", product_type="nysc_kit"
+            )
+            NyscKit.objects.create(
+                name="Quality Nysc Vest",
+                type="vest",
+                category=category,
+                price=Decimal("2000.00"),
+            )
+
+        with CaptureQueriesContext(connection) as many:
+            payloads = build_storefront_payloads()
+
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+        self.assertEqual(len(payloads), 14)
+
+    @override_settings(CACHES=DUMMY_CACHES)
+    def test_category_list_counts_batched(self):
+        """Test category product counts no longer cost a query per category"""
+        url = reverse("products:category-list")
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+
+        for i in range(10):
+            Category.objects.create(
+                name="NYSC KIT", slug=f"extra-{i}", product_type="nysc_kit"
+            )
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+        data = response.data["results"] if "results" in response.data else response.data
+        counts = {c["slug"]: c["product_count"] for c in data}
+        self.assertEqual(counts["nysc-kit"], 6)
+        self.assertEqual(counts["extra-0"], 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StorefrontViewTest(StorefrontDataMixin, APITestCase):
+    """Test ProductListView served from the snapshot"""
+
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        self.client = APIClient()
+        self.url = reverse("products:product-list")
+        self.create_catalog()
+
+    def test_served_as_json_bytes_with_etag(self):
+        """Test the response is the prebuilt payload with an ETag"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertTrue(response["ETag"])
+        self.assertEqual(len(response.json()["nysc_kits"]), 4)
+
+        response = self.client.get(self.url, {"category": "nysc-tour"})
+        self.assertEqual(response.json()["current_category"]["slug"], "nysc-tour")
+
+        response = self.client.get(self.url, {"category": "no-such-slug"})
+        self.assertIsNone(response.json()["current_category"])
+
+    def test_warm_snapshot_served_without_queries(self):
+        """Test a warm snapshot is answered from the cache alone"""
+        self.client.get(self.url)  # Warm
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+            self.client.get(self.url, {"category": "nysc-tour"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["nysc_kits"]), 4)
+
+    def test_if_none_match_returns_304(self):
+        """Test unchanged storefronts are revalidated without a body"""
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+        kit = NyscKit.objects.filter(available=True).first()
+        kit.price = Decimal("9999.00")
+        kit.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_custom_limit(self):
+        """Test non-default limits are built on demand"""
+        response = self.client.get(self.url, {"limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["nysc_kits"]), 2)
+        self.assertEqual(response.data["pagination"]["nysc_kits"]["total"], 6)
+
+    def test_custom_limit_builds_one_category(self):
+        """Test a custom limit builds just the requested category's payload"""
+        with patch("products.storefront.build_storefront_payloads") as mock_build_all:
+            response = self.client.get(self.url, {"limit": 2, "category": "nysc-tour"})
+
+        mock_build_all.assert_not_called()
+        self.assertEqual(response.data["current_category"]["slug"], "nysc-tour")
+        self.assertEqual(response.data["nysc_kits"], [])
+        self.assertEqual(len(response.data["nysc_tours"]), 1)
+        self.assertEqual(response.data["pagination"]["nysc_tours"]["total"], 1)
+
+    def test_limit_clamped_and_cache_keys_bounded(self):
+        """Test oversized limits and unknown slugs share one cache entry"""
+        response = self.client.get(self.url, {"limit": STOREFRONT_MAX_LIMIT})
+        self.assertEqual(response["X-Catalog-Cache"], "MISS")
+
+        for params in [
+            {"limit": 10000},
+            {"limit": 999999, "category": "no-such-slug"},
+        ]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response["X-Catalog-Cache"], "HIT")
+            self.assertEqual(
+                response.data["pagination"]["nysc_kits"]["showing"], 6
+            )
+
+    def test_bad_limit_rejected(self):
+        """Test non-numeric and non-positive limits get 400"""
+        for limit in ["abc", "0", "-3", "2.5"]:
+            response = self.client.get(self.url, {"limit": limit})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, limit)
+
+    def test_rebuild_detects_changes_without_signals(self):
+        """Test the scheduled rebuild invalidates after a queryset update"""
+        self.client.get(self.url)
+        version = get_catalog_version()
+
+        call_command("rebuild_storefront", stdout=StringIO())
+        self.assertEqual(get_catalog_version(), version)
+
+        NyscKit.objects.update(price=Decimal("100.00"))  # No signals
+        call_command("rebuild_storefront", stdout=StringIO())
+
+        self.assertNotEqual(get_catalog_version(), version)
+        prices = {k["price"] for k in self.client.get(self.url).json()["nysc_kits"]}
+        self.assertEqual(prices, {"100.00"})
+
+
+@unittest.skipUnless(os.environ.get("RUN_BENCHMARKS"), "Benchmark; set RUN_BENCHMARKS=1")
+class StorefrontBenchmarkTest(StorefrontDataMixin, APITestCase):
+    """Benchmark: homepage p50/p99 latency, snapshot vs per-request build"""
+
+    REQUESTS = 200
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("products:product-list")
+        self.create_catalog(kits=40)
+
+    def _latencies(self, caches_setting):
+        # Throttling off: the burst rate would cut the run short
+        with override_settings(CACHES=caches_setting), patch.object(
+            ProductListView, "throttle_classes", []
+        ):
+            for alias in caches_setting:
+                caches[alias].clear()
+            self.client.get(self.url)  # Warm
+
+            samples = []
+            with CaptureQueriesContext(connection) as ctx:
+                for _ in range(self.REQUESTS):
+                    start = time.perf_counter()
+                    response = self.client.get(self.url)
+                    samples.append(time.perf_counter() - start)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product_table = NyscKit._meta.db_table
+        queries = [q for q in ctx.captured_queries if product_table in q["sql"]]
+        return samples, len(queries)
+
+    def test_snapshot_latency(self):
+        """Test the snapshot takes the catalog queries out of the request"""
+        # Dummy cache: no version to key a snapshot on, so every request builds
+        built, built_queries = self._latencies(DUMMY_CACHES)
+        snapshot, snapshot_queries = self._latencies(LOCMEM_CACHES)
+
+        summary = (
+            f"per-request build p50 {percentile(built, 50) * 1000:.2f}ms "
+            f"p99 {percentile(built, 99) * 1000:.2f}ms ({built_queries} product queries), "
+            f"snapshot p50 {percentile(snapshot, 50) * 1000:.2f}ms "
+            f"p99 {percentile(snapshot, 99) * 1000:.2f}ms ({snapshot_queries} product queries)"
+        )
+        self.assertGreaterEqual(built_queries, self.REQUESTS, summary)
+        self.assertEqual(snapshot_queries, 0, summary)
+        self.assertLess(percentile(snapshot, 50), percentile(built, 50), summary)
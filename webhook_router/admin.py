@@ -1,3 +1,40 @@
 from django.contrib import admin
+from .inbox import requeue_events
+from .models import WebhookEvent
 
-# Register your models here.
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "reference",
+        "event",
+        "status",
+        "attempts",
+        "response_status",
+        "received_at",
+        "processed_at",
+    ]
+    list_filter = ["status", "event", "received_at"]
+    search_fields = ["reference"]
+    readonly_fields = [
+        "event",
+        "reference",
+        "raw_body",
+        "signature",
+        "status",
+        "attempts",
+        "response_status",
+        "last_error",
+        "received_at",
+        "claimed_at",
+        "processed_at",
+    ]
+    actions = ["replay_events"]
+
+    @admin.action(description="Replay selected events")
+    def replay_events(self, request, queryset):
+        from material.background_utils import drain_webhook_inbox_task
+
+        queued = requeue_events(queryset)
+        drain_webhook_inbox_task()
+        self.message_user(request, f"Requeued {queued} event(s) for processing.")
@@ -0,0 +1,176 @@
+# webhook_router/inbox.py
+"""
+Webhook inbox: store verified events now, run the app handlers later.
+
+router_webhook calls store_event() and returns 200 straight away; the
+worker (drain_webhook_inbox_task / process_webhook_inbox command) claims
+pending events in batches and hands each stored payload to the handler
+registered for its reference prefix (see webhook_router.registry).
+
+Failed events are claimed again RETRY_FAILED_AFTER after their last
+attempt, up to MAX_ATTEMPTS attempts in all; a Paystack redelivery of a
+failed event puts it straight back in the inbox whatever its attempts.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import WebhookEvent
+from .registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+# Events left in "processing" this long (worker crashed) are claimed again
+STALE_CLAIM_AFTER = timedelta(minutes=10)
+
+# Failed events are retried automatically until they have this many attempts
+MAX_ATTEMPTS = 5
+RETRY_FAILED_AFTER = timedelta(minutes=5)
+
+
+def is_inbox_enabled():
+    return getattr(settings, "WEBHOOK_INBOX_ENABLED", True)
+
+
+def store_event(raw_body, signature, payload):
+    """
+    Persist a verified event. Returns (event, created); created is False
+    when Paystack re-sends an event that is already in the inbox.
+    """
+    data = payload.get("data") or {}
+    try:
+        with transaction.atomic():
+            event = WebhookEvent.objects.create(
+                event=payload.get("event", ""),
+                reference=data.get("reference", ""),
+                raw_body=raw_body.decode("utf-8"),
+                signature=signature,
+            )
+        return event, True
+    except IntegrityError:
+        event = WebhookEvent.objects.get(
+            event=payload.get("event", ""), reference=data.get("reference", "")
+        )
+        return event, False
+
+
+def process_event(event):
+    """
+    Run one claimed event through its app handler and record the outcome.
+    Returns True when the handler accepted it.
+    """
+    handler = get_handler(event.reference)
+    response_status = None
+    error = ""
+
+    if handler is None:
+        error = f"Unknown reference format: {event.reference}"
+    else:
+        try:
+            response = handler(json.loads(event.raw_body))
+            response_status = response.status_code
+            if response_status >= 400:
+                error = response.content.decode("utf-8", "replace")[:1000]
+        except Exception as e:
+            logger.exception(f"Webhook inbox: handler failed for {event.reference}")
+            error = str(e)
+
+    event.response_status = response_status
+    event.last_error = error
+    event.status = WebhookEvent.STATUS_FAILED if error else WebhookEvent.STATUS_PROCESSED
+    event.processed_at = timezone.now()
+    event.save(
+        update_fields=["response_status", "last_error", "status", "processed_at"]
+    )
+
+    if error:
+        logger.error(f"Webhook inbox: {event.reference} failed - {error}")
+    return not error
+
+
+def claim_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Claim up to batch_size pending events (oldest first) for this worker,
+    plus stale claims and failed events due another attempt.
+    SKIP LOCKED lets several workers drain the inbox side by side.
+    """
+    now = timezone.now()
+    claimable = (
+        Q(status=WebhookEvent.STATUS_PENDING)
+        | Q(
+            status=WebhookEvent.STATUS_PROCESSING,
+            claimed_at__lt=now - STALE_CLAIM_AFTER,
+        )
+        | Q(
+            status=WebhookEvent.STATUS_FAILED,
+            attempts__lt=MAX_ATTEMPTS,
+            processed_at__lt=now - RETRY_FAILED_AFTER,
+        )
+    )
+    with transaction.atomic():
+        ids = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .order_by("received_at", "id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        WebhookEvent.objects.filter(id__in=ids).update(
+            status=WebhookEvent.STATUS_PROCESSING,
+            attempts=F("attempts") + 1,
+            claimed_at=now,
+        )
+    return list(
+        WebhookEvent.objects.filter(id__in=ids).order_by("received_at", "id")
+    )
+
+
+def drain_inbox(batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """
+    Process claimed batches until the inbox is empty (or max_batches ran).
+    Returns (processed, failed) counts.
+    """
+    processed = failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        events = claim_batch(batch_size)
+        if not events:
+            break
+        for event in events:
+            if process_event(event):
+                processed += 1
+            else:
+                failed += 1
+        batches += 1
+
+    if processed or failed:
+        logger.info(
+            f"Webhook inbox drained: {processed} processed, {failed} failed"
+        )
+    return processed, failed
+
+
+def requeue_failed_event(event):
+    """
+    Put a failed event back in the inbox when Paystack delivers it again.
+    Returns True if it was failed (and is now pending).
+    """
+    return bool(
+        requeue_events(
+            WebhookEvent.objects.filter(id=event.id, status=WebhookEvent.STATUS_FAILED)
+        )
+    )
+
+
+def requeue_events(queryset):
+    """Put events back in the inbox for replay. Returns how many were queued."""
+    return queryset.update(
+        status=WebhookEvent.STATUS_PENDING,
+        claimed_at=None,
+        last_error="",
+    )
@@ -0,0 +1,37 @@
+# webhook_router/management/commands/process_webhook_inbox.py
+"""
+Management command: process_webhook_inbox
+
+Drains pending webhook events into the app handlers. router_webhook already
+queues a background drain per event; run this from cron as a safety net:
+  * * * * * /path/to/python manage.py process_webhook_inbox
+"""
+from django.core.management.base import BaseCommand
+
+from webhook_router.inbox import DEFAULT_BATCH_SIZE, drain_inbox
+
+
+class Command(BaseCommand):
+    help = "Process pending webhook events in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of events claimed per batch",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: until the inbox is empty)",
+        )
+
+    def handle(self, *args, **options):
+        processed, failed = drain_inbox(
+            batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {processed} events ({failed} failed)")
+        )
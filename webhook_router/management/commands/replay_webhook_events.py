@@ -0,0 +1,73 @@
+# webhook_router/management/commands/replay_webhook_events.py
+"""
+Management command: replay_webhook_events
+
+Puts stored webhook events back in the inbox and processes them again.
+Handlers are idempotent, so replaying an already-applied event is safe.
+
+  python manage.py replay_webhook_events                 # all failed events
+  python manage.py replay_webhook_events --reference MATERIAL-ABC123
+  python manage.py replay_webhook_events --all --since 2026-10-01
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date, parse_datetime
+
+from webhook_router.inbox import DEFAULT_BATCH_SIZE, drain_inbox, requeue_events
+from webhook_router.models import WebhookEvent
+
+
+class Command(BaseCommand):
+    help = "Replay stored webhook events through their handlers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reference",
+            action="append",
+            default=[],
+            help="Replay events for this reference (repeatable)",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Replay processed events too, not only failed ones",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only events received on/after this date or datetime",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of events claimed per batch",
+        )
+        parser.add_argument(
+            "--queue-only",
+            action="store_true",
+            help="Requeue without processing (leave it to the worker)",
+        )
+
+    def handle(self, *args, **options):
+        events = WebhookEvent.objects.all()
+
+        if options["reference"]:
+            events = events.filter(reference__in=options["reference"])
+        elif not options["all"]:
+            events = events.filter(status=WebhookEvent.STATUS_FAILED)
+
+        if options["since"]:
+            since = parse_datetime(options["since"]) or parse_date(options["since"])
+            if since is None:
+                raise CommandError(f"Invalid --since value: {options['since']}")
+            events = events.filter(received_at__gte=since)
+
+        queued = requeue_events(events)
+        self.stdout.write(f"Requeued {queued} events")
+
+        if options["queue_only"]:
+            return
+
+        processed, failed = drain_inbox(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Replayed {processed} events ({failed} failed)")
+        )
@@ -1,3 +1,53 @@
 from django.db import models
 
-# Create your models here.
+
+class WebhookEvent(models.Model):
+    """
+    Durable inbox for verified Paystack webhooks.
+
+    The router stores each event and answers 200 straight away; a worker
+    drains pending rows into the per-app handlers (see webhook_router.inbox).
+    The (reference, event) constraint absorbs Paystack's retries.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_PROCESSED = "processed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_PROCESSED, "Processed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    event = models.CharField(max_length=100)
+    reference = models.CharField(max_length=255)
+    # Exact body and header as received, so handlers see the original request
+    raw_body = models.TextField()
+    signature = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["received_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reference", "event"], name="unique_webhook_reference_event"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["status", "received_at"], name="webhook_status_received_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.reference} ({self.status})"
@@ -0,0 +1,57 @@
+# webhook_router/registry.py
+"""
+Registry of Paystack webhook handlers by reference prefix.
+
+Apps register in AppConfig.ready():
+
+    register_webhook_handler("MATERIAL-", "payment.api_views.handle_payment_webhook")
+
+A handler receives the payload the router already verified and parsed,
+and returns an HttpResponse. Handlers are given as dotted paths so apps
+don't import each other at startup; each is imported on first use and
+cached. The longest matching prefix wins (IMG-BULK- before any shorter
+prefix it starts with).
+"""
+from django.utils.module_loading import import_string
+
+# prefix -> dotted path (or callable)
+_handlers = {}
+# prefixes, longest first
+_prefixes = []
+# prefix -> imported handler
+_resolved = {}
+
+
+def register_webhook_handler(prefix, handler):
+    """Route references starting with prefix to handler (callable or dotted path)"""
+    _handlers[prefix] = handler
+    _resolved.pop(prefix, None)
+    _prefixes[:] = sorted(_handlers, key=len, reverse=True)
+
+
+def get_handler_prefix(reference):
+    """Return the registered prefix matching reference, or None"""
+    for prefix in _prefixes:
+        if reference.startswith(prefix):
+            return prefix
+    return None
+
+
+def get_handler(reference):
+    """Return the handler for reference, or None if the format is unknown"""
+    prefix = get_handler_prefix(reference)
+    if prefix is None:
+        return None
+
+    handler = _resolved.get(prefix)
+    if handler is None:
+        handler = _handlers[prefix]
+        if isinstance(handler, str):
+            handler = import_string(handler)
+        _resolved[prefix] = handler
+    return handler
+
+
+def clear_handler_cache():
+    """Forget imported handlers so the next call re-imports them (tests)"""
+    _resolved.clear()
@@ -0,0 +1,204 @@
+# webhook_router/tests/tests_caching.py
+"""
+Tests for material/caching.py and the cache aliases in material/settings.py
+
+Test Coverage:
+===============
+✅ Aliases
+   - get_cache() returns the named alias when configured
+   - Falls back to "default" when an alias isn't configured
+   - Throttle history stored in the "throttle" alias
+   - Catalog cache version stored in the "pages" alias
+   - Redis aliases pool connections, compress app/page data, fail open
+
+✅ Benchmark: throttle + cache overhead per request, database vs Redis
+   (Redis half runs against TEST_REDIS_URL, default redis://127.0.0.1:6379/15)
+"""
+import importlib.util
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from material import settings as project_settings
+from material.caching import get_cache
+from material.throttling import AnonRateThrottle, UserRateThrottle
+from products.catalog_cache import CATALOG_VERSION_CACHE_KEY, get_catalog_version
+
+User = get_user_model()
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL", "redis://127.0.0.1:6379/15")
+
+
+def locmem(location):
+    return {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": location,
+    }
+
+
+SPLIT_CACHES = {
+    "default": locmem("caching-default"),
+    "pages": locmem("caching-pages"),
+    "throttle": locmem("caching-throttle"),
+}
+
+
+@override_settings(CACHES=SPLIT_CACHES)
+class CacheAliasTests(SimpleTestCase):
+    """Test alias lookup and where each kind of data lands"""
+
+    def setUp(self):
+        for alias in SPLIT_CACHES:
+            caches[alias].clear()
+
+    def test_named_alias(self):
+        """Test configured aliases are returned as-is"""
+        self.assertIs(get_cache("pages"), caches["pages"])
+        self.assertIs(get_cache("throttle"), caches["throttle"])
+
+    @override_settings(CACHES={"default": locmem("caching-only-default")})
+    def test_missing_alias_falls_back_to_default(self):
+        """Test CACHES overrides with only a default entry keep working"""
+        self.assertIs(get_cache("pages"), caches["default"])
+        self.assertIs(get_cache("throttle"), caches["default"])
+
+    def test_throttle_history_in_throttle_alias(self):
+        """Test throttle checks write to the throttle cache only"""
+        request = APIRequestFactory().get("/")
+        request.META["REMOTE_ADDR"] = "10.0.0.1"
+
+        class Throttle(AnonRateThrottle):
+            rate = "10/minute"
+            scope = "caching_test"
+
+        throttle = Throttle()
+        self.assertTrue(throttle.allow_request(request, None))
+
+        key = throttle.get_cache_key(request, None)
+        self.assertIsNotNone(caches["throttle"].get(key))
+        self.assertIsNone(caches["default"].get(key))
+
+    def test_catalog_cache_uses_pages_alias(self):
+        """Test the product catalog cache keeps its state in the pages cache"""
+        version = get_catalog_version()
+
+        self.assertEqual(caches["pages"].get(CATALOG_VERSION_CACHE_KEY), version)
+        self.assertIsNone(caches["default"].get(CATALOG_VERSION_CACHE_KEY))
+
+    def test_redis_alias_options(self):
+        """Test Redis aliases pool, compress large payloads and fail open"""
+        pages = project_settings.redis_cache(
+            "redis://cache:6379/1", "material_pages", compress=True
+        )
+        throttle = project_settings.redis_cache(
+            "redis://cache:6379/1", "material_throttle"
+        )
+
+        self.assertEqual(pages["BACKEND"], "django_redis.cache.RedisCache")
+        self.assertIn("max_connections", pages["OPTIONS"]["CONNECTION_POOL_KWARGS"])
+        self.assertTrue(pages["OPTIONS"]["IGNORE_EXCEPTIONS"])
+        self.assertIn("Zlib", pages["OPTIONS"]["COMPRESSOR"])
+        # Throttle entries are tiny; compressing them only costs CPU
+        self.assertNotIn("COMPRESSOR", throttle["OPTIONS"])
+
+
+class BenchThrottle(UserRateThrottle):
+    rate = "100000/hour"
+    scope = "caching_bench"
+
+
+class CachedCatalogView(APIView):
+    """Throttled view that reads a product-list sized payload from the cache"""
+
+    throttle_classes = [BenchThrottle]
+
+    def get(self, request):
+        cache = get_cache("default")
+        payload = cache.get("caching_bench_catalog")
+        if payload is None:
+            payload = [
+                {"id": i, "name": f"Product {i}", "price": "5000.00"}
+                for i in range(50)
+            ]
+            cache.set("caching_bench_catalog", payload, 300)
+        return Response(payload)
+
+
+class CacheBackendBenchmarkTests(TestCase):
+    """Benchmark: throttle + cache overhead per request, database vs Redis"""
+
+    REQUESTS = 200
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.view = CachedCatalogView.as_view()
+        self.factory = APIRequestFactory()
+
+    def _measure(self, caches_setting):
+        """Return (seconds per request, queries issued) for REQUESTS requests"""
+        with override_settings(CACHES=caches_setting):
+            for alias in caches_setting:
+                caches[alias].clear()
+            request = self.factory.get("/catalog/")
+            force_authenticate(request, user=self.user)
+            self.view(request)  # Warm the catalog entry and connections
+
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                for _ in range(self.REQUESTS):
+                    response = self.view(request)
+                elapsed = time.perf_counter() - start
+
+            self.assertEqual(response.status_code, 200)
+            for alias in caches_setting:
+                caches[alias].clear()
+        return elapsed / self.REQUESTS, len(ctx.captured_queries)
+
+    def _redis_caches(self):
+        if importlib.util.find_spec("django_redis") is None:
+            self.skipTest("django_redis not installed")
+        try:
+            import redis
+
+            redis.Redis.from_url(TEST_REDIS_URL, socket_connect_timeout=0.5).ping()
+        except Exception:
+            self.skipTest(f"No Redis reachable at {TEST_REDIS_URL}")
+
+        redis_cache = project_settings.redis_cache
+        return {
+            "default": redis_cache(TEST_REDIS_URL, "bench", compress=True),
+            "pages": redis_cache(TEST_REDIS_URL, "bench_pages", compress=True),
+            "throttle": redis_cache(TEST_REDIS_URL, "bench_throttle"),
+        }
+
+    def test_database_vs_redis_overhead(self):
+        """Test Redis takes throttle and cache traffic off the database"""
+        redis_caches = self._redis_caches()
+        call_command("createcachetable", verbosity=0)
+        database_caches = {
+            "default": project_settings.database_cache("bench"),
+            "pages": project_settings.database_cache("bench_pages"),
+            "throttle": project_settings.database_cache("bench_throttle"),
+        }
+
+        db_per_request, db_queries = self._measure(database_caches)
+        redis_per_request, redis_queries = self._measure(redis_caches)
+
+        summary = (
+            f"database {db_per_request * 1000:.2f}ms/request ({db_queries} queries), "
+            f"redis {redis_per_request * 1000:.2f}ms/request ({redis_queries} queries)"
+        )
+        # Every throttle check and cache read was a Postgres round trip
+        self.assertGreaterEqual(db_queries, self.REQUESTS * 2, summary)
+        self.assertEqual(redis_queries, 0, summary)
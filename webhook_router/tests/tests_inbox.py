@@ -0,0 +1,329 @@
+# webhook_router/tests/tests_inbox.py
+"""
+Tests for the webhook inbox (webhook_router/inbox.py)
+
+Test Coverage:
+===============
+✅ router_webhook with the inbox enabled
+   - Signature verified before anything is stored
+   - Event stored and 200 returned without running the handler
+   - Duplicate (reference, event) absorbed
+   - Redelivered failed event queued again
+   - Non charge.success events and unknown references not stored
+
+✅ Draining
+   - Stored payloads handed to the right registered handler
+   - Failed handlers leave the event failed with the error recorded
+   - Stale claims are picked up again
+   - Failed events retried after a delay, up to MAX_ATTEMPTS
+   - process_webhook_inbox / replay_webhook_events commands
+
+✅ Query counts: flat per event on ingest and drain
+"""
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.http import HttpResponse, JsonResponse
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from webhook_router.inbox import MAX_ATTEMPTS, RETRY_FAILED_AFTER, drain_inbox
+from webhook_router.models import WebhookEvent
+from webhook_router.registry import clear_handler_cache
+from webhook_router.views import router_webhook
+
+SECRET = "test_secret_key"
+
+
+def sign(body):
+    return hmac.new(SECRET.encode("utf-8"), body, hashlib.sha512).hexdigest()
+
+
+class InboxTestMixin:
+    def setUp(self):
+        self.factory = RequestFactory()
+        # Handlers are cached on first use; start each test from the patched module
+        clear_handler_cache()
+        self.addCleanup(clear_handler_cache)
+
+    def _payload(self, reference="MATERIAL-TEST", event="charge.success"):
+        return {
+            "event": event,
+            "data": {"reference": reference, "amount": 1000000, "status": "success"},
+        }
+
+    def _post(self, payload, signature=None):
+        body = json.dumps(payload).encode("utf-8")
+        headers = {}
+        if signature is not False:
+            headers["HTTP_X_PAYSTACK_SIGNATURE"] = signature or sign(body)
+        request = self.factory.post(
+            "/api/webhook/", data=body, content_type="application/json", **headers
+        )
+        return router_webhook(request)
+
+    def _store(self, count, prefix="MATERIAL-BENCH"):
+        for i in range(count):
+            body = json.dumps(self._payload(f"{prefix}-{i}"))
+            WebhookEvent.objects.create(
+                event="charge.success",
+                reference=f"{prefix}-{i}",
+                raw_body=body,
+                signature=sign(body.encode("utf-8")),
+            )
+
+
+@override_settings(PAYSTACK_SECRET_KEY=SECRET, WEBHOOK_INBOX_ENABLED=True)
+@patch("material.background_utils.drain_webhook_inbox_task")
+class RouterInboxTests(InboxTestMixin, TestCase):
+    """Test router_webhook storing events instead of running handlers"""
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_event_stored_and_acknowledged(self, mock_handler, mock_drain):
+        """Test the event is stored and 200 returned without the handler"""
+        response = self._post(self._payload("MATERIAL-ABC"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["status"], "queued")
+        mock_handler.assert_not_called()
+        mock_drain.assert_called_once()
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.reference, "MATERIAL-ABC")
+        self.assertEqual(event.event, "charge.success")
+        self.assertEqual(event.status, WebhookEvent.STATUS_PENDING)
+
+    def test_missing_signature_rejected(self, mock_drain):
+        """Test unsigned webhooks are rejected and not stored"""
+        response = self._post(self._payload(), signature=False)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_invalid_signature_rejected(self, mock_drain):
+        """Test webhooks with a bad signature are rejected and not stored"""
+        response = self._post(self._payload(), signature="invalid")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_duplicate_event_absorbed(self, mock_drain):
+        """Test Paystack retries of the same event are stored once"""
+        self._post(self._payload("MATERIAL-DUP"))
+        response = self._post(self._payload("MATERIAL-DUP"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["status"], "duplicate")
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        mock_drain.assert_called_once()
+
+    def test_redelivered_failed_event_requeued(self, mock_drain):
+        """Test a Paystack redelivery puts a failed event back in the inbox"""
+        self._post(self._payload("MATERIAL-RETRY"))
+        WebhookEvent.objects.update(
+            status=WebhookEvent.STATUS_FAILED, last_error="boom", attempts=MAX_ATTEMPTS
+        )
+
+        response = self._post(self._payload("MATERIAL-RETRY"))
+
+        self.assertEqual(json.loads(response.content)["status"], "queued")
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.status, WebhookEvent.STATUS_PENDING)
+        self.assertEqual(event.last_error, "")
+        self.assertEqual(mock_drain.call_count, 2)
+
+    def test_other_events_ignored(self, mock_drain):
+        """Test non charge.success events are acknowledged but not stored"""
+        response = self._post(self._payload(event="transfer.success"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_unknown_reference_rejected(self, mock_drain):
+        """Test references no app handles are rejected"""
+        response = self._post(self._payload("UNKNOWN-123"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+
+@override_settings(PAYSTACK_SECRET_KEY=SECRET)
+class DrainInboxTests(InboxTestMixin, TestCase):
+    """Test the worker side of the inbox"""
+
+    @patch("bulk_orders.views.handle_bulk_order_payment")
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_events_routed_to_handlers(self, mock_payment, mock_bulk):
+        """Test each stored payload reaches its registered handler"""
+        mock_payment.return_value = HttpResponse(status=200)
+        mock_bulk.return_value = JsonResponse({"status": "success"})
+        self._store(1, prefix="MATERIAL-A")
+        self._store(1, prefix="ORDER-B")
+
+        processed, failed = drain_inbox()
+
+        self.assertEqual((processed, failed), (2, 0))
+        forwarded_payload = mock_payment.call_args[0][0]
+        self.assertEqual(forwarded_payload, self._payload("MATERIAL-A-0"))
+        mock_bulk.assert_called_once()
+        self.assertEqual(
+            set(WebhookEvent.objects.values_list("status", flat=True)),
+            {WebhookEvent.STATUS_PROCESSED},
+        )
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_handler_error_marks_event_failed(self, mock_payment):
+        """Test error responses and exceptions leave the event failed"""
+        mock_payment.side_effect = [HttpResponse(status=404), Exception("boom")]
+        self._store(2)
+
+        processed, failed = drain_inbox()
+
+        self.assertEqual((processed, failed), (0, 2))
+        first, second = WebhookEvent.objects.order_by("reference")
+        self.assertEqual(first.status, WebhookEvent.STATUS_FAILED)
+        self.assertEqual(first.response_status, 404)
+        self.assertEqual(second.last_error, "boom")
+        self.assertEqual(first.attempts, 1)
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_stale_claims_reclaimed(self, mock_payment):
+        """Test events stuck in processing are picked up again"""
+        mock_payment.return_value = HttpResponse(status=200)
+        self._store(2)
+        WebhookEvent.objects.filter(reference="MATERIAL-BENCH-0").update(
+            status=WebhookEvent.STATUS_PROCESSING,
+            claimed_at=timezone.now() - timedelta(hours=1),
+        )
+        WebhookEvent.objects.filter(reference="MATERIAL-BENCH-1").update(
+            status=WebhookEvent.STATUS_PROCESSING, claimed_at=timezone.now()
+        )
+
+        processed, _ = drain_inbox()
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(
+            WebhookEvent.objects.get(reference="MATERIAL-BENCH-1").status,
+            WebhookEvent.STATUS_PROCESSING,
+        )
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_failed_events_retried(self, mock_payment):
+        """Test failed events are claimed again once due, until MAX_ATTEMPTS"""
+        mock_payment.return_value = HttpResponse(status=200)
+        self._store(3)
+        due = timezone.now() - RETRY_FAILED_AFTER - timedelta(seconds=1)
+        for reference, attempts, processed_at in [
+            ("MATERIAL-BENCH-0", 1, due),  # Retried
+            ("MATERIAL-BENCH-1", 1, timezone.now()),  # Not due yet
+            ("MATERIAL-BENCH-2", MAX_ATTEMPTS, due),  # Out of attempts
+        ]:
+            WebhookEvent.objects.filter(reference=reference).update(
+                status=WebhookEvent.STATUS_FAILED,
+                attempts=attempts,
+                processed_at=processed_at,
+            )
+
+        processed, failed = drain_inbox()
+
+        self.assertEqual((processed, failed), (1, 0))
+        statuses = dict(WebhookEvent.objects.values_list("reference", "status"))
+        self.assertEqual(
+            statuses,
+            {
+                "MATERIAL-BENCH-0": WebhookEvent.STATUS_PROCESSED,
+                "MATERIAL-BENCH-1": WebhookEvent.STATUS_FAILED,
+                "MATERIAL-BENCH-2": WebhookEvent.STATUS_FAILED,
+            },
+        )
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_process_command(self, mock_payment):
+        """Test process_webhook_inbox drains in batches"""
+        mock_payment.return_value = HttpResponse(status=200)
+        self._store(5)
+        out = StringIO()
+
+        call_command("process_webhook_inbox", batch_size=2, max_batches=2, stdout=out)
+
+        self.assertIn("Processed 4 events", out.getvalue())
+        self.assertEqual(
+            WebhookEvent.objects.filter(status=WebhookEvent.STATUS_PENDING).count(), 1
+        )
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_replay_command_retries_failed_events(self, mock_payment):
+        """Test replay_webhook_events reprocesses failed events only"""
+        mock_payment.return_value = HttpResponse(status=200)
+        self._store(3)
+        WebhookEvent.objects.filter(reference="MATERIAL-BENCH-0").update(
+            status=WebhookEvent.STATUS_FAILED, last_error="boom"
+        )
+        WebhookEvent.objects.exclude(reference="MATERIAL-BENCH-0").update(
+            status=WebhookEvent.STATUS_PROCESSED
+        )
+        out = StringIO()
+
+        call_command("replay_webhook_events", stdout=out)
+
+        self.assertIn("Requeued 1 events", out.getvalue())
+        mock_payment.assert_called_once()
+        event = WebhookEvent.objects.get(reference="MATERIAL-BENCH-0")
+        self.assertEqual(event.status, WebhookEvent.STATUS_PROCESSED)
+        self.assertEqual(event.last_error, "")
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_replay_command_by_reference(self, mock_payment):
+        """Test replay_webhook_events can target processed events by reference"""
+        mock_payment.return_value = HttpResponse(status=200)
+        self._store(2)
+        WebhookEvent.objects.update(status=WebhookEvent.STATUS_PROCESSED)
+
+        call_command(
+            "replay_webhook_events", reference=["MATERIAL-BENCH-1"], stdout=StringIO()
+        )
+
+        mock_payment.assert_called_once()
+
+
+@override_settings(PAYSTACK_SECRET_KEY=SECRET)
+class InboxQueryCountTests(InboxTestMixin, TestCase):
+    """Test ingest and drain costs stay flat per event"""
+
+    @patch("payment.api_views.handle_payment_webhook")
+    @patch("material.background_utils.drain_webhook_inbox_task")
+    def test_ingest_queries_constant_per_event(self, mock_drain, mock_payment):
+        """Test every webhook costs the same queries and runs no handler inline"""
+        counts = []
+        for i in range(5):
+            with CaptureQueriesContext(connection) as ctx:
+                self._post(self._payload(f"MATERIAL-INGEST-{i}"))
+            counts.append(len(ctx.captured_queries))
+
+        self.assertEqual(WebhookEvent.objects.count(), 5)
+        self.assertEqual(len(set(counts)), 1, counts)
+        mock_payment.assert_not_called()
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_drain_one_query_per_event(self, mock_payment):
+        """Test claiming costs the same whatever the batch size, plus one write per event"""
+        mock_payment.return_value = HttpResponse(status=200)
+
+        def drain_queries(count, prefix):
+            self._store(count, prefix=prefix)
+            with CaptureQueriesContext(connection) as ctx:
+                processed, _ = drain_inbox(batch_size=count)
+            self.assertEqual(processed, count)
+            return len(ctx.captured_queries)
+
+        small = drain_queries(10, "MATERIAL-SMALL")
+        large = drain_queries(20, "MATERIAL-LARGE")
+
+        self.assertEqual(large - small, 10)
@@ -0,0 +1,152 @@
+# webhook_router/tests/tests_registry.py
+"""
+Tests for webhook_router/registry.py
+
+Test Coverage:
+===============
+✅ Registration
+   - Every payment app registers its reference prefix
+   - Longest matching prefix wins
+   - Unknown references resolve to None
+
+✅ Lazy import
+   - Dotted paths imported on first use, then cached
+   - clear_handler_cache() forces a re-import
+
+✅ Dispatch
+   - Body parsed once, only the matching handler called
+   - Non-matching registrations never imported
+"""
+import hashlib
+import hmac
+import json
+from unittest.mock import Mock, patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from webhook_router import registry
+from webhook_router.registry import (
+    clear_handler_cache,
+    get_handler,
+    get_handler_prefix,
+    register_webhook_handler,
+)
+from webhook_router.views import router_webhook
+
+
+class RegistryIsolationMixin:
+    """Restore the app registrations after each test"""
+
+    def setUp(self):
+        saved = (dict(registry._handlers), list(registry._prefixes))
+
+        def restore():
+            registry._handlers.clear()
+            registry._handlers.update(saved[0])
+            registry._prefixes[:] = saved[1]
+            clear_handler_cache()
+
+        clear_handler_cache()
+        self.addCleanup(restore)
+
+
+class WebhookRegistryTests(RegistryIsolationMixin, SimpleTestCase):
+    """Test handler registration and lookup"""
+
+    def test_apps_register_their_prefixes(self):
+        """Test each payment app's handler is registered at startup"""
+        from bulk_orders.views import handle_bulk_order_payment
+        from excel_bulk_orders.views import handle_excel_bulk_order_payment
+        from image_bulk_orders.views import handle_image_bulk_order_payment
+        from payment.api_views import handle_payment_webhook
+
+        self.assertIs(get_handler("MATERIAL-1"), handle_payment_webhook)
+        self.assertIs(get_handler("ORDER-1-2"), handle_bulk_order_payment)
+        self.assertIs(get_handler("IMG-BULK-1"), handle_image_bulk_order_payment)
+        self.assertIs(get_handler("EXL-1"), handle_excel_bulk_order_payment)
+
+    def test_unknown_reference(self):
+        """Test unregistered formats resolve to None"""
+        self.assertIsNone(get_handler("UNKNOWN-1"))
+        self.assertIsNone(get_handler("order-lowercase"))
+        self.assertIsNone(get_handler(""))
+
+    def test_longest_prefix_wins(self):
+        """Test overlapping prefixes resolve to the most specific one"""
+        general = lambda payload: HttpResponse(status=200)  # noqa: E731
+        specific = lambda payload: HttpResponse(status=201)  # noqa: E731
+        register_webhook_handler("TEST-", general)
+        register_webhook_handler("TEST-SPECIAL-", specific)
+
+        self.assertEqual(get_handler_prefix("TEST-SPECIAL-1"), "TEST-SPECIAL-")
+        self.assertIs(get_handler("TEST-SPECIAL-1"), specific)
+        self.assertIs(get_handler("TEST-1"), general)
+
+    def test_handler_imported_once(self):
+        """Test dotted paths are imported on first use and then cached"""
+        with patch(
+            "webhook_router.registry.import_string", wraps=registry.import_string
+        ) as mock_import:
+            for _ in range(5):
+                get_handler("MATERIAL-1")
+
+        mock_import.assert_called_once_with("payment.api_views.handle_payment_webhook")
+
+    def test_clear_cache_reimports(self):
+        """Test clearing the cache picks up a patched handler"""
+        get_handler("MATERIAL-1")
+
+        with patch("payment.api_views.handle_payment_webhook") as mock_handler:
+            self.assertIsNot(get_handler("MATERIAL-1"), mock_handler)
+            clear_handler_cache()
+            self.assertIs(get_handler("MATERIAL-1"), mock_handler)
+
+
+@override_settings(PAYSTACK_SECRET_KEY="test_secret_key", WEBHOOK_INBOX_ENABLED=False)
+class RouterDispatchTests(RegistryIsolationMixin, SimpleTestCase):
+    """Test the router resolves one handler by prefix and parses once"""
+
+    def _post(self, reference):
+        body = json.dumps(
+            {"event": "charge.success", "data": {"reference": reference}}
+        ).encode("utf-8")
+        signature = hmac.new(b"test_secret_key", body, hashlib.sha512).hexdigest()
+        request = RequestFactory().post(
+            "/api/webhook/",
+            data=body,
+            content_type="application/json",
+            HTTP_X_PAYSTACK_SIGNATURE=signature,
+        )
+        return router_webhook(request)
+
+    def test_dispatch_calls_matching_handler_once(self):
+        """Test each webhook is parsed once and reaches only its handler"""
+        handler = Mock(return_value=HttpResponse(status=200))
+        register_webhook_handler("BENCH-", handler)
+
+        with patch("webhook_router.views.json.loads", wraps=json.loads) as mock_loads:
+            for _ in range(3):
+                response = self._post("BENCH-1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(handler.call_count, 3)
+        self.assertEqual(handler.call_args[0][0]["data"]["reference"], "BENCH-1")
+        self.assertEqual(mock_loads.call_count, 3)
+        # Only the matching prefix was resolved; no other app handler imported
+        self.assertEqual(list(registry._resolved), ["BENCH-"])
+
+    def test_lookup_never_touches_other_handlers(self):
+        """Test resolving a reference skips every non-matching registration"""
+        handler = Mock()
+        register_webhook_handler("BENCH-", handler)
+        for prefix in ["BENCH-X-", "BENCHMARK-", "OTHER-"]:
+            # Importing any of these would raise
+            register_webhook_handler(prefix, f"does.not.exist.{prefix.lower()}")
+
+        with patch("webhook_router.registry.import_string") as mock_import:
+            for _ in range(5):
+                self.assertIs(get_handler("BENCH-1"), handler)
+
+        mock_import.assert_not_called()
+        self.assertEqual(get_handler_prefix("BENCH-X-1"), "BENCH-X-")
@@ -14,19 +14,28 @@ Test Coverage:
 - SustainedUserRateThrottle (User-based, 500/hour)
 - LiveFormSubmitThrottle (Anon-based, 30/hour)
 - LiveFormViewThrottle (Anon-based, 200/hour)
+- GCRA: burst of N, one request per period/N, O(1) state, atomic on Redis
+- Benchmark: throttled requests/sec (opt-in: set RUN_BENCHMARKS=1;
+  Redis half needs TEST_REDIS_URL)
 """
 from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
+from django.core.cache import cache, caches
 from rest_framework.test import APIRequestFactory, force_authenticate
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from unittest.mock import Mock, patch
+import importlib.util
+import os
+import threading
 import time
+import unittest
 
 # Import all throttle classes
+from material.settings import redis_cache
 from material.throttling import (
+    AnonRateThrottle,
     CheckoutRateThrottle,
     PaymentRateThrottle,
     BulkOrderWebhookThrottle,
@@ -878,3 +887,236 @@ class ThrottleDocumentationTests(TestCase):
 
         # Live form view: 200/hour - generous for polling
         self.assertEqual(LiveFormViewThrottle().rate, "200/hour")
+
+
+# ============================================================================
+# GCRA TESTS
+# ============================================================================
+
+
+class CountingThrottle(AnonRateThrottle):
+    """Test throttle: 3 requests a minute"""
+
+    rate = "3/minute"
+    scope = "gcra_test"
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-cache",
+        }
+    }
+)
+class GCRAThrottleTests(TestCase):
+    """Test the GCRA throttle behind every class in material/throttling.py"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.factory = APIRequestFactory()
+        self.now = 1000.0
+        cache.clear()
+
+    def tearDown(self):
+        """Clean up cache"""
+        cache.clear()
+
+    def _allow(self):
+        throttle = CountingThrottle()
+        throttle.timer = lambda: self.now
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.1")
+        return throttle.allow_request(request, None), throttle
+
+    def test_burst_then_throttled(self):
+        """Test N/period allows a burst of N, then throttles"""
+        for i in range(3):
+            allowed, _ = self._allow()
+            self.assertTrue(allowed)
+
+        allowed, throttle = self._allow()
+        self.assertFalse(allowed)
+        # One request frees up every period/N (20s)
+        self.assertAlmostEqual(throttle.wait(), 20.0)
+
+    def test_burst_is_exactly_n_for_any_rate(self):
+        """Test request N+1 within one period is rejected, wait is period/N"""
+        for rate, emission in [("1/second", 1), ("5/minute", 12), ("10/hour", 360)]:
+            with self.subTest(rate=rate):
+                cache.clear()
+                throttle_class = type("RateThrottle", (CountingThrottle,), {"rate": rate})
+                request = self.factory.get("/", REMOTE_ADDR="10.0.0.9")
+                burst = throttle_class().num_requests
+                results = []
+                for _ in range(burst + 1):
+                    throttle = throttle_class()
+                    throttle.timer = lambda: self.now
+                    results.append(throttle.allow_request(request, None))
+
+                self.assertEqual(results, [True] * burst + [False])
+                self.assertAlmostEqual(throttle.wait(), emission)
+
+    def test_requests_free_up_at_emission_interval(self):
+        """Test a throttled client gets one request per period/N"""
+        for i in range(3):
+            self._allow()
+
+        self.now += 20
+        self.assertTrue(self._allow()[0])
+        self.assertFalse(self._allow()[0])
+
+    def test_state_is_one_value_per_key(self):
+        """Test the stored state stays a single number (O(1) per client)"""
+        for i in range(3):
+            _, throttle = self._allow()
+
+        state = cache.get(throttle.key)
+        self.assertIsInstance(state, float)
+        self.assertEqual(state, self.now + 60)
+
+    def test_one_key_per_client_constant_state(self):
+        """Test state stays one float per client however many requests it sends"""
+        keys = set()
+        for client in range(3):
+            request = self.factory.get("/", REMOTE_ADDR=f"10.0.1.{client}")
+            for _ in range(50):
+                self.now += 5
+                throttle = CountingThrottle()
+                throttle.timer = lambda: self.now
+                throttle.allow_request(request, None)
+                keys.add(throttle.key)
+                self.assertIsInstance(cache.get(throttle.key), float)
+
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(len(cache._cache), 3)
+
+    def test_rejected_requests_do_not_write(self):
+        """Test throttled requests leave the stored state untouched"""
+        for i in range(3):
+            _, throttle = self._allow()
+
+        with patch.object(cache, "set") as mock_set:
+            self.assertFalse(self._allow()[0])
+        mock_set.assert_not_called()
+
+    def test_is_drop_in_for_drf_classes(self):
+        """Test the project classes still subclass DRF's throttles"""
+        from rest_framework import throttling
+
+        self.assertIsInstance(LiveFormViewThrottle(), throttling.AnonRateThrottle)
+        self.assertIsInstance(BurstUserRateThrottle(), throttling.UserRateThrottle)
+
+
+def redis_throttle_caches():
+    """CACHES pointing the throttle alias at TEST_REDIS_URL, or None"""
+    url = os.environ.get("TEST_REDIS_URL", "redis://127.0.0.1:6379/15")
+    if importlib.util.find_spec("django_redis") is None:
+        return None
+    try:
+        import redis
+
+        redis.Redis.from_url(url, socket_connect_timeout=0.5).ping()
+    except Exception:
+        return None
+
+    return {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "throttle": redis_cache(url, "gcra_test"),
+    }
+
+
+class GCRARedisThrottleTests(TestCase):
+    """Test the atomic Lua GCRA on a local Redis"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        caches_setting = redis_throttle_caches()
+        if caches_setting is None:
+            self.skipTest("No Redis reachable at TEST_REDIS_URL")
+        override = override_settings(CACHES=caches_setting)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.throttle_cache = caches["throttle"]
+        self.throttle_cache.clear()
+        self.addCleanup(self.throttle_cache.clear)
+        self.factory = APIRequestFactory()
+
+    def test_burst_then_throttled(self):
+        """Test the Lua script allows exactly N then throttles"""
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.2")
+        results = [CountingThrottle().allow_request(request, None) for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_one_key_with_ttl(self):
+        """Test each client is one expiring string key"""
+        from django_redis import get_redis_connection
+
+        throttle = CountingThrottle()
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.3")
+        for _ in range(3):
+            throttle.allow_request(request, None)
+
+        client = get_redis_connection("throttle")
+        key = self.throttle_cache.make_key(throttle.key)
+        self.assertEqual(client.type(key), b"string")
+        self.assertGreater(client.pttl(key), 0)
+
+    def test_concurrent_checks_are_atomic(self):
+        """Test parallel requests never let more than N through"""
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.4")
+        results = []
+        barrier = threading.Barrier(10)
+
+        def hit():
+            barrier.wait()
+            results.append(CountingThrottle().allow_request(request, None))
+
+        threads = [threading.Thread(target=hit) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 3)
+
+
+@unittest.skipUnless(os.environ.get("RUN_BENCHMARKS"), "Benchmark; set RUN_BENCHMARKS=1")
+class GCRAThroughputTests(TestCase):
+    """Benchmark: throttled requests/sec"""
+
+    REQUESTS = 2000
+
+    def _throughput(self):
+        throttle = LiveFormViewThrottle()
+        requests = [
+            APIRequestFactory().get("/", REMOTE_ADDR=f"10.1.{i // 250}.{i % 250}")
+            for i in range(self.REQUESTS)
+        ]
+        start = time.perf_counter()
+        for request in requests:
+            throttle.allow_request(request, None)
+        return self.REQUESTS / (time.perf_counter() - start)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_local_cache_throughput(self):
+        """Test GCRA on an in-process cache"""
+        cache.clear()
+        # Generous floor: catches accidental per-request history scans
+        self.assertGreater(self._throughput(), 2000)
+
+    def test_redis_throughput(self):
+        """Test GCRA on Redis: one round trip per check"""
+        caches_setting = redis_throttle_caches()
+        if caches_setting is None:
+            self.skipTest("No Redis reachable at TEST_REDIS_URL")
+
+        with override_settings(CACHES=caches_setting):
+            caches["throttle"].clear()
+            throughput = self._throughput()
+            caches["throttle"].clear()
+
+        self.assertGreater(throughput, 500)
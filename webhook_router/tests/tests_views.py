@@ -33,17 +33,30 @@ from django.test import TestCase, RequestFactory, override_settings
 from django.http import HttpResponse
 from django.urls import reverse
 from unittest.mock import Mock, patch, MagicMock, call
+import hashlib
+import hmac
 import json
 import logging
 
+from webhook_router.registry import clear_handler_cache
 from webhook_router.views import router_webhook
 
+SECRET = "test_secret_key"
+
+
+def sign(body):
+    """Paystack signature for a request body"""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hmac.new(SECRET.encode("utf-8"), body, hashlib.sha512).hexdigest()
+
 
 # ============================================================================
 # ROUTER WEBHOOK TESTS
 # ============================================================================
 
 
+@override_settings(PAYSTACK_SECRET_KEY=SECRET, WEBHOOK_INBOX_ENABLED=False)  # Inline routing; inbox covered in tests_inbox.py
 class RouterWebhookTests(TestCase):
     """Test router_webhook function"""
 
@@ -51,13 +64,18 @@ class RouterWebhookTests(TestCase):
         """Set up test fixtures"""
         self.factory = RequestFactory()
         self.url = "/api/webhook/"
+        # Handlers are cached on first use; start each test from the patched module
+        clear_handler_cache()
+        self.addCleanup(clear_handler_cache)
 
     def _create_request(self, payload, method="POST", **headers):
-        """Helper to create webhook request"""
+        """Helper to create a signed webhook request"""
         if method == "POST":
+            body = json.dumps(payload) if isinstance(payload, dict) else payload
+            headers.setdefault("HTTP_X_PAYSTACK_SIGNATURE", sign(body))
             request = self.factory.post(
                 self.url,
-                data=json.dumps(payload) if isinstance(payload, dict) else payload,
+                data=body,
                 content_type="application/json",
                 **headers
             )
@@ -87,7 +105,7 @@ class RouterWebhookTests(TestCase):
     # SUCCESSFUL ROUTING TESTS
     # ========================================================================
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_route_to_regular_payment_webhook(self, mock_payment_webhook):
         """Test routing to regular payment webhook handler (MATERIAL- prefix)"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -101,11 +119,11 @@ class RouterWebhookTests(TestCase):
         self.assertEqual(response.status_code, 200)
         mock_payment_webhook.assert_called_once()
 
-        # Verify request was forwarded
-        forwarded_request = mock_payment_webhook.call_args[0][0]
-        self.assertEqual(forwarded_request.method, "POST")
+        # Verify the parsed payload was forwarded
+        forwarded_payload = mock_payment_webhook.call_args[0][0]
+        self.assertEqual(forwarded_payload, payload)
 
-    @patch("bulk_orders.views.bulk_order_payment_webhook")
+    @patch("bulk_orders.views.handle_bulk_order_payment")
     def test_route_to_bulk_order_webhook(self, mock_bulk_webhook):
         """Test routing to bulk order webhook handler (ORDER- prefix)"""
         mock_bulk_webhook.return_value = HttpResponse(status=200)
@@ -119,11 +137,11 @@ class RouterWebhookTests(TestCase):
         self.assertEqual(response.status_code, 200)
         mock_bulk_webhook.assert_called_once()
 
-        # Verify request was forwarded
-        forwarded_request = mock_bulk_webhook.call_args[0][0]
-        self.assertEqual(forwarded_request.method, "POST")
+        # Verify the parsed payload was forwarded
+        forwarded_payload = mock_bulk_webhook.call_args[0][0]
+        self.assertEqual(forwarded_payload, payload)
 
-    @patch("image_bulk_orders.views.image_bulk_order_payment_webhook")
+    @patch("image_bulk_orders.views.handle_image_bulk_order_payment")
     def test_route_to_image_bulk_order_webhook(self, mock_image_webhook):
         """Test routing to image bulk order webhook handler (IMG-BULK- prefix)"""
         mock_image_webhook.return_value = HttpResponse(status=200)
@@ -137,11 +155,11 @@ class RouterWebhookTests(TestCase):
         self.assertEqual(response.status_code, 200)
         mock_image_webhook.assert_called_once()
 
-        # Verify request was forwarded
-        forwarded_request = mock_image_webhook.call_args[0][0]
-        self.assertEqual(forwarded_request.method, "POST")
+        # Verify the parsed payload was forwarded
+        forwarded_payload = mock_image_webhook.call_args[0][0]
+        self.assertEqual(forwarded_payload, payload)
 
-    @patch("excel_bulk_orders.views.excel_bulk_order_payment_webhook")
+    @patch("excel_bulk_orders.views.handle_excel_bulk_order_payment")
     def test_route_to_excel_bulk_order_webhook(self, mock_excel_webhook):
         """Test routing to excel bulk order webhook handler (EXL- prefix)"""
         mock_excel_webhook.return_value = HttpResponse(status=200)
@@ -155,11 +173,11 @@ class RouterWebhookTests(TestCase):
         self.assertEqual(response.status_code, 200)
         mock_excel_webhook.assert_called_once()
 
-        # Verify request was forwarded
-        forwarded_request = mock_excel_webhook.call_args[0][0]
-        self.assertEqual(forwarded_request.method, "POST")
+        # Verify the parsed payload was forwarded
+        forwarded_payload = mock_excel_webhook.call_args[0][0]
+        self.assertEqual(forwarded_payload, payload)
 
-    @patch("bulk_orders.views.bulk_order_payment_webhook")
+    @patch("bulk_orders.views.handle_bulk_order_payment")
     def test_bulk_order_reference_variations(self, mock_bulk_webhook):
         """Test various bulk order reference formats"""
         mock_bulk_webhook.return_value = HttpResponse(status=200)
@@ -183,7 +201,7 @@ class RouterWebhookTests(TestCase):
         # Verify called for each reference
         self.assertEqual(mock_bulk_webhook.call_count, len(test_references))
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_regular_payment_reference_formats(self, mock_payment_webhook):
         """Test various MATERIAL reference formats"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -207,7 +225,7 @@ class RouterWebhookTests(TestCase):
         # Verify called for each reference
         self.assertEqual(mock_payment_webhook.call_count, len(test_references))
 
-    @patch("image_bulk_orders.views.image_bulk_order_payment_webhook")
+    @patch("image_bulk_orders.views.handle_image_bulk_order_payment")
     def test_image_bulk_order_reference_variations(self, mock_image_webhook):
         """Test various image bulk order reference formats"""
         mock_image_webhook.return_value = HttpResponse(status=200)
@@ -229,7 +247,7 @@ class RouterWebhookTests(TestCase):
 
         self.assertEqual(mock_image_webhook.call_count, len(test_references))
 
-    @patch("excel_bulk_orders.views.excel_bulk_order_payment_webhook")
+    @patch("excel_bulk_orders.views.handle_excel_bulk_order_payment")
     def test_excel_bulk_order_reference_variations(self, mock_excel_webhook):
         """Test various excel bulk order reference formats"""
         mock_excel_webhook.return_value = HttpResponse(status=200)
@@ -309,7 +327,7 @@ class RouterWebhookTests(TestCase):
 
     def test_charge_success_event_is_processed(self):
         """Test that charge.success events are processed"""
-        with patch("payment.api_views.payment_webhook") as mock_webhook:
+        with patch("payment.api_views.handle_payment_webhook") as mock_webhook:
             mock_webhook.return_value = HttpResponse(status=200)
 
             payload = self._create_payload(event="charge.success")
@@ -374,7 +392,7 @@ class RouterWebhookTests(TestCase):
         # Missing data means empty reference which is unknown format
         self.assertEqual(response.status_code, 400)
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_handler_exception_caught(self, mock_payment_webhook):
         """Test that handler exceptions are caught"""
         mock_payment_webhook.side_effect = Exception("Handler error")
@@ -389,7 +407,7 @@ class RouterWebhookTests(TestCase):
         response_data = json.loads(response.content)
         self.assertEqual(response_data.get("error"), "Internal server error")
 
-    @patch("bulk_orders.views.bulk_order_payment_webhook")
+    @patch("bulk_orders.views.handle_bulk_order_payment")
     def test_bulk_handler_exception_caught(self, mock_bulk_webhook):
         """Test that bulk handler exceptions are caught"""
         mock_bulk_webhook.side_effect = Exception("Bulk handler error")
@@ -401,7 +419,7 @@ class RouterWebhookTests(TestCase):
 
         self.assertEqual(response.status_code, 500)
 
-    @patch("image_bulk_orders.views.image_bulk_order_payment_webhook")
+    @patch("image_bulk_orders.views.handle_image_bulk_order_payment")
     def test_image_bulk_handler_exception_caught(self, mock_image_webhook):
         """Test that image bulk handler exceptions are caught"""
         mock_image_webhook.side_effect = Exception("Image bulk handler error")
@@ -413,7 +431,7 @@ class RouterWebhookTests(TestCase):
 
         self.assertEqual(response.status_code, 500)
 
-    @patch("excel_bulk_orders.views.excel_bulk_order_payment_webhook")
+    @patch("excel_bulk_orders.views.handle_excel_bulk_order_payment")
     def test_excel_bulk_handler_exception_caught(self, mock_excel_webhook):
         """Test that excel bulk handler exceptions are caught"""
         mock_excel_webhook.side_effect = Exception("Excel bulk handler error")
@@ -425,6 +443,36 @@ class RouterWebhookTests(TestCase):
 
         self.assertEqual(response.status_code, 500)
 
+    # ========================================================================
+    # SIGNATURE TESTS
+    # ========================================================================
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_missing_signature_rejected(self, mock_payment_webhook):
+        """Test that unsigned webhooks never reach a handler"""
+        request = self.factory.post(
+            self.url,
+            data=json.dumps(self._create_payload()),
+            content_type="application/json",
+        )
+
+        response = router_webhook(request)
+
+        self.assertEqual(response.status_code, 401)
+        mock_payment_webhook.assert_not_called()
+
+    @patch("payment.api_views.handle_payment_webhook")
+    def test_invalid_signature_rejected(self, mock_payment_webhook):
+        """Test that badly signed webhooks never reach a handler"""
+        request = self._create_request(
+            self._create_payload(), HTTP_X_PAYSTACK_SIGNATURE="invalid"
+        )
+
+        response = router_webhook(request)
+
+        self.assertEqual(response.status_code, 401)
+        mock_payment_webhook.assert_not_called()
+
     # ========================================================================
     # HTTP METHOD VALIDATION TESTS
     # ========================================================================
@@ -435,7 +483,7 @@ class RouterWebhookTests(TestCase):
         payload = self._create_payload()
         request = self._create_request(payload, method="POST")
 
-        with patch("payment.api_views.payment_webhook") as mock_webhook:
+        with patch("payment.api_views.handle_payment_webhook") as mock_webhook:
             mock_webhook.return_value = HttpResponse(status=200)
             response = router_webhook(request)
             self.assertEqual(response.status_code, 200)
@@ -470,7 +518,7 @@ class RouterWebhookTests(TestCase):
     # ========================================================================
 
     @patch("webhook_router.views.logger")
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_logging_webhook_received(self, mock_webhook, mock_logger):
         """Test that webhook receipt is logged with reference"""
         mock_webhook.return_value = HttpResponse(status=200)
@@ -519,7 +567,7 @@ class RouterWebhookTests(TestCase):
         self.assertTrue(any("Invalid JSON" in str(call) for call in log_calls))
 
     @patch("webhook_router.views.logger")
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_logging_exception_details(self, mock_payment_webhook, mock_logger):
         """Test that exception details are logged"""
         mock_payment_webhook.side_effect = Exception("Test error")
@@ -540,7 +588,7 @@ class RouterWebhookTests(TestCase):
     # EDGE CASES & SPECIAL SCENARIOS
     # ========================================================================
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_reference_with_special_characters(self, mock_payment_webhook):
         """Test handling reference with special characters in MATERIAL format"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -561,7 +609,7 @@ class RouterWebhookTests(TestCase):
 
                 self.assertEqual(response.status_code, 200)
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_very_long_reference(self, mock_payment_webhook):
         """Test handling of very long reference"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -574,7 +622,7 @@ class RouterWebhookTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
-    @patch("bulk_orders.views.bulk_order_payment_webhook")
+    @patch("bulk_orders.views.handle_bulk_order_payment")
     def test_order_prefix_case_sensitivity(self, mock_bulk_webhook):
         """Test that ORDER prefix is case-sensitive (uppercase only)"""
         mock_bulk_webhook.return_value = HttpResponse(status=200)
@@ -597,7 +645,7 @@ class RouterWebhookTests(TestCase):
         response_data = json.loads(response.content)
         self.assertEqual(response_data.get("error"), "Unknown reference format")
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_extra_fields_in_payload(self, mock_payment_webhook):
         """Test that extra fields don't break routing"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -622,7 +670,7 @@ class RouterWebhookTests(TestCase):
         response_data = json.loads(response.content)
         self.assertEqual(response_data.get("status"), "ignored")
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_whitespace_in_reference(self, mock_payment_webhook):
         """Test handling of whitespace in reference - routes based on prefix"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -640,7 +688,7 @@ class RouterWebhookTests(TestCase):
     # RESPONSE HANDLING TESTS
     # ========================================================================
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_handler_response_preserved(self, mock_payment_webhook):
         """Test that handler response is preserved"""
         custom_response = HttpResponse("Custom response", status=201)
@@ -655,7 +703,7 @@ class RouterWebhookTests(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.content, b"Custom response")
 
-    @patch("bulk_orders.views.bulk_order_payment_webhook")
+    @patch("bulk_orders.views.handle_bulk_order_payment")
     def test_bulk_handler_response_preserved(self, mock_bulk_webhook):
         """Test that bulk handler response is preserved"""
         from django.http import JsonResponse
@@ -671,7 +719,7 @@ class RouterWebhookTests(TestCase):
         # Response should be preserved
         self.assertEqual(response.status_code, 202)
 
-    @patch("image_bulk_orders.views.image_bulk_order_payment_webhook")
+    @patch("image_bulk_orders.views.handle_image_bulk_order_payment")
     def test_image_bulk_handler_response_preserved(self, mock_image_webhook):
         """Test that image bulk handler response is preserved"""
         from django.http import JsonResponse
@@ -686,7 +734,7 @@ class RouterWebhookTests(TestCase):
 
         self.assertEqual(response.status_code, 202)
 
-    @patch("excel_bulk_orders.views.excel_bulk_order_payment_webhook")
+    @patch("excel_bulk_orders.views.handle_excel_bulk_order_payment")
     def test_excel_bulk_handler_response_preserved(self, mock_excel_webhook):
         """Test that excel bulk handler response is preserved"""
         from django.http import JsonResponse
@@ -705,10 +753,10 @@ class RouterWebhookTests(TestCase):
     # INTEGRATION & STRESS TESTS
     # ========================================================================
 
-    @patch("payment.api_views.payment_webhook")
-    @patch("bulk_orders.views.bulk_order_payment_webhook")
-    @patch("image_bulk_orders.views.image_bulk_order_payment_webhook")
-    @patch("excel_bulk_orders.views.excel_bulk_order_payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
+    @patch("bulk_orders.views.handle_bulk_order_payment")
+    @patch("image_bulk_orders.views.handle_image_bulk_order_payment")
+    @patch("excel_bulk_orders.views.handle_excel_bulk_order_payment")
     def test_concurrent_routing_simulation(
         self,
         mock_excel_webhook,
@@ -746,7 +794,7 @@ class RouterWebhookTests(TestCase):
         self.assertEqual(mock_image_webhook.call_count, 1)
         self.assertEqual(mock_excel_webhook.call_count, 1)
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_large_payload_handling(self, mock_payment_webhook):
         """Test handling of large webhook payload"""
         mock_payment_webhook.return_value = HttpResponse(status=200)
@@ -789,6 +837,7 @@ class RouterWebhookDecoratorsTests(TestCase):
 # ============================================================================
 
 
+@override_settings(PAYSTACK_SECRET_KEY=SECRET, WEBHOOK_INBOX_ENABLED=False)  # Inline routing; inbox covered in tests_inbox.py
 class WebhookRouterUrlTests(TestCase):
     """Test URL configuration for webhook router"""
 
@@ -802,24 +851,29 @@ class WebhookRouterUrlTests(TestCase):
             # Just verify the view function exists
             self.assertTrue(callable(router_webhook))
 
-    @patch("payment.api_views.payment_webhook")
+    @patch("payment.api_views.handle_payment_webhook")
     def test_url_accessible_via_client(self, mock_payment_webhook):
         """Test that URL is accessible via test client"""
         from django.test import Client
 
         mock_payment_webhook.return_value = HttpResponse(status=200)
 
+        clear_handler_cache()
+        self.addCleanup(clear_handler_cache)
+
         client = Client()
         payload = {
             "event": "charge.success",
             "data": {"reference": "MATERIAL-TEST", "amount": 1000000},
         }
+        body = json.dumps(payload)
 
         try:
             response = client.post(
                 "/api/webhook/",
-                data=json.dumps(payload),
+                data=body,
                 content_type="application/json",
+                HTTP_X_PAYSTACK_SIGNATURE=sign(body),
             )
 
             # Should get a response (might be 404 if URL not configured in test)
@@ -834,19 +888,26 @@ class WebhookRouterUrlTests(TestCase):
 # ============================================================================
 
 
+@override_settings(PAYSTACK_SECRET_KEY=SECRET, WEBHOOK_INBOX_ENABLED=False)  # Inline routing; inbox covered in tests_inbox.py
 class RoutingPriorityTests(TestCase):
     """Test routing priority when prefixes could overlap"""
 
     def setUp(self):
         self.factory = RequestFactory()
         self.url = "/api/webhook/"
+        clear_handler_cache()
+        self.addCleanup(clear_handler_cache)
 
     def _create_request(self, payload):
+        body = json.dumps(payload)
         return self.factory.post(
-            self.url, data=json.dumps(payload), content_type="application/json"
+            self.url,
+            data=body,
+            content_type="application/json",
+            HTTP_X_PAYSTACK_SIGNATURE=sign(body),
         )
 
-    @patch("image_bulk_orders.views.image_bulk_order_payment_webhook")
+    @patch("image_bulk_orders.views.handle_image_bulk_order_payment")
     def test_img_bulk_takes_precedence(self, mock_image_webhook):
         """Test that IMG-BULK- is checked before ORDER-"""
         mock_image_webhook.return_value = HttpResponse(status=200)
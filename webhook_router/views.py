@@ -2,17 +2,21 @@
 """
 Central webhook router for all payment callbacks.
 
-Routes payment webhooks to appropriate app handlers based on reference format:
-- MATERIAL-xxxx → payment.api_views.payment_webhook (regular orders)
-- ORDER-xxx-xxx → bulk_orders.views.bulk_order_payment_webhook
-- IMG-BULK-xxxx → image_bulk_orders.views.image_bulk_order_payment_webhook
-- EXL-xxxx → excel_bulk_orders.views.excel_bulk_order_payment_webhook (FIXED)
+Routes payment webhooks to the handler each app registers for its
+reference prefix (see webhook_router.registry):
+- MATERIAL-xxxx → payment.api_views.handle_payment_webhook (regular orders)
+- ORDER-xxx-xxx → bulk_orders.views.handle_bulk_order_payment
+- IMG-BULK-xxxx → image_bulk_orders.views.handle_image_bulk_order_payment
+- EXL-xxxx → excel_bulk_orders.views.handle_excel_bulk_order_payment
 """
 import json
 import logging
 from django.http import JsonResponse, HttpRequest
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from payment.security import verify_paystack_signature
+from .inbox import is_inbox_enabled, requeue_failed_event, store_event
+from .registry import get_handler
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +32,24 @@ def router_webhook(request: HttpRequest):
     - ORDER-xxx-xxx → Bulk orders
     - IMG-BULK-xxxx → Image bulk orders
     - EXL-xxxx → Excel bulk orders (FIXED import name)
+
+    The signature is verified and the body parsed once, here. With
+    WEBHOOK_INBOX_ENABLED (the default) the event is stored in the inbox and
+    Paystack gets 200 immediately; the handler runs later in the inbox
+    worker. A redelivered event is acknowledged as a duplicate, unless its
+    handler failed, in which case it is queued again. Otherwise the handler
+    runs inline with the parsed payload.
     """
     if request.method != "POST":
         return JsonResponse({"error": "Method not allowed"}, status=405)
 
     try:
+        # Verified once here; handlers trust the payload they are given
+        signature = request.META.get("HTTP_X_PAYSTACK_SIGNATURE")
+        if not signature or not verify_paystack_signature(request.body, signature):
+            logger.error("Router webhook signature verification failed")
+            return JsonResponse({"error": "Invalid signature"}, status=401)
+
         # Parse webhook payload
         payload = json.loads(request.body)
         event = payload.get("event")
@@ -45,34 +62,26 @@ def router_webhook(request: HttpRequest):
 
         logger.info(f"Router received webhook for reference: {reference}")
 
-        # Route based on reference format
-        if reference.startswith("IMG-BULK-"):
-            # Image bulk orders
-            from image_bulk_orders.views import image_bulk_order_payment_webhook
-
-            return image_bulk_order_payment_webhook(request)
-
-        elif reference.startswith("ORDER-"):
-            # Regular bulk orders
-            from bulk_orders.views import bulk_order_payment_webhook
-
-            return bulk_order_payment_webhook(request)
-
-        elif reference.startswith("EXL-"):
-            # Excel bulk orders - FIXED: Use correct function name
-            from excel_bulk_orders.views import excel_bulk_order_payment_webhook
+        # Route based on reference prefix (handlers registered by each app)
+        handler = get_handler(reference)
+        if handler is None:
+            logger.error(f"Unknown reference format: {reference}")
+            return JsonResponse({"error": "Unknown reference format"}, status=400)
 
-            return excel_bulk_order_payment_webhook(request)
+        if not is_inbox_enabled():
+            return handler(payload)
 
-        elif reference.startswith("MATERIAL-"):
-            # Regular payment app orders
-            from payment.api_views import payment_webhook
+        event, created = store_event(request.body, signature, payload)
+        if not created:
+            if not requeue_failed_event(event):
+                logger.info(f"Duplicate webhook for {reference} ignored")
+                return JsonResponse({"status": "duplicate"}, status=200)
+            logger.info(f"Redelivered webhook for {reference} queued again after failure")
 
-            return payment_webhook(request)
+        from material.background_utils import drain_webhook_inbox_task
 
-        else:
-            logger.error(f"Unknown reference format: {reference}")
-            return JsonResponse({"error": "Unknown reference format"}, status=400)
+        drain_webhook_inbox_task()
+        return JsonResponse({"status": "queued"}, status=200)
 
     except json.JSONDecodeError:
         logger.error("Invalid JSON payload")